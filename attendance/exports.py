@@ -0,0 +1,75 @@
+"""
+CSV export rows for attendance records (see blowcomotion.exports), shared by
+the admin export view and the export_attendance_to_csv command.
+"""
+from datetime import datetime
+
+from blowcomotion.exports import EXPORT_CHUNK_SIZE
+from blowcomotion.models import AttendanceRecord
+
+HEADERS = [
+    "date",
+    "member_id",
+    "member_first_name",
+    "member_last_name",
+    "member_preferred_name",
+    "member_gigomatic_username",
+    "member_email",
+    "member_phone",
+    "member_is_active",
+    "member_primary_instrument",
+    "member_section",
+    "played_instrument",
+    "played_instrument_section",
+    "guest_name",
+    "notes",
+    "created_at",
+]
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD filter date; raises ValueError with a readable message."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise ValueError(f"Invalid date '{value}'. Expected format is YYYY-MM-DD.") from exc
+
+
+def attendance_rows(start_date=None, end_date=None):
+    """Header row, then one row per attendance record in the date range, oldest first."""
+    yield HEADERS
+    queryset = AttendanceRecord.objects.select_related(
+        "member",
+        "member__user",
+        "member__primary_instrument",
+        "member__primary_instrument__section",
+        "played_instrument",
+        "played_instrument__section",
+    ).order_by("date", "member__user__last_name", "member__user__first_name", "guest_name")
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+
+    for record in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        member = record.member
+        primary_instrument = getattr(member, "primary_instrument", None) if member else None
+        section = getattr(primary_instrument, "section", None) if primary_instrument else None
+        yield [
+            record.date.isoformat() if record.date else "",
+            member.id if member else "",
+            member.first_name if member else "",
+            member.last_name if member else "",
+            member.preferred_name if member else "",
+            member.gigomatic_username if member else "",
+            member.email if member else "",
+            member.phone if member else "",
+            "YES" if (member and member.is_active) else ("NO" if member else ""),
+            primary_instrument.name if primary_instrument else "",
+            section.name if section else "",
+            record.played_instrument.name if record.played_instrument else "",
+            record.played_instrument.section.name if getattr(record.played_instrument, "section", None) else "",
+            record.guest_name or "",
+            record.notes or "",
+            record.created_at.isoformat() if record.created_at else "",
+        ]
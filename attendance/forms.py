@@ -5,6 +5,7 @@ import requests
 from django import forms
 from django.conf import settings
 
+from blowcomotion import integrations
 from blowcomotion.models import Member, Section
 
 
@@ -124,12 +125,13 @@ class SectionAttendanceForm(forms.Form):
         """Populate gig choices from GigoGig API"""
         try:
             # Fetch gigs from API
-            response = requests.get(
-                f"{settings.GIGO_API_URL}/gigs",
-                headers={"X-API-KEY": settings.GIGO_API_KEY},
-                timeout=5
-            )
-            response.raise_for_status()
+            with integrations.guard("go3") as timeout:
+                response = requests.get(
+                    f"{settings.GIGO_API_URL}/gigs",
+                    headers={"X-API-KEY": settings.GIGO_API_KEY},
+                    timeout=min(timeout, 5)
+                )
+                response.raise_for_status()
             
             gigs_data = response.json()
             if gigs_data.get("gigs"):
@@ -158,7 +160,7 @@ class SectionAttendanceForm(forms.Form):
                 self.fields['gig'].choices = [('', 'No gigs available')]
                 
         except Exception as e:
-            # Fallback if API is unavailable
+            # Fallback if API is unavailable (including an open GO3 circuit)
             self.fields['gig'].choices = [('', 'Unable to load gigs')]
 
 
@@ -1,10 +1,7 @@
-import csv
-import os
-from datetime import date, datetime
-
 from django.core.management.base import BaseCommand, CommandError
 
-from blowcomotion.models import AttendanceRecord
+from attendance.exports import attendance_rows, parse_date
+from blowcomotion.exports import write_csv
 
 
 class Command(BaseCommand):
@@ -33,75 +30,10 @@ class Command(BaseCommand):
         start_date = self._parse_date(options.get("start_date")) if options.get("start_date") else None
         end_date = self._parse_date(options.get("end_date")) if options.get("end_date") else None
 
-        directory = os.path.dirname(os.path.abspath(output_path)) or "."
-        os.makedirs(directory, exist_ok=True)
-
-        queryset = AttendanceRecord.objects.all().select_related(
-            "member",
-            "member__user",
-            "member__primary_instrument",
-            "member__primary_instrument__section",
-            "played_instrument",
-            "played_instrument__section",
-        ).order_by("date", "member__user__last_name", "member__user__first_name", "guest_name")
-
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-
-        headers = [
-            "date",
-            "member_id",
-            "member_first_name",
-            "member_last_name",
-            "member_preferred_name",
-            "member_gigomatic_username",
-            "member_email",
-            "member_phone",
-            "member_is_active",
-            "member_primary_instrument",
-            "member_section",
-            "played_instrument",
-            "played_instrument_section",
-            "guest_name",
-            "notes",
-            "created_at",
-        ]
-
-        record_count = queryset.count()
+        record_count = write_csv(attendance_rows(start_date, end_date), output_path)
         if record_count == 0:
             self.stdout.write(self.style.WARNING("No attendance records found for the provided filters."))
 
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-
-            for record in queryset.iterator(chunk_size=1000):
-                member = record.member
-                primary_instrument = getattr(member, "primary_instrument", None) if member else None
-                section = getattr(primary_instrument, "section", None) if primary_instrument else None
-
-                row = [
-                    record.date.isoformat() if record.date else "",
-                    member.id if member else "",
-                    member.first_name if member else "",
-                    member.last_name if member else "",
-                    member.preferred_name if member else "",
-                    member.gigomatic_username if member else "",
-                    member.email if member else "",
-                    member.phone if member else "",
-                    "YES" if (member and member.is_active) else ("NO" if member else ""),
-                    primary_instrument.name if primary_instrument else "",
-                    section.name if section else "",
-                    record.played_instrument.name if record.played_instrument else "",
-                    record.played_instrument.section.name if getattr(record.played_instrument, "section", None) else "",
-                    record.guest_name or "",
-                    record.notes or "",
-                    record.created_at.isoformat() if record.created_at else "",
-                ]
-                writer.writerow(row)
-
         summary = f"Export complete. {record_count} attendance records written to {output_path}"
         if start_date or end_date:
             summary += " ("
@@ -113,8 +45,6 @@ class Command(BaseCommand):
 
     def _parse_date(self, value):
         try:
-            return datetime.strptime(value, "%Y-%m-%d").date()
+            return parse_date(value)
         except ValueError as exc:
-            raise CommandError(
-                f"Invalid date '{value}'. Expected format is YYYY-MM-DD."
-            ) from exc
+            raise CommandError(str(exc)) from exc
@@ -4,10 +4,11 @@ from collections import defaultdict
 from wagtail.models import Site
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.core.management.base import BaseCommand
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
 from django.db.models import Count
 
+from blowcomotion.bulk_mail import send_bulk
 from blowcomotion.models import AttendanceRecord, Member, Section, SiteSettings
 
 
@@ -35,28 +36,21 @@ class Command(BaseCommand):
                 self.style.NOTICE(f'[Dry Run] Would send email to {recipients}:\nSubject: {subject}\n\nMessage:\n{message}')
             )
         else:
-            send_mail(
-                subject,
-                message,
-                settings.FROM_EMAIL,
-                recipients,
-                fail_silently=False,
-            )
+            messages = [EmailMessage(subject, message, settings.FROM_EMAIL, recipients)]
+            # Send a copy for verifying functionality
+            extra_email = settings.FORM_TEST_EMAIL if hasattr(settings, 'FORM_TEST_EMAIL') else None
+            if extra_email:
+                messages.append(EmailMessage(subject, message, settings.FROM_EMAIL, [extra_email]))
+            # One SMTP connection for the report and its copy
+            report = send_bulk(messages)
+            report.log_summary('send_attendance_report')
+            if report.failed:
+                raise CommandError('Failed to send attendance report: ' + '; '.join(report.report_lines()))
             self.stdout.write(
                 self.style.SUCCESS(
                     f'✅ Attendance report sent to {len(recipients)} recipient(s)'
                 )
             )
-            # Send a copy for verifying functionality
-            extra_email = settings.FORM_TEST_EMAIL if hasattr(settings, 'FORM_TEST_EMAIL') else None
-            if extra_email:
-                send_mail(
-                    subject,
-                    message,
-                    settings.FROM_EMAIL,
-                    [extra_email],
-                    fail_silently=False,
-                )
 
     def _get_site_settings(self):
         """Retrieve site settings."""
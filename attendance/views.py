@@ -1,20 +1,17 @@
 import logging
-import os
-import tempfile
 from collections import OrderedDict
 from datetime import date, datetime, timedelta
-from io import StringIO
 
 from django.contrib.auth.decorators import login_required, permission_required
-from django.core.cache import cache
-from django.core.management import call_command
 from django.db.models import Count, Q
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
-from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from attendance.exports import attendance_rows, parse_date
 from attendance.forms import AttendanceReportFilterForm
+from blowcomotion import cache_namespaces
+from blowcomotion.exports import streaming_csv_response
 from blowcomotion.models import AttendanceRecord, CachedGig, Instrument, Member, Section
 from gigs.gigo import make_gigo_api_request
 
@@ -448,7 +445,7 @@ def attendance_capture(request, section_slug=None):
     cache_key = f"gigs_for_date_{date_str}"
     
     # Check cache first
-    cached_result = cache.get(cache_key)
+    cached_result = cache_namespaces.get(cache_namespaces.GIGS, cache_key)
     if cached_result is not None:
         gig_choices = cached_result.get('gigs', [])
     else:
@@ -463,7 +460,7 @@ def attendance_capture(request, section_slug=None):
         
         # Cache the result for 10 minutes (fast lookup for repeated requests)
         result = {'gigs': gig_choices}
-        cache.set(cache_key, result, 600)
+        cache_namespaces.set(cache_namespaces.GIGS, cache_key, result)
     
     # Determine default event_type selection
     # Priority: last selected (if exists and not date changed) > first gig > rehearsal
@@ -755,44 +752,17 @@ def export_attendance_csv(request):
 
     start_date = request.GET.get('start_date')
     end_date = request.GET.get('end_date')
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
-    temp_path = temp_file.name
-    temp_file.close()
-
     try:
-        logger.info(
-            "Starting attendance export by user %s (start_date=%s, end_date=%s)",
-            request.user.username,
-            start_date or 'min',
-            end_date or 'max',
-        )
-        command_kwargs = {
-            'output': temp_path,
-            'stdout': StringIO(),
-        }
-        if start_date:
-            command_kwargs['start_date'] = start_date
-        if end_date:
-            command_kwargs['end_date'] = end_date
-
-        call_command('export_attendance_to_csv', **command_kwargs)
-
-    except Exception:
-        logger.exception("Error during attendance export by user %s", request.user.username)
-        return JsonResponse({'error': 'An internal error occurred while exporting attendance data.'}, status=500)
-    else:
-        with open(temp_path, 'rb') as csv_file:
-            csv_data = csv_file.read()
-
-        timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
-        filename = f'attendance_export_{timestamp}.csv'
-        response = HttpResponse(csv_data, content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        logger.info("Attendance export completed successfully by user %s", request.user.username)
-        return response
-    finally:
-        try:
-            os.remove(temp_path)
-        except OSError:
-            logger.warning("Temporary file %s could not be removed after attendance export", temp_path)
+        start = parse_date(start_date) if start_date else None
+        end = parse_date(end_date) if end_date else None
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    logger.info(
+        "Starting attendance export by user %s (start_date=%s, end_date=%s)",
+        request.user.username,
+        start_date or 'min',
+        end_date or 'max',
+    )
+    return streaming_csv_response(attendance_rows(start, end), 'attendance_export')
 
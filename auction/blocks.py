@@ -1,11 +1,19 @@
 from wagtail import blocks
 from wagtail.snippets.blocks import SnippetChooserBlock
 
+from django.conf import settings
+
 
 class AuctionBlock(blocks.StructBlock):
     intro = blocks.RichTextBlock(required=False)
     auction = SnippetChooserBlock("auction.Auction")
 
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        # Streams replace the grid's polling; see auction.views.bid_stream
+        context["live_updates"] = getattr(settings, "AUCTION_LIVE_UPDATES", False)
+        return context
+
     class Meta:
         template = "auction/blocks/auction_block.html"
         icon = "tag"
@@ -0,0 +1,241 @@
+"""
+Concurrent-bidder load and correctness harness for auction.services.place_bid.
+
+Seeds a throwaway auction, runs N simulated bidders (one thread and one DB
+connection each) placing bids at the current minimum or a little above on
+random items, while a poller renders the grid the way the HTMX refresh does.
+Afterwards it checks the database for lost or out-of-order bids and reports
+latency percentiles:
+
+    report = run(bidders=20, items=5, duration=30)
+    report.violations   # [] when every accepted bid is accounted for
+    report.bid_latency  # {"p50": ms, "p95": ms, "p99": ms, "max": ms}
+
+It runs against whatever DATABASES["default"] points at, so the same run
+can be repeated on SQLite and on a local MySQL/MariaDB by switching settings
+(see `manage.py auction_load_test`). Outbid notices are queued as in
+production; nothing here sends them.
+
+Lock wait is the time spent in place_bid's SELECT ... FOR UPDATE. SQLite
+has no row locks (Django drops FOR UPDATE there, so lock wait is n/a);
+writers contend for the whole database instead. A transaction that read
+first and then can't take the write lock fails at once with "database is
+locked", counted under errors. The SQLite OPTIONS setting
+{"transaction_mode": "IMMEDIATE"} makes writers queue instead, and the
+harness is the way to measure the difference.
+"""
+import random
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import OperationalError, connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from auction.models import Auction, AuctionEvent, AuctionItem, AuctionStats, Bid, Bidder
+from auction.services import BidError, place_bid
+
+
+@dataclass
+class LoadReport:
+    vendor: str
+    bidders: int
+    items: int
+    duration: float
+    accepted: int = 0
+    rejected: int = 0
+    errors: int = 0
+    bid_latency: dict = field(default_factory=dict)
+    lock_wait: dict = field(default_factory=dict)
+    poll_latency: dict = field(default_factory=dict)
+    polls: int = 0
+    violations: list = field(default_factory=list)
+
+    @property
+    def bids_per_second(self):
+        return self.accepted / self.duration if self.duration else 0.0
+
+
+def percentiles(seconds):
+    """p50/p95/p99/max of a list of durations, in milliseconds ({} if empty)."""
+    if not seconds:
+        return {}
+    ms = sorted(s * 1000 for s in seconds)
+    if len(ms) == 1:
+        return {"p50": ms[0], "p95": ms[0], "p99": ms[0], "max": ms[0]}
+    cuts = statistics.quantiles(ms, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": ms[-1]}
+
+
+def seed_auction(items, bidders):
+    """Create an open auction with ``items`` items and ``bidders`` bidders."""
+    auction = Auction.objects.create(
+        name=f"Load test {timezone.now():%Y-%m-%d %H:%M:%S}",
+        close_time=timezone.now() + timedelta(days=1),
+    )
+    for n in range(items):
+        AuctionItem.objects.create(
+            auction=auction, title=f"Load test item {n + 1}",
+            starting_bid=Decimal("10"), bid_increment=Decimal("1"),
+        )
+    for n in range(bidders):
+        Bidder.objects.create(
+            auction=auction, name=f"Load Bidder{n + 1}",
+            email=f"load-bidder{n + 1}@example.com", phone=f"+1512555{n:04d}",
+        )
+    return auction
+
+
+class _Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bid_latency = []
+        self.lock_wait = []
+        self.poll_latency = []
+        self.accepted = 0
+        self.rejected = 0
+        self.errors = 0
+
+
+def _bidder_loop(bidder, item_ids, deadline, rng, results):
+    lock_waits = []
+
+    def time_row_lock(execute, sql, params, many, context):
+        if "FOR UPDATE" not in sql:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            lock_waits.append(time.perf_counter() - start)
+
+    try:
+        with connection.execute_wrapper(time_row_lock):
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    item = AuctionItem.objects.only(
+                        "starting_bid", "bid_increment", "current_high_bid"
+                    ).get(pk=rng.choice(item_ids))
+                    amount = item.minimum_bid + item.bid_increment * rng.randint(0, 2)
+                    start = time.perf_counter()
+                    place_bid(item.pk, bidder, amount)
+                    outcome = "accepted"
+                except BidError:
+                    outcome = "rejected"  # outbid between our read and our lock
+                except OperationalError:
+                    outcome = "errors"  # e.g. SQLite's "database is locked"
+                elapsed = time.perf_counter() - start
+                with results.lock:
+                    setattr(results, outcome, getattr(results, outcome) + 1)
+                    if outcome != "errors":
+                        results.bid_latency.append(elapsed)
+                if outcome == "errors":
+                    time.sleep(0.01)  # back off like a retrying client rather than spin
+    finally:
+        with results.lock:
+            results.lock_wait.extend(lock_waits)
+        connection.close()
+
+
+def _poller_loop(auction_id, deadline, interval, results):
+    from auction.views import grid_partial
+
+    factory = RequestFactory()
+    try:
+        while time.monotonic() < deadline:
+            request = factory.get(f"/auction/{auction_id}/grid/", HTTP_HX_REQUEST="true")
+            start = time.perf_counter()
+            try:
+                grid_partial(request, auction_id)  # no If-None-Match: a full render
+            except OperationalError:
+                continue
+            with results.lock:
+                results.poll_latency.append(time.perf_counter() - start)
+            time.sleep(interval)
+    finally:
+        connection.close()
+
+
+def verify(auction, accepted):
+    """Return a list of human-readable consistency violations (empty when all is well)."""
+    violations = []
+    total = 0
+    for item in auction.items.all():
+        bids = list(item.bids.order_by("id"))
+        total += len(bids)
+        floor = item.starting_bid
+        for bid in bids:
+            if bid.amount < floor:
+                violations.append(
+                    f"{item}: bid {bid.pk} of ${bid.amount} accepted below the minimum ${floor}"
+                )
+            floor = max(floor, bid.amount + item.bid_increment)
+        top = max(bids, key=lambda b: (b.amount, -b.pk), default=None)
+        if item.bid_count != len(bids):
+            violations.append(f"{item}: bid_count {item.bid_count} but {len(bids)} bids stored")
+        if (item.current_high_bid, item.current_high_bidder_id) != (
+            (top.amount, top.bidder_id) if top else (None, None)
+        ):
+            violations.append(
+                f"{item}: high bid column ${item.current_high_bid} disagrees with the bids "
+                f"(${top.amount if top else None})"
+            )
+        events = AuctionEvent.objects.filter(item=item, kind=AuctionEvent.KIND_BID).count()
+        if events != len(bids):
+            violations.append(f"{item}: {events} live-stream events for {len(bids)} bids")
+    if total != accepted:
+        violations.append(f"{accepted} bids were accepted but {total} are stored")
+    for name, (running, actual) in AuctionStats.refresh(auction.pk, save=False).items():
+        violations.append(f"AuctionStats.{name} is {running} but the bids say {actual}")
+    return violations
+
+
+def run(bidders=10, items=5, duration=10.0, poll_interval=1.0, seed=0, keep=False):
+    """Run one load test and return a LoadReport; the seeded auction is deleted unless ``keep``."""
+    auction = seed_auction(items, bidders)
+    item_ids = list(auction.items.values_list("pk", flat=True))
+    results = _Results()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=_bidder_loop,
+            args=(bidder, item_ids, deadline, random.Random(seed + n), results),
+        )
+        for n, bidder in enumerate(auction.bidders.order_by("pk"))
+    ]
+    if poll_interval:
+        threads.append(threading.Thread(
+            target=_poller_loop, args=(auction.pk, deadline, poll_interval, results)
+        ))
+    try:
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        report = LoadReport(
+            vendor=connection.vendor,
+            bidders=bidders,
+            items=items,
+            duration=elapsed,
+            accepted=results.accepted,
+            rejected=results.rejected,
+            errors=results.errors,
+            bid_latency=percentiles(results.bid_latency),
+            lock_wait=percentiles(results.lock_wait),
+            poll_latency=percentiles(results.poll_latency),
+            polls=len(results.poll_latency),
+            violations=verify(auction, results.accepted),
+        )
+    finally:
+        if not keep:
+            Bid.objects.filter(item__auction=auction).delete()
+            auction.delete()
+    return report
@@ -0,0 +1,73 @@
+"""
+Management command to load-test bidding with concurrent simulated bidders.
+
+Seeds a throwaway auction in the configured database, hammers
+auction.services.place_bid from --bidders threads for --duration seconds
+while polling the grid, then checks for lost or out-of-order high bids and
+prints bid latency, row-lock wait and grid poll latency percentiles.
+Exits non-zero if any consistency check fails. See auction.loadtest.
+
+Usage:
+    python manage.py auction_load_test
+    python manage.py auction_load_test --bidders 50 --items 3 --duration 60
+
+To compare against MySQL/MariaDB, point DATABASES["default"] at a local
+server (e.g. in local.py), run `migrate`, then run the same command.
+Never run it against production: it writes real rows (deleted afterwards
+unless --keep).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from auction.loadtest import run
+
+
+class Command(BaseCommand):
+    help = 'Load-test place_bid with concurrent bidders and verify no bids are lost or misordered'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bidders', type=int, default=10, help='Concurrent bidder threads')
+        parser.add_argument('--items', type=int, default=5, help='Items to spread bids over')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds between grid polls (0 disables the poller)',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for bid choices')
+        parser.add_argument('--keep', action='store_true', help="Don't delete the seeded auction")
+
+    def handle(self, *args, **options):
+        report = run(
+            bidders=options['bidders'],
+            items=options['items'],
+            duration=options['duration'],
+            poll_interval=options['poll_interval'],
+            seed=options['seed'],
+            keep=options['keep'],
+        )
+        self.stdout.write(
+            f"{report.vendor}: {report.bidders} bidders on {report.items} items for {report.duration:.1f}s"
+        )
+        self.stdout.write(
+            f"  bids: {report.accepted} accepted ({report.bids_per_second:.1f}/s), "
+            f"{report.rejected} outbid, {report.errors} database errors"
+        )
+        for label, stats in (
+            ("bid latency", report.bid_latency),
+            ("lock wait", report.lock_wait),
+            (f"grid poll ({report.polls})", report.poll_latency),
+        ):
+            if stats:
+                self.stdout.write(
+                    f"  {label}: p50 {stats['p50']:.1f}ms  p95 {stats['p95']:.1f}ms  "
+                    f"p99 {stats['p99']:.1f}ms  max {stats['max']:.1f}ms"
+                )
+            else:
+                self.stdout.write(f"  {label}: n/a")
+
+        if report.violations:
+            for violation in report.violations:
+                self.stderr.write(f"  {violation}")
+            raise CommandError(f"{len(report.violations)} consistency violation(s)")
+        self.stdout.write(self.style.SUCCESS("  no lost or out-of-order bids"))
@@ -1,17 +1,92 @@
 """
 Close expired auction items: pick winners/backups and send notifications.
+Also prunes live-grid stream events older than a day.
 
-Cron (hourly backstop; page views also close lazily):
-0 * * * * cd /path/to/project && /path/to/venv/bin/python manage.py close_auction_items
+Pages no longer close items themselves (they show the closed state from the
+clock), so run the closer continuously while an auction is live. With
+--watch it sleeps until the next item deadline, closes everything due in
+one pass, and repeats; it also sends queued outbid notices as they fall
+due (see send_outbid_notices). On PythonAnywhere, add it as an always-on
+task:
+
+    python manage.py close_auction_items --watch
+
+run_scheduler also runs the one-shot pass every minute (see
+blowcomotion.scheduler; this replaces the old hourly scheduled task), which
+is the backstop when --watch isn't running. A pass that fails (e.g. "database
+is locked") is logged and retried after --max-sleep rather than stopping the
+watcher.
 """
+import logging
+import time
+
 from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from auction.models import AuctionItem
+from auction.notifications import deliver_outbid_notices, next_outbid_notice_time
+from auction.services import close_expired_items, prune_events, seconds_until
+
+logger = logging.getLogger(__name__)
 
-from auction.services import close_expired_items
+PRUNE_INTERVAL_SECONDS = 60 * 60
 
 
 class Command(BaseCommand):
     help = "Pick winners for expired auction items and send notifications"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running, waking at each item deadline to close it',
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help=(
+                'Longest nap between checks in --watch mode (default: 60s), so new '
+                'items and edited deadlines are picked up'
+            ),
+        )
+
     def handle(self, *args, **options):
+        if not options['watch']:
+            self.close_and_prune()
+            return
+
+        self.stdout.write("Watching for auction deadlines (Ctrl-C to stop)")
+        last_prune = time.monotonic()
+        try:
+            while True:
+                try:
+                    close_old_connections()
+                    closed = close_expired_items()
+                    if closed:
+                        self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M:%S} closed {closed} item(s)")
+                    deliver_outbid_notices()
+                    if time.monotonic() - last_prune >= PRUNE_INTERVAL_SECONDS:
+                        prune_events()
+                        last_prune = time.monotonic()
+                    delay = self.seconds_until_next_close(options['max_sleep'])
+                except Exception:
+                    logger.exception("Auction closer pass failed; retrying in %ss", options['max_sleep'])
+                    delay = options['max_sleep']
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+
+    def close_and_prune(self):
         closed = close_expired_items()
         self.stdout.write(f"Closed {closed} item(s)")
+        pruned = prune_events()
+        if pruned:
+            self.stdout.write(f"Pruned {pruned} old live-stream event(s)")
+
+    @staticmethod
+    def seconds_until_next_close(max_sleep):
+        """Seconds until the next item deadline or outbid notice, whichever is first."""
+        due = [t for t in (AuctionItem.next_close_time(), next_outbid_notice_time()) if t is not None]
+        return seconds_until(min(due, default=None), max_sleep)
@@ -0,0 +1,46 @@
+"""
+Check the running AuctionStats totals against the bids and fix any drift.
+
+place_bid and the closer keep them in step; run this after bids are edited
+outside them (e.g. bulk deletes or raw SQL), or to verify before trusting
+the dashboard's totals.
+
+Usage:
+    python manage.py reconcile_auction_stats
+    python manage.py reconcile_auction_stats --auction 3
+    python manage.py reconcile_auction_stats --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from auction.models import Auction, AuctionStats
+
+
+class Command(BaseCommand):
+    help = "Verify AuctionStats against the bids and repair any differences"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--auction", type=int, help="Only check this auction (id)")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report differences without saving"
+        )
+
+    def handle(self, *args, **options):
+        auctions = Auction.objects.order_by("pk")
+        if options["auction"]:
+            auctions = auctions.filter(pk=options["auction"])
+
+        checked = drifted = 0
+        for auction in auctions:
+            with transaction.atomic():
+                # The row place_bid locks, so totals can't move underneath us
+                Auction.objects.select_for_update().get(pk=auction.pk)
+                changes = AuctionStats.refresh(auction.pk, save=not options["dry_run"])
+            checked += 1
+            if changes:
+                drifted += 1
+                detail = ", ".join(f"{field} {old} -> {new}" for field, (old, new) in changes.items())
+                self.stdout.write(f"  {auction}: {detail}")
+
+        verb = "would repair" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} auction(s), {verb} {drifted}"))
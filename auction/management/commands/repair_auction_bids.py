@@ -0,0 +1,49 @@
+"""
+Recompute the denormalized bid columns on AuctionItem (current_high_bid,
+current_high_bidder, bid_count, last_bid_at) from the Bid rows.
+
+place_bid keeps these in step; run this after bids are edited outside it
+(e.g. bulk deletes or raw SQL) or if the grid ever disagrees with the bid
+history.
+
+Usage:
+    python manage.py repair_auction_bids
+    python manage.py repair_auction_bids --auction 3
+    python manage.py repair_auction_bids --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from auction.models import AuctionItem
+
+
+class Command(BaseCommand):
+    help = "Recompute AuctionItem high bid / bid count columns from the bids"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--auction", type=int, help="Only repair items in this auction (id)")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report items that are out of date without saving"
+        )
+
+    def handle(self, *args, **options):
+        items = AuctionItem.objects.order_by("auction_id", "number")
+        if options["auction"]:
+            items = items.filter(auction_id=options["auction"])
+
+        checked = repaired = 0
+        for item_id in items.values_list("pk", flat=True):
+            with transaction.atomic():
+                # Same lock place_bid takes, so a concurrent bid can't interleave
+                item = AuctionItem.objects.select_for_update().get(pk=item_id)
+                checked += 1
+                before = (item.current_high_bid, item.bid_count)
+                if item.refresh_bid_summary(save=not options["dry_run"]):
+                    repaired += 1
+                    self.stdout.write(
+                        f"  #{item.number} {item.title}: high bid {before[0]} -> {item.current_high_bid}, "
+                        f"bids {before[1]} -> {item.bid_count}"
+                    )
+
+        verb = "would repair" if options["dry_run"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} item(s), {verb} {repaired}"))
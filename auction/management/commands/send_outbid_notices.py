@@ -0,0 +1,47 @@
+"""
+Send queued "you've been outbid" emails and texts (auction.models.OutbidNotice).
+
+place_bid only queues notices, so something has to drain them. The
+auction closer does it on every pass (`close_auction_items --watch`), so a
+single always-on task covers both. Run this command on its own when the
+closer isn't running, or to flush the queue by hand:
+
+    python manage.py send_outbid_notices
+    python manage.py send_outbid_notices --watch
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from auction.notifications import deliver_outbid_notices, next_outbid_notice_time
+from auction.services import seconds_until
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbid notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep running, sending notices as they fall due')
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=5,
+            help='Longest nap between checks in --watch mode (default: 5s)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['watch']:
+            self.stdout.write(f"Sent {deliver_outbid_notices()} outbid notice(s)")
+            return
+        try:
+            while True:
+                close_old_connections()
+                sent = deliver_outbid_notices()
+                if sent:
+                    self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M:%S} sent {sent} outbid notice(s)")
+                time.sleep(seconds_until(next_outbid_notice_time(), options['max_sleep']))
+        except KeyboardInterrupt:
+            pass
+
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.7 on 2026-10-19 00:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auctionitem',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='auctionitem',
+            name='current_high_bid',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='auctionitem',
+            name='current_high_bidder',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='auction.bidder'),
+        ),
+        migrations.AddField(
+            model_name='auctionitem',
+            name='last_bid_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def backfill_bid_summary(apps, schema_editor):
+    """Populate the denormalized bid columns added in 0002 from existing bids."""
+    AuctionItem = apps.get_model("auction", "AuctionItem")
+    Bid = apps.get_model("auction", "Bid")
+    items = AuctionItem.objects.annotate(n=Count("bids"), last=Max("bids__created_at")).filter(n__gt=0)
+    for item in items:
+        top = Bid.objects.filter(item=item).order_by("-amount", "created_at").first()
+        item.current_high_bid = top.amount
+        item.current_high_bidder_id = top.bidder_id
+        item.bid_count = item.n
+        item.last_bid_at = item.last
+        item.save(update_fields=["current_high_bid", "current_high_bidder", "bid_count", "last_bid_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auction", "0002_bid_summary_columns"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_bid_summary, migrations.RunPython.noop),
+    ]
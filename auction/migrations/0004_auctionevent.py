@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-19 00:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0003_backfill_bid_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('bid', 'Bid'), ('closed', 'Closed')], max_length=10)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('auction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='auction.auction')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auction.auctionitem')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['auction', 'id'], name='auction_auc_auction_7d88c9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-19 01:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0004_auctionevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
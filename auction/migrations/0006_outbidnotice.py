@@ -0,0 +1,36 @@
+# Generated by Django 6.0.7 on 2026-10-19 01:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0005_auction_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutbidNotice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('email', 'Email'), ('sms', 'SMS')], max_length=10)),
+                ('outbid_count', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('send_after', models.DateTimeField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bidder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auction.bidder')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auction.auctionitem')),
+                ('outbid_by', models.ForeignKey(help_text='The latest bid that outbid them.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auction.bid')),
+            ],
+            options={
+                'ordering': ['send_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'send_after'], name='auction_out_status_f16d94_idx'), models.Index(fields=['bidder', 'channel', 'sent_at'], name='auction_out_bidder__16c284_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('bidder', 'item', 'channel'), name='one_pending_outbid_notice')],
+            },
+        ),
+    ]
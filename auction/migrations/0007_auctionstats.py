@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-19 01:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0006_outbidnotice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionStats',
+            fields=[
+                ('auction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auction.auction')),
+                ('total_raised', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('bid_count', models.PositiveIntegerField(default=0)),
+                ('items_with_bids', models.PositiveIntegerField(default=0)),
+                ('unique_bidders', models.PositiveIntegerField(default=0)),
+                ('items_closed', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'auction stats',
+            },
+        ),
+    ]
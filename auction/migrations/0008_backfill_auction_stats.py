@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def backfill_auction_stats(apps, schema_editor):
+    """Create an AuctionStats row (added in 0007) for every existing auction."""
+    Auction = apps.get_model("auction", "Auction")
+    AuctionItem = apps.get_model("auction", "AuctionItem")
+    AuctionStats = apps.get_model("auction", "AuctionStats")
+    Bid = apps.get_model("auction", "Bid")
+    for auction in Auction.objects.all():
+        bids = Bid.objects.filter(item__auction=auction)
+        items = AuctionItem.objects.filter(auction=auction)
+        raised = items.annotate(top=Max("bids__amount")).values_list("winning_bid__amount", "top")
+        AuctionStats.objects.update_or_create(auction=auction, defaults={
+            "total_raised": sum((winning or top or 0 for winning, top in raised), Decimal("0")),
+            "bid_count": bids.count(),
+            "items_with_bids": bids.values("item").distinct().count(),
+            "unique_bidders": bids.values("bidder").distinct().count(),
+            "items_closed": items.filter(winner_notified_at__isnull=False).count(),
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auction", "0007_auctionstats"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_auction_stats, migrations.RunPython.noop),
+    ]
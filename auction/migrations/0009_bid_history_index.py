@@ -0,0 +1,17 @@
+# Generated by Django 6.0.7 on 2026-10-19 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0008_backfill_auction_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bid',
+            index=models.Index(fields=['item', 'created_at', 'id'], name='auction_bid_history_idx'),
+        ),
+    ]
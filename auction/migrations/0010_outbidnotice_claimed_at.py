@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auction', '0009_bid_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outbidnotice',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker took it; a SENDING row claimed long ago belonged to a worker that died.', null=True),
+        ),
+    ]
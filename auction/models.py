@@ -1,14 +1,20 @@
 import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
 from modelcluster.fields import ParentalKey
 from modelcluster.models import ClusterableModel
 from wagtail.images import get_image_model_string
 from wagtail.models import Orderable
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Max
+from django.db import models, transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.dateformat import format as date_format
 
 
 def normalize_phone(raw):
@@ -42,6 +48,9 @@ class Auction(ClusterableModel):
     )
     summary_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped whenever anything the grid or an item page shows changes (bids,
+    # closes, item and auction edits); served as the ETag for their polls.
+    version = models.PositiveBigIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
@@ -49,11 +58,76 @@ class Auction(ClusterableModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if not adding:
+            # Increment in the UPDATE itself: writing back the loaded value
+            # would undo bumps made while this instance was in memory.
+            self.version = models.F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+        if adding:
+            AuctionStats.objects.create(auction=self)
+        else:
+            self.refresh_from_db(fields=["version"])
+        self._forget_state(self.pk)
+
+    @classmethod
+    def bump_version(cls, auction_id):
+        """Mark the auction's public pages as changed (call inside the changing transaction)."""
+        cls.objects.filter(pk=auction_id).update(version=models.F("version") + 1)
+        cls._forget_state(auction_id)
+
+    @staticmethod
+    def _state_cache_key(auction_id):
+        return f"auction:{auction_id}:state"
+
+    @classmethod
+    def _forget_state(cls, auction_id):
+        key = cls._state_cache_key(auction_id)
+        # Again after commit, in case a poll re-cached the old version meanwhile.
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    @classmethod
+    def cached_state(cls, auction_id):
+        """
+        ``{"version", "next_close"}`` for conditional polling, or None if the
+        auction doesn't exist. ``next_close`` is the earliest deadline of an
+        item that hasn't been closed yet: past it, the cached version can't be
+        trusted until the item is closed (which bumps the version).
+
+        Cached for AUCTION_STATE_CACHE_SECONDS. Bumps clear the entry in this
+        process's cache; with a per-process cache other workers may answer
+        304 for up to that long after a change.
+        """
+        key = cls._state_cache_key(auction_id)
+        state = cache.get(key)
+        if state is None:
+            version = cls.objects.filter(pk=auction_id).values_list("version", flat=True).first()
+            if version is None:
+                return None
+            next_close = AuctionItem.next_close_time(auction_id=auction_id)
+            state = {"version": version, "next_close": next_close}
+            cache.set(key, state, getattr(settings, "AUCTION_STATE_CACHE_SECONDS", 5))
+        return state
+
+    def items_for_display(self):
+        """Items with everything the grid renders; bid state comes from the denormalized columns."""
+        return self.items.select_related(
+            "auction", "current_high_bidder", "winning_bid__bidder"
+        ).prefetch_related("images__image")
+
     def open_items_list(self):
-        return [i for i in self.items.prefetch_related("images", "bids") if i.is_open]
+        return [i for i in self.items_for_display() if i.is_open]
 
     def closed_items_list(self):
-        return [i for i in self.items.prefetch_related("images", "bids") if not i.is_open]
+        return [i for i in self.items_for_display() if not i.is_open]
+
+    def last_event_id(self):
+        """Id of the newest AuctionEvent, so a freshly rendered grid can stream from there."""
+        return self.events.aggregate(m=Max("id"))["m"] or 0
 
     def get_page(self):
         """The live page that embeds this auction via an AuctionBlock, if any."""
@@ -91,6 +165,21 @@ class AuctionItem(ClusterableModel):
     )
     winner_notified_at = models.DateTimeField(null=True, blank=True, editable=False)
 
+    # Denormalized from Bid so the polled grid needs no per-item queries.
+    # Maintained by auction.services.place_bid under the item's row lock;
+    # recompute with refresh_bid_summary() / `manage.py repair_auction_bids`.
+    current_high_bid = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True, editable=False
+    )
+    current_high_bidder = models.ForeignKey(
+        "auction.Bidder", null=True, blank=True, on_delete=models.SET_NULL, related_name="+",
+        editable=False,
+    )
+    bid_count = models.PositiveIntegerField(default=0, editable=False)
+    last_bid_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    BID_SUMMARY_FIELDS = ["current_high_bid", "current_high_bidder", "bid_count", "last_bid_at"]
+
     class Meta:
         ordering = ["number"]
         constraints = [
@@ -105,6 +194,19 @@ class AuctionItem(ClusterableModel):
             current = AuctionItem.objects.filter(auction=self.auction).aggregate(m=Max("number"))["m"] or 0
             self.number = current + 1
         super().save(*args, **kwargs)
+        Auction.bump_version(self.auction_id)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Auction.bump_version(self.auction_id)
+        return result
+
+    @classmethod
+    def next_close_time(cls, **filters):
+        """Earliest deadline among items not yet closed (optionally filtered), or None."""
+        return cls.objects.filter(winner_notified_at__isnull=True, **filters).aggregate(
+            m=Min(Coalesce("close_time", "auction__close_time"))
+        )["m"]
 
     @property
     def effective_close_time(self):
@@ -114,14 +216,90 @@ class AuctionItem(ClusterableModel):
     def is_open(self):
         return self.winner_notified_at is None and self.effective_close_time > timezone.now()
 
+    @property
+    def result(self):
+        """
+        ``(bidder, amount)`` of the winner, or None. Until the closer has
+        processed an item past its deadline, that's the standing high bid,
+        which is exactly what closing will pick.
+        """
+        if self.winning_bid_id:
+            return self.winning_bid.bidder, self.winning_bid.amount
+        if self.winner_notified_at is None and self.current_high_bidder_id:
+            return self.current_high_bidder, self.current_high_bid
+        return None
+
     @property
     def top_bid(self):
         return self.bids.order_by("-amount", "created_at").first()
 
     @property
     def minimum_bid(self):
+        if self.current_high_bid is None:
+            return self.starting_bid
+        return self.current_high_bid + self.bid_increment
+
+    def bid_history(self, before=None, after=None, limit=20):
+        """
+        One page of bids, newest first, seeking on (created_at, id) so a page
+        costs the same however long the history is. ``before`` / ``after``
+        are decoded cursors: older bids than, or bids placed since, that
+        position. Returns ``(bids, has_more)``. For ``after``, has_more means
+        more new bids remain beyond this page (fetch again from its newest).
+        """
+        bids = self.bids.select_related("bidder")
+        if after is not None:
+            created_at, pk = after
+            bids = bids.filter(
+                models.Q(created_at__gt=created_at) | models.Q(created_at=created_at, pk__gt=pk)
+            ).order_by("created_at", "id")
+        else:
+            if before is not None:
+                created_at, pk = before
+                bids = bids.filter(
+                    models.Q(created_at__lt=created_at) | models.Q(created_at=created_at, pk__lt=pk)
+                )
+            bids = bids.order_by("-created_at", "-id")
+        page = list(bids[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        if after is not None:
+            page.reverse()
+        return page, has_more
+
+    def live_state(self):
+        """Compact bid state pushed to the live grid (see AuctionEvent)."""
+        bidder = self.current_high_bidder
+        return {
+            "item": self.pk,
+            "number": self.number,
+            "high_bid": f"{self.current_high_bid:.2f}" if self.current_high_bid is not None else None,
+            "bidder": bidder.display_name if bidder else None,
+            "bid_count": self.bid_count,
+            "minimum_bid": f"{self.minimum_bid:.2f}",
+            "closes": date_format(timezone.localtime(self.effective_close_time), "M j, g:i A"),
+            "open": self.is_open,
+        }
+
+    def refresh_bid_summary(self, save=True):
+        """
+        Recompute the denormalized bid columns from this item's Bid rows.
+        Returns True if any of them changed.
+        """
         top = self.top_bid
-        return top.amount + self.bid_increment if top else self.starting_bid
+        stats = self.bids.aggregate(count=Count("id"), last=Max("created_at"))
+        summary = {
+            "current_high_bid": top.amount if top else None,
+            "current_high_bidder_id": top.bidder_id if top else None,
+            "bid_count": stats["count"],
+            "last_bid_at": stats["last"],
+        }
+        changed = any(getattr(self, field) != value for field, value in summary.items())
+        for field, value in summary.items():
+            setattr(self, field, value)
+        if changed and save:
+            self.save(update_fields=self.BID_SUMMARY_FIELDS)
+        return changed
 
 
 class AuctionItemImage(Orderable):
@@ -181,6 +359,180 @@ class Bid(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["item", "created_at", "id"], name="auction_bid_history_idx")]
 
     def __str__(self):
         return f"${self.amount} on {self.item} by {self.bidder.display_name}"
+
+    @property
+    def cursor(self):
+        return encode_bid_cursor(self.created_at, self.pk)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_bid_cursor(created_at, pk):
+    """Opaque keyset position for bid history: "<microseconds since epoch>-<id>"."""
+    return f"{(created_at - _EPOCH) // timedelta(microseconds=1)}-{pk}"
+
+
+def decode_bid_cursor(cursor):
+    """Inverse of encode_bid_cursor; raises ValueError for anything malformed."""
+    micros, pk = cursor.split("-")
+    return _EPOCH + timedelta(microseconds=int(micros)), int(pk)
+
+
+class AuctionEvent(models.Model):
+    """
+    Append-only log of item bid-state changes, tailed by the live grid stream
+    (auction.views.bid_stream). Written inside the same transaction as the
+    change, so a viewer never sees an event for a bid that rolled back.
+    Old rows are pruned by close_auction_items.
+    """
+
+    KIND_BID = "bid"
+    KIND_CLOSED = "closed"
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, related_name="events")
+    item = models.ForeignKey(AuctionItem, on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(max_length=10, choices=[(KIND_BID, "Bid"), (KIND_CLOSED, "Closed")])
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["auction", "id"])]
+
+    def __str__(self):
+        return f"{self.kind} on {self.item_id} at {self.created_at}"
+
+    @classmethod
+    def record(cls, item, kind):
+        return cls.objects.create(auction_id=item.auction_id, item=item, kind=kind, data=item.live_state())
+
+
+class AuctionStats(models.Model):
+    """
+    Running totals for an auction, for the auctioneer dashboard and the
+    results email. Updated under the auction's row lock by place_bid and
+    recomputed from the bids when items close; `manage.py
+    reconcile_auction_stats` checks them against the bids.
+
+    total_raised sums each item's winning bid (or, until it closes, its
+    current high bid).
+    """
+
+    auction = models.OneToOneField(Auction, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    total_raised = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    bid_count = models.PositiveIntegerField(default=0)
+    items_with_bids = models.PositiveIntegerField(default=0)
+    unique_bidders = models.PositiveIntegerField(default=0)
+    items_closed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    FIELDS = ["total_raised", "bid_count", "items_with_bids", "unique_bidders", "items_closed"]
+
+    class Meta:
+        verbose_name_plural = "auction stats"
+
+    def __str__(self):
+        return f"Stats for {self.auction_id}"
+
+    @staticmethod
+    def from_bids(auction_id):
+        """The stats as recomputed from the Bid and AuctionItem rows."""
+        bids = Bid.objects.filter(item__auction_id=auction_id)
+        items = AuctionItem.objects.filter(auction_id=auction_id)
+        raised = items.annotate(top=Max("bids__amount")).values_list("winning_bid__amount", "top")
+        return {
+            "total_raised": sum((winning or top or 0 for winning, top in raised), Decimal("0")).quantize(
+                Decimal("0.01")
+            ),
+            "bid_count": bids.count(),
+            "items_with_bids": bids.values("item").distinct().count(),
+            "unique_bidders": bids.values("bidder").distinct().count(),
+            "items_closed": items.filter(winner_notified_at__isnull=False).count(),
+        }
+
+    @classmethod
+    def refresh(cls, auction_id, save=True):
+        """
+        Recompute from the bids; returns ``{field: (old, new)}`` for anything
+        that was out of step.
+        """
+        stats, _ = cls.objects.get_or_create(auction_id=auction_id)
+        fresh = cls.from_bids(auction_id)
+        changes = {
+            field: (getattr(stats, field), value)
+            for field, value in fresh.items()
+            if getattr(stats, field) != value
+        }
+        if changes and save:
+            for field, value in fresh.items():
+                setattr(stats, field, value)
+            stats.save()
+        return changes
+
+
+class OutbidNotice(models.Model):
+    """
+    Queued "you've been outbid" message for one bidder, item and channel,
+    written by place_bid and sent by auction.notifications.deliver_outbid_notices.
+    Further outbids while a notice is still pending update it in place, so a
+    bidding war produces one message per window rather than one per bid.
+    """
+
+    CHANNEL_EMAIL = "email"
+    CHANNEL_SMS = "sms"
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_SKIPPED = "skipped"
+    STATUS_FAILED = "failed"
+    bidder = models.ForeignKey(Bidder, on_delete=models.CASCADE, related_name="+")
+    item = models.ForeignKey(AuctionItem, on_delete=models.CASCADE, related_name="+")
+    channel = models.CharField(
+        max_length=10, choices=[(CHANNEL_EMAIL, "Email"), (CHANNEL_SMS, "SMS")]
+    )
+    outbid_by = models.ForeignKey(
+        Bid, on_delete=models.CASCADE, related_name="+", help_text="The latest bid that outbid them."
+    )
+    outbid_count = models.PositiveIntegerField(default=1)
+    status = models.CharField(
+        max_length=10,
+        default=STATUS_PENDING,
+        choices=[
+            (STATUS_PENDING, "Pending"),
+            (STATUS_SENDING, "Sending"),
+            (STATUS_SENT, "Sent"),
+            (STATUS_SKIPPED, "Skipped"),
+            (STATUS_FAILED, "Failed"),
+        ],
+    )
+    send_after = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a worker took it; a SENDING row claimed long ago belonged to a worker that died.",
+    )
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["send_after", "id"]
+        indexes = [
+            models.Index(fields=["status", "send_after"]),
+            models.Index(fields=["bidder", "channel", "sent_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bidder", "item", "channel"],
+                condition=models.Q(status="pending"),
+                name="one_pending_outbid_notice",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.bidder} about {self.item} ({self.status})"
@@ -1,15 +1,33 @@
+import functools
 import logging
+from datetime import timedelta
 
-from twilio.rest import Client
 from wagtail.models import Site
 
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.core.mail import get_connection
+from django.db.models import F, Max, Min, Q
+from django.utils import timezone
 
+from auction.models import AuctionStats, OutbidNotice
+from blowcomotion import integrations
+from blowcomotion.bulk_mail import BulkMailer
 from members.auth import _MemberEmail
 
 logger = logging.getLogger(__name__)
 
+# Outbid notices (see deliver_outbid_notices). A notice waits
+# AUCTION_OUTBID_COALESCE_SECONDS for further outbids to fold into it, and a
+# bidder gets at most one message per channel per AUCTION_OUTBID_RATE_LIMITS
+# seconds, across items; later notices wait their turn rather than being
+# dropped.
+OUTBID_COALESCE_SECONDS = 30
+OUTBID_RATE_LIMITS = {OutbidNotice.CHANNEL_EMAIL: 60, OutbidNotice.CHANNEL_SMS: 300}
+OUTBID_MAX_ATTEMPTS = 5
+OUTBID_BATCH_SIZE = 100
+OUTBID_CLAIM_TIMEOUT = timedelta(minutes=10)
+
 
 def _root_url():
     site = Site.objects.filter(is_default_site=True).first() or Site.objects.first()
@@ -20,7 +38,17 @@ def item_url(item):
     return f"{_root_url()}/auction/{item.auction_id}/item/{item.number}/"
 
 
-def send_sms(to_phone, body):
+@functools.lru_cache(maxsize=4)
+def _twilio_client(sid, token, timeout):
+    # Imported here so the SDK only loads in processes that actually send SMS.
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+    # One client (and so one pooled HTTPS session) per process, not per SMS.
+    return Client(sid, token, http_client=TwilioHttpClient(timeout=timeout))
+
+
+def send_sms(to_phone, body, raise_errors=False):
     sid = getattr(settings, "TWILIO_ACCOUNT_SID", None)
     token = getattr(settings, "TWILIO_AUTH_TOKEN", None)
     from_number = getattr(settings, "TWILIO_FROM_NUMBER", None)
@@ -28,45 +56,210 @@ def send_sms(to_phone, body):
         logger.debug("Twilio not configured; SMS to %s skipped", to_phone)
         return
     try:
-        Client(sid, token).messages.create(to=to_phone, from_=from_number, body=body)
+        with integrations.guard("twilio") as timeout:
+            _twilio_client(sid, token, timeout).messages.create(to=to_phone, from_=from_number, body=body)
+    except integrations.CircuitOpenError:
+        logger.warning("Twilio circuit open; SMS to %s skipped", to_phone)
+        if raise_errors:
+            raise
     except Exception:
+        if raise_errors:
+            raise
         logger.exception("Failed to send SMS to %s", to_phone)
 
 
-def _send_email(subject, body, to):
+def _send_email(subject, body, to, mailer=None):
     # Runs in transaction.on_commit after the bid succeeded — never propagate.
     try:
-        _MemberEmail(
-            subject=subject, body=body, from_email=settings.FROM_EMAIL, to=to
-        ).send()
+        message = _MemberEmail(subject=subject, body=body, from_email=settings.FROM_EMAIL, to=to)
+        if mailer is not None:
+            mailer.send(message)
+        else:
+            message.send()
     except Exception:
         logger.exception("Failed to send auction email to %s", to)
 
 
 def notify_outbid(previous_top_bid, new_bid):
-    item = new_bid.item
+    """
+    Queue outbid notices for the previous leader. Called by place_bid inside
+    its transaction (under the item's row lock), so a notice exists exactly
+    when the bid does and concurrent bids can't both open a pending notice.
+    """
     bidder = previous_top_bid.bidder
+    channels = [OutbidNotice.CHANNEL_EMAIL]
+    if bidder.sms_opt_in:
+        channels.append(OutbidNotice.CHANNEL_SMS)
+    now = timezone.now()
+    coalesce = timedelta(seconds=getattr(settings, "AUCTION_OUTBID_COALESCE_SECONDS", OUTBID_COALESCE_SECONDS))
+    for channel in channels:
+        updated = OutbidNotice.objects.filter(
+            bidder=bidder, item_id=new_bid.item_id, channel=channel, status=OutbidNotice.STATUS_PENDING
+        ).update(outbid_by=new_bid, outbid_count=F("outbid_count") + 1)
+        if updated:
+            continue
+        # Space this notice after the bidder's last one on the channel, whether
+        # already sent or still queued (e.g. for another item).
+        latest = OutbidNotice.objects.filter(bidder=bidder, channel=channel).aggregate(
+            sent=Max("sent_at"),
+            queued=Max("send_after", filter=Q(status__in=[OutbidNotice.STATUS_PENDING, OutbidNotice.STATUS_SENDING])),
+        )
+        send_after = now + coalesce
+        last = max(filter(None, latest.values()), default=None)
+        if last:
+            send_after = max(send_after, last + timedelta(seconds=_rate_limit(channel)))
+        OutbidNotice.objects.create(
+            bidder=bidder, item_id=new_bid.item_id, channel=channel, outbid_by=new_bid, send_after=send_after
+        )
+
+
+def _rate_limit(channel):
+    limits = {**OUTBID_RATE_LIMITS, **getattr(settings, "AUCTION_OUTBID_RATE_LIMITS", {})}
+    return limits[channel]
+
+
+def _outbid_message(notice):
+    item, bidder, bid = notice.item, notice.bidder, notice.outbid_by
     url = item_url(item)
     next_min = item.minimum_bid
-    _send_email(
+    if notice.channel == OutbidNotice.CHANNEL_SMS:
+        return (
+            f"You've been outbid on #{item.number} {item.title} — now ${item.current_high_bid}. "
+            f"Reply BID {item.number} {next_min} to retake the lead, or see it here: {url}"
+        )
+    return _MemberEmail(
         subject=f"You've been outbid on #{item.number} {item.title}",
         body=(
             f"Hi {bidder.name},\n\n"
-            f"Someone bid ${new_bid.amount} on #{item.number} {item.title} — "
+            f"Someone bid ${bid.amount} on #{item.number} {item.title} — "
             f"you're no longer in the lead.\n\n"
             f"Bid again (at least ${next_min}): {url}\n"
         ),
+        from_email=settings.FROM_EMAIL,
         to=[bidder.email],
     )
-    if bidder.sms_opt_in:
-        send_sms(
-            bidder.phone,
-            f"You've been outbid on #{item.number} {item.title} — now ${new_bid.amount}. "
-            f"Reply BID {item.number} {next_min} to retake the lead, or see it here: {url}",
+
+
+def _finish(notice, error=None):
+    now = timezone.now()
+    if error is None:
+        OutbidNotice.objects.filter(pk=notice.pk).update(status=OutbidNotice.STATUS_SENT, sent_at=now)
+    elif notice.attempts >= OUTBID_MAX_ATTEMPTS:
+        logger.error("Giving up on outbid %s to %s: %s", notice.channel, notice.bidder_id, error)
+        OutbidNotice.objects.filter(pk=notice.pk).update(status=OutbidNotice.STATUS_FAILED, last_error=error)
+    else:
+        retry_at = now + timedelta(minutes=2 ** notice.attempts)
+        OutbidNotice.objects.filter(pk=notice.pk).update(
+            status=OutbidNotice.STATUS_PENDING, send_after=retry_at, last_error=error
         )
 
 
-def notify_winner(item):
+def requeue_stale_outbid_notices(now=None):
+    """
+    Put notices claimed by a worker that died back in the queue; returns how
+    many. One that a later outbid has since replaced with a new pending
+    notice is skipped instead.
+    """
+    now = now or timezone.now()
+    stale = OutbidNotice.objects.filter(status=OutbidNotice.STATUS_SENDING).filter(
+        Q(claimed_at__lt=now - OUTBID_CLAIM_TIMEOUT) | Q(claimed_at__isnull=True)
+    )
+    requeued = 0
+    for notice in stale:
+        superseded = OutbidNotice.objects.filter(
+            bidder_id=notice.bidder_id, item_id=notice.item_id, channel=notice.channel,
+            status=OutbidNotice.STATUS_PENDING,
+        ).exists()
+        status = OutbidNotice.STATUS_SKIPPED if superseded else OutbidNotice.STATUS_PENDING
+        if OutbidNotice.objects.filter(pk=notice.pk, status=OutbidNotice.STATUS_SENDING).update(status=status):
+            requeued += not superseded
+    return requeued
+
+
+def deliver_outbid_notices(limit=OUTBID_BATCH_SIZE):
+    """
+    Send due outbid notices; returns how many went out. Safe to run from
+    several workers: each notice is claimed with a conditional UPDATE first,
+    and notices left claimed by a worker that died are requeued after
+    OUTBID_CLAIM_TIMEOUT.
+
+    Notices whose bidder is back in the lead, or whose item has closed, are
+    skipped. All emails in a batch share one SMTP connection and SMS go
+    through one pooled Twilio client.
+    """
+    requeue_stale_outbid_notices()
+    due = list(
+        OutbidNotice.objects.filter(status=OutbidNotice.STATUS_PENDING, send_after__lte=timezone.now())
+        .select_related("bidder", "item__auction", "outbid_by")[:limit]
+    )
+    claimed = []
+    for notice in due:
+        if OutbidNotice.objects.filter(pk=notice.pk, status=OutbidNotice.STATUS_PENDING).update(
+            status=OutbidNotice.STATUS_SENDING, claimed_at=timezone.now(), attempts=F("attempts") + 1
+        ):
+            notice.attempts += 1
+            claimed.append(notice)
+
+    to_send = []
+    for notice in claimed:
+        if notice.item.current_high_bidder_id == notice.bidder_id or not notice.item.is_open:
+            OutbidNotice.objects.filter(pk=notice.pk).update(status=OutbidNotice.STATUS_SKIPPED)
+        else:
+            to_send.append(notice)
+
+    sent = 0
+    emails = [n for n in to_send if n.channel == OutbidNotice.CHANNEL_EMAIL]
+    if emails:
+        try:
+            connection = get_connection()
+            connection.open()
+        except Exception as exc:
+            logger.exception("Could not connect to the mail server for outbid notices")
+            for notice in emails:
+                _finish(notice, error=str(exc))
+            emails = []
+        for notice in emails:
+            message = _outbid_message(notice)
+            message.connection = connection
+            try:
+                message.send()
+            except Exception as exc:
+                _finish(notice, error=str(exc))
+            else:
+                _finish(notice)
+                sent += 1
+        if emails:
+            connection.close()
+
+    for notice in to_send:
+        if notice.channel != OutbidNotice.CHANNEL_SMS:
+            continue
+        try:
+            send_sms(notice.bidder.phone, _outbid_message(notice), raise_errors=True)
+        except Exception as exc:
+            _finish(notice, error=str(exc))
+        else:
+            _finish(notice)
+            sent += 1
+    return sent
+
+
+def next_outbid_notice_time():
+    """When the earliest pending notice falls due, or None."""
+    return OutbidNotice.objects.filter(status=OutbidNotice.STATUS_PENDING).aggregate(
+        m=Min("send_after")
+    )["m"]
+
+
+def notify_winners(items):
+    """notify_winner for each item, with the emails sharing one SMTP connection."""
+    with BulkMailer() as mailer:
+        for item in items:
+            notify_winner(item, mailer=mailer)
+    mailer.log_summary("Auction winner emails")
+
+
+def notify_winner(item, mailer=None):
     bid = item.winning_bid
     if not bid:
         return
@@ -80,6 +273,7 @@ def notify_winner(item):
             f"{instructions}\n\n{item_url(item)}\n"
         ),
         to=[bidder.email],
+        mailer=mailer,
     )
     if bidder.sms_opt_in:
         send_sms(
@@ -96,10 +290,10 @@ def send_auction_summary(auction):
     recipients = [e for e in group.user_set.values_list("email", flat=True) if e]
     if not recipients:
         return
-    lines, total = [], 0
-    for item in auction.items.order_by("number"):
+    lines = []
+    items = auction.items.select_related("winning_bid__bidder", "backup_bid__bidder").order_by("number")
+    for item in items:
         if item.winning_bid:
-            total += item.winning_bid.amount
             backup = item.backup_bid
             lines.append(
                 f"#{item.number} {item.title}: ${item.winning_bid.amount} — "
@@ -108,5 +302,7 @@ def send_auction_summary(auction):
             )
         else:
             lines.append(f"#{item.number} {item.title}: no bids")
+    stats = AuctionStats.objects.filter(auction=auction).first()
+    total = stats.total_raised if stats else AuctionStats.from_bids(auction.pk)["total_raised"]
     body = f"{auction.name} — final results\n\n" + "\n".join(lines) + f"\n\nTotal raised: ${total}\n"
     _send_email(subject=f"Auction results: {auction.name}", body=body, to=recipients)
@@ -1,9 +1,12 @@
+from collections import defaultdict
 from datetime import timedelta
+from decimal import Decimal
 
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
-from auction.models import AuctionItem, Bid
+from auction.models import AuctionEvent, AuctionItem, AuctionStats, Bid
 
 
 class BidError(Exception):
@@ -20,55 +23,105 @@ def place_bid(item_id, bidder, amount, source=Bid.SOURCE_WEB):
         now = timezone.now()
         if item.winner_notified_at or item.effective_close_time <= now:
             raise BidError(f"Bidding on #{item.number} {item.title} has closed.")
-        previous_top = item.top_bid
         minimum = item.minimum_bid
         if amount < minimum:
             raise BidError(f"Your bid on #{item.number} must be at least ${minimum}.")
+        # Only fetch the previous leader's Bid when there's someone to notify.
+        previous_top = (
+            item.top_bid
+            if item.current_high_bidder_id not in (None, bidder.pk)
+            else None
+        )
         bid = Bid.objects.create(item=item, bidder=bidder, amount=amount, source=source)
 
+        # The row lock above makes these read-modify-write updates safe.
+        update_fields = list(AuctionItem.BID_SUMMARY_FIELDS)
+        raised = Decimal("0")
+        if item.current_high_bid is None or amount > item.current_high_bid:
+            raised = amount - (item.current_high_bid or 0)
+            item.current_high_bid = amount
+            item.current_high_bidder = bidder
+        first_bid_on_item = item.bid_count == 0
+        item.bid_count += 1
+        item.last_bid_at = bid.created_at
+
         auction = item.auction
         if auction.soft_close_enabled:
             window = timedelta(minutes=auction.soft_close_minutes)
             if item.effective_close_time - now < window:
                 item.close_time = now + window
-                item.save(update_fields=["close_time"])
+                update_fields.append("close_time")
+        item.save(update_fields=update_fields)  # also bumps the auction's version
+        AuctionEvent.record(item, AuctionEvent.KIND_BID)
+        # The version bump holds the auction row lock, so bids on other items
+        # can't race the first-bid-by-this-bidder check.
+        first_bid_by_bidder = not Bid.objects.filter(bidder=bidder).exclude(pk=bid.pk).exists()
+        AuctionStats.objects.filter(auction_id=item.auction_id).update(
+            total_raised=F("total_raised") + raised,
+            bid_count=F("bid_count") + 1,
+            items_with_bids=F("items_with_bids") + int(first_bid_on_item),
+            unique_bidders=F("unique_bidders") + int(first_bid_by_bidder),
+            updated_at=now,
+        )
 
-        if previous_top and previous_top.bidder_id != bidder.pk:
+        if previous_top:
             from auction import notifications
 
-            transaction.on_commit(lambda: notifications.notify_outbid(previous_top, bid))
+            notifications.notify_outbid(previous_top, bid)  # queues; sent by the worker
         return bid
 
 
 def close_expired_items(auction=None):
-    """Pick winner + backup for every expired, unprocessed item. Idempotent."""
+    """
+    Pick winner + backup for every expired, unprocessed item. Idempotent.
+
+    Works in bulk: one query for the due items' bids, one UPDATE for the
+    items, one INSERT for their stream events and one version bump per
+    auction, however many items close at once.
+    """
     from django.db.models import Q
 
     from auction import notifications
-    from auction.models import Auction
+    from auction.models import Auction, Bidder
 
     now = timezone.now()
-    closed = 0
     qs = AuctionItem.objects.filter(winner_notified_at__isnull=True).filter(
         Q(close_time__lte=now) | Q(close_time__isnull=True, auction__close_time__lte=now)
     )
     if auction is not None:
         qs = qs.filter(auction=auction)
-    touched_auction_ids = set()
     with transaction.atomic():
-        for item in qs.select_for_update().select_related("auction"):
-            top = item.top_bid
-            if top:
+        items = list(qs.select_for_update().select_related("auction"))
+        if not items:
+            return 0
+        bids_by_item = defaultdict(list)
+        for bid in Bid.objects.filter(item__in=items).order_by("item_id", "-amount", "created_at"):
+            bids_by_item[bid.item_id].append(bid)
+        bidders = Bidder.objects.in_bulk({item.current_high_bidder_id for item in items} - {None})
+
+        for item in items:
+            bids = bids_by_item[item.pk]
+            if bids:
+                top = bids[0]
                 item.winning_bid = top
-                item.backup_bid = (
-                    item.bids.exclude(bidder=top.bidder).order_by("-amount", "created_at").first()
-                )
+                item.backup_bid = next((b for b in bids if b.bidder_id != top.bidder_id), None)
             item.winner_notified_at = now
-            item.save(update_fields=["winning_bid", "backup_bid", "winner_notified_at"])
-            touched_auction_ids.add(item.auction_id)
-            closed += 1
-            if top:
-                transaction.on_commit(lambda i=item: notifications.notify_winner(i))
+            item.current_high_bidder = bidders.get(item.current_high_bidder_id)
+        AuctionItem.objects.bulk_update(items, ["winning_bid", "backup_bid", "winner_notified_at"])
+        AuctionEvent.objects.bulk_create([
+            AuctionEvent(
+                auction_id=item.auction_id, item=item, kind=AuctionEvent.KIND_CLOSED, data=item.live_state()
+            )
+            for item in items
+        ])
+        touched_auction_ids = {item.auction_id for item in items}
+        for auction_id in touched_auction_ids:
+            Auction.bump_version(auction_id)  # bulk_update skips AuctionItem.save
+            AuctionStats.refresh(auction_id)
+        winners = [item for item in items if item.winning_bid_id]
+        if winners:
+            transaction.on_commit(lambda: notifications.notify_winners(winners))
+
         for a in Auction.objects.select_for_update().filter(
             pk__in=touched_auction_ids, summary_sent_at__isnull=True
         ):
@@ -76,7 +129,7 @@ def close_expired_items(auction=None):
                 a.summary_sent_at = now
                 a.save(update_fields=["summary_sent_at"])
                 transaction.on_commit(lambda a=a: notifications.send_auction_summary(a))
-    return closed
+    return len(items)
 
 
 def promote_backup(item):
@@ -91,4 +144,18 @@ def promote_backup(item):
         item.backup_bid = None
         item.winner_notified_at = timezone.now()
         item.save(update_fields=["winning_bid", "backup_bid", "winner_notified_at"])
+        AuctionStats.refresh(item.auction_id)  # total_raised now counts the backup's bid
         transaction.on_commit(lambda: notifications.notify_winner(item))
+
+
+def prune_events(older_than=timedelta(days=1)):
+    """Delete live-stream events no viewer could still be catching up on."""
+    deleted, _ = AuctionEvent.objects.filter(created_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def seconds_until(when, max_sleep):
+    """Seconds to sleep to wake just after ``when`` (capped at max_sleep; None means max_sleep)."""
+    if when is None:
+        return max_sleep
+    return min(max(0.0, (when - timezone.now()).total_seconds()) + 0.1, max_sleep)
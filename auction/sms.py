@@ -2,9 +2,6 @@ import logging
 import re
 from decimal import Decimal
 
-from twilio.request_validator import RequestValidator
-from twilio.twiml.messaging_response import MessagingResponse
-
 from django.conf import settings
 from django.http import HttpResponse, HttpResponseForbidden
 from django.views.decorators.csrf import csrf_exempt
@@ -25,6 +22,8 @@ def _signature_valid(request):
     if not token:
         # Dev convenience only; production must have the token configured.
         return settings.DEBUG
+    from twilio.request_validator import RequestValidator
+
     validator = RequestValidator(token)
     return validator.validate(
         request.build_absolute_uri(),
@@ -34,6 +33,8 @@ def _signature_valid(request):
 
 
 def _twiml(text):
+    from twilio.twiml.messaging_response import MessagingResponse
+
     response = MessagingResponse()
     response.message(text)
     return HttpResponse(str(response), content_type="text/xml")
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from auction.models import Bid, decode_bid_cursor, encode_bid_cursor
+from auction.tests.test_models import make_auction, make_bidder, make_item
+from auction.views import BID_HISTORY_PAGE_SIZE
+
+HTMX = {"HTTP_HX_REQUEST": "true"}
+
+
+class BidHistoryTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.bidder = make_bidder(self.auction)
+        self.url = reverse("auction-bid-history", args=[self.auction.pk, self.item.number])
+        start = timezone.now() - timedelta(hours=1)
+        self.bids = []
+        for n in range(BID_HISTORY_PAGE_SIZE + 5):
+            bid = Bid.objects.create(item=self.item, bidder=self.bidder, amount=Decimal(25 + n))
+            # Two bids share each timestamp, so the id tiebreak matters.
+            Bid.objects.filter(pk=bid.pk).update(created_at=start + timedelta(seconds=n // 2))
+            bid.refresh_from_db()
+            self.bids.append(bid)
+
+    def amounts(self, bids):
+        return [bid.amount for bid in bids]
+
+    def test_cursor_round_trip(self):
+        bid = self.bids[3]
+        self.assertEqual(decode_bid_cursor(bid.cursor), (bid.created_at, bid.pk))
+        self.assertEqual(encode_bid_cursor(*decode_bid_cursor(bid.cursor)), bid.cursor)
+        with self.assertRaises(ValueError):
+            decode_bid_cursor("nonsense")
+
+    def test_pages_walk_the_whole_history_once(self):
+        first, has_more = self.item.bid_history(limit=10)
+        self.assertTrue(has_more)
+        seen = list(first)
+        while has_more:
+            page, has_more = self.item.bid_history(before=decode_bid_cursor(seen[-1].cursor), limit=10)
+            seen.extend(page)
+        self.assertEqual(self.amounts(seen), self.amounts(reversed(self.bids)))
+
+    def test_new_since_cursor(self):
+        cursor = decode_bid_cursor(self.bids[-3].cursor)
+        page, more = self.item.bid_history(after=cursor, limit=10)
+        self.assertEqual(self.amounts(page), self.amounts([self.bids[-1], self.bids[-2]]))
+        self.assertFalse(more)
+
+        page, more = self.item.bid_history(after=decode_bid_cursor(self.bids[0].cursor), limit=3)
+        self.assertEqual(self.amounts(page), self.amounts([self.bids[3], self.bids[2], self.bids[1]]))
+        self.assertTrue(more)
+
+    def test_item_page_shows_first_page_and_older_link(self):
+        response = self.client.get(reverse("auction-item-detail", args=[self.auction.pk, self.item.number]))
+        self.assertContains(response, "Show older bids")
+        self.assertContains(response, f"?after={self.bids[-1].cursor}")
+        self.assertContains(response, f"?before={self.bids[5].cursor}")
+        self.assertNotContains(response, "$29.00 —")  # on the second page
+
+    def test_older_page_endpoint(self):
+        response = self.client.get(self.url, {"before": self.bids[5].cursor}, **HTMX)
+        self.assertContains(response, "$29.00 —")
+        self.assertNotContains(response, "Show older bids")
+        self.assertNotContains(response, "?after=")
+
+    def test_new_bids_endpoint_advances_poller(self):
+        response = self.client.get(self.url, {"after": self.bids[-2].cursor}, **HTMX)
+        self.assertContains(response, f"?after={self.bids[-1].cursor}")
+        self.assertContains(response, "$49.00 —")
+        self.assertNotContains(response, "$48.00 —")
+
+        response = self.client.get(self.url, {"after": self.bids[-1].cursor}, **HTMX)
+        self.assertContains(response, f"?after={self.bids[-1].cursor}")
+        self.assertNotContains(response, "<li>$")
+
+    def test_bad_cursor_rejected(self):
+        response = self.client.get(self.url, {"after": "x-y"}, **HTMX)
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_query_is_bounded(self):
+        with self.assertNumQueries(2):  # the item, then one page of bids with bidders
+            self.client.get(self.url, {"before": self.bids[-1].cursor})
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from wagtail import hooks
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from auction.models import Bid
+from auction.services import place_bid
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+
+class RepairAuctionBidsCommandTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.alice = make_bidder(self.auction)
+
+    def test_repairs_items_with_stale_columns(self):
+        Bid.objects.create(item=self.item, bidder=self.alice, amount=Decimal("30"))
+        out = StringIO()
+        call_command("repair_auction_bids", "--dry-run", stdout=out)
+        self.assertIn("would repair 1", out.getvalue())
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.bid_count, 0)
+
+        call_command("repair_auction_bids", stdout=StringIO())
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.current_high_bid, Decimal("30"))
+        self.assertEqual(self.item.current_high_bidder, self.alice)
+        self.assertEqual(self.item.bid_count, 1)
+
+        out = StringIO()
+        call_command("repair_auction_bids", "--auction", str(self.auction.pk), stdout=out)
+        self.assertIn("repaired 0", out.getvalue())
+
+
+class SnippetBidHooksTests(TestCase):
+    def test_deleting_bid_in_admin_refreshes_item(self):
+        auction = make_auction()
+        item = make_item(auction)
+        alice = make_bidder(auction)
+        with patch("auction.notifications.notify_outbid"):
+            place_bid(item.pk, alice, Decimal("25"))
+            bid = place_bid(item.pk, alice, Decimal("30"))
+        bid.delete()
+        for fn in hooks.get_hooks("after_delete_snippet"):
+            fn(MagicMock(), [bid])
+        item.refresh_from_db()
+        self.assertEqual(item.current_high_bid, Decimal("25"))
+        self.assertEqual(item.bid_count, 1)
+
+
+class GridQueryCountTests(TestCase):
+    def _grid_queries(self, auction):
+        url = reverse("auction-grid", args=[auction.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_HX_REQUEST="true")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_query_count_independent_of_items_and_bids(self):
+        auction = make_auction()
+        bidder = make_bidder(auction)
+        item = make_item(auction)
+        with patch("auction.notifications.notify_outbid"):
+            place_bid(item.pk, bidder, Decimal("25"))
+        baseline, _ = self._grid_queries(auction)
+
+        for n in range(5):
+            extra = make_item(auction, title=f"Item {n}")
+            with patch("auction.notifications.notify_outbid"):
+                place_bid(extra.pk, bidder, Decimal("25"))
+                place_bid(extra.pk, bidder, Decimal("40"))
+        queries, response = self._grid_queries(auction)
+
+        self.assertEqual(queries, baseline)
+        self.assertContains(response, '<span data-field="high-bid">40.00</span>')
+        self.assertContains(response, "2 bids")
@@ -1,12 +1,14 @@
 from datetime import timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from django.core.management import call_command
+from django.db import OperationalError
 from django.test import TestCase
 from django.utils import timezone
 
-from auction.models import Bid
+from auction.management.commands.close_auction_items import Command as CloseCommand
+from auction.models import AuctionEvent, Bid
 from auction.services import close_expired_items
 from auction.tests.test_models import make_auction, make_bidder, make_item
 
@@ -34,7 +36,7 @@ class CloseExpiredItemsTests(TestCase):
         self.assertEqual(self.item.winning_bid.bidder, self.alice)
         self.assertEqual(self.item.winning_bid.amount, Decimal("35"))
         self.assertEqual(self.item.backup_bid.bidder, self.bob)  # highest by a DIFFERENT bidder
-        mock_winner.assert_called_once_with(self.item)
+        mock_winner.assert_called_once_with(self.item, mailer=ANY)
 
     def test_no_bids_closes_silently(self, mock_winner, mock_summary):
         self._close()
@@ -60,7 +62,72 @@ class CloseExpiredItemsTests(TestCase):
         self._close()
         mock_summary.assert_called_once()
 
+    def test_closes_many_items_in_one_pass(self, mock_winner, mock_summary):
+        items = [self.item] + [make_item(self.auction, title=f"Item {n}") for n in range(5)]
+        for n, item in enumerate(items):
+            Bid.objects.create(item=item, bidder=self.alice, amount=Decimal("25") + n)
+            Bid.objects.create(item=item, bidder=self.bob, amount=Decimal("40") + n)
+            item.refresh_bid_summary()
+
+        with self.assertNumQueries(19):
+            closed = self._close()
+
+        self.assertEqual(closed, 6)
+        for n, item in enumerate(items):
+            item.refresh_from_db()
+            self.assertEqual(item.winning_bid.amount, Decimal("40") + n)
+            self.assertEqual(item.backup_bid.bidder, self.alice)
+        self.assertEqual(mock_winner.call_count, 6)
+        mock_summary.assert_called_once_with(self.auction)
+        self.assertEqual(AuctionEvent.objects.filter(kind=AuctionEvent.KIND_CLOSED).count(), 6)
+        self.assertEqual(AuctionEvent.objects.last().data["bidder"], "Bob J.")
+
     def test_management_command_runs(self, mock_winner, mock_summary):
         call_command("close_auction_items")
         self.item.refresh_from_db()
         self.assertIsNotNone(self.item.winner_notified_at)
+
+
+class CloserWatchTests(TestCase):
+    def test_sleeps_until_next_deadline(self):
+        auction = make_auction(close_time=timezone.now() + timedelta(days=1))
+        make_item(auction, close_time=timezone.now() + timedelta(seconds=30))
+        make_item(auction)
+        self.assertAlmostEqual(CloseCommand.seconds_until_next_close(60), 30, delta=1)
+        self.assertEqual(CloseCommand.seconds_until_next_close(10), 10)
+
+    def test_sleeps_max_when_nothing_pending(self):
+        self.assertEqual(CloseCommand.seconds_until_next_close(60), 60)
+
+    @patch("auction.notifications.send_auction_summary")
+    @patch("auction.notifications.notify_winner")
+    def test_watch_closes_then_sleeps(self, mock_winner, mock_summary):
+        auction = make_auction(close_time=timezone.now() - timedelta(minutes=1))
+        item = make_item(auction)
+        with patch("auction.management.commands.close_auction_items.time.sleep", side_effect=KeyboardInterrupt) as sleep:
+            call_command("close_auction_items", "--watch", "--max-sleep", "5")
+        item.refresh_from_db()
+        self.assertIsNotNone(item.winner_notified_at)
+        sleep.assert_called_once_with(5)
+
+    @patch("auction.notifications.send_auction_summary")
+    @patch("auction.notifications.notify_winner")
+    def test_watch_survives_a_failed_pass(self, mock_winner, mock_summary):
+        auction = make_auction(close_time=timezone.now() - timedelta(minutes=1))
+        item = make_item(auction)
+        failures = [OperationalError("database is locked")]
+
+        def flaky_close():
+            if failures:
+                raise failures.pop()
+            return close_expired_items()
+
+        module = "auction.management.commands.close_auction_items"
+        with patch(f"{module}.close_expired_items", side_effect=flaky_close), \
+                patch(f"{module}.time.sleep", side_effect=[None, KeyboardInterrupt]) as sleep, \
+                self.assertLogs(module, level="ERROR") as logs:
+            call_command("close_auction_items", "--watch", "--max-sleep", "5")
+        self.assertIn("database is locked", logs.output[0])
+        self.assertEqual(sleep.call_count, 2)
+        item.refresh_from_db()
+        self.assertIsNotNone(item.winner_notified_at)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from auction.models import Auction
+from auction.services import close_expired_items, place_bid
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+HTMX = {"HTTP_HX_REQUEST": "true"}
+
+
+@patch("auction.notifications.notify_outbid")
+class AuctionVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.bidder = make_bidder(self.auction)
+
+    def version(self):
+        return Auction.objects.get(pk=self.auction.pk).version
+
+    def test_bumped_by_bids_closes_and_edits(self, _):
+        start = self.version()
+        place_bid(self.item.pk, self.bidder, Decimal("30"))
+        self.assertEqual(self.version(), start + 1)
+
+        self.item.title = "Bigger Yeti Cooler"
+        self.item.save()
+        self.assertEqual(self.version(), start + 2)
+
+        self.auction.description = "New description"
+        self.auction.save()
+        self.assertEqual(self.auction.version, start + 3)
+
+        self.item.close_time = timezone.now() - timedelta(minutes=1)
+        self.item.save()
+        before_close = self.version()
+        close_expired_items()
+        self.assertGreater(self.version(), before_close)
+
+    def test_stale_instance_save_does_not_rewind_version(self, _):
+        stale = Auction.objects.get(pk=self.auction.pk)
+        place_bid(self.item.pk, self.bidder, Decimal("30"))
+        place_bid(self.item.pk, self.bidder, Decimal("35"))
+        current = self.version()
+
+        stale.name = "Renamed"
+        stale.save()
+        self.assertEqual(stale.version, current + 1)
+        self.assertEqual(self.version(), current + 1)
+
+    def test_cached_state_cleared_on_bump(self, _):
+        first = Auction.cached_state(self.auction.pk)
+        place_bid(self.item.pk, self.bidder, Decimal("30"))
+        self.assertEqual(Auction.cached_state(self.auction.pk)["version"], first["version"] + 1)
+        self.assertIsNone(Auction.cached_state(0))
+
+
+@patch("auction.notifications.notify_outbid")
+class ConditionalPollTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.bidder = make_bidder(self.auction)
+        self.grid_url = reverse("auction-grid", args=[self.auction.pk])
+        self.item_url = reverse("auction-item-detail", args=[self.auction.pk, self.item.number])
+
+    def test_unchanged_grid_poll_is_304_without_item_queries(self, _):
+        response = self.client.get(self.grid_url, **HTMX)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("HX-Request", response["Vary"])
+
+        # The version is cached: the repeat poll touches no tables at all.
+        with self.assertNumQueries(0):
+            response = self.client.get(self.grid_url, HTTP_IF_NONE_MATCH=etag, **HTMX)
+        self.assertEqual(response.status_code, 304)
+
+    def test_bid_invalidates_grid_etag(self, _):
+        etag = self.client.get(self.grid_url, **HTMX)["ETag"]
+        place_bid(self.item.pk, self.bidder, Decimal("30"))
+
+        response = self.client.get(self.grid_url, HTTP_IF_NONE_MATCH=etag, **HTMX)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertContains(response, "30.00")
+
+    def test_item_past_deadline_is_not_short_circuited(self, _):
+        etag = self.client.get(self.grid_url, **HTMX)["ETag"]
+        # Deadline passes without any write, so the version hasn't moved yet.
+        with patch("auction.views.timezone.now", return_value=timezone.now() + timedelta(days=8)):
+            response = self.client.get(self.grid_url, HTTP_IF_NONE_MATCH=etag, **HTMX)
+        self.assertEqual(response.status_code, 200)
+
+    def test_item_detail_poll_is_conditional(self, _):
+        etag = self.client.get(self.item_url, **HTMX)["ETag"]
+        response = self.client.get(self.item_url, HTTP_IF_NONE_MATCH=etag, **HTMX)
+        self.assertEqual(response.status_code, 304)
+
+        place_bid(self.item.pk, self.bidder, Decimal("30"))
+        response = self.client.get(self.item_url, HTTP_IF_NONE_MATCH=etag, **HTMX)
+        self.assertEqual(response.status_code, 200)
+
+    def test_full_page_load_has_no_etag(self, _):
+        response = self.client.get(self.item_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
@@ -0,0 +1,51 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from auction.loadtest import percentiles, run, verify
+from auction.models import Auction, Bid
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+
+class PercentilesTests(SimpleTestCase):
+    def test_reports_milliseconds(self):
+        stats = percentiles([i / 1000 for i in range(1, 101)])
+        self.assertAlmostEqual(stats["p50"], 50.5)
+        self.assertAlmostEqual(stats["max"], 100)
+        self.assertEqual(percentiles([]), {})
+
+
+class VerifyTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.bidder = make_bidder(self.auction)
+
+    def test_detects_out_of_order_and_stale_columns(self):
+        Bid.objects.create(item=self.item, bidder=self.bidder, amount=Decimal("40"))
+        Bid.objects.create(item=self.item, bidder=self.bidder, amount=Decimal("30"))
+        violations = verify(self.auction, accepted=2)
+        self.assertTrue(any("below the minimum" in v for v in violations))
+        self.assertTrue(any("bid_count 0" in v for v in violations))
+        self.assertTrue(any("0 live-stream events for 2 bids" in v for v in violations))
+
+    def test_lost_bid_detected(self):
+        self.assertEqual(verify(self.auction, accepted=1), ["1 bids were accepted but 0 are stored"])
+
+
+class LoadRunTests(TransactionTestCase):
+    def test_concurrent_bidders_leave_consistent_state(self):
+        report = run(bidders=4, items=2, duration=1.0, poll_interval=0.2)
+        self.assertEqual(report.violations, [])
+        self.assertGreater(report.accepted, 0)
+        self.assertGreater(report.polls, 0)
+        self.assertIn("p95", report.bid_latency)
+        self.assertFalse(Auction.objects.exists())  # cleaned up
+
+    def test_command_prints_report(self):
+        out = StringIO()
+        call_command("auction_load_test", "--bidders", "2", "--duration", "0.5", stdout=out)
+        self.assertIn("no lost or out-of-order bids", out.getvalue())
+        self.assertIn("bid latency: p50", out.getvalue())
@@ -63,8 +63,26 @@ class AuctionItemTests(TestCase):
         bidder = make_bidder(self.auction)
         Bid.objects.create(item=item, bidder=bidder, amount=Decimal("30"))
         self.assertEqual(item.top_bid.amount, Decimal("30"))
+        # minimum_bid reads the denormalized columns place_bid maintains
+        item.refresh_bid_summary()
         self.assertEqual(item.minimum_bid, Decimal("35"))
 
+    def test_refresh_bid_summary(self):
+        item = make_item(self.auction)
+        alice = make_bidder(self.auction)
+        bob = make_bidder(self.auction, name="Bob Jones", email="bob@example.com", phone="512-555-9999")
+        Bid.objects.create(item=item, bidder=alice, amount=Decimal("30"))
+        Bid.objects.create(item=item, bidder=bob, amount=Decimal("30"))
+        latest = Bid.objects.create(item=item, bidder=bob, amount=Decimal("28"))
+
+        self.assertTrue(item.refresh_bid_summary())
+        item.refresh_from_db()
+        self.assertEqual(item.current_high_bid, Decimal("30"))
+        self.assertEqual(item.current_high_bidder, alice)  # earliest of the tied bids
+        self.assertEqual(item.bid_count, 3)
+        self.assertEqual(item.last_bid_at, latest.created_at)
+        self.assertFalse(item.refresh_bid_summary())
+
 
 class BidderTests(TestCase):
     def setUp(self):
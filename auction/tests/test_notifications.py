@@ -1,3 +1,4 @@
+from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
@@ -5,9 +6,10 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core import mail
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from auction import notifications
-from auction.models import Bid
+from auction.models import AuctionStats, Bid
 from auction.tests.test_models import make_auction, make_bidder, make_item
 
 
@@ -19,10 +21,17 @@ class NotificationTests(TestCase):
         self.bob = make_bidder(self.auction, name="Bob Jones", email="bob@example.com", phone="512-555-9999")
         self.first = Bid.objects.create(item=self.item, bidder=self.alice, amount=Decimal("25"))
         self.second = Bid.objects.create(item=self.item, bidder=self.bob, amount=Decimal("30"))
+        self.item.refresh_bid_summary()
+
+    def deliver_later(self, seconds=3600):
+        with patch("auction.notifications.timezone.now", return_value=timezone.now() + timedelta(seconds=seconds)):
+            return notifications.deliver_outbid_notices()
 
     @patch("auction.notifications.send_sms")
     def test_outbid_sends_email_and_sms_when_opted_in(self, mock_sms):
         notifications.notify_outbid(self.first, self.second)
+        self.assertEqual(len(mail.outbox), 0)  # queued, not sent in the bid request
+        self.assertEqual(self.deliver_later(), 2)
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("robin@example.com", mail.outbox[0].to)
         self.assertIn("outbid", mail.outbox[0].subject.lower())
@@ -33,8 +42,12 @@ class NotificationTests(TestCase):
 
     @patch("auction.notifications.send_sms")
     def test_outbid_no_sms_without_opt_in(self, mock_sms):
+        self.item.current_high_bidder = self.alice
+        self.item.save()
         notifications.notify_outbid(self.second, self.first)  # bob has sms_opt_in=False
+        self.deliver_later()
         mock_sms.assert_not_called()
+        self.assertEqual(len(mail.outbox), 1)
 
     @patch("auction.notifications.send_sms")
     def test_winner_notice_includes_payment_instructions(self, mock_sms):
@@ -49,13 +62,19 @@ class NotificationTests(TestCase):
     @override_settings(
         TWILIO_ACCOUNT_SID="sid", TWILIO_AUTH_TOKEN="tok", TWILIO_FROM_NUMBER="+15550000000"
     )
-    @patch("auction.notifications.Client")
+    @patch("twilio.rest.Client")
     def test_send_sms_calls_twilio(self, mock_client):
+        notifications._twilio_client.cache_clear()
+        notifications.send_sms("+15125551234", "hello")
         notifications.send_sms("+15125551234", "hello")
-        mock_client.assert_called_once_with("sid", "tok")
-        mock_client.return_value.messages.create.assert_called_once_with(
+        mock_client.assert_called_once()  # one pooled client, not one per message
+        args, kwargs = mock_client.call_args
+        self.assertEqual(args, ("sid", "tok"))
+        self.assertEqual(kwargs["http_client"].timeout, 10)
+        mock_client.return_value.messages.create.assert_called_with(
             to="+15125551234", from_="+15550000000", body="hello"
         )
+        notifications._twilio_client.cache_clear()
 
 
 class AuctionSummaryTests(TestCase):
@@ -71,6 +90,7 @@ class AuctionSummaryTests(TestCase):
         self.item1.winning_bid = self.winning_bid
         self.item1.backup_bid = self.backup_bid
         self.item1.save()
+        AuctionStats.refresh(self.auction.pk)
         # item2 has no bids at all.
 
         self.auctioneer_group = Group.objects.create(name="Auctioneer")
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from auction import notifications
+from auction.models import OutbidNotice
+from auction.services import place_bid
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+
+def later(seconds):
+    return patch("auction.notifications.timezone.now", return_value=timezone.now() + timedelta(seconds=seconds))
+
+
+@override_settings(AUCTION_OUTBID_COALESCE_SECONDS=30, AUCTION_OUTBID_RATE_LIMITS={"email": 60, "sms": 300})
+@patch("auction.notifications.send_sms")
+class OutbidQueueTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.item = make_item(self.auction)  # starting 25, increment 5
+        self.alice = make_bidder(self.auction, sms_opt_in=True)
+        self.bob = make_bidder(self.auction, name="Bob Jones", email="bob@example.com", phone="512-555-9999")
+
+    def test_bid_queues_instead_of_sending(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        with self.captureOnCommitCallbacks(execute=True):
+            place_bid(self.item.pk, self.bob, Decimal("30"))
+        self.assertEqual(len(mail.outbox), 0)
+        mock_sms.assert_not_called()
+        self.assertEqual(
+            sorted(OutbidNotice.objects.filter(bidder=self.alice).values_list("channel", flat=True)),
+            ["email", "sms"],
+        )
+
+    def test_bidding_war_coalesces_into_one_message_per_channel(self, mock_sms):
+        carol = make_bidder(self.auction, name="Carol King", email="carol@example.com", phone="512-555-7777")
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        place_bid(self.item.pk, carol, Decimal("35"))  # outbids bob; alice isn't leading
+        place_bid(self.item.pk, self.bob, Decimal("40"))  # outbids carol
+        place_bid(self.item.pk, carol, Decimal("45"))  # outbids bob again
+
+        bob_notice = OutbidNotice.objects.get(bidder=self.bob)
+        self.assertEqual(bob_notice.outbid_count, 2)
+        self.assertEqual(bob_notice.outbid_by.amount, Decimal("45"))
+
+        with later(0):
+            self.assertEqual(notifications.deliver_outbid_notices(), 0)  # still coalescing
+        with later(31):
+            notifications.deliver_outbid_notices()
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["bob@example.com", "robin@example.com"])
+        self.assertIn("$45.00", next(m for m in mail.outbox if m.to == ["bob@example.com"]).body)
+
+    def test_skipped_when_back_in_the_lead(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        place_bid(self.item.pk, self.alice, Decimal("35"))
+        with later(31):
+            notifications.deliver_outbid_notices()
+        alice_statuses = set(OutbidNotice.objects.filter(bidder=self.alice).values_list("status", flat=True))
+        self.assertEqual(alice_statuses, {OutbidNotice.STATUS_SKIPPED})
+        self.assertEqual([m.to for m in mail.outbox], [["bob@example.com"]])
+
+    def test_rate_limit_defers_next_message_on_same_channel(self, mock_sms):
+        other = make_item(self.auction, title="Gift Card")
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        with later(31):
+            notifications.deliver_outbid_notices()
+        self.assertEqual(len(mail.outbox), 1)
+
+        with later(31):
+            place_bid(other.pk, self.alice, Decimal("25"))
+            place_bid(other.pk, self.bob, Decimal("30"))
+        notice = OutbidNotice.objects.get(bidder=self.alice, item=other, channel="sms")
+        sms_sent = OutbidNotice.objects.get(bidder=self.alice, item=self.item, channel="sms").sent_at
+        self.assertGreaterEqual(notice.send_after, sms_sent + timedelta(seconds=300))
+
+    def test_rate_limit_spaces_queued_notices_for_different_items(self, mock_sms):
+        other = make_item(self.auction, title="Gift Card")
+        for item in (self.item, other):
+            place_bid(item.pk, self.alice, Decimal("25"))
+            place_bid(item.pk, self.bob, Decimal("30"))
+        with later(31):
+            notifications.deliver_outbid_notices()
+        self.assertEqual([m.to for m in mail.outbox], [["robin@example.com"]])
+        with later(91):
+            notifications.deliver_outbid_notices()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("Gift Card", mail.outbox[1].subject)
+
+    def test_failed_send_retries_then_gives_up(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        mock_sms.side_effect = RuntimeError("twilio down")
+        for attempt in range(notifications.OUTBID_MAX_ATTEMPTS):
+            with later(31 + 3600 * (attempt + 1)):
+                notifications.deliver_outbid_notices()
+        notice = OutbidNotice.objects.get(channel="sms")
+        self.assertEqual(notice.status, OutbidNotice.STATUS_FAILED)
+        self.assertEqual(notice.attempts, notifications.OUTBID_MAX_ATTEMPTS)
+        self.assertIn("twilio down", notice.last_error)
+        # The email went out on the first pass regardless.
+        self.assertEqual(OutbidNotice.objects.get(channel="email").status, OutbidNotice.STATUS_SENT)
+
+    def test_batch_shares_one_smtp_connection(self, mock_sms):
+        for n in range(3):
+            item = make_item(self.auction, title=f"Item {n}")
+            leader = make_bidder(
+                self.auction, name=f"Leader {n}", email=f"leader{n}@example.com", phone=f"512-555-000{n}"
+            )
+            place_bid(item.pk, leader, Decimal("25"))
+            place_bid(item.pk, self.bob, Decimal("30"))
+        with later(31), patch("auction.notifications.get_connection", wraps=notifications.get_connection) as conn:
+            notifications.deliver_outbid_notices()
+        conn.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_command_sends_due_notices(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        OutbidNotice.objects.update(send_after=timezone.now())
+        out = StringIO()
+        call_command("send_outbid_notices", stdout=out)
+        self.assertIn("Sent 2 outbid notice(s)", out.getvalue())
+
+    def test_notices_abandoned_mid_send_are_requeued(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        email = OutbidNotice.objects.get(channel="email")
+        sms = OutbidNotice.objects.get(channel="sms")
+        OutbidNotice.objects.filter(pk=email.pk).update(
+            status=OutbidNotice.STATUS_SENDING, attempts=1, claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        OutbidNotice.objects.filter(pk=sms.pk).update(status=OutbidNotice.STATUS_SENDING, claimed_at=timezone.now())
+
+        with later(31):
+            self.assertEqual(notifications.deliver_outbid_notices(), 1)
+        self.assertEqual(mail.outbox[0].to, ["robin@example.com"])
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutbidNotice.STATUS_SENT, 2))
+        self.assertEqual(OutbidNotice.objects.get(pk=sms.pk).status, OutbidNotice.STATUS_SENDING)  # still in flight
+
+    def test_abandoned_notice_replaced_by_a_newer_one_is_skipped(self, mock_sms):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("30"))
+        stale = OutbidNotice.objects.get(channel="email")
+        OutbidNotice.objects.filter(pk=stale.pk).update(
+            status=OutbidNotice.STATUS_SENDING, claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        place_bid(self.item.pk, self.alice, Decimal("35"))
+        place_bid(self.item.pk, self.bob, Decimal("40"))  # queues a fresh pending email for Alice
+
+        self.assertEqual(notifications.requeue_stale_outbid_notices(), 0)
+        self.assertEqual(OutbidNotice.objects.get(pk=stale.pk).status, OutbidNotice.STATUS_SKIPPED)
@@ -66,3 +66,24 @@ class PlaceBidTests(TestCase):
     def test_sms_source_recorded(self, mock_notify):
         bid = place_bid(self.item.pk, self.alice, Decimal("25"), source=Bid.SOURCE_SMS)
         self.assertEqual(bid.source, "sms")
+
+    def test_maintains_bid_summary_columns(self, mock_notify):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        last = place_bid(self.item.pk, self.bob, Decimal("40"))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.current_high_bid, Decimal("40"))
+        self.assertEqual(self.item.current_high_bidder, self.bob)
+        self.assertEqual(self.item.bid_count, 2)
+        self.assertEqual(self.item.last_bid_at, last.created_at)
+        self.assertEqual(self.item.minimum_bid, Decimal("45"))
+        # The columns agree with a full recompute from the bids
+        self.assertFalse(self.item.refresh_bid_summary(save=False))
+
+    def test_equal_bid_keeps_earlier_leader(self, mock_notify):
+        self.item.bid_increment = Decimal("0")
+        self.item.save()
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.bob, Decimal("25"))
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.current_high_bidder, self.alice)
+        self.assertEqual(self.item.bid_count, 2)
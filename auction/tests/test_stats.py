@@ -0,0 +1,106 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from auction.models import AuctionStats, Bid
+from auction.services import close_expired_items, place_bid, promote_backup
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+
+@patch("auction.notifications.notify_winner")
+@patch("auction.notifications.send_auction_summary")
+class AuctionStatsTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.cooler = make_item(self.auction)  # starting 25, increment 5
+        self.card = make_item(self.auction, title="Gift Card")
+        self.alice = make_bidder(self.auction)
+        self.bob = make_bidder(self.auction, name="Bob Jones", email="bob@example.com", phone="512-555-9999")
+
+    def stats(self):
+        return AuctionStats.objects.get(auction=self.auction)
+
+    def assertStatsMatchBids(self):
+        self.assertEqual(AuctionStats.refresh(self.auction.pk, save=False), {})
+
+    def test_created_with_auction(self, *mocks):
+        self.assertEqual(self.stats().total_raised, 0)
+
+    def test_place_bid_updates_totals(self, *mocks):
+        place_bid(self.cooler.pk, self.alice, Decimal("25"))
+        place_bid(self.cooler.pk, self.bob, Decimal("40"))
+        place_bid(self.card.pk, self.alice, Decimal("25"))
+        stats = self.stats()
+        self.assertEqual(stats.total_raised, Decimal("65"))
+        self.assertEqual(stats.bid_count, 3)
+        self.assertEqual(stats.items_with_bids, 2)
+        self.assertEqual(stats.unique_bidders, 2)
+        self.assertStatsMatchBids()
+
+    def test_close_and_promote_keep_totals_in_step(self, *mocks):
+        place_bid(self.cooler.pk, self.alice, Decimal("25"))
+        place_bid(self.cooler.pk, self.bob, Decimal("40"))
+        self.auction.close_time = timezone.now() - timedelta(minutes=1)
+        self.auction.save()
+        close_expired_items()
+        self.assertEqual(self.stats().items_closed, 2)
+
+        self.cooler.refresh_from_db()
+        promote_backup(self.cooler)
+        self.assertEqual(self.stats().total_raised, Decimal("25"))
+        self.assertStatsMatchBids()
+
+    def test_reconcile_reports_and_repairs_drift(self, *mocks):
+        place_bid(self.cooler.pk, self.alice, Decimal("25"))
+        Bid.objects.create(item=self.card, bidder=self.bob, amount=Decimal("50"))  # bypasses place_bid
+
+        out = StringIO()
+        call_command("reconcile_auction_stats", "--dry-run", stdout=out)
+        self.assertIn("total_raised 25.00 -> 75.00", out.getvalue())
+        self.assertIn("would repair 1", out.getvalue())
+        self.assertEqual(self.stats().total_raised, Decimal("25"))
+
+        call_command("reconcile_auction_stats", stdout=StringIO())
+        self.assertEqual(self.stats().total_raised, Decimal("75"))
+        self.assertEqual(self.stats().unique_bidders, 2)
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="beej", password="Pass123!")
+        self.user.user_permissions.add(Permission.objects.get(codename="change_auctionitem"))
+        self.client.force_login(self.user)
+        self.auction = make_auction()
+        bidders = [
+            make_bidder(self.auction, name=f"Bidder {n}", email=f"b{n}@example.com", phone=f"512-555-00{n:02d}")
+            for n in range(3)
+        ]
+        for n in range(3):
+            item = make_item(self.auction, title=f"Item {n}")
+            for bidder in bidders:
+                with patch("auction.notifications.notify_outbid"):
+                    place_bid(item.pk, bidder, item.minimum_bid)
+                item.refresh_from_db()
+
+    def test_dashboard_reads_stats_without_per_item_queries(self):
+        response = self.client.get(reverse("auction-manage"))
+        self.assertContains(response, "Raised $105.00 — 9 bids")
+        self.assertContains(response, "from 3 bidders")
+
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(reverse("auction-manage"))
+        other = make_item(self.auction, title="Another")
+        with patch("auction.notifications.notify_outbid"):
+            place_bid(other.pk, self.auction.bidders.first(), Decimal("25"))
+        with self.assertNumQueries(len(before.captured_queries)):
+            self.client.get(reverse("auction-manage"))
@@ -0,0 +1,123 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from auction.blocks import AuctionBlock
+from auction.models import AuctionEvent
+from auction.services import close_expired_items, place_bid, prune_events
+from auction.tests.test_models import make_auction, make_bidder, make_item
+
+
+def parse_events(response):
+    body = b"".join(response.streaming_content).decode()
+    events = []
+    for chunk in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in chunk.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return body, events
+
+
+@override_settings(AUCTION_LIVE_UPDATES=True, AUCTION_STREAM_MAX_SECONDS=0)
+@patch("auction.notifications.notify_outbid")
+class BidStreamTests(TestCase):
+    def setUp(self):
+        self.auction = make_auction()
+        self.item = make_item(self.auction)
+        self.alice = make_bidder(self.auction)
+        self.url = reverse("auction-stream", args=[self.auction.pk])
+
+    def test_place_bid_records_event(self, _):
+        place_bid(self.item.pk, self.alice, Decimal("30"))
+        event = AuctionEvent.objects.get()
+        self.assertEqual(event.kind, AuctionEvent.KIND_BID)
+        self.assertEqual(event.data["item"], self.item.pk)
+        self.assertEqual(event.data["high_bid"], "30.00")
+        self.assertEqual(event.data["bidder"], "Robin P.")
+        self.assertEqual(event.data["bid_count"], 1)
+        self.assertEqual(event.data["minimum_bid"], "35.00")
+        self.assertTrue(event.data["open"])
+
+    def test_rejected_bid_records_nothing(self, _):
+        with self.assertRaises(Exception):
+            place_bid(self.item.pk, self.alice, Decimal("1"))
+        self.assertFalse(AuctionEvent.objects.exists())
+
+    def test_streams_events_since_cursor(self, _):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        place_bid(self.item.pk, self.alice, Decimal("30"))
+        first = AuctionEvent.objects.first()
+
+        response = self.client.get(self.url, {"since": first.pk})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        body, events = parse_events(response)
+        self.assertTrue(body.startswith("retry: "))
+        self.assertEqual([(e[1], e[2]["high_bid"]) for e in events], [("bid", "30.00")])
+
+    def test_last_event_id_header_wins_over_query(self, _):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        response = self.client.get(self.url, {"since": 10**6}, HTTP_LAST_EVENT_ID="0")
+        _, events = parse_events(response)
+        self.assertEqual(len(events), 1)
+
+    def test_new_viewer_starts_at_latest_event(self, _):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        _, events = parse_events(self.client.get(self.url))
+        self.assertEqual(events, [])
+
+    def test_other_auctions_events_excluded(self, _):
+        other = make_auction(name="Other")
+        other_item = make_item(other)
+        place_bid(other_item.pk, make_bidder(other), Decimal("25"))
+        _, events = parse_events(self.client.get(self.url, {"since": 0}))
+        self.assertEqual(events, [])
+
+    @override_settings(AUCTION_LIVE_UPDATES=False)
+    def test_disabled_returns_no_content(self, _):
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+
+    def test_block_grid_starts_stream_at_latest_event(self, _):
+        place_bid(self.item.pk, self.alice, Decimal("25"))
+        html = AuctionBlock().render({"auction": self.auction})
+        self.assertIn(f'{self.url}?since={AuctionEvent.objects.get().pk}', html)
+        self.assertIn(f'data-auction-item="{self.item.pk}"', html)
+        self.assertIn("auction-live.js", html)
+        self.assertIn('hx-trigger="refreshAuction"', html)  # the stream replaces polling
+
+    @override_settings(AUCTION_LIVE_UPDATES=False)
+    def test_block_grid_polls_when_live_updates_are_off(self, _):
+        html = AuctionBlock().render({"auction": self.auction})
+        self.assertNotIn("data-auction-stream", html)
+        self.assertNotIn("auction-live.js", html)
+        self.assertIn('hx-trigger="every 60s, refreshAuction"', html)
+
+
+@patch("auction.notifications.notify_winner")
+@patch("auction.notifications.send_auction_summary")
+class ClosedEventTests(TestCase):
+    def test_close_records_closed_event(self, *_):
+        auction = make_auction()
+        item = make_item(auction)
+        with patch("auction.notifications.notify_outbid"):
+            place_bid(item.pk, make_bidder(auction), Decimal("25"))
+        item.close_time = timezone.now() - timedelta(minutes=1)
+        item.save()
+        close_expired_items()
+        event = AuctionEvent.objects.last()
+        self.assertEqual(event.kind, AuctionEvent.KIND_CLOSED)
+        self.assertFalse(event.data["open"])
+
+    def test_prune_events(self, *_):
+        auction = make_auction()
+        item = make_item(auction)
+        old = AuctionEvent.record(item, AuctionEvent.KIND_BID)
+        AuctionEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=2))
+        AuctionEvent.record(item, AuctionEvent.KIND_BID)
+        self.assertEqual(prune_events(), 1)
+        self.assertEqual(AuctionEvent.objects.count(), 1)
@@ -8,6 +8,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from auction.models import Bidder
+from auction.services import place_bid
 from auction.tests.test_models import make_auction, make_bidder, make_item
 from blowcomotion.models import Member
 from members.auth import create_member_user
@@ -148,13 +149,17 @@ class BidViewTests(TestCase):
         guest_bidder = Bidder.objects.get(auction=self.auction)
         self.assertIsNone(guest_bidder.member_id)
 
-    def test_expired_item_lazily_closed_on_view(self, _):
+    def test_expired_item_shown_closed_without_closing_it(self, _):
+        bidder = make_bidder(self.auction)
+        place_bid(self.item.pk, bidder, Decimal("30"))
+        self.item.refresh_from_db()
         self.item.close_time = timezone.now() - timedelta(minutes=1)
         self.item.save()
-        make_bidder(self.auction)
-        self.client.get(self.detail_url)
+
+        response = self.client.get(self.detail_url)
+        self.assertContains(response, "Bidding closed. Won by Robin P. ($30.00).")
         self.item.refresh_from_db()
-        self.assertIsNotNone(self.item.winner_notified_at)
+        self.assertIsNone(self.item.winner_notified_at)  # left to the closer
 
     def test_recaptcha_failure_rejects(self, mock_captcha):
         mock_captcha.return_value = (False, "reCAPTCHA validation failed")
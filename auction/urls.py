@@ -5,7 +5,9 @@ from auction import sms, views
 urlpatterns = [
     path("<int:auction_id>/item/<int:number>/", views.item_detail, name="auction-item-detail"),
     path("<int:auction_id>/item/<int:number>/bid/", views.place_bid_view, name="auction-place-bid"),
+    path("<int:auction_id>/item/<int:number>/bids/", views.bid_history, name="auction-bid-history"),
     path("<int:auction_id>/grid/", views.grid_partial, name="auction-grid"),
+    path("<int:auction_id>/stream/", views.bid_stream, name="auction-stream"),
     path("manage/", views.manage, name="auction-manage"),
     path("manage/item/<int:pk>/promote/", views.promote, name="auction-promote"),
     path("sms/", sms.sms_webhook, name="auction-sms-webhook"),
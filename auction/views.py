@@ -1,16 +1,28 @@
+import json
 import logging
+import time
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.db import IntegrityError
-from django.http import HttpResponseNotFound
+from django.db.models import Prefetch
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotFound,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.http import require_POST
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_POST
+from django.views.decorators.vary import vary_on_headers
 
 from auction.forms import BidderRegistrationForm, BidForm
-from auction.models import Auction, AuctionItem, Bidder
-from auction.services import BidError, close_expired_items, place_bid, promote_backup
+from auction.models import Auction, AuctionEvent, AuctionItem, Bidder, decode_bid_cursor
+from auction.services import BidError, place_bid, promote_backup
 from blowcomotion import views as blowcomotion_views
 
 logger = logging.getLogger(__name__)
@@ -18,6 +30,19 @@ logger = logging.getLogger(__name__)
 BIDDER_COOKIE_SALT = "auction-bidder"
 BIDDER_COOKIE_MAX_AGE = 60 * 60 * 24 * 30
 
+# Live grid stream (bid_stream), off unless AUCTION_LIVE_UPDATES = True. Each
+# open stream holds its worker for up to AUCTION_STREAM_MAX_SECONDS before
+# the browser's EventSource reconnects (resuming from Last-Event-ID), so only
+# turn it on behind async workers (e.g. gunicorn --worker-class gevent, or an
+# ASGI server). The Dockerfile and PythonAnywhere run sync workers, which a
+# handful of viewers would tie up. While streaming, the grid stops its 60s
+# HTMX polling.
+STREAM_POLL_SECONDS = 1
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_RETRY_MS = 2000
+
+BID_HISTORY_PAGE_SIZE = 20
+
 
 def _cookie_name(auction):
     return f"auction_bidder_{auction.pk}"
@@ -39,18 +64,6 @@ def resolve_bidder(request, auction):
     return None
 
 
-def _lazy_close(auction):
-    from django.db.models import Q
-    from django.utils import timezone
-
-    now = timezone.now()
-    pending = auction.items.filter(winner_notified_at__isnull=True).filter(
-        Q(close_time__lte=now) | Q(close_time__isnull=True, auction__close_time__lte=now)
-    )
-    if pending.exists():
-        close_expired_items(auction)
-
-
 def _registration_initial(request):
     if request.user.is_authenticated and hasattr(request.user, "member"):
         member = request.user.member
@@ -58,35 +71,151 @@ def _registration_initial(request):
     return {}
 
 
+def _poll_etag(request, auction_id, number=None):
+    """
+    ETag for the HTMX polls of the grid and the item page's bid state: the
+    auction's version, read from the cache, so an unchanged poll is answered
+    304 before any item is loaded or anything rendered. Full page loads get
+    no ETag (the page carries messages and a CSRF token). Nor does a poll
+    once an item is past its deadline but the closer hasn't processed it:
+    the page shows it closed by the clock, which the version can't see.
+    """
+    if request.headers.get("HX-Request") != "true":
+        return None
+    state = Auction.cached_state(auction_id)
+    if state is None:
+        return None
+    if state["next_close"] is not None and state["next_close"] <= timezone.now():
+        return None
+    return f'"auction-{auction_id}-v{state["version"]}"'
+
+
+def _poll_response(request, response):
+    if request.headers.get("HX-Request") == "true":
+        # Cacheable by this browser only, and always revalidated.
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@vary_on_headers("HX-Request")
+@condition(etag_func=_poll_etag)
 def item_detail(request, auction_id, number):
     auction = get_object_or_404(Auction, pk=auction_id)
-    _lazy_close(auction)
     item = get_object_or_404(
-        AuctionItem.objects.select_related("auction"), auction=auction, number=number
+        AuctionItem.objects.select_related("auction", "current_high_bidder", "winning_bid__bidder"),
+        auction=auction, number=number,
     )
     bidder = resolve_bidder(request, auction)
-    return render(request, "auction/item_detail.html", {
+    bids, has_older = item.bid_history(limit=BID_HISTORY_PAGE_SIZE)
+    return _poll_response(request, render(request, "auction/item_detail.html", {
         "auction": auction,
         "item": item,
         "bidder": bidder,
-        "bids": item.bids.select_related("bidder").order_by("-amount"),
+        **_bid_history_context(item, bids, poll_from=bids[0].cursor if bids else "0-0", has_older=has_older),
         "registration_form": BidderRegistrationForm(initial=_registration_initial(request)),
         "bid_form": BidForm(initial={"amount": item.minimum_bid}),
         "include_form_js": True,
-    })
+    }))
 
 
+def _bid_history_context(item, bids, poll_from=None, has_older=False, new_only=False, more_new=False):
+    return {
+        "bids": bids,
+        "new_only": new_only,
+        "history_url": reverse("auction-bid-history", args=[item.auction_id, item.number]),
+        "poll_from": poll_from,
+        "more_new": more_new,
+        "older_cursor": bids[-1].cursor if has_older and bids else None,
+    }
+
+
+@vary_on_headers("HX-Request")
+@condition(etag_func=_poll_etag)
+def bid_history(request, auction_id, number):
+    """
+    Bid history rows for an item page (HTMX). ``?before=<cursor>`` returns the
+    next page of older bids; ``?after=<cursor>`` only the bids placed since,
+    plus a poller that picks up from the newest of them.
+    """
+    item = get_object_or_404(AuctionItem, auction_id=auction_id, number=number)
+    try:
+        before = decode_bid_cursor(request.GET["before"]) if "before" in request.GET else None
+        after = decode_bid_cursor(request.GET["after"]) if "after" in request.GET else None
+    except ValueError:
+        return HttpResponseBadRequest("Invalid cursor")
+    if after is not None:
+        bids, more_new = item.bid_history(after=after, limit=BID_HISTORY_PAGE_SIZE)
+        context = _bid_history_context(
+            item, bids, poll_from=bids[0].cursor if bids else request.GET["after"],
+            new_only=True, more_new=more_new,
+        )
+    else:
+        bids, has_older = item.bid_history(before=before, limit=BID_HISTORY_PAGE_SIZE)
+        context = _bid_history_context(item, bids, has_older=has_older)
+    return _poll_response(request, render(request, "auction/_bid_history.html", context))
+
+
+@vary_on_headers("HX-Request")
+@condition(etag_func=_poll_etag)
 def grid_partial(request, auction_id):
     if request.headers.get("HX-Request") != "true":
         return HttpResponseNotFound()
     auction = get_object_or_404(Auction, pk=auction_id)
-    _lazy_close(auction)
-    items = list(auction.items.prefetch_related("images", "bids"))
-    return render(request, "auction/_grid.html", {
+    items = list(auction.items_for_display())
+    return _poll_response(request, render(request, "auction/_grid.html", {
         "auction": auction,
         "open_items": [i for i in items if i.is_open],
         "closed_items": [i for i in items if not i.is_open],
-    })
+    }))
+
+
+def _event_stream(auction_id, last_id, max_seconds):
+    yield f"retry: {STREAM_RETRY_MS}\n\n"
+    deadline = time.monotonic() + max_seconds
+    last_sent = time.monotonic()
+    while True:
+        events = list(
+            AuctionEvent.objects.filter(auction_id=auction_id, id__gt=last_id)
+            .values_list("id", "kind", "data")[:100]
+        )
+        for event_id, kind, data in events:
+            last_id = event_id
+            yield f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+        if time.monotonic() >= deadline:
+            return
+        if events:
+            last_sent = time.monotonic()
+            continue  # drain a backlog before sleeping
+        if time.monotonic() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+            yield ": ping\n\n"
+            last_sent = time.monotonic()
+        time.sleep(STREAM_POLL_SECONDS)
+
+
+def bid_stream(request, auction_id):
+    """
+    Server-Sent Events feed of per-item bid deltas for the live grid.
+
+    Tails AuctionEvent by id: idle viewers cost one indexed query per second
+    and nothing is rendered. ``?since=<event id>`` (or the Last-Event-ID header
+    on reconnect) picks up exactly where the viewer's page left off.
+    """
+    auction = get_object_or_404(Auction, pk=auction_id)
+    if not getattr(settings, "AUCTION_LIVE_UPDATES", False):
+        return HttpResponse(status=204)  # tells EventSource not to reconnect
+    try:
+        last_id = int(request.headers.get("Last-Event-ID") or request.GET.get("since") or -1)
+    except ValueError:
+        last_id = -1
+    if last_id < 0:
+        last_id = auction.last_event_id()
+    max_seconds = getattr(settings, "AUCTION_STREAM_MAX_SECONDS", 55)
+    response = StreamingHttpResponse(
+        _event_stream(auction.pk, last_id, max_seconds), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let a proxy buffer the stream
+    return response
 
 
 def _get_or_register_bidder(request, auction):
@@ -180,9 +309,10 @@ def place_bid_view(request, auction_id, number):
 @login_required
 @permission_required("auction.change_auctionitem", raise_exception=True)
 def manage(request):
-    auctions = Auction.objects.prefetch_related(
-        "items__winning_bid__bidder", "items__backup_bid__bidder", "items__bids"
+    items = AuctionItem.objects.select_related(
+        "current_high_bidder", "winning_bid__bidder", "backup_bid__bidder"
     )
+    auctions = Auction.objects.select_related("stats").prefetch_related(Prefetch("items", queryset=items))
     return render(
         request,
         "auction/manage.html",
@@ -1,8 +1,9 @@
+from wagtail import hooks
 from wagtail.admin.panels import FieldPanel, InlinePanel
 from wagtail.snippets.models import register_snippet
 from wagtail.snippets.views.snippets import SnippetViewSet, SnippetViewSetGroup
 
-from auction.models import Auction, AuctionItem, Bid, Bidder
+from auction.models import Auction, AuctionItem, AuctionStats, Bid, Bidder
 
 
 class AuctionViewSet(SnippetViewSet):
@@ -61,3 +62,27 @@ class AuctionGroup(SnippetViewSetGroup):
 
 
 register_snippet(AuctionGroup)
+
+
+def _refresh_bid_summaries(bids):
+    items = list(AuctionItem.objects.filter(pk__in={bid.item_id for bid in bids}))
+    for item in items:
+        item.refresh_bid_summary()
+    for auction_id in {item.auction_id for item in items}:
+        AuctionStats.refresh(auction_id)
+
+
+# Bids added, edited or deleted through the snippet admin bypass place_bid,
+# so recompute the affected items' denormalized bid columns and auction stats.
+@hooks.register("after_create_snippet")
+@hooks.register("after_edit_snippet")
+def refresh_item_after_bid_saved(request, instance):
+    if isinstance(instance, Bid):
+        _refresh_bid_summaries([instance])
+
+
+@hooks.register("after_delete_snippet")
+def refresh_items_after_bids_deleted(request, instances):
+    bids = [instance for instance in instances if isinstance(instance, Bid)]
+    if bids:
+        _refresh_bid_summaries(bids)
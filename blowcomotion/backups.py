@@ -0,0 +1,387 @@
+"""
+Database backups for the ``backup_db`` and ``restore_db`` commands.
+
+A backup set is one full backup plus the incrementals taken after it:
+
+- full, ``backup_<ts>.sqlite3.gz``: a consistent copy of the whole database
+  taken with SQLite's online backup API (writers can't tear it the way a
+  table-by-table dumpdata can), gzipped. On MySQL it is a gzipped
+  ``mysqldump --single-transaction`` (``backup_<ts>.sql.gz``).
+- incremental, ``backup_<ts>.incr.json.gz``: a loaddata fixture of the rows
+  of timestamped models (those with an ``auto_now`` or ``auto_now_add``
+  DateTimeField) created or changed since the previous backup, plus every
+  row of the models without a timestamp (members, pages, users, settings,
+  ...), which can't say what changed and are small. Deletions reach the
+  next full backup.
+
+``create_backup(incremental=True)`` takes a full backup instead when there is
+none yet or the last one is older than ``FULL_EVERY``. Restoring a backup
+restores its chain: the full backup it builds on, then each incremental up to
+and including it. ``verify_backup()`` checks a file without touching the
+database (gzip CRC, ``PRAGMA integrity_check``, fixture deserialization), and
+is what ``restore_db --dry-run`` runs over the chain.
+
+Usage:
+    backup = create_backup(BACKUP_DIR, incremental=True)
+    verify_backup(backup.path)           # {table or model label: row count}
+    restore_backup(backup.path, dry_run=True)
+"""
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.serializers.base import DeserializationError
+from django.db import connection, models
+from django.utils import timezone
+
+from blowcomotion.data_dump import (
+    dump_models,
+    encode_json,
+    gzip_chunks,
+    serialize_queryset,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = Path.home() / 'backups'
+KEEP = 7  # full backups (each with its incrementals) to keep
+FULL_EVERY = timedelta(days=7)
+TIMESTAMP_FORMAT = '%Y-%m-%d_%H%M%S'
+COPY_BUFFER_SIZE = 1024 * 1024
+
+SQLITE_SUFFIX = '.sqlite3.gz'
+MYSQL_SUFFIX = '.sql.gz'
+LEGACY_SUFFIX = '.json'  # uncompressed full dumpdata backups from before incrementals
+INCREMENTAL_SUFFIX = '.incr.json.gz'
+FULL_SUFFIXES = (SQLITE_SUFFIX, MYSQL_SUFFIX, LEGACY_SUFFIX)
+
+# Left out of incrementals: data that is rebuilt, session-scoped or log noise.
+# (Full backups are byte-for-byte copies and include everything.)
+INCREMENTAL_EXCLUDE = [
+    'contenttypes', 'auth.permission', 'sessions', 'wagtailsearch',
+    'wagtailcore.referenceindex', 'wagtailcore.taskstate', 'wagtailcore.workflowstate',
+    'wagtailcore.comment', 'wagtailcore.commentreply', 'wagtailcore.pagesubscription',
+    'wagtailcore.groupcollectionpermission', 'wagtailcore.grouppagepermission',
+    'wagtailadmin.editingsession', 'wagtailadmin.formstate', 'wagtailusers.userprofile',
+    'axes.accesslog',
+]
+
+
+class BackupError(Exception):
+    """A backup could not be written, verified or restored."""
+
+
+@dataclass(frozen=True)
+class Backup:
+    path: Path
+    taken_at: datetime
+    incremental: bool
+
+    @property
+    def kind(self):
+        return 'incremental' if self.incremental else 'full'
+
+
+def list_backups(directory):
+    """Backups in ``directory``, oldest first (a full sorts before an incremental of the same second)."""
+    backups = []
+    for path in Path(directory).glob('backup_*'):
+        stamp, _, extension = path.name.removeprefix('backup_').partition('.')
+        suffix = f'.{extension}'
+        if suffix not in FULL_SUFFIXES + (INCREMENTAL_SUFFIX,):
+            continue  # e.g. a .part file left by an interrupted backup
+        try:
+            taken_at = timezone.make_aware(datetime.strptime(stamp, TIMESTAMP_FORMAT))
+        except ValueError:
+            continue
+        backups.append(Backup(path, taken_at, suffix == INCREMENTAL_SUFFIX))
+    return sorted(backups, key=lambda backup: (backup.taken_at, backup.incremental))
+
+
+def timestamp_field(model):
+    """Name of the field that says when a row last changed: an auto_now field, else auto_now_add."""
+    fields = [field for field in model._meta.concrete_fields if isinstance(field, models.DateTimeField)]
+    for option in ('auto_now', 'auto_now_add'):
+        for field in fields:
+            if getattr(field, option):
+                return field.name
+    return None
+
+
+def changed_objects(since):
+    """
+    Serialized rows of timestamped models created or changed at or after
+    ``since``, and all rows of models without a timestamp.
+    """
+    for model in dump_models(exclude=INCREMENTAL_EXCLUDE):
+        field = timestamp_field(model)
+        rows = model._default_manager.all()
+        if field is not None:
+            rows = rows.filter(**{f'{field}__gte': since})
+        yield from serialize_queryset(rows)
+
+
+def create_backup(directory=BACKUP_DIR, incremental=False, now=None, full_every=FULL_EVERY):
+    """
+    Write a backup to ``directory`` and return it. An incremental is only
+    taken when a full backup newer than ``full_every`` exists; it covers the
+    rows changed since the latest backup of either kind.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    now = now or timezone.now()
+    existing = list_backups(directory)
+    last_full = next((backup for backup in reversed(existing) if not backup.incremental), None)
+    if incremental and (last_full is None or now - last_full.taken_at >= full_every):
+        incremental = False
+
+    stamp = timezone.localtime(now).strftime(TIMESTAMP_FORMAT)
+    if incremental:
+        suffix = INCREMENTAL_SUFFIX
+    elif connection.vendor == 'sqlite':
+        suffix = SQLITE_SUFFIX
+    elif connection.vendor == 'mysql':
+        suffix = MYSQL_SUFFIX
+    else:
+        raise BackupError(f'Full backups are not supported on {connection.vendor}')
+    path = directory / f'backup_{stamp}{suffix}'
+    if path.exists():
+        raise BackupError(f'{path.name} already exists')
+
+    # Write under a temporary name so an interrupted run never looks like a backup.
+    partial = path.with_name(f'{path.name}.part')
+    try:
+        if incremental:
+            _write_incremental(partial, since=existing[-1].taken_at)
+        elif suffix == SQLITE_SUFFIX:
+            _write_sqlite_snapshot(partial)
+        else:
+            _write_mysqldump(partial)
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+    logger.info('Wrote %s backup %s (%d bytes)', 'incremental' if incremental else 'full', path, path.stat().st_size)
+    return Backup(path, now, incremental)
+
+
+def _write_sqlite_snapshot(path):
+    if connection.in_atomic_block:
+        # The copy would wait on this connection's own write lock forever.
+        raise BackupError('Cannot take a SQLite snapshot inside a transaction')
+    connection.ensure_connection()
+    with tempfile.TemporaryDirectory(dir=path.parent) as tmp:
+        snapshot = Path(tmp) / 'snapshot.sqlite3'
+        target = sqlite3.connect(snapshot)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        with open(snapshot, 'rb') as source, gzip.open(path, 'wb') as out:
+            shutil.copyfileobj(source, out, COPY_BUFFER_SIZE)
+
+
+def _mysql_command(program, *args):
+    db = connection.settings_dict
+    command = [program]
+    if db['HOST']:
+        command.append(f"--host={db['HOST']}")
+    if db['PORT']:
+        command.append(f"--port={db['PORT']}")
+    command += [f"--user={db['USER']}", *args, db['NAME']]
+    # The password goes in the environment so it doesn't show up in ps.
+    return command, {**os.environ, 'MYSQL_PWD': db['PASSWORD']}
+
+
+def _write_mysqldump(path):
+    command, env = _mysql_command('mysqldump', '--single-transaction', '--quick')
+    # stderr goes to a file, not a pipe: a full stderr pipe nobody reads would stall the dump.
+    with gzip.open(path, 'wb') as out, tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=errors, env=env)
+        shutil.copyfileobj(process.stdout, out, COPY_BUFFER_SIZE)
+        process.stdout.close()
+        if process.wait():
+            raise BackupError(f'mysqldump failed: {_read_errors(errors)}')
+
+
+def _read_errors(errors):
+    errors.seek(0)
+    return errors.read().decode(errors='replace').strip()
+
+
+def _write_incremental(path, since):
+    rows = 0
+
+    def counted(objects):
+        nonlocal rows
+        for item in objects:
+            rows += 1
+            yield item
+
+    with open(path, 'wb') as out:
+        for chunk in gzip_chunks(encode_json(counted(changed_objects(since)))):
+            out.write(chunk)
+    logger.info('Incremental backup has %d row(s) changed since %s', rows, since)
+
+
+def rotate_backups(directory=BACKUP_DIR, keep=KEEP):
+    """Delete all but the newest ``keep`` full backups and the incrementals built on them; returns the deleted backups."""
+    backups = list_backups(directory)
+    fulls = [backup for backup in backups if not backup.incremental]
+    if len(fulls) <= keep:
+        return []
+    cutoff = fulls[-keep].taken_at
+    deleted = [backup for backup in backups if backup.taken_at < cutoff]
+    for backup in deleted:
+        backup.path.unlink()
+    return deleted
+
+
+@contextmanager
+def _decompressed(path):
+    """Path to a decompressed temporary copy of the gzipped ``path``."""
+    with tempfile.TemporaryDirectory(dir=path.parent) as tmp:
+        target = Path(tmp) / path.name.removesuffix('.gz')
+        try:
+            with gzip.open(path, 'rb') as source, open(target, 'wb') as out:
+                shutil.copyfileobj(source, out, COPY_BUFFER_SIZE)
+        except (OSError, EOFError, zlib.error) as e:
+            raise BackupError(f'{path.name} is not a complete gzip file: {e}') from e
+        yield target
+
+
+def _open_text(path):
+    return gzip.open(path, 'rt', encoding='utf-8') if path.suffix == '.gz' else open(path, encoding='utf-8')
+
+
+def verify_backup(path):
+    """
+    Check that ``path`` can be restored, without touching the database.
+    Returns {table name or model label: row count}; raises BackupError.
+    """
+    path = Path(path)
+    if path.name.endswith(SQLITE_SUFFIX):
+        return _verify_sqlite(path)
+    if path.name.endswith(MYSQL_SUFFIX):
+        return _verify_mysqldump(path)
+    return _verify_fixture(path)
+
+
+def _verify_sqlite(path):
+    with _decompressed(path) as snapshot:
+        db = sqlite3.connect(f'file:{snapshot}?mode=ro', uri=True)
+        try:
+            result = db.execute('PRAGMA integrity_check').fetchall()
+            if result != [('ok',)]:
+                raise BackupError(f'{path.name} failed integrity_check: {"; ".join(row[0] for row in result[:5])}')
+            tables = [row[0] for row in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )]
+            if 'django_migrations' not in tables:
+                raise BackupError(f'{path.name} is not a Django database')
+            return {table: db.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+        except sqlite3.DatabaseError as e:
+            raise BackupError(f'{path.name} is not a usable SQLite database: {e}') from e
+        finally:
+            db.close()
+
+
+def _verify_mysqldump(path):
+    inserts, last_line = Counter(), ''
+    try:
+        with _open_text(path) as dump:
+            for line in dump:
+                if line.startswith('INSERT INTO `'):
+                    inserts[line.split('`', 2)[1]] += 1
+                if line.strip():
+                    last_line = line
+    except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+        raise BackupError(f'{path.name} could not be read: {e}') from e
+    if not last_line.startswith('-- Dump completed'):
+        raise BackupError(f'{path.name} is truncated (no "Dump completed" trailer)')
+    return dict(inserts)
+
+
+def _verify_fixture(path):
+    counts = Counter()
+    try:
+        with _open_text(path) as fixture:
+            for obj in serializers.deserialize('json', fixture, handle_forward_references=True):
+                counts[obj.object._meta.label_lower] += 1
+    except (OSError, EOFError, zlib.error, DeserializationError) as e:
+        raise BackupError(f'{path.name} could not be loaded: {e}') from e
+    return dict(counts)
+
+
+def backup_chain(path):
+    """The backups to restore, in order, to bring the database back to ``path``."""
+    path = Path(path).resolve()
+    backups = list_backups(path.parent)
+    index = next((i for i, backup in enumerate(backups) if backup.path.resolve() == path), None)
+    if index is None:
+        raise BackupError(f'{path} is not a backup file')
+    base = index
+    while backups[base].incremental:
+        base -= 1
+        if base < 0:
+            raise BackupError(f'No full backup before {path.name}')
+    return backups[base:index + 1]
+
+
+def latest_backup(directory=BACKUP_DIR):
+    backups = list_backups(directory)
+    if not backups:
+        raise BackupError(f'No backups in {directory}')
+    return backups[-1]
+
+
+def restore_backup(path, dry_run=False):
+    """
+    Verify every backup in ``path``'s chain, then (unless ``dry_run``)
+    restore them in order over the current database. Returns
+    [(backup, verify_backup() summary)].
+    """
+    verified = [(backup, verify_backup(backup.path)) for backup in backup_chain(path)]
+    if not dry_run:
+        for backup, _ in verified:
+            _restore(backup.path)
+            logger.info('Restored %s backup %s', backup.kind, backup.path)
+    return verified
+
+
+def _restore(path):
+    if path.name.endswith(SQLITE_SUFFIX):
+        if connection.vendor != 'sqlite':
+            raise BackupError(f'{path.name} is a SQLite backup but the database is {connection.vendor}')
+        with _decompressed(path) as snapshot:
+            connection.ensure_connection()
+            source = sqlite3.connect(snapshot)
+            try:
+                source.backup(connection.connection)
+            finally:
+                source.close()
+    elif path.name.endswith(MYSQL_SUFFIX):
+        if connection.vendor != 'mysql':
+            raise BackupError(f'{path.name} is a MySQL backup but the database is {connection.vendor}')
+        command, env = _mysql_command('mysql')
+        # Not stdin=dump: a GzipFile's fileno() is the compressed file.
+        with tempfile.TemporaryFile() as errors:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=errors, env=env)
+            with gzip.open(path, 'rb') as dump:
+                shutil.copyfileobj(dump, process.stdin, COPY_BUFFER_SIZE)
+            process.stdin.close()
+            if process.wait():
+                raise BackupError(f'mysql failed: {_read_errors(errors)}')
+    else:
+        call_command('loaddata', str(path), verbosity=0)
@@ -5,8 +5,7 @@ import uuid
 from wagtail import blocks
 from wagtail.images.blocks import ImageChooserBlock
 
-from django.core.cache import cache
-
+from blowcomotion import cache_namespaces
 from blowcomotion.chooser_blocks import EventChooserBlock, GigoGigChooserBlock
 
 logger = logging.getLogger(__name__)
@@ -428,7 +427,7 @@ class UpcomingPublicGigs(blocks.StructBlock):
         context['error'] = None
         
         try:
-            context['gigs'] = cache.get('upcoming_public_gigs')
+            context['gigs'] = cache_namespaces.get(cache_namespaces.GIGS, 'upcoming_public_gigs')
             if context['gigs'] is None:
                 # Import here to avoid circular imports
                 from blowcomotion.models import CachedGig
@@ -440,14 +439,7 @@ class UpcomingPublicGigs(blocks.StructBlock):
                 for gig in cached_gigs:
                     try:
                         # Filter out private, hidden, archived, and trashed gigs using raw_data
-                        raw = gig.raw_data or {}
-                        if raw.get('is_private', False):
-                            continue
-                        if raw.get('hide_from_calendar', False):
-                            continue
-                        if raw.get('is_archived', False):
-                            continue
-                        if raw.get('is_in_trash', False):
+                        if not gig.is_public:
                             continue
                         
                         # Build gig dict for template
@@ -470,7 +462,7 @@ class UpcomingPublicGigs(blocks.StructBlock):
                 # Already sorted by date from get_upcoming_gigs()
                 context['gigs'] = validated_gigs
 
-                cache.set('upcoming_public_gigs', context['gigs'], 60 * 60) # cache for 1 hour
+                cache_namespaces.set(cache_namespaces.GIGS, 'upcoming_public_gigs', context['gigs'], 60 * 60) # cache for 1 hour
         except Exception as e:
             logger.error(f"Error in UpcomingPublicGigs block: {e}")
             context['error'] = None  # Don't show errors to end users
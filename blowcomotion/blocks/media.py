@@ -7,6 +7,7 @@ from wagtail.embeds.blocks import EmbedBlock
 from wagtail.images.blocks import ImageChooserBlock
 from wagtailmedia.blocks import VideoChooserBlock
 
+from blowcomotion import integrations
 from blowcomotion.chooser_blocks import SongChooserBlock
 
 
@@ -183,11 +184,17 @@ class VideoFeedBlock(blocks.StructBlock):
         
         try:
             from wagtail.embeds import embeds
-            embed = embeds.get_embed(embed_value.url)
+            try:
+                with integrations.guard("oembed"):
+                    embed = embeds.get_embed(embed_value.url)
+            except integrations.CircuitOpenError:
+                # Provider is failing; build the player URL ourselves below
+                # and render without a thumbnail/title rather than waiting.
+                embed = None
             
             # Extract iframe src from embed HTML
             embed_url = None
-            if hasattr(embed, 'html') and embed.html:
+            if embed is not None and getattr(embed, 'html', None):
                 iframe_match = re.search(r'<iframe[^>]+src="([^"]+)"', embed.html)
                 if iframe_match:
                     embed_url = iframe_match.group(1)
@@ -215,10 +222,10 @@ class VideoFeedBlock(blocks.StructBlock):
             
             return {
                 'embed_url': embed_url,
-                'thumbnail_url': embed.thumbnail_url,
-                'title': embed.title,
-                'author_name': embed.author_name,
-                'provider_name': embed.provider_name,
+                'thumbnail_url': getattr(embed, 'thumbnail_url', ''),
+                'title': getattr(embed, 'title', ''),
+                'author_name': getattr(embed, 'author_name', ''),
+                'provider_name': getattr(embed, 'provider_name', ''),
             }
         except Exception:
             return None
@@ -0,0 +1,133 @@
+"""
+One SMTP connection for code that sends many emails in one go.
+
+send_mail() and EmailMessage.send() open (and TLS-handshake) a fresh SMTP
+connection per message. BulkMailer sends through one connection per batch of
+BULK_MAIL_BATCH_SIZE messages, pauses BULK_MAIL_BATCH_DELAY seconds between
+batches so a long run stays under the mail provider's rate limits, and
+records a result per recipient.
+
+Usage:
+    with BulkMailer() as mailer:
+        for member in members:
+            try:
+                mailer.send(build_message(member))  # raises like EmailMessage.send()
+            except Exception:
+                ...                                 # already recorded in mailer.results
+    mailer.log_summary("invite_members")
+
+    report = send_bulk(messages)  # send them all, never raise
+    if report.failed: ...
+"""
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BATCH_DELAY = 1.0  # seconds
+
+
+@dataclass
+class RecipientResult:
+    recipient: str
+    subject: str
+    error: str = ""
+
+    @property
+    def ok(self):
+        return not self.error
+
+
+class BulkMailer:
+    """Send messages through a shared, batched SMTP connection; see the module docstring."""
+
+    def __init__(self, batch_size=None, delay=None):
+        self.batch_size = batch_size or getattr(settings, "BULK_MAIL_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.delay = getattr(settings, "BULK_MAIL_BATCH_DELAY", DEFAULT_BATCH_DELAY) if delay is None else delay
+        self.results = []
+        self.connection = None
+        self.connections_opened = 0
+        self._sent_on_connection = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.connection is None:
+            return
+        try:
+            self.connection.close()
+        except Exception:
+            logger.warning("Error closing bulk mail connection", exc_info=True)
+        self.connection = None
+
+    def _connection(self):
+        if self.connection is not None and self._sent_on_connection >= self.batch_size:
+            self.close()
+            if self.delay:
+                time.sleep(self.delay)
+        if self.connection is None:
+            # Opened lazily, so a mailer that ends up sending nothing never connects.
+            self.connection = get_connection()
+            self.connection.open()
+            self.connections_opened += 1
+            self._sent_on_connection = 0
+        return self.connection
+
+    def send(self, message):
+        """Send one EmailMessage on the shared connection; re-raises a failure after recording it."""
+        try:
+            message.connection = self._connection()
+            self._sent_on_connection += 1
+            message.send()
+        except Exception as exc:
+            self._record(message, str(exc) or exc.__class__.__name__)
+            self.close()  # the connection may be unusable; the next message opens a new one
+            raise
+        self._record(message)
+
+    def _record(self, message, error=""):
+        for recipient in message.recipients():
+            self.results.append(RecipientResult(recipient, message.subject, error))
+
+    @property
+    def sent(self):
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if not result.ok]
+
+    def report_lines(self):
+        return [
+            f"{'sent' if result.ok else 'FAILED'}: {result.recipient} — {result.subject}"
+            + ("" if result.ok else f" ({result.error})")
+            for result in self.results
+        ]
+
+    def log_summary(self, label):
+        logger.info(
+            "%s: emailed %d recipient(s), %d failed, over %d SMTP connection(s)",
+            label, len(self.sent), len(self.failed), self.connections_opened,
+        )
+        for result in self.failed:
+            logger.warning("%s: failed to email %s: %s", label, result.recipient, result.error)
+
+
+def send_bulk(messages, batch_size=None, delay=None):
+    """Send every message, carrying on past failures; returns the BulkMailer with the results."""
+    with BulkMailer(batch_size=batch_size, delay=delay) as mailer:
+        for message in messages:
+            try:
+                mailer.send(message)
+            except Exception:
+                pass  # recorded in mailer.results
+    return mailer
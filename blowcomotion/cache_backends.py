@@ -0,0 +1,94 @@
+"""
+TieredCache: a per-process LocMem L1 in front of a shared cache.
+
+The shared (L2) cache is another entry in CACHES, named by this backend's
+LOCATION; reads are served from L1 for at most L1_TIMEOUT seconds, so a value
+changed by another worker (including a cache_namespaces version bump) is seen
+here within that window. add(), incr(), touch() and delete() go straight to
+L2 and drop the local copy, so they are only as atomic as L2 is. With the
+default FileBasedCache they are not: add() is check-then-set and incr() is
+get-then-set, so across processes add() locks are best-effort (two workers can
+occasionally both win) and incr() counters, e.g. django-ratelimit's, can lose
+concurrent increments. Nothing here relies on them being exact; for a real
+lock use a database row (select_for_update / conditional UPDATE).
+
+    CACHES = {
+        "default": {
+            "BACKEND": "blowcomotion.cache_backends.TieredCache",
+            "LOCATION": "shared",
+            "OPTIONS": {"L1_TIMEOUT": 5},
+        },
+        "shared": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", ...},
+    }
+"""
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        options = dict(params.get("OPTIONS", {}))
+        self.l1_timeout = options.pop("L1_TIMEOUT", 5)
+        l1_max_entries = options.pop("L1_MAX_ENTRIES", 1000)
+        super().__init__({**params, "OPTIONS": options})
+        self.shared_alias = location
+        self.l1 = LocMemCache(
+            f"tiered-l1:{location}", {"TIMEOUT": self.l1_timeout, "OPTIONS": {"MAX_ENTRIES": l1_max_entries}}
+        )
+
+    @property
+    def l2(self):
+        return caches[self.shared_alias]
+
+    def _l1_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self.l1.set(key, value, self.l1_timeout, version=version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        l1_timeout = self._l1_timeout(timeout)
+        if l1_timeout > 0:
+            self.l1.set(key, value, l1_timeout, version=version)
+        else:
+            self.l1.delete(key, version=version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.add(key, value, timeout, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.l1.has_key(key, version=version) or self.l2.has_key(key, version=version)
+
+    def clear(self):
+        """Clear the shared cache and this process's L1 (other workers' L1s expire on their own)."""
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
@@ -0,0 +1,178 @@
+"""
+Namespaced, versioned keys for the shared Django cache.
+
+Each domain that caches derived data (gigs, Patreon status, charts, menus)
+owns a namespace with its own version number. Keys are built as
+``<namespace>:v<version>:<key>``, so invalidating a namespace is a single
+version bump: every old key becomes unreachable and simply ages out, while
+unrelated entries (django-ratelimit counters, signup-invite throttles, other
+namespaces) stay put. Never use ``cache.clear()`` to invalidate domain data.
+
+Each namespace has a default TTL (DEFAULT_TTLS, overridable per namespace
+with the CACHE_NAMESPACE_TTLS setting) used when set() is given no timeout.
+Hits and misses are counted per namespace and pooled across worker
+processes in the cache itself; see stats_summary() and the Cache Stats admin
+page.
+
+Usage:
+    from blowcomotion import cache_namespaces
+
+    result = cache_namespaces.get(cache_namespaces.GIGS, f"gigs_for_date_{date_str}")
+    cache_namespaces.set(cache_namespaces.GIGS, f"gigs_for_date_{date_str}", result)
+    cache_namespaces.invalidate(cache_namespaces.GIGS)
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+GIGS = "gigs"
+PATREON = "patreon"
+CHARTS = "charts"
+MENUS = "menus"
+
+NAMESPACES = (GIGS, PATREON, CHARTS, MENUS)
+
+DEFAULT_TTLS = {
+    GIGS: 60 * 10,
+    PATREON: 60 * 60,
+    CHARTS: 60 * 60,
+    MENUS: 60 * 60,
+}
+
+# Hit/miss counts are kept in memory and added to the shared totals at most
+# this often, so counting doesn't double the cache traffic.
+STATS_FLUSH_INTERVAL = 60
+
+_stats_lock = threading.Lock()
+_pending_stats = Counter()
+_last_flush = time.monotonic()
+
+
+_MISSING = object()
+
+
+def _version_key(namespace):
+    if namespace not in NAMESPACES:
+        raise ValueError(f"Unknown cache namespace: {namespace!r}")
+    return f"cache_namespace_version:{namespace}"
+
+
+def get_version(namespace):
+    """
+    Return the current version number for a namespace.
+
+    The first version is seeded from the clock rather than 1, so if the version
+    key is ever evicted, re-seeding can't resurrect entries written under an
+    earlier version.
+    """
+    version_key = _version_key(namespace)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, int(time.time()), timeout=None)
+        version = cache.get(version_key, int(time.time()))
+    return version
+
+
+def make_key(namespace, key):
+    """Build the versioned cache key for ``key`` within ``namespace``."""
+    return f"{namespace}:v{get_version(namespace)}:{key}"
+
+
+def ttl(namespace):
+    """Default timeout in seconds for entries in ``namespace``."""
+    overrides = getattr(settings, "CACHE_NAMESPACE_TTLS", {})
+    return overrides.get(namespace, DEFAULT_TTLS[namespace])
+
+
+def get(namespace, key, default=None):
+    value = cache.get(make_key(namespace, key), _MISSING)
+    _record(namespace, "misses" if value is _MISSING else "hits")
+    return default if value is _MISSING else value
+
+
+def set(namespace, key, value, timeout=None):
+    """Cache ``value``; ``timeout`` defaults to the namespace's TTL."""
+    cache.set(make_key(namespace, key), value, ttl(namespace) if timeout is None else timeout)
+
+
+def delete(namespace, key):
+    cache.delete(make_key(namespace, key))
+
+
+def invalidate(namespace):
+    """
+    Invalidate every key in a namespace by bumping its version.
+
+    Returns the new version number.
+    """
+    version_key = _version_key(namespace)
+    try:
+        version = cache.incr(version_key)
+    except ValueError:
+        # Version key not set yet (or evicted) — seed it past anything the
+        # clock could have produced for an earlier version.
+        version = int(time.time()) + 1
+        cache.set(version_key, version, timeout=None)
+    logger.info("Invalidated cache namespace %s (now v%s)", namespace, version)
+    return version
+
+
+def _stats_key(namespace, outcome):
+    return f"cache_namespace_stats:{namespace}:{outcome}"
+
+
+def _record(namespace, outcome):
+    with _stats_lock:
+        _pending_stats[(namespace, outcome)] += 1
+        due = time.monotonic() - _last_flush >= STATS_FLUSH_INTERVAL
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    """Add this process's pending hit/miss counts to the shared totals."""
+    global _last_flush
+    with _stats_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _last_flush = time.monotonic()
+    for (namespace, outcome), count in pending.items():
+        key = _stats_key(namespace, outcome)
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, count)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(key, count, timeout=None)
+
+
+def stats_summary():
+    """Per-namespace version, TTL, hits, misses and hit ratio (shared totals)."""
+    flush_stats()
+    summary = []
+    for namespace in NAMESPACES:
+        hits = cache.get(_stats_key(namespace, "hits"), 0)
+        misses = cache.get(_stats_key(namespace, "misses"), 0)
+        lookups = hits + misses
+        summary.append({
+            "namespace": namespace,
+            "version": get_version(namespace),
+            "ttl": ttl(namespace),
+            "hits": hits,
+            "misses": misses,
+            "lookups": lookups,
+            "hit_ratio": round(100 * hits / lookups, 1) if lookups else None,
+        })
+    return summary
+
+
+def reset_stats():
+    """Zero the hit/miss counts for every namespace."""
+    with _stats_lock:
+        _pending_stats.clear()
+    cache.delete_many([_stats_key(ns, outcome) for ns in NAMESPACES for outcome in ("hits", "misses")])
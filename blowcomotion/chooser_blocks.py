@@ -1,15 +1,40 @@
 from blowcomotion.chooser_viewsets import (
+    GigoGig,
     event_chooser_viewset,
     gigo_gig_chooser_viewset,
+    resolve_gigo_gigs,
     song_chooser_viewset,
 )
 
 EventChooserBlock = event_chooser_viewset.get_block_class(
     name="EventChooserBlock", module_path="blowcomotion.chooser_blocks"
 )
-GigoGigChooserBlock = gigo_gig_chooser_viewset.get_block_class(
+_BaseGigoGigChooserBlock = gigo_gig_chooser_viewset.get_block_class(
     name="GigoGigChooserBlock", module_path="blowcomotion.chooser_blocks"
 )
+
+
+class GigoGigChooserBlock(_BaseGigoGigChooserBlock):
+    """
+    Resolves chosen gigs from CachedGig instead of the GO3 API.
+
+    StreamField/ListBlock route every gig in a stream through bulk_to_python,
+    so an EventsBlock with N gigs costs one CachedGig query rather than N API
+    calls during page rendering.
+    """
+
+    def to_python(self, value):
+        return self.bulk_to_python([value])[0]
+
+    def bulk_to_python(self, values):
+        return resolve_gigo_gigs(values)
+
+    def value_from_form(self, value):
+        if value is None or isinstance(value, GigoGig):
+            return value
+        return self.to_python(value)
+
+
 SongChooserBlock = song_chooser_viewset.get_block_class(
     name="SongChooserBlock", module_path="blowcomotion.chooser_blocks"
 )
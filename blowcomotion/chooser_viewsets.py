@@ -1,7 +1,7 @@
 import datetime
+import logging
 import re
 
-import requests
 from queryish.rest import APIModel, APIQuerySet
 from wagtail.admin.ui.tables import Column, TitleColumn
 from wagtail.admin.views.generic.chooser import (
@@ -16,8 +16,16 @@ from wagtail.admin.viewsets.chooser import ChooserViewSet
 from wagtail.admin.widgets import BaseChooser
 
 from django.conf import settings
+from django.http import Http404
 from django.views.generic.base import View
 
+from gigs.gigo import make_gigo_api_request, request_background_sync
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait on GO3 when an admin chooser needs a gig that isn't cached yet
+GIGO_CHOOSER_TIMEOUT = 5
+
 
 def get_cached_gig_model():
     """Late import to avoid circular import."""
@@ -230,13 +238,61 @@ class GigoAPIQuerySet(APIQuerySet):
 class GigoGig(APIModel):
     base_query_class = GigoAPIQuerySet
 
+    # True for stand-ins rendered while a gig is missing from CachedGig
+    is_placeholder = False
+
     class Meta:
         detail_url = f"{settings.GIGO_API_URL}/gigs/%s"
         fields = ["id", "title", "date", "address", "gig_status"]
         verbose_name_plural = "GigoGigs"
 
     def __str__(self):
-        return self.title
+        return self.title or f"Gig #{self.pk}"
+
+    @classmethod
+    def from_cached_gig(cls, cached_gig):
+        return cls(
+            id=cached_gig.gig_id,
+            title=cached_gig.title,
+            date=cached_gig.date.isoformat(),
+            address=cached_gig.address,
+            gig_status=cached_gig.gig_status,
+        )
+
+    @classmethod
+    def placeholder(cls, gig_id):
+        gig = cls(id=gig_id, title="")
+        gig.is_placeholder = True
+        return gig
+
+
+def resolve_gigo_gigs(gig_ids):
+    """
+    Resolve GigoGig instances for a list of GO3 gig IDs in one CachedGig query.
+
+    Returns a list in the same order as gig_ids, keeping None for empty values.
+    IDs missing from CachedGig come back as placeholders and trigger a
+    (throttled) background gig sync — page rendering never calls GO3 inline.
+    """
+    CachedGig = get_cached_gig_model()
+    wanted = {int(gig_id) for gig_id in gig_ids if gig_id not in (None, "")}
+    cached = {gig.gig_id: gig for gig in CachedGig.objects.filter(gig_id__in=wanted)} if wanted else {}
+
+    results = []
+    missing = []
+    for gig_id in gig_ids:
+        if gig_id in (None, ""):
+            results.append(None)
+        elif int(gig_id) in cached:
+            results.append(GigoGig.from_cached_gig(cached[int(gig_id)]))
+        else:
+            missing.append(int(gig_id))
+            results.append(GigoGig.placeholder(int(gig_id)))
+
+    if missing:
+        logger.info("Gigs %s not in CachedGig; rendering placeholders", missing)
+        request_background_sync()
+    return results
 
 
 class BaseGigoGigChooseView(BaseChooseView):
@@ -285,13 +341,11 @@ class GigoGigChosenViewMixin(ChosenViewMixin):
                 "date": cached_gig.date.isoformat(),
                 "address": cached_gig.address,
             }
-        # Fallback to API if not in cache
-        r = requests.get(
-            f"{settings.GIGO_API_URL}/gigs/{int(pk)}",
-            headers={"X-API-KEY": settings.GIGO_API_KEY},
-        )
-        r.raise_for_status()
-        return r.json()
+        # Fallback to API if not in cache (e.g. a gig created since the last sync)
+        gig = make_gigo_api_request(f"/gigs/{int(pk)}", timeout=GIGO_CHOOSER_TIMEOUT)
+        if gig is None:
+            raise Http404("Gig not found")
+        return gig
 
 
 class GigoGigChosenResponseMixin(ChosenResponseMixin):
@@ -325,21 +379,24 @@ class BaseGigoGigChooserWidget(BaseChooser):
                 "id": value.gig_id,
                 "title": value.title,
             }
+        elif isinstance(value, GigoGig):
+            # Already resolved by GigoGigChooserBlock.bulk_to_python
+            return {
+                "id": value.pk,
+                "title": str(value),
+            }
         else:
+            gig_id = int(value.id) if hasattr(value, 'id') else int(value)
             # Try to get from database cache first
-            cached_gig = CachedGig.get_gig_by_id(int(value.id) if hasattr(value, 'id') else int(value))
+            cached_gig = CachedGig.get_gig_by_id(gig_id)
             if cached_gig:
                 return {
                     "id": cached_gig.gig_id,
                     "title": cached_gig.title,
                 }
-            # Fallback to API
-            r = requests.get(
-                f"{settings.GIGO_API_URL}/gigs/{value.id if hasattr(value, 'id') else value}",
-                headers={"X-API-KEY": settings.GIGO_API_KEY},
-            )
-            r.raise_for_status()
-            return r.json()
+            # Fallback to API, bounded so a slow GO3 can't hang the editor
+            gig = make_gigo_api_request(f"/gigs/{gig_id}", timeout=GIGO_CHOOSER_TIMEOUT)
+            return gig or {"id": gig_id, "title": f"Gig #{gig_id}"}
 
     def get_value_data_from_instance(self, instance):
         CachedGig = get_cached_gig_model()
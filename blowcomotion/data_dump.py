@@ -0,0 +1,175 @@
+"""
+Streaming database dump for the admin "Dump Data" tool.
+
+Produces the same fixture `manage.py dumpdata --natural-foreign` would (the
+same exclusions, dependency order and per-model pk order), but one object at
+a time: each model is read with ``.iterator()``, serialized in chunks,
+cleaned/scrubbed per object, and encoded straight into the response. Peak
+memory is one chunk of objects however large the database gets, where
+dumpdata-to-StringIO plus json.loads/json.dumps held it three times over.
+
+Usage:
+    chunks = dump_json(include_real_data=False)   # iterator of str
+    chunks = gzip_chunks(chunks)                  # optional: iterator of bytes
+
+The gzipped output is a ``.json.gz`` fixture that loaddata reads directly.
+"""
+import json
+import logging
+import zlib
+from itertools import islice
+
+from django.apps import apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, router
+
+logger = logging.getLogger(__name__)
+
+DUMP_CHUNK_SIZE = 500
+OUTPUT_BUFFER_SIZE = 64 * 1024  # characters per yielded chunk
+
+# Never dumped: users, sessions, logs, permissions and other data that is
+# either sensitive or meaningless in another database.
+EXCLUDE = [
+    'contenttypes', 'auth.permission',
+    'wagtailcore.groupcollectionpermission', 'wagtailcore.grouppagepermission', 'wagtailcore.referenceindex',
+    'sessions', 'wagtailsearch', 'wagtailcore.pagelogentry', 'wagtailcore.revision', 'wagtailcore.taskstate',
+    'wagtailcore.workflowstate', 'wagtailcore.comment',
+    'auth.user',
+    'admin.logentry', 'axes.accesslog',
+    'wagtailcore.modellogentry', 'wagtailcore.pagesubscription',
+    'wagtailadmin.editingsession', 'wagtailadmin.formstate',
+    'wagtailusers.userprofile',
+    'blowcomotion.outboundemail', 'blowcomotion.patreonmember',
+    # Work queues and job state: copied contact details and tracebacks.
+    'blowcomotion.instrumentrentalnagjob', 'blowcomotion.instrumentrentalnagjobitem',
+    'blowcomotion.scheduledjob', 'auction.outbidnotice',
+]
+
+# Revision pointers would dangle (revisions are excluded) and break loading.
+REVISION_FIELDS = {'latest_revision', 'live_revision'}
+# FKs to the excluded auth.user table (e.g. Image.uploaded_by_user,
+# LibraryInstrument.locked_by, InstrumentHistoryLog.user,
+# InstrumentRentalNagJob.requested_by).
+USER_FK_FIELDS = {'uploaded_by_user', 'user', 'locked_by', 'owner', 'requested_by'}
+# Optional FileFields serialized as "" instead of null cause DeserializationError on load.
+EMPTY_STRING_FILE_FIELDS = {'thumbnail', 'avatar'}
+# Always replaced, even in real-data dumps.
+SITESETTINGS_RECIPIENT_FIELDS = {
+    'contact_form_email_recipients', 'join_band_form_email_recipients',
+    'booking_form_email_recipients', 'feedback_form_email_recipients',
+    'donate_form_email_recipients', 'birthday_summary_email_recipients',
+    'instrument_rental_notification_recipients',
+    'attendance_report_notification_recipients',
+    'member_signup_notification_recipients',
+}
+
+
+def dump_models(exclude=EXCLUDE):
+    """Models to dump, in dumpdata's dependency order."""
+    excluded_apps, excluded_models = set(), set()
+    for label in exclude:
+        if '.' in label:
+            excluded_models.add(apps.get_model(label))
+        else:
+            excluded_apps.add(apps.get_app_config(label))
+    app_list = [
+        (app_config, None)
+        for app_config in apps.get_app_configs()
+        if app_config.models_module is not None and app_config not in excluded_apps
+    ]
+    for model in serializers.sort_dependencies(app_list, allow_cycles=True):
+        if model in excluded_models or model._meta.proxy:
+            continue
+        if router.allow_migrate_model(DEFAULT_DB_ALIAS, model):
+            yield model
+
+
+def serialize_queryset(queryset, chunk_size=DUMP_CHUNK_SIZE):
+    """Serialized objects ({"model", "pk", "fields"} dicts) of ``queryset``, in pk order."""
+    serializer = serializers.get_serializer('python')()
+    objects = queryset.order_by(queryset.model._meta.pk.name).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(objects, chunk_size)):
+        yield from serializer.serialize(chunk, use_natural_foreign_keys=True)
+
+
+def dump_objects(chunk_size=DUMP_CHUNK_SIZE):
+    """Serialized objects of every dumped model, model by model."""
+    for model in dump_models():
+        yield from serialize_queryset(model._default_manager.all(), chunk_size=chunk_size)
+
+
+def _scrub_member(fields, idx):
+    # first_name / last_name / email live on auth.user, which is excluded
+    # from the dump and has its FK nulled.
+    fields['preferred_name'] = f'Preferred{idx}' if fields.get('preferred_name') else None
+    fields['phone'] = f'555-{idx:04d}' if fields.get('phone') else None
+    fields['address'] = f'{idx} Main Street' if fields.get('address') else None
+    fields['city'] = 'Austin' if fields.get('city') else None
+    fields['state'] = 'TX' if fields.get('state') else None
+    fields['zip_code'] = f'{idx:05d}' if fields.get('zip_code') else None
+    fields['country'] = 'USA' if fields.get('country') else None
+    fields['emergency_contact'] = f'Emergency Contact {idx}' if fields.get('emergency_contact') else None
+    fields['inspired_by'] = 'Scrubbed for privacy' if fields.get('inspired_by') else None
+    fields['bio'] = 'Scrubbed for privacy' if fields.get('bio') else None
+    fields['notes'] = 'Scrubbed for privacy' if fields.get('notes') else None
+    # GigoGig integration identifiers and member photos
+    fields['gigomatic_username'] = None
+    fields['gigomatic_id'] = None
+    fields['image'] = None
+
+
+def clean_objects(objects, include_real_data=False):
+    """
+    Make each object loadable elsewhere and, unless ``include_real_data``,
+    replace members' personal details with deterministic fake values
+    (member N in pk order gets Preferred{N}, 555-{N:04d}, ...).
+    """
+    members = 0
+    for item in objects:
+        fields = item['fields']
+        for name in REVISION_FIELDS | USER_FK_FIELDS:
+            if name in fields:
+                fields[name] = None
+        for name in EMPTY_STRING_FILE_FIELDS:
+            if fields.get(name) == '':
+                fields[name] = None
+        if item['model'] == 'blowcomotion.member' and not include_real_data:
+            members += 1  # members are dumped in pk order, so this is the pk's rank
+            _scrub_member(fields, members)
+        elif item['model'] == 'blowcomotion.sitesettings':
+            for name in SITESETTINGS_RECIPIENT_FIELDS & fields.keys():
+                fields[name] = 'local@example.com'
+        yield item
+    if not include_real_data:
+        logger.info('Scrubbed %d member records in data dump', members)
+
+
+def encode_json(objects, buffer_size=OUTPUT_BUFFER_SIZE):
+    """Encode objects as one JSON array, yielded in chunks of about ``buffer_size`` characters."""
+    parts, size, separator = ['['], 1, '\n'
+    for item in objects:
+        text = separator + json.dumps(item, indent=2, cls=DjangoJSONEncoder)
+        separator = ',\n'
+        parts.append(text)
+        size += len(text)
+        if size >= buffer_size:
+            yield ''.join(parts)
+            parts, size = [], 0
+    parts.append('\n]\n')
+    yield ''.join(parts)
+
+
+def dump_json(include_real_data=False):
+    return encode_json(clean_objects(dump_objects(), include_real_data=include_real_data))
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of str chunks on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,85 @@
+"""
+Shared CSV export layer for the admin export views and their management
+commands.
+
+Each export is a row generator: it yields the header row, then one row per
+object read with ``.iterator(chunk_size=EXPORT_CHUNK_SIZE)``, so only one
+chunk of model instances is in memory at a time. The same generator feeds
+
+- ``streaming_csv_response()``: a StreamingHttpResponse that sends each row
+  as it is produced, so the browser starts downloading immediately and the
+  worker never holds the whole file; and
+- ``write_csv()``: the management commands' file output.
+
+Usage:
+    from blowcomotion.exports import streaming_csv_response, write_csv
+
+    return streaming_csv_response(chart_rows(), "charts_export")
+    count = write_csv(chart_rows(), "charts_export.csv")
+"""
+import csv
+import logging
+import os
+from datetime import date, datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: write() hands back the formatted line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def serialize(value):
+    """The export convention for a single cell: blank for None, YES/NO, ISO dates, '; '-joined lists."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "YES" if value else "NO"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value)
+    return str(value)
+
+
+def _stream(rows, filename):
+    writer = csv.writer(Echo())
+    count = -1  # the header row
+    try:
+        for row in rows:
+            yield writer.writerow(row)
+            count += 1
+    except Exception:
+        # Headers are already sent, so all we can do is log and cut the download short.
+        logger.exception("CSV export %s failed after %d row(s)", filename, max(count, 0))
+        raise
+    logger.info("CSV export %s completed: %d row(s)", filename, max(count, 0))
+
+
+def streaming_csv_response(rows, filename_prefix):
+    """Stream ``rows`` (header first) as a timestamped CSV attachment."""
+    filename = f"{filename_prefix}_{timezone.now():%Y%m%d-%H%M%S}.csv"
+    response = StreamingHttpResponse(_stream(rows, filename), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def write_csv(rows, path):
+    """Write ``rows`` (header first) to ``path``, creating its directory; returns the number of data rows."""
+    directory = os.path.dirname(os.path.abspath(path)) or "."
+    os.makedirs(directory, exist_ok=True)
+    count = -1
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return max(count, 0)
@@ -0,0 +1,224 @@
+"""
+Shared guard for outbound calls to third-party services.
+
+Every synchronous call the site makes to an external service (GO3, Patreon,
+reCAPTCHA, Google Drive, Twilio, oEmbed providers) goes through ``guard()``,
+which provides:
+
+- a per-service timeout (the "latency budget"), yielded to the caller so it
+  can be passed to the HTTP client;
+- a circuit breaker: after ``failure_threshold`` consecutive failures the
+  service is marked *open* and calls fail fast with ``CircuitOpenError``
+  instead of tying up a gunicorn worker. After ``reset_timeout`` seconds one
+  trial call is let through (*half-open*); success closes the circuit again,
+  failure re-opens it;
+- a short rolling window of recent latencies for the admin status page.
+
+Breaker state lives in the Django cache so all workers sharing that cache see
+the same state.
+
+Usage:
+    from blowcomotion import integrations
+
+    try:
+        with integrations.guard("patreon") as timeout:
+            response = requests.get(url, timeout=timeout)
+            response.raise_for_status()
+    except integrations.CircuitOpenError:
+        return None  # fast-fail fallback
+
+Per-service settings can be overridden in settings.INTEGRATIONS, e.g.
+    INTEGRATIONS = {"go3": {"timeout": 5, "failure_threshold": 3}}
+Setting INTEGRATION_BREAKERS_ENABLED = False keeps the timeouts but disables
+the breaker (the test settings do this).
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+from wagtail.embeds.exceptions import (
+    EmbedNotFoundException,
+    EmbedUnsupportedProviderException,
+)
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60  # seconds an open circuit waits before a trial call
+LATENCY_SAMPLES = 20
+
+SERVICES = {
+    "go3": {"label": "Gig-O-Matic (GO3)", "timeout": 10},
+    "patreon": {"label": "Patreon", "timeout": 10},
+    "recaptcha": {"label": "reCAPTCHA", "timeout": 5},
+    "gdrive": {"label": "Google Drive", "timeout": 30},
+    "twilio": {"label": "Twilio", "timeout": 10},
+    "oembed": {"label": "oEmbed (YouTube/Vimeo)", "timeout": 5},
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+    def __init__(self, service):
+        self.service = service
+        super().__init__(f"{service} circuit is open; skipping call")
+
+
+def get_config(service):
+    if service not in SERVICES:
+        raise ValueError(f"Unknown integration: {service!r}")
+    config = {
+        "failure_threshold": DEFAULT_FAILURE_THRESHOLD,
+        "reset_timeout": DEFAULT_RESET_TIMEOUT,
+        **SERVICES[service],
+    }
+    config.update((getattr(settings, "INTEGRATIONS", None) or {}).get(service, {}))
+    return config
+
+
+def get_timeout(service):
+    return get_config(service)["timeout"]
+
+
+def _breaker_key(service):
+    return f"integration:{service}:breaker"
+
+
+def _latency_key(service):
+    return f"integration:{service}:latencies"
+
+
+def _probe_key(service):
+    return f"integration:{service}:probe"
+
+
+def _closed_state():
+    return {"state": CLOSED, "failures": 0, "opened_at": None}
+
+
+def get_state(service):
+    """Return the breaker dict: state, consecutive failures, opened_at (epoch seconds)."""
+    return cache.get(_breaker_key(service)) or _closed_state()
+
+
+def _set_state(service, state):
+    cache.set(_breaker_key(service), state, timeout=None)
+
+
+def reset(service):
+    """Force a service's circuit closed (admin override)."""
+    _set_state(service, _closed_state())
+    cache.delete(_probe_key(service))
+
+
+def _before_call(service, config):
+    state = get_state(service)
+    if state["state"] == CLOSED:
+        return
+    if time.time() - (state["opened_at"] or 0) < config["reset_timeout"]:
+        raise CircuitOpenError(service)
+    # Reset window elapsed: let exactly one caller (across workers) probe.
+    if not cache.add(_probe_key(service), True, timeout=config["timeout"] + 5):
+        raise CircuitOpenError(service)
+    if state["state"] != HALF_OPEN:
+        _set_state(service, {**state, "state": HALF_OPEN})
+
+
+def _counts_as_failure(exc):
+    """
+    Client errors (4xx other than 429) and bad input (e.g. an editor's
+    unsupported or deleted video URL) mean the service is up; don't trip on them.
+    """
+    if isinstance(exc, EmbedUnsupportedProviderException):
+        return False
+    if isinstance(exc, EmbedNotFoundException):
+        # Wagtail wraps the provider's requests error, if there was one.
+        return exc.__cause__ is not None and _counts_as_failure(exc.__cause__)
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status != 429:
+        return False
+    return True
+
+
+def _record(service, config, elapsed, ok):
+    samples = cache.get(_latency_key(service)) or []
+    samples.append({"at": time.time(), "ms": round(elapsed * 1000), "ok": ok})
+    cache.set(_latency_key(service), samples[-LATENCY_SAMPLES:], timeout=None)
+
+    state = get_state(service)
+    if ok:
+        if state["state"] != CLOSED or state["failures"]:
+            if state["state"] != CLOSED:
+                logger.info("%s circuit closed after successful call", service)
+            _set_state(service, _closed_state())
+        cache.delete(_probe_key(service))
+        return
+
+    failures = state["failures"] + 1
+    if state["state"] == HALF_OPEN or failures >= config["failure_threshold"]:
+        logger.warning("%s circuit opened after %d consecutive failure(s)", service, failures)
+        _set_state(service, {"state": OPEN, "failures": failures, "opened_at": time.time()})
+        cache.delete(_probe_key(service))
+    else:
+        _set_state(service, {**state, "failures": failures})
+
+
+@contextmanager
+def guard(service):
+    """
+    Guard one outbound call to ``service``; yields the timeout (seconds) to use.
+
+    Raises CircuitOpenError without running the block when the circuit is open.
+    An exception escaping the block is recorded as a failure (unless it's a 4xx
+    client error or bad input, see _counts_as_failure) and re-raised; callers keep their existing error handling.
+    """
+    config = get_config(service)
+    if not getattr(settings, "INTEGRATION_BREAKERS_ENABLED", True):
+        yield config["timeout"]
+        return
+    _before_call(service, config)
+    start = time.monotonic()
+    try:
+        yield config["timeout"]
+    except Exception as exc:
+        _record(service, config, time.monotonic() - start, ok=not _counts_as_failure(exc))
+        raise
+    _record(service, config, time.monotonic() - start, ok=True)
+
+
+def status_summary():
+    """Breaker state and recent latencies for every service, for the admin status page."""
+    rows = []
+    now = time.time()
+    for service, base in SERVICES.items():
+        config = get_config(service)
+        state = get_state(service)
+        samples = cache.get(_latency_key(service)) or []
+        latencies = sorted(s["ms"] for s in samples)
+        retry_in = None
+        if state["state"] == OPEN and state["opened_at"]:
+            retry_in = max(0, round(config["reset_timeout"] - (now - state["opened_at"])))
+        rows.append({
+            "service": service,
+            "label": base["label"],
+            "state": state["state"],
+            "failures": state["failures"],
+            "retry_in": retry_in,
+            "timeout": config["timeout"],
+            "calls": len(samples),
+            "errors": sum(1 for s in samples if not s["ok"]),
+            "median_ms": latencies[len(latencies) // 2] if latencies else None,
+            "max_ms": latencies[-1] if latencies else None,
+            "last_ms": samples[-1]["ms"] if samples else None,
+        })
+    return rows
@@ -0,0 +1,165 @@
+"""
+Durable outbound email queue (OutboundEmail rows) and its worker.
+
+Request handlers call enqueue() instead of sending: the row is committed with
+the request, and the send_queued_emails worker (always-on, or every minute
+from run_scheduler) delivers it. deliver_queued():
+
+- claims up to MAIL_QUEUE_BATCH_SIZE due rows, auth emails first, each with
+  a conditional UPDATE so several workers never send the same row;
+- sends them from a pool of MAIL_QUEUE_WORKERS threads, each with its own
+  BulkMailer (one SMTP connection per thread, no database access in the
+  threads);
+- marks each row SENT, or PENDING again with a send_after 2, 4, 8, ...
+  minutes out, or DEAD after MAX_ATTEMPTS (see retry_dead()).
+
+Rows left SENDING by a worker that died are put back after CLAIM_TIMEOUT, so
+delivery is at-least-once.
+
+Auth emails (login, set-password and email-change links) carry live tokens,
+so their body is blanked once they are sent or dead-lettered; dead ones are
+not retried (the member just asks for a new link). The table is also left
+out of data dumps (blowcomotion.data_dump.EXCLUDE).
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Min
+from django.utils import timezone
+
+from blowcomotion.bulk_mail import BulkMailer
+from blowcomotion.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+CLAIM_TIMEOUT = timedelta(minutes=10)
+KEEP_SENT = timedelta(days=30)
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_WORKERS = 4
+
+
+def enqueue(message, priority=OutboundEmail.PRIORITY_NORMAL, category=""):
+    """Queue a plain-text EmailMessage; returns the OutboundEmail."""
+    email = OutboundEmail.objects.create(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+        priority=priority,
+        category=category,
+    )
+    return email
+
+
+def requeue_stale(now=None):
+    """Put rows claimed by a worker that died back in the queue; returns how many."""
+    now = now or timezone.now()
+    return OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENDING, claimed_at__lt=now - CLAIM_TIMEOUT
+    ).update(status=OutboundEmail.STATUS_PENDING)
+
+
+def _claim(limit, ids=None):
+    now = timezone.now()
+    due = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING, send_after__lte=now)
+    if ids is not None:
+        due = due.filter(pk__in=ids)
+    claimed = []
+    for email in due.order_by("priority", "send_after", "pk")[:limit]:
+        if OutboundEmail.objects.filter(pk=email.pk, status=OutboundEmail.STATUS_PENDING).update(
+            status=OutboundEmail.STATUS_SENDING, claimed_at=now, attempts=F("attempts") + 1
+        ):
+            email.attempts += 1
+            claimed.append(email)
+    return claimed
+
+
+def _message(email):
+    from members.auth import _MemberEmail
+
+    return _MemberEmail(subject=email.subject, body=email.body, from_email=email.from_email, to=email.to)
+
+
+def _send_all(emails):
+    """Send ``emails`` over one connection; returns [(email, error or None)]. Runs in a pool thread."""
+    results = []
+    with BulkMailer(delay=0) as mailer:
+        for email in emails:
+            try:
+                mailer.send(_message(email))
+            except Exception as exc:
+                results.append((email, str(exc) or exc.__class__.__name__))
+            else:
+                results.append((email, None))
+    return results
+
+
+def _finish(email, error=None):
+    # Don't keep live login/set-password tokens around once the email is done with.
+    scrub = {"body": ""} if email.priority == OutboundEmail.PRIORITY_AUTH else {}
+    if error is None:
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            status=OutboundEmail.STATUS_SENT, sent_at=timezone.now(), last_error="", **scrub
+        )
+    elif email.attempts >= MAX_ATTEMPTS:
+        logger.error("Giving up on email %s to %s after %d attempts: %s", email.pk, email.to, email.attempts, error)
+        OutboundEmail.objects.filter(pk=email.pk).update(status=OutboundEmail.STATUS_DEAD, last_error=error, **scrub)
+    else:
+        retry_at = timezone.now() + timedelta(minutes=2 ** email.attempts)
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            status=OutboundEmail.STATUS_PENDING, send_after=retry_at, last_error=error
+        )
+
+
+def deliver_queued(limit=None, workers=None, ids=None):
+    """Send due queued emails; returns (sent, failed) counts for this pass."""
+    limit = limit or getattr(settings, "MAIL_QUEUE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    workers = workers or getattr(settings, "MAIL_QUEUE_WORKERS", DEFAULT_WORKERS)
+    emails = _claim(limit, ids=ids)
+    if not emails:
+        return 0, 0
+
+    # Round-robin, so the auth emails at the front of the claim lead every thread's share.
+    shares = [emails[i::workers] for i in range(min(workers, len(emails)))]
+    if len(shares) == 1:
+        results = [_send_all(shares[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(shares), thread_name_prefix="mail-queue") as pool:
+            results = list(pool.map(_send_all, shares))
+
+    sent = failed = 0
+    for share in results:
+        for email, error in share:
+            _finish(email, error)
+            if error is None:
+                sent += 1
+            else:
+                failed += 1
+                logger.warning("Queued email %s to %s failed (attempt %d): %s", email.pk, email.to, email.attempts, error)
+    return sent, failed
+
+
+def next_due_time():
+    """When the earliest pending email falls due, or None."""
+    return OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING).aggregate(m=Min("send_after"))["m"]
+
+
+def retry_dead():
+    """Give every dead-lettered email but auth ones (blanked) a fresh set of attempts; returns how many."""
+    return OutboundEmail.objects.filter(status=OutboundEmail.STATUS_DEAD).exclude(
+        priority=OutboundEmail.PRIORITY_AUTH
+    ).update(
+        status=OutboundEmail.STATUS_PENDING, attempts=0, send_after=timezone.now()
+    )
+
+
+def prune_sent(now=None):
+    """Delete sent emails older than KEEP_SENT; returns how many."""
+    now = now or timezone.now()
+    deleted, _ = OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENT, sent_at__lt=now - KEEP_SENT
+    ).delete()
+    return deleted
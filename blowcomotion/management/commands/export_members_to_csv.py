@@ -1,10 +1,7 @@
-import csv
-import os
-from datetime import date, datetime
-
 from django.core.management.base import BaseCommand
 
-from blowcomotion.models import Member
+from blowcomotion.exports import write_csv
+from members.exports import member_rows
 
 
 class Command(BaseCommand):
@@ -25,60 +22,13 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         output_path = options["output_path"]
-        include_extra = options["include_extra"]
-
-        directory = os.path.dirname(os.path.abspath(output_path)) or "."
-        os.makedirs(directory, exist_ok=True)
 
-        members = Member.objects.select_related("user").order_by("user__last_name", "user__first_name", "id")
-        if not members.exists():
+        row_count = write_csv(member_rows(include_extra=options["include_extra"]), output_path)
+        if not row_count:
             self.stdout.write(self.style.WARNING("No members found to export."))
 
-        fields = Member._meta.concrete_fields
-        field_names = [field.attname for field in fields]
-
-        extra_headers = []
-        if include_extra:
-            extra_headers.extend([
-                "primary_instrument_name",
-                "additional_instruments",
-            ])
-
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(field_names + extra_headers)
-
-            for member in members:
-                row = [self._serialize(getattr(member, field.attname)) for field in fields]
-
-                if include_extra:
-                    primary_instrument_name = (
-                        member.primary_instrument.name if member.primary_instrument else ""
-                    )
-                    additional_instruments = "; ".join(
-                        instrument.instrument.name
-                        for instrument in member.additional_instruments.all()
-                    )
-                    row.extend([
-                        primary_instrument_name,
-                        additional_instruments,
-                    ])
-
-                writer.writerow(row)
-
         self.stdout.write(
             self.style.SUCCESS(
-                f"Export complete. {members.count()} members written to {output_path}"
+                f"Export complete. {row_count} members written to {output_path}"
             )
         )
-
-    def _serialize(self, value):
-        if value is None:
-            return ""
-        if isinstance(value, bool):
-            return "YES" if value else "NO"
-        if isinstance(value, (datetime, date)):
-            return value.isoformat()
-        if isinstance(value, (list, tuple)):
-            return "; ".join(str(item) for item in value)
-        return str(value)
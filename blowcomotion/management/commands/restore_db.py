@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blowcomotion.backups import (
+    BACKUP_DIR,
+    BackupError,
+    backup_chain,
+    latest_backup,
+    restore_backup,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Restore the database from a backup_db backup: the full backup it builds on, then each '
+        'incremental up to it. Use --dry-run to only verify the backups.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'backup',
+            nargs='?',
+            default=str(BACKUP_DIR),
+            help=f'Backup file, or a directory to restore its latest backup (default: {BACKUP_DIR})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Verify every backup that would be restored and report its contents; change nothing',
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not ask for confirmation before overwriting the database',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['backup'])
+        try:
+            if path.is_dir():
+                path = latest_backup(path).path
+            chain = backup_chain(path)
+            for backup in chain:
+                self.stdout.write(f'{backup.kind}: {backup.path.name}')
+
+            if not options['dry_run'] and options['interactive']:
+                answer = input('This will overwrite the current database. Type "yes" to continue: ')
+                if answer != 'yes':
+                    raise CommandError('Restore cancelled.')
+
+            for backup, counts in restore_backup(path, dry_run=options['dry_run']):
+                self.stdout.write(
+                    f'  {backup.path.name}: OK, {len(counts)} tables/models, {sum(counts.values())} rows'
+                )
+                if options['verbosity'] > 1:
+                    for label, count in sorted(counts.items()):
+                        self.stdout.write(f'    {label}: {count}')
+        except BackupError as e:
+            raise CommandError(str(e)) from e
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Dry run: {len(chain)} backup(s) verified, nothing restored'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Restored {path.name}; run migrate if the backup predates any migrations'))
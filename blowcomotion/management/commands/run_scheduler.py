@@ -0,0 +1,120 @@
+"""
+Run the site's periodic jobs from one resident process instead of cron.
+
+Each job in blowcomotion.scheduler.JOBS (sync_gigs, sync_charts, backup_db,
+the attendance and birthday emails, the auction closer, ...) runs in-process
+on its cron schedule, under a database lock so overlapping runs can't
+collide. Each lane of jobs (see blowcomotion.scheduler) gets its own thread,
+so a long backup doesn't hold up the every-minute email and auction jobs.
+The last run, duration and outcome of every job are shown on the admin
+"Scheduled Jobs" page.
+
+On PythonAnywhere, add it as an always-on task and remove the per-command
+scheduled tasks it replaces:
+
+    python manage.py run_scheduler
+
+Usage:
+    python manage.py run_scheduler                 # stay resident
+    python manage.py run_scheduler --once          # run whatever is due, then exit
+    python manage.py run_scheduler --job sync_gigs # run one job now, due or not
+    python manage.py run_scheduler --list          # show jobs and their next run
+"""
+import logging
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from blowcomotion import scheduler
+from blowcomotion.models import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run scheduled jobs (sync, backups, reports, auction closer) from one resident process"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the jobs that are due, then exit')
+        parser.add_argument('--job', help='Run this job now (if no other process is running it), then exit')
+        parser.add_argument('--list', action='store_true', help='List jobs with their schedule and next run')
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=60,
+            help='Longest nap between checks (default: 60s), so "Run now" from the admin is picked up',
+        )
+
+    def handle(self, *args, **options):
+        jobs = scheduler.sync_jobs()
+
+        if options['list']:
+            for row in ScheduledJob.objects.filter(name__in=jobs):
+                next_run = f"{timezone.localtime(row.next_run_at):%Y-%m-%d %H:%M}" if row.next_run_at else "-"
+                self.stdout.write(f"{row.name:30} {row.schedule:15} next {next_run}  last {row.last_outcome or '-'}")
+            return
+
+        if options['job']:
+            name = options['job']
+            if name not in jobs:
+                raise CommandError(f"Unknown or disabled job {name!r}; choose from {', '.join(sorted(jobs))}")
+            outcome = scheduler.run_job(name, jobs[name], force=True)
+            if outcome is None:
+                raise CommandError(f"{name} is already running in another process")
+            self._report(name, outcome)
+            if outcome != ScheduledJob.OUTCOME_OK:
+                raise CommandError(f"{name} failed; see the Scheduled Jobs admin page for the traceback")
+            return
+
+        if options['once']:
+            self._run_due(jobs)
+            return
+
+        self.stdout.write(f"Running {len(jobs)} scheduled job(s) (Ctrl-C to stop)")
+        self.stopping = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self._run_lane, args=(lane, options['max_sleep']), name=f"scheduler-{lane}", daemon=True
+            )
+            for lane in scheduler.lanes(jobs)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            # Let runs in progress finish and release their locks; Ctrl-C again to abandon them.
+            self.stdout.write("Stopping after the jobs in progress finish")
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+    def _run_lane(self, lane, max_sleep):
+        """One lane's loop: run its due jobs in order, then sleep until the next is due."""
+        while not self.stopping.is_set():
+            try:
+                close_old_connections()
+                jobs = scheduler.lanes(scheduler.get_jobs()).get(lane, {})
+                self._run_due(jobs, lane=lane)
+                close_old_connections()
+                delay = scheduler.seconds_until_next_run(jobs, max_sleep)
+            except Exception:
+                logger.exception("Scheduler lane %s failed; retrying in %ss", lane, max_sleep)
+                delay = max_sleep
+            self.stopping.wait(delay)
+        connections.close_all()
+
+    def _run_due(self, jobs, lane=None):
+        for name, outcome in scheduler.run_due_jobs(jobs, lane=lane):
+            self._report(name, outcome)
+
+    def _report(self, name, outcome):
+        line = f"{timezone.now():%Y-%m-%d %H:%M:%S} {name}: {outcome}"
+        if outcome == ScheduledJob.OUTCOME_OK:
+            self.stdout.write(line)
+        else:
+            self.stderr.write(line)
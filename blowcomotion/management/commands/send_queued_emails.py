@@ -0,0 +1,82 @@
+"""
+Send queued emails (blowcomotion.models.OutboundEmail); see blowcomotion.mail_queue.
+
+Login links, set-password and other member emails are queued by the request
+that triggers them, so something has to drain the queue. run_scheduler runs
+a pass every minute; for prompt login links run the worker as an always-on
+task on PythonAnywhere:
+
+    python manage.py send_queued_emails --watch
+    python manage.py send_queued_emails --retry-dead   # requeue dead letters, then send
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from blowcomotion.mail_queue import (
+    deliver_queued,
+    next_due_time,
+    prune_sent,
+    requeue_stale,
+    retry_dead,
+)
+
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound emails, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep running, sending emails as they fall due')
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=2,
+            help='Longest nap between checks in --watch mode (default: 2s)',
+        )
+        parser.add_argument('--workers', type=int, default=None, help='Sending threads (default: MAIL_QUEUE_WORKERS or 4)')
+        parser.add_argument('--retry-dead', action='store_true', help='Give dead-lettered emails another set of attempts first')
+
+    def handle(self, *args, **options):
+        if options['retry_dead']:
+            self.stdout.write(f"Requeued {retry_dead()} dead email(s)")
+        if not options['watch']:
+            self.send_once(options['workers'])
+            prune_sent()
+            return
+
+        last_prune = time.monotonic()
+        try:
+            while True:
+                close_old_connections()
+                self.send_once(options['workers'], quiet=True)
+                if time.monotonic() - last_prune >= PRUNE_INTERVAL_SECONDS:
+                    prune_sent()
+                    last_prune = time.monotonic()
+                time.sleep(self.seconds_until_next_email(options['max_sleep']))
+        except KeyboardInterrupt:
+            pass
+
+    def send_once(self, workers, quiet=False):
+        stale = requeue_stale()
+        if stale:
+            self.stdout.write(f"Requeued {stale} email(s) abandoned by a stopped worker")
+        sent = failed = 0
+        while True:  # a batch at a time until nothing is due (failures are rescheduled, so this ends)
+            batch_sent, batch_failed = deliver_queued(workers=workers)
+            if not batch_sent and not batch_failed:
+                break
+            sent += batch_sent
+            failed += batch_failed
+        if sent or failed or not quiet:
+            self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M:%S} sent {sent} email(s), {failed} failed")
+
+    @staticmethod
+    def seconds_until_next_email(max_sleep):
+        due = next_due_time()
+        if due is None:
+            return max_sleep
+        return min(max(0.0, (due - timezone.now()).total_seconds()) + 0.1, max_sleep)
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.7 on 2026-10-19 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blowcomotion', '0135_equipment_member'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('schedule', models.CharField(blank=True, help_text="Cron expression, in the site's time zone.", max_length=100)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Set while a scheduler is running the job; a lock past this time is treated as abandoned.', null=True)),
+                ('locked_by', models.CharField(blank=True, max_length=255)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration', models.DurationField(blank=True, null=True)),
+                ('last_outcome', models.CharField(blank=True, choices=[('ok', 'OK'), ('failed', 'Failed')], max_length=10)),
+                ('last_output', models.TextField(blank=True, help_text="Tail of the last run's output or traceback.")),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+    ]
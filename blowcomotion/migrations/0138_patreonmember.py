@@ -0,0 +1,32 @@
+# Generated by Django 6.0.7 on 2026-10-19 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blowcomotion', '0137_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatreonMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(help_text='Lowercased; see normalize_email().', max_length=254, unique=True)),
+                ('is_active', models.BooleanField(default=False, help_text='patron_status is active_patron')),
+                ('pledge_cents', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_charge_date', models.DateTimeField(blank=True, null=True)),
+                ('last_charge_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('patron_since', models.DateTimeField(blank=True, null=True)),
+                ('lifetime_cents', models.PositiveIntegerField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(help_text='When the sync that last saw this member ran.')),
+            ],
+            options={
+                'verbose_name': 'Patreon Member',
+                'verbose_name_plural': 'Patreon Members',
+                'ordering': ['email'],
+            },
+        ),
+    ]
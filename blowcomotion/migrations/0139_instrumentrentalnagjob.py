@@ -0,0 +1,47 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blowcomotion', '0138_patreonmember'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InstrumentRentalNagJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done')], default='queued', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, help_text='When a worker took it; a RUNNING job started long ago belonged to a worker that died.', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='InstrumentRentalNagJobItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_name', models.CharField(max_length=255)),
+                ('member_email', models.EmailField(max_length=254)),
+                ('reasons', models.CharField(help_text='"attendance", "patreon", or "attendance+patreon"', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('detail', models.TextField(blank=True, help_text='Why it was skipped, or the send error.')),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='blowcomotion.instrumentrentalnagjob')),
+                ('library_instrument', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blowcomotion.libraryinstrument')),
+            ],
+            options={
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.7 on 2026-10-19 03:15
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_nag_reasons(apps, schema_editor):
+    """Flag current renters the way LibraryInstrument.compute_nag_reasons does."""
+    LibraryInstrument = apps.get_model("blowcomotion", "LibraryInstrument")
+    SiteSettings = apps.get_model("blowcomotion", "SiteSettings")
+    Site = apps.get_model("wagtailcore", "Site")
+
+    site = Site.objects.filter(is_default_site=True).first() or Site.objects.first()
+    site_settings = SiteSettings.objects.filter(site=site).first() if site else None
+    cleanup_days = site_settings.attendance_cleanup_days if site_settings else 90
+    cutoff = datetime.date.today() - datetime.timedelta(days=cleanup_days)
+
+    changed = []
+    for li in LibraryInstrument.objects.filter(status="rented", member__isnull=False).select_related("member"):
+        member = li.member
+        reasons = []
+        if not member.is_active or not member.last_seen or member.last_seen < cutoff:
+            reasons.append("attendance")
+        if not li.patreon_active:
+            reasons.append("patreon")
+        if reasons:
+            li.nag_reasons = "+".join(reasons)
+            changed.append(li)
+    LibraryInstrument.objects.bulk_update(changed, ["nag_reasons"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blowcomotion', '0139_instrumentrentalnagjob'),
+        ('wagtailcore', '0097_baselogentry_uuid_action_timestamp_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='libraryinstrument',
+            name='nag_reasons',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Why "Nag all" would email this renter: \'attendance\' and/or \'patreon\', joined with \'+\'; blank if it wouldn\'t. Kept current by save() and refresh_nag_reasons().', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='libraryinstrument',
+            index=models.Index(fields=['status', 'nag_reasons'], name='blowcomotio_status_67b28e_idx'),
+        ),
+        migrations.RunPython(backfill_nag_reasons, migrations.RunPython.noop),
+    ]
@@ -19,6 +19,8 @@ from blowcomotion.models.instruments import (
     Equipment,
     EquipmentPhoto,
     InstrumentHistoryLog,
+    InstrumentRentalNagJob,
+    InstrumentRentalNagJobItem,
     InstrumentRentalNagLog,
     InstrumentStorageLocation,
     LibraryInstrument,
@@ -39,6 +41,7 @@ from blowcomotion.models.music import (
     SongSoloist,
     SongVideo,
 )
+from blowcomotion.models.outbound_email import OutboundEmail
 from blowcomotion.models.pages import (
     BasePage,
     BlankCanvasPage,
@@ -46,6 +49,8 @@ from blowcomotion.models.pages import (
     WikiIndexPage,
     WikiPage,
 )
+from blowcomotion.models.patreon import PatreonMember
+from blowcomotion.models.scheduler import ScheduledJob
 from blowcomotion.models.submissions import (
     BaseFormSubmission,
     BookingFormSubmission,
@@ -186,6 +186,12 @@ class SiteSettings(BaseSiteSetting):
         ], heading="Attendance Cleanup Notifications", help_text="Configure attendance cleanup settings."),
     ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # attendance_cleanup_days moves the nag cutoff for every current renter
+        from .instruments import LibraryInstrument
+        LibraryInstrument.refresh_nag_reasons()
+
     class Meta:
         permissions = [
             ("access_dev_tools", "Can access developer data dump tools"),
@@ -74,6 +74,17 @@ class CachedGig(models.Model):
         except cls.DoesNotExist:
             return None
 
+    @property
+    def is_public(self):
+        """False for gigs GO3 marks private, hidden from calendar, archived, or trashed."""
+        raw = self.raw_data or {}
+        return not (
+            raw.get('is_private', False)
+            or raw.get('hide_from_calendar', False)
+            or raw.get('is_archived', False)
+            or raw.get('is_in_trash', False)
+        )
+
     def to_api_format(self):
         """Return the gig data in the same format as the API response."""
         return self.raw_data if self.raw_data else {
@@ -44,6 +44,9 @@ class LibraryInstrument(DraftStateMixin, RevisionMixin, LockableMixin, Clusterab
         (STATUS_DISPOSED, "Disposed"),
     ]
 
+    NAG_REASON_ATTENDANCE = "attendance"
+    NAG_REASON_PATREON = "patreon"
+
     instrument = models.ForeignKey(
         "blowcomotion.Instrument",
         on_delete=models.PROTECT,
@@ -125,6 +128,16 @@ class LibraryInstrument(DraftStateMixin, RevisionMixin, LockableMixin, Clusterab
         blank=True,
         help_text="Date the most recent nag email was sent to this renter.",
     )
+    nag_reasons = models.CharField(
+        max_length=20,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=(
+            "Why \"Nag all\" would email this renter: 'attendance' and/or 'patreon', joined "
+            "with '+'; blank if it wouldn't. Kept current by save() and refresh_nag_reasons()."
+        ),
+    )
     storage_location = models.ForeignKey(
         "blowcomotion.InstrumentStorageLocation",
         null=True,
@@ -161,6 +174,9 @@ class LibraryInstrument(DraftStateMixin, RevisionMixin, LockableMixin, Clusterab
 
     class Meta:
         ordering = ["instrument__name", "serial_number"]
+        indexes = [
+            models.Index(fields=["status", "nag_reasons"]),
+        ]
         verbose_name = "Library Instrument"
         verbose_name_plural = "Library Instruments"
 
@@ -184,6 +200,48 @@ class LibraryInstrument(DraftStateMixin, RevisionMixin, LockableMixin, Clusterab
         if not self.member and not self.storage_location:
             raise ValidationError("An instrument must be stored with a member or in a storage location. Please choose one.")
 
+    @staticmethod
+    def nag_attendance_cutoff(today=None):
+        """Renters not seen at rehearsal since this date are nagged (SiteSettings.attendance_cleanup_days)."""
+        from wagtail.models import Site
+
+        from .core import SiteSettings
+
+        site = Site.objects.filter(is_default_site=True).first() or Site.objects.first()
+        cleanup_days = SiteSettings.for_site(site).attendance_cleanup_days if site else 90
+        return (today or datetime.date.today()) - datetime.timedelta(days=cleanup_days)
+
+    def compute_nag_reasons(self, cutoff):
+        """The nag_reasons value for this instrument's current renter, given the attendance cutoff."""
+        member = self.member
+        if self.status != self.STATUS_RENTED or not member:
+            return ""
+        reasons = []
+        if not member.is_active or not member.last_seen or member.last_seen < cutoff:
+            reasons.append(self.NAG_REASON_ATTENDANCE)
+        if not self.patreon_active:
+            reasons.append(self.NAG_REASON_PATREON)
+        return "+".join(reasons)
+
+    @classmethod
+    def refresh_nag_reasons(cls, queryset=None, cutoff=None):
+        """
+        Recompute nag_reasons for ``queryset`` (default: every rented or
+        flagged instrument) and save the rows whose value changed; returns
+        how many did. Attendance reasons age with the calendar, so the
+        refresh_rental_nag_reasons job runs this daily as well.
+        """
+        cutoff = cutoff or cls.nag_attendance_cutoff()
+        if queryset is None:
+            queryset = cls.objects.filter(models.Q(status=cls.STATUS_RENTED) | ~models.Q(nag_reasons=""))
+        changed = []
+        for li in queryset.select_related("member").order_by():
+            reasons = li.compute_nag_reasons(cutoff)
+            if li.nag_reasons != reasons:
+                li.nag_reasons = reasons
+                changed.append(li)
+        cls.objects.bulk_update(changed, ["nag_reasons"], batch_size=500)
+        return len(changed)
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
@@ -191,6 +249,12 @@ class LibraryInstrument(DraftStateMixin, RevisionMixin, LockableMixin, Clusterab
         old_member_id = None
         old_member = None
 
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"status", "member", "member_id", "patreon_active"} & set(update_fields):
+            self.nag_reasons = self.compute_nag_reasons(self.nag_attendance_cutoff())
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "nag_reasons"}
+
         if not is_new:
             old_instance = LibraryInstrument.objects.filter(pk=self.pk).first()
             if old_instance:
@@ -350,6 +414,93 @@ class InstrumentRentalNagLog(models.Model):
         return f"{self.member_name} — {self.sent_at} ({self.reasons})"
 
 
+class InstrumentRentalNagJob(models.Model):
+    """
+    A "Nag all eligible renters" run. The rental dashboard queues one with an
+    item per candidate rental; the process_nag_jobs worker sends the emails
+    (see instruments.nag_jobs) while the dashboard polls its progress.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    requested_by = models.ForeignKey(
+        "auth.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a worker took it; a RUNNING job started long ago belonged to a worker that died.",
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Nag all #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status == self.STATUS_DONE
+
+    def progress(self):
+        """Item counts by status, plus "total" and "processed"."""
+        counts = dict.fromkeys((choice for choice, _ in InstrumentRentalNagJobItem.STATUS_CHOICES), 0)
+        counts.update(self.items.values_list("status").annotate(n=models.Count("id")).order_by())
+        counts["total"] = sum(counts.values())
+        counts["processed"] = counts["total"] - counts["pending"] - counts["sending"]
+        return counts
+
+
+class InstrumentRentalNagJobItem(models.Model):
+    """One rental in an InstrumentRentalNagJob and what happened to its nag email."""
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_SKIPPED = "skipped"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_SKIPPED, "Skipped"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job = models.ForeignKey(InstrumentRentalNagJob, on_delete=models.CASCADE, related_name="items")
+    library_instrument = models.ForeignKey(
+        "blowcomotion.LibraryInstrument",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    member_name = models.CharField(max_length=255)
+    member_email = models.EmailField()
+    reasons = models.CharField(max_length=255, help_text='"attendance", "patreon", or "attendance+patreon"')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    detail = models.TextField(blank=True, help_text="Why it was skipped, or the send error.")
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"{self.member_name} — {self.status}"
+
+
 class InstrumentHistoryLog(models.Model):
     """
     Model for tracking the event history of library instruments.
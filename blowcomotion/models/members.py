@@ -586,6 +586,11 @@ class Member(RevisionMixin, ClusterableModel, index.Indexed):
         # Call parent save
         super().save(*args, **kwargs)
 
+        # Attendance feeds the rental dashboard's nag reasons for whatever this member is renting
+        final_update_fields = kwargs.get('update_fields')
+        if self.renting and (final_update_fields is None or {'is_active', 'last_seen'} & set(final_update_fields)):
+            self.rented_instruments.model.refresh_nag_reasons(self.rented_instruments.all())
+
         # Only query GO3 when sync_go3=True AND sync_relevant_fields=True AND one of these conditions is met:
         # 1. gigomatic_id or gigomatic_username is missing
         # 2. Email changed
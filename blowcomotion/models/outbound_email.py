@@ -0,0 +1,56 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmail(models.Model):
+    """
+    An email waiting to be sent by the send_queued_emails worker (see
+    blowcomotion.mail_queue). Request handlers enqueue here instead of
+    talking to SMTP, so a slow mail server can't stall a request and a
+    worker restart doesn't lose mail. Failed sends are retried with backoff
+    and end up DEAD after MAX_ATTEMPTS. Auth emails have their body blanked
+    once they are SENT or DEAD, so login tokens don't sit in the table.
+    """
+
+    PRIORITY_AUTH = 0
+    PRIORITY_NORMAL = 10
+    PRIORITY_CHOICES = [(PRIORITY_AUTH, "Auth"), (PRIORITY_NORMAL, "Normal")]
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    category = models.CharField(max_length=50, blank=True, help_text="What sent it, e.g. login_link.")
+    priority = models.PositiveSmallIntegerField(choices=PRIORITY_CHOICES, default=PRIORITY_NORMAL)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a worker took it; a SENDING row claimed long ago belonged to a worker that died.",
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "priority", "send_after"]),
+        ]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
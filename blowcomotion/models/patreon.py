@@ -0,0 +1,49 @@
+from django.db import models
+from django.db.models import Max
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+class PatreonMember(models.Model):
+    """
+    Local mirror of the Patreon campaign's member list, keyed by normalized
+    email and refreshed in bulk by the sync_patreon_members command (see
+    instruments.patreon.sync_patreon_members). Membership checks read this
+    table instead of paging through the Patreon API.
+    """
+
+    email = models.EmailField(unique=True, help_text="Lowercased; see normalize_email().")
+    is_active = models.BooleanField(default=False, help_text="patron_status is active_patron")
+    pledge_cents = models.PositiveIntegerField(null=True, blank=True)
+    last_charge_date = models.DateTimeField(null=True, blank=True)
+    last_charge_status = models.CharField(max_length=20, null=True, blank=True)
+    patron_since = models.DateTimeField(null=True, blank=True)
+    lifetime_cents = models.PositiveIntegerField(null=True, blank=True)
+    synced_at = models.DateTimeField(help_text="When the sync that last saw this member ran.")
+
+    class Meta:
+        ordering = ["email"]
+        verbose_name = "Patreon Member"
+        verbose_name_plural = "Patreon Members"
+
+    def __str__(self):
+        return f"{self.email} ({'active' if self.is_active else 'inactive'})"
+
+    def as_status(self):
+        """The membership dict shape returned by instruments.patreon.check_patreon_membership."""
+        return {
+            "is_active": self.is_active,
+            "pledge_cents": self.pledge_cents,
+            "last_charge_date": self.last_charge_date,
+            "last_charge_status": self.last_charge_status,
+            "patron_since": self.patron_since,
+            "lifetime_cents": self.lifetime_cents,
+            "synced_at": self.synced_at,
+        }
+
+    @classmethod
+    def last_synced_at(cls):
+        """When the mirror was last refreshed, or None if it never has been."""
+        return cls.objects.aggregate(latest=Max("synced_at"))["latest"]
@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class ScheduledJob(models.Model):
+    """
+    One row per job in blowcomotion.scheduler.JOBS: when it next runs, the
+    lock a run_scheduler process holds while running it, and how the last
+    run went. Rows are created by the scheduler; the admin "Scheduled Jobs"
+    page shows them.
+    """
+
+    OUTCOME_OK = "ok"
+    OUTCOME_FAILED = "failed"
+    OUTCOME_CHOICES = [(OUTCOME_OK, "OK"), (OUTCOME_FAILED, "Failed")]
+
+    name = models.CharField(max_length=100, unique=True)
+    schedule = models.CharField(max_length=100, blank=True, help_text="Cron expression, in the site's time zone.")
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Set while a scheduler is running the job; a lock past this time is treated as abandoned.",
+    )
+    locked_by = models.CharField(max_length=255, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_duration = models.DurationField(null=True, blank=True)
+    last_outcome = models.CharField(max_length=10, choices=OUTCOME_CHOICES, blank=True)
+    last_output = models.TextField(blank=True, help_text="Tail of the last run's output or traceback.")
+    run_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
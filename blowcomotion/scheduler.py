@@ -0,0 +1,293 @@
+"""
+In-process scheduler for the site's periodic management commands.
+
+``manage.py run_scheduler`` stays resident and runs each job in JOBS on its
+cron schedule via call_command, so a run costs the command itself rather
+than a fresh Django + Wagtail startup. State lives in the ScheduledJob
+table (one row per job), which also makes the scheduler safe to run in more
+than one process:
+
+- a run is claimed with a single conditional UPDATE that takes the job's
+  lock and advances ``next_run_at``, so two schedulers can't both start it;
+- the lock is a lease (``locked_until``): a long run keeps the next
+  occurrence from starting on top of it, and a crashed scheduler's lock
+  simply expires after the job's ``timeout``;
+- a scheduler that was down when a job fell due runs it once on startup
+  (missed occurrences are not replayed).
+
+Jobs are grouped into lanes. Within a lane they run one at a time in
+schedule order, and each lane has its own loop in run_scheduler, so the
+quick every-minute jobs in the "frequent" lane (queued email, including
+login links that expire after 15 minutes, and the auction closer) keep
+running while a long backup or chart sync holds the "default" lane.
+Schedules are standard five-field cron expressions (minute hour
+day-of-month month day-of-week, Sunday = 0) in settings.TIME_ZONE.
+
+Per-job settings can be overridden, and jobs added, in
+settings.SCHEDULED_JOBS, e.g.
+    SCHEDULED_JOBS = {
+        "backup_db": {"schedule": "30 1 * * *"},
+        "sync_charts": {"enabled": False},
+    }
+"""
+import io
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from blowcomotion.models import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60  # seconds a run may hold its lock
+DEFAULT_LANE = "default"
+FREQUENT_LANE = "frequent"
+OUTPUT_LIMIT = 10000  # characters of output kept per run
+
+JOBS = {
+    "close_auction_items": {
+        "schedule": "* * * * *", "command": ["close_auction_items"], "timeout": 10 * 60, "lane": FREQUENT_LANE,
+    },
+    "send_outbid_notices": {
+        "schedule": "* * * * *", "command": ["send_outbid_notices"], "timeout": 10 * 60, "lane": FREQUENT_LANE,
+    },
+    "send_queued_emails": {
+        "schedule": "* * * * *", "command": ["send_queued_emails"], "timeout": 10 * 60, "lane": FREQUENT_LANE,
+    },
+    "process_nag_jobs": {"schedule": "* * * * *", "command": ["process_nag_jobs"], "timeout": 30 * 60},
+    "sync_gigs": {"schedule": "0 * * * *", "command": ["sync_gigs"]},
+    "sync_charts": {"schedule": "30 3 * * *", "command": ["sync_charts"]},
+    "sync_patreon_members": {"schedule": "15 * * * *", "command": ["sync_patreon_members"]},
+    "backup_db": {"schedule": "0 2 * * *", "command": ["backup_db", "--incremental", "--verify"]},
+    "cleanup_attendance_roster": {"schedule": "0 4 * * *", "command": ["cleanup_attendance_roster"]},
+    "refresh_rental_nag_reasons": {"schedule": "30 4 * * *", "command": ["refresh_rental_nag_reasons"]},
+    "send_attendance_report": {"schedule": "0 18 * * 5", "command": ["send_attendance_report"]},
+    "birthday_summary_monthly": {"schedule": "0 9 1 * *", "command": ["send_monthly_birthday_summary"]},
+    "birthday_summary_weekly": {
+        "schedule": "0 9 * * 0",
+        "command": ["send_monthly_birthday_summary", "--days"],
+    },
+}
+
+_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7))
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = int(part)
+            end = high if step != 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"{text!r} is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A five-field cron expression; ``next_after(dt)`` gives the next matching minute."""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} needs 5 fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(text, low, high) for text, (_, low, high) in zip(fields, _FIELDS)
+        )
+        self.weekdays = frozenset(d % 7 for d in weekdays)  # 7 is Sunday too
+        # As in cron, when both day fields are restricted a day matching either runs.
+        self.day_or_weekday = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    def _day_matches(self, dt):
+        day = dt.day in self.days
+        weekday = (dt.weekday() + 1) % 7 in self.weekdays
+        return (day or weekday) if self.day_or_weekday else (day and weekday)
+
+    def next_after(self, dt):
+        local = timezone.localtime(dt).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        give_up = local.year + 5
+        while local.year <= give_up:
+            if local.month not in self.months:
+                local = datetime(local.year + local.month // 12, local.month % 12 + 1, 1)
+            elif not self._day_matches(local):
+                local = datetime(local.year, local.month, local.day) + timedelta(days=1)
+            elif local.hour not in self.hours:
+                local = local.replace(minute=0) + timedelta(hours=1)
+            elif local.minute not in self.minutes:
+                local += timedelta(minutes=1)
+            else:
+                return timezone.make_aware(local)
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+
+def get_jobs():
+    """Enabled jobs with settings overrides applied: {name: config} with a parsed ``cron``."""
+    overrides = getattr(settings, "SCHEDULED_JOBS", {})
+    jobs = {}
+    for name in {**JOBS, **overrides}:
+        config = {
+            "timeout": DEFAULT_TIMEOUT, "enabled": True, "lane": DEFAULT_LANE,
+            **JOBS.get(name, {}), **overrides.get(name, {}),
+        }
+        if config["enabled"]:
+            config["cron"] = CronSchedule(config["schedule"])
+            jobs[name] = config
+    return jobs
+
+
+def sync_jobs(jobs=None, now=None):
+    """Create rows for new jobs and reschedule any whose cron expression changed."""
+    jobs = jobs if jobs is not None else get_jobs()
+    now = now or timezone.now()
+    current = dict(ScheduledJob.objects.filter(name__in=jobs).values_list("name", "schedule"))
+    for name, config in jobs.items():
+        if name not in current:
+            ScheduledJob.objects.get_or_create(
+                name=name,
+                defaults={"schedule": config["schedule"], "next_run_at": config["cron"].next_after(now)},
+            )
+        elif current[name] != config["schedule"]:
+            ScheduledJob.objects.filter(name=name).update(
+                schedule=config["schedule"], next_run_at=config["cron"].next_after(now)
+            )
+    return jobs
+
+
+def _owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(name, config, now, force=False):
+    """
+    Take the job's lock for one run; False if another process holds it (or,
+    unless ``force``, the job isn't due). Advances next_run_at in the same
+    UPDATE, so a due run is claimed exactly once.
+    """
+    rows = ScheduledJob.objects.filter(name=name).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lte=now)
+    )
+    changes = {
+        "locked_until": now + timedelta(seconds=config["timeout"]),
+        "locked_by": _owner(),
+        "last_started_at": now,
+    }
+    if not force:
+        rows = rows.filter(next_run_at__lte=now)
+        changes["next_run_at"] = config["cron"].next_after(now)
+    return rows.update(**changes) == 1
+
+
+def run_job(name, config, force=False):
+    """Run one job if it can be claimed; returns its outcome, or None if it didn't run."""
+    if not claim(name, config, timezone.now(), force=force):
+        return None
+    output = io.StringIO()
+    outcome = ScheduledJob.OUTCOME_FAILED
+    start = time.monotonic()
+    try:
+        call_command(*config["command"], stdout=output, stderr=output)
+        outcome = ScheduledJob.OUTCOME_OK
+    except (Exception, SystemExit):
+        output.write(traceback.format_exc())
+        logger.exception("Scheduled job %s failed", name)
+    finally:
+        # Also runs on Ctrl-C, so a stopped scheduler doesn't leave the lock held.
+        failed = outcome == ScheduledJob.OUTCOME_FAILED
+        ScheduledJob.objects.filter(name=name).update(
+            locked_until=None,
+            locked_by="",
+            last_finished_at=timezone.now(),
+            last_duration=timedelta(seconds=time.monotonic() - start),
+            last_outcome=outcome,
+            last_output=output.getvalue()[-OUTPUT_LIMIT:],
+            run_count=F("run_count") + 1,
+            failure_count=F("failure_count") + int(failed),
+        )
+    return outcome
+
+
+def request_run(name, min_interval=0, now=None):
+    """
+    Make a job due now, so its lane's run_scheduler loop starts it on its
+    next pass (within that loop's max sleep). Request handlers use this
+    instead of running a command themselves. Does nothing if the job is
+    already due, or if it started less than ``min_interval`` seconds ago;
+    returns True if the job was moved up.
+    """
+    now = now or timezone.now()
+    rows = ScheduledJob.objects.filter(name=name, next_run_at__gt=now)
+    if min_interval:
+        rows = rows.filter(
+            Q(last_started_at__isnull=True) | Q(last_started_at__lte=now - timedelta(seconds=min_interval))
+        )
+    return rows.update(next_run_at=now) == 1
+
+
+def lanes(jobs):
+    """Split ``jobs`` by lane: {lane: {name: config}}."""
+    split = {}
+    for name, config in jobs.items():
+        split.setdefault(config["lane"], {})[name] = config
+    return split
+
+
+def run_due_jobs(jobs=None, lane=None):
+    """
+    Run every job that is due (in ``lane``, if given), oldest first; returns
+    [(name, outcome)] for those that ran.
+    """
+    jobs = sync_jobs(jobs)
+    if lane is not None:
+        jobs = lanes(jobs).get(lane, {})
+    due = ScheduledJob.objects.filter(name__in=jobs, next_run_at__lte=timezone.now()).order_by(
+        "next_run_at", "name"
+    )
+    ran = []
+    for name in due.values_list("name", flat=True):
+        outcome = run_job(name, jobs[name])
+        if outcome is not None:
+            ran.append((name, outcome))
+    return ran
+
+
+def seconds_until_next_run(jobs, max_sleep):
+    """Seconds until the next job falls due, between 1 and ``max_sleep``."""
+    next_run = ScheduledJob.objects.filter(name__in=jobs).aggregate(t=Min("next_run_at"))["t"]
+    if next_run is None:
+        return max_sleep
+    return min(max(1.0, (next_run - timezone.now()).total_seconds()), max_sleep)
+
+
+def status_summary():
+    """Every configured job with its last run, for the admin Scheduled Jobs page."""
+    jobs = get_jobs()
+    rows = {row.name: row for row in ScheduledJob.objects.filter(name__in=jobs)}
+    now = timezone.now()
+    summary = []
+    for name, config in sorted(jobs.items()):
+        row = rows.get(name)
+        summary.append({
+            "name": name,
+            "schedule": config["schedule"],
+            "command": " ".join(config["command"]),
+            "job": row,
+            "running": bool(row and row.locked_until and row.locked_until > now),
+        })
+    return summary
@@ -117,6 +117,41 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+#
+# Every web worker and the scheduler must see the same cache (ratelimit
+# counters, cache_namespaces versions, circuit breakers), so "shared" lives on
+# disk rather than in process memory. The file backend's add() and incr() are
+# not atomic across processes, so cache.add() locks and ratelimit counters are
+# best-effort. To keep it in the database instead (a real insert for add(),
+# though incr() is still get-then-set), use
+# django.core.cache.backends.db.DatabaseCache with a table name as LOCATION
+# and run `manage.py createcachetable`. "default" puts a short
+# per-process L1 in front of it (blowcomotion.cache_backends.TieredCache);
+# point "default" straight at the shared backend to turn the L1 off.
+
+CACHES = {
+    "default": {
+        "BACKEND": "blowcomotion.cache_backends.TieredCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"L1_TIMEOUT": 5},
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "cache"),
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+if TESTING:
+    # Per-process and wiped with the test run; the tiering has its own tests.
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Per-namespace overrides of cache_namespaces.DEFAULT_TTLS, in seconds,
+# e.g. {"patreon": 6 * 60 * 60}.
+CACHE_NAMESPACE_TTLS = {}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -182,10 +217,38 @@ AXES_CLIENT_IP_CALLABLE = lambda request: (
 if TESTING:
     AXES_ENABLED = False
 
+# Outbound integrations (GO3, Patreon, reCAPTCHA, Drive, Twilio, oEmbed) go
+# through blowcomotion.integrations.guard(). Per-service overrides, e.g.
+# INTEGRATIONS = {"go3": {"timeout": 5, "failure_threshold": 3}}
+INTEGRATIONS = {}
+# Breaker state lives in the cache and would leak between tests that mock
+# failures; the breaker tests turn it back on explicitly.
+INTEGRATION_BREAKERS_ENABLED = not TESTING
+
 # Session security
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = "Lax"
 MEMBER_IDLE_TIMEOUT = 3600  # seconds (60 minutes); used by MemberIdleLogoutMiddleware
+# last_activity is only re-saved once it is this many seconds old, so rapid
+# requests don't each write the session row.
+MEMBER_IDLE_WRITE_GRANULARITY = 60
+# Requests that never count as member activity (they can still log out an
+# idle member): these path prefixes and, when turned on, htmx polls (elements
+# sending an "X-Poll: true" header, like the auction refreshers) and fetch()
+# calls that only accept JSON. The last two are off by default, so polls and
+# JSON requests keep a member logged in as they always have.
+MEMBER_IDLE_EXEMPT_PATHS = ["/static/", "/media/", "/favicon.ico"]
+MEMBER_IDLE_EXEMPT_HTMX_POLLS = False
+MEMBER_IDLE_EXEMPT_JSON = False
+
+# Auction grid live updates over Server-Sent Events (auction.views.bid_stream).
+# Each viewer holds a worker for up to AUCTION_STREAM_MAX_SECONDS at a time,
+# so this needs async workers (gunicorn's gevent worker class, which means
+# adding gevent to the deploy, or an ASGI server). The Dockerfile and
+# PythonAnywhere run sync workers: leave it off there and the grid polls
+# every 60s instead.
+AUCTION_LIVE_UPDATES = False
+AUCTION_STREAM_MAX_SECONDS = 55
 
 
 # Static files (CSS, JavaScript, Images)
@@ -0,0 +1,100 @@
+/**
+ * Auction live grid
+ *
+ * Opens a Server-Sent Events stream (auction.views.bid_stream) for every
+ * auction grid on the page and patches the affected item card in place as
+ * bids land, instead of re-rendering the whole grid. Anything the patch
+ * can't express (an item closing, an item that isn't on the page yet) falls
+ * back to the grid's normal HTMX refresh.
+ *
+ * Only included when AUCTION_LIVE_UPDATES is on, in which case the grid
+ * doesn't poll.
+ *
+ * Safe to include more than once (HTMX page swaps re-run it): each grid
+ * element gets at most one stream, closed once the element leaves the page.
+ */
+(function () {
+    if (!window.EventSource) {
+        // No streaming here: put back the polling the grid drops when live
+        // updates are on.
+        var polled = document.querySelectorAll('[data-auction-stream]');
+        for (var p = 0; p < polled.length; p++) {
+            polled[p].setAttribute('hx-trigger', 'every 60s, refreshAuction');
+            if (window.htmx) {
+                htmx.process(polled[p]);
+            }
+        }
+        return;
+    }
+
+    function refreshGrid(grid) {
+        if (window.htmx) {
+            htmx.trigger(grid, 'refreshAuction');
+        }
+    }
+
+    function setField(card, field, text) {
+        var el = card.querySelector('[data-field="' + field + '"]');
+        if (el) {
+            el.textContent = text;
+        }
+    }
+
+    function applyBid(grid, state) {
+        var card = grid.querySelector('[data-auction-item="' + state.item + '"]');
+        if (!card) {
+            refreshGrid(grid);
+            return;
+        }
+        if (state.high_bid !== null) {
+            setField(card, 'high-bid', state.high_bid);
+        }
+        setField(card, 'bid-count', state.bid_count + (state.bid_count === 1 ? ' bid' : ' bids'));
+        setField(card, 'closes', state.closes);
+    }
+
+    function connect(grid) {
+        if (grid._auctionStream) {
+            return;
+        }
+        var source = new EventSource(grid.getAttribute('data-auction-stream'));
+        grid._auctionStream = source;
+
+        function stillOnPage() {
+            if (document.body.contains(grid)) {
+                return true;
+            }
+            source.close();
+            return false;
+        }
+
+        source.addEventListener('bid', function (event) {
+            if (stillOnPage()) {
+                applyBid(grid, JSON.parse(event.data));
+            }
+        });
+        source.addEventListener('closed', function () {
+            if (stillOnPage()) {
+                refreshGrid(grid); // moves the item to "Completed" with its winner
+            }
+        });
+        source.addEventListener('error', function () {
+            // EventSource reconnects on its own (resuming from the last event
+            // id); just stop if the grid has gone away.
+            stillOnPage();
+        });
+    }
+
+    function init() {
+        var grids = document.querySelectorAll('[data-auction-stream]');
+        for (var i = 0; i < grids.length; i++) {
+            connect(grids[i]);
+        }
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
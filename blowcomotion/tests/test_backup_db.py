@@ -0,0 +1,175 @@
+"""
+Tests for the database backup subsystem (blowcomotion.backups) and the
+backup_db / restore_db commands.
+"""
+import gzip
+import json
+import sys
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from blowcomotion import backups
+from blowcomotion.backups import (
+    BackupError,
+    create_backup,
+    list_backups,
+    rotate_backups,
+    verify_backup,
+)
+from blowcomotion.models import AdminToolUsage, Instrument, Member
+
+
+class BackupTests(TransactionTestCase):
+    # Not TestCase: SQLite snapshots can't be taken inside a transaction.
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_full_backup_is_a_compressed_sqlite_snapshot(self):
+        Instrument.objects.create(name="Sousaphone")
+        backup = create_backup(self.dir)
+        self.assertFalse(backup.incremental)
+        self.assertTrue(backup.path.name.endswith(".sqlite3.gz"))
+        counts = verify_backup(backup.path)
+        self.assertEqual(counts["blowcomotion_instrument"], 1)
+        self.assertIn("django_migrations", counts)
+
+    def test_incremental_has_only_rows_changed_since_the_last_backup(self):
+        now = timezone.now()
+        create_backup(self.dir, now=now - timedelta(hours=2))
+        old = AdminToolUsage.objects.create(tool="old")
+        AdminToolUsage.objects.filter(pk=old.pk).update(timestamp=now - timedelta(hours=3))
+        AdminToolUsage.objects.create(tool="new")
+        Instrument.objects.create(name="Tuba")  # no timestamp field: dumped in full every time
+
+        backup = create_backup(self.dir, incremental=True, now=now)
+        self.assertTrue(backup.incremental)
+        with gzip.open(backup.path, "rt") as f:
+            objects = json.load(f)
+        self.assertEqual(
+            [o["fields"]["tool"] for o in objects if o["model"] == "blowcomotion.admintoolusage"], ["new"]
+        )
+        self.assertIn(("blowcomotion.instrument", "Tuba"), [(o["model"], o["fields"].get("name")) for o in objects])
+        counts = verify_backup(backup.path)
+        self.assertEqual(counts["blowcomotion.admintoolusage"], 1)
+        self.assertEqual(counts["blowcomotion.instrument"], 1)
+
+    def test_incremental_includes_untimestamped_changes(self):
+        now = timezone.now()
+        member = Member.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+        create_backup(self.dir, now=now - timedelta(hours=2))
+        Member.objects.filter(pk=member.pk).update(bio="Changed after the full backup")
+        incremental = create_backup(self.dir, incremental=True, now=now)
+
+        Member.objects.filter(pk=member.pk).update(bio="")
+        call_command("restore_db", str(incremental.path), interactive=False, stdout=StringIO())
+        self.assertEqual(Member.objects.get(pk=member.pk).bio, "Changed after the full backup")
+
+    def test_incremental_falls_back_to_full(self):
+        now = timezone.now()
+        self.assertFalse(create_backup(self.dir, incremental=True, now=now - timedelta(days=8)).incremental)
+        self.assertFalse(create_backup(self.dir, incremental=True, now=now).incremental)  # last full is 8 days old
+        self.assertTrue(create_backup(self.dir, incremental=True, now=now + timedelta(days=1)).incremental)
+
+    def test_rotation_deletes_old_sets_with_their_incrementals(self):
+        now = timezone.now()
+        created = [
+            create_backup(self.dir, incremental=incremental, now=now + timedelta(days=days))
+            for days, incremental in ((0, False), (1, True), (2, False), (3, True), (4, False))
+        ]
+        (self.dir / "backup_2020-01-01_000000.sqlite3.gz.part").touch()
+
+        deleted = rotate_backups(self.dir, keep=2)
+        self.assertEqual([b.path for b in deleted], [b.path for b in created[:2]])
+        self.assertEqual([b.kind for b in list_backups(self.dir)], ["full", "incremental", "full"])
+
+    def test_verify_rejects_truncated_and_corrupt_backups(self):
+        backup = create_backup(self.dir)
+        data = backup.path.read_bytes()
+        backup.path.write_bytes(data[: len(data) // 2])
+        with self.assertRaisesMessage(BackupError, "not a complete gzip file"):
+            verify_backup(backup.path)
+
+        backup.path.write_bytes(gzip.compress(b"not a database" * 100))
+        with self.assertRaises(BackupError):
+            verify_backup(backup.path)
+
+        fixture = self.dir / "backup_2026-01-01_000000.incr.json.gz"
+        fixture.write_bytes(gzip.compress(b'[{"model": "blowcomotion.nope", "pk": 1, "fields": {}}]'))
+        with self.assertRaisesMessage(BackupError, "could not be loaded"):
+            verify_backup(fixture)
+
+    def test_backup_command(self):
+        out = StringIO()
+        call_command("backup_db", output_dir=str(self.dir), incremental=True, verify=True, stdout=out)
+        self.assertIn("Backup complete (full)", out.getvalue())
+        self.assertIn("Verified backup_", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("backup_db", output_dir=str(self.dir), keep=0, stdout=out)
+
+    def test_restore_dry_run_verifies_the_chain(self):
+        now = timezone.now()
+        create_backup(self.dir, now=now - timedelta(hours=2))
+        AdminToolUsage.objects.create(tool="new")
+        incremental = create_backup(self.dir, incremental=True, now=now)
+
+        out = StringIO()
+        call_command("restore_db", str(self.dir), dry_run=True, stdout=out)
+        output = out.getvalue()
+        self.assertIn("full: backup_", output)
+        self.assertIn(f"incremental: {incremental.path.name}", output)
+        self.assertIn("Dry run: 2 backup(s) verified, nothing restored", output)
+
+        incremental.path.write_bytes(b"garbage")
+        with self.assertRaises(CommandError):
+            call_command("restore_db", str(incremental.path), dry_run=True, stdout=out)
+
+    def test_incremental_without_full_cannot_be_restored(self):
+        path = self.dir / "backup_2026-01-01_000000.incr.json.gz"
+        path.write_bytes(gzip.compress(b"[]"))
+        with self.assertRaisesMessage(BackupError, "No full backup before"):
+            backups.backup_chain(path)
+
+    def test_snapshot_refuses_to_run_inside_a_transaction(self):
+        with transaction.atomic(), self.assertRaisesMessage(BackupError, "inside a transaction"):
+            create_backup(self.dir)
+        self.assertEqual(list_backups(self.dir), [])
+
+    def test_restore_full_and_incremental(self):
+        now = timezone.now()
+        Instrument.objects.create(name="Trombone")
+        create_backup(self.dir, now=now - timedelta(hours=2))
+        AdminToolUsage.objects.create(tool="after full")
+        incremental = create_backup(self.dir, incremental=True, now=now)
+
+        Instrument.objects.all().delete()
+        AdminToolUsage.objects.all().delete()
+        call_command("restore_db", str(incremental.path), interactive=False, stdout=StringIO())
+
+        self.assertTrue(Instrument.objects.filter(name="Trombone").exists())
+        self.assertTrue(AdminToolUsage.objects.filter(tool="after full").exists())
+
+    def test_mysqldump_with_noisy_stderr_does_not_stall(self):
+        script = (
+            "import sys; sys.stderr.write('warning\\n' * 50000); "
+            "print('INSERT INTO `t` VALUES (1);'); print('-- Dump completed'); sys.exit(int(sys.argv[1]))"
+        )
+        path = self.dir / "backup_2026-01-01_000000.sql.gz"
+        with patch.object(backups, "_mysql_command", return_value=([sys.executable, "-c", script, "0"], {})):
+            backups._write_mysqldump(path)
+        self.assertEqual(verify_backup(path), {"t": 1})
+
+        with patch.object(backups, "_mysql_command", return_value=([sys.executable, "-c", script, "2"], {})), \
+                self.assertRaisesMessage(BackupError, "mysqldump failed: warning"):
+            backups._write_mysqldump(path)
@@ -0,0 +1,98 @@
+"""
+Tests for the pooled bulk-mail helper (blowcomotion.bulk_mail) and the
+senders that use it.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from blowcomotion import bulk_mail
+from blowcomotion.bulk_mail import BulkMailer, send_bulk
+from blowcomotion.models import Member
+from members.auth import _MemberEmail
+
+FLAKY_BACKEND = "blowcomotion.tests.test_bulk_mail.FlakyBackend"
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that counts connections and refuses any address starting with "bad"."""
+
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.startswith("bad") for address in message.recipients()):
+                raise OSError("550 mailbox unavailable")
+        return super().send_messages(messages)
+
+
+def message(to, subject="Hello"):
+    return EmailMessage(subject, "Body", "from@example.com", [to])
+
+
+@override_settings(EMAIL_BACKEND=FLAKY_BACKEND, BULK_MAIL_BATCH_DELAY=0)
+class BulkMailerTests(SimpleTestCase):
+    def setUp(self):
+        FlakyBackend.opened = 0
+
+    def test_batches_share_a_connection_and_pause_between_them(self):
+        with patch.object(bulk_mail.time, "sleep") as sleep:
+            report = send_bulk([message(f"m{n}@example.com") for n in range(5)], batch_size=2, delay=0.5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(FlakyBackend.opened, 3)  # 2 + 2 + 1
+        self.assertEqual(report.connections_opened, 3)
+        self.assertEqual(sleep.call_count, 2)
+        sleep.assert_called_with(0.5)
+
+    def test_reports_each_recipient_and_carries_on_after_a_failure(self):
+        multi = EmailMessage("Team", "Body", "from@example.com", ["a@example.com", "b@example.com"])
+        report = send_bulk([multi, message("bad@example.com", "Oops"), message("c@example.com")])
+
+        self.assertEqual([r.recipient for r in report.sent], ["a@example.com", "b@example.com", "c@example.com"])
+        self.assertEqual([(r.recipient, r.error) for r in report.failed], [("bad@example.com", "550 mailbox unavailable")])
+        self.assertIn("FAILED: bad@example.com — Oops (550 mailbox unavailable)", report.report_lines())
+        self.assertEqual(FlakyBackend.opened, 2)  # reconnected after the failure
+
+    def test_send_reraises_and_nothing_opens_if_nothing_is_sent(self):
+        with BulkMailer() as mailer, self.assertRaises(OSError):
+            mailer.send(message("bad@example.com"))
+        self.assertEqual(len(mailer.failed), 1)
+
+        with BulkMailer() as mailer:
+            pass
+        self.assertEqual(mailer.connections_opened, 0)
+
+    @override_settings(FORM_TEST_EMAIL="copy@example.com")
+    def test_member_email_copy_uses_the_shared_connection(self):
+        send_bulk([_MemberEmail(subject="Hi", body="Body", from_email="from@example.com", to=[f"m{n}@example.com"])
+                   for n in range(3)])
+        self.assertEqual(len(mail.outbox), 6)
+        self.assertEqual(FlakyBackend.opened, 1)
+
+
+@override_settings(EMAIL_BACKEND=FLAKY_BACKEND, BULK_MAIL_BATCH_DELAY=0)
+class BulkSendersTests(TestCase):
+    def setUp(self):
+        FlakyBackend.opened = 0
+
+    def test_invite_members_uses_one_connection(self):
+        for n in range(3):
+            Member.objects.create(first_name="Test", last_name=f"M{n}", email=f"invite{n}@example.com")
+        Member.objects.create(first_name="Test", last_name="Bad", email="bad@example.com")
+
+        out, err = StringIO(), StringIO()
+        call_command("invite_members", stdout=out, stderr=err)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertLessEqual(FlakyBackend.opened, 2)  # one, plus a fresh one if the failure wasn't last
+        self.assertIn("Invited: 3 | Skipped: 0 | Errored: 1", out.getvalue())
+        self.assertIsNone(Member.objects.get(user__email="bad@example.com").invite_sent_at)
@@ -0,0 +1,174 @@
+"""
+Tests for the namespaced, versioned cache helpers, the tiered cache backend
+(blowcomotion.cache_backends) and the Cache Stats admin page.
+"""
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from blowcomotion import cache_namespaces
+
+User = get_user_model()
+
+
+class CacheNamespaceTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_set_and_get_round_trip(self):
+        cache_namespaces.set(cache_namespaces.GIGS, "upcoming_public_gigs", ["gig"], 60)
+        self.assertEqual(
+            cache_namespaces.get(cache_namespaces.GIGS, "upcoming_public_gigs"), ["gig"]
+        )
+
+    def test_same_key_in_different_namespaces_is_isolated(self):
+        cache_namespaces.set(cache_namespaces.GIGS, "shared", "gigs", 60)
+        cache_namespaces.set(cache_namespaces.PATREON, "shared", "patreon", 60)
+        self.assertEqual(cache_namespaces.get(cache_namespaces.GIGS, "shared"), "gigs")
+        self.assertEqual(cache_namespaces.get(cache_namespaces.PATREON, "shared"), "patreon")
+
+    def test_invalidate_drops_only_that_namespace(self):
+        cache_namespaces.set(cache_namespaces.GIGS, "gigs_for_date_2027-07-15", {"gigs": []}, 60)
+        cache_namespaces.set(cache_namespaces.PATREON, "member_patreon_status:a@example.com", {}, 60)
+        cache.set("rl:some-ratelimit-counter", 3, 60)
+
+        cache_namespaces.invalidate(cache_namespaces.GIGS)
+
+        self.assertIsNone(cache_namespaces.get(cache_namespaces.GIGS, "gigs_for_date_2027-07-15"))
+        self.assertEqual(
+            cache_namespaces.get(cache_namespaces.PATREON, "member_patreon_status:a@example.com"), {}
+        )
+        self.assertEqual(cache.get("rl:some-ratelimit-counter"), 3)
+
+    def test_invalidate_bumps_version(self):
+        before = cache_namespaces.get_version(cache_namespaces.CHARTS)
+        after = cache_namespaces.invalidate(cache_namespaces.CHARTS)
+        self.assertGreater(after, before)
+        self.assertEqual(cache_namespaces.get_version(cache_namespaces.CHARTS), after)
+
+    def test_invalidate_without_existing_version_key(self):
+        version = cache_namespaces.invalidate(cache_namespaces.MENUS)
+        self.assertEqual(cache_namespaces.get_version(cache_namespaces.MENUS), version)
+
+    def test_unknown_namespace_rejected(self):
+        with self.assertRaises(ValueError):
+            cache_namespaces.make_key("nope", "key")
+
+    @override_settings(CACHE_NAMESPACE_TTLS={"patreon": 5})
+    def test_set_defaults_to_the_namespace_ttl(self):
+        with patch.object(cache, "set") as cache_set:
+            cache_namespaces.set(cache_namespaces.GIGS, "a", 1)
+            cache_namespaces.set(cache_namespaces.PATREON, "b", 2)
+            cache_namespaces.set(cache_namespaces.PATREON, "c", 3, 60)
+        self.assertEqual([c.args[2] for c in cache_set.call_args_list], [600, 5, 60])
+
+    def test_hits_and_misses_are_counted_per_namespace(self):
+        cache_namespaces.reset_stats()
+        cache_namespaces.set(cache_namespaces.GIGS, "a", 0)
+        cache_namespaces.get(cache_namespaces.GIGS, "a")
+        cache_namespaces.get(cache_namespaces.GIGS, "a")
+        cache_namespaces.get(cache_namespaces.GIGS, "missing")
+        cache_namespaces.get(cache_namespaces.PATREON, "missing")
+
+        stats = {s["namespace"]: s for s in cache_namespaces.stats_summary()}
+        self.assertEqual((stats["gigs"]["hits"], stats["gigs"]["misses"], stats["gigs"]["hit_ratio"]), (2, 1, 66.7))
+        self.assertEqual((stats["patreon"]["hits"], stats["patreon"]["misses"]), (0, 1))
+        self.assertIsNone(stats["charts"]["hit_ratio"])
+        # Totals live in the shared cache, so other workers see them too.
+        self.assertEqual(cache.get("cache_namespace_stats:gigs:hits"), 2)
+
+        cache_namespaces.reset_stats()
+        self.assertEqual(cache_namespaces.stats_summary()[0]["lookups"], 0)
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        caches_setting = {
+            "default": {
+                "BACKEND": "blowcomotion.cache_backends.TieredCache",
+                "LOCATION": "shared",
+                "OPTIONS": {"L1_TIMEOUT": 5},
+            },
+            "shared": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory.name,
+            },
+        }
+        override = override_settings(CACHES=caches_setting)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.tiered, self.shared = caches["default"], caches["shared"]
+        self.addCleanup(self.tiered.l1.clear)
+
+    def test_writes_reach_the_shared_tier(self):
+        self.tiered.set("k", "v", 60)
+        self.assertEqual(self.shared.get("k"), "v")
+        self.assertEqual(self.tiered.get("k"), "v")
+
+    def test_reads_are_served_from_l1_until_it_expires(self):
+        self.shared.set("k", "from another worker", 60)
+        self.assertEqual(self.tiered.get("k"), "from another worker")
+        self.shared.set("k", "changed", 60)
+        self.assertEqual(self.tiered.get("k"), "from another worker")  # within L1_TIMEOUT
+        self.tiered.l1.clear()  # as if L1_TIMEOUT had passed
+        self.assertEqual(self.tiered.get("k"), "changed")
+
+    def test_counters_and_locks_bypass_l1(self):
+        self.assertTrue(self.tiered.add("lock", 1, 60))
+        self.assertFalse(self.tiered.add("lock", 1, 60))
+
+        self.tiered.set("count", 1, 60)
+        self.shared.incr("count")  # another worker
+        self.assertEqual(self.tiered.incr("count"), 3)
+        self.assertEqual(self.tiered.get("count"), 3)
+
+    def test_namespace_invalidation_is_shared(self):
+        cache_namespaces.set(cache_namespaces.GIGS, "upcoming_public_gigs", ["gig"])
+        cache_namespaces.invalidate(cache_namespaces.GIGS)
+        self.tiered.l1.clear()
+        self.assertIsNone(cache_namespaces.get(cache_namespaces.GIGS, "upcoming_public_gigs"))
+        self.assertIsNotNone(self.shared.get("cache_namespace_version:gigs"))
+
+
+class CacheStatsViewTests(TestCase):
+    url = "/admin/cache-stats/"
+
+    def setUp(self):
+        cache.clear()
+        cache_namespaces.reset_stats()
+        self.dev = User.objects.create_user(username="dev", password="testpass")
+        self.dev.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+            Permission.objects.get(codename="access_dev_tools", content_type__app_label="blowcomotion"),
+        )
+        self.editor = User.objects.create_user(username="editor", password="testpass")
+        self.editor.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+        )
+
+    def test_requires_dev_tools_permission(self):
+        self.client.login(username="editor", password="testpass")
+        self.assertNotEqual(self.client.get(self.url).status_code, 200)
+
+    def test_shows_hit_ratios_and_invalidates(self):
+        cache_namespaces.set(cache_namespaces.CHARTS, "a", 1)
+        cache_namespaces.get(cache_namespaces.CHARTS, "a")
+        cache_namespaces.get(cache_namespaces.CHARTS, "b")
+        self.client.login(username="dev", password="testpass")
+        response = self.client.get(self.url)
+        self.assertContains(response, "50.0%")
+        self.assertContains(response, "LocMemCache")
+
+        version = cache_namespaces.get_version(cache_namespaces.CHARTS)
+        response = self.client.post(self.url, {"invalidate": "charts"})
+        self.assertRedirects(response, self.url)
+        self.assertGreater(cache_namespaces.get_version(cache_namespaces.CHARTS), version)
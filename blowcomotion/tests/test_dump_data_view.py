@@ -2,13 +2,35 @@
 Unit tests for admin dump_data view.
 """
 
+import gzip
 import json
+from io import StringIO
 
 from django.contrib.auth.models import Permission, User
+from django.core import serializers
+from django.core.management import call_command
 from django.test import Client, TestCase
 from django.urls import reverse
+from django.utils import timezone
 
-from blowcomotion.models import Instrument, Member, Section
+from blowcomotion.data_dump import EXCLUDE
+from blowcomotion.models import (
+    Instrument,
+    InstrumentRentalNagJob,
+    InstrumentRentalNagJobItem,
+    LibraryInstrument,
+    Member,
+    PatreonMember,
+    ScheduledJob,
+    Section,
+)
+
+
+def read_dump(response):
+    content = b"".join(response.streaming_content)
+    if response["Content-Type"] == "application/gzip":
+        content = gzip.decompress(content)
+    return json.loads(content)
 
 
 class DumpDataViewTests(TestCase):
@@ -163,7 +185,7 @@ class DumpDataViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'application/json')
         
-        data = json.loads(response.content)
+        data = read_dump(response)
         
         # Find member records in the dump
         member_records = [item for item in data if item.get('model') == 'blowcomotion.member']
@@ -207,7 +229,7 @@ class DumpDataViewTests(TestCase):
         response = self.client.get(reverse('dump_data') + '?include_real_data=true')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
+        data = read_dump(response)
         
         # Find member records in the dump
         member_records = [item for item in data if item.get('model') == 'blowcomotion.member']
@@ -233,12 +255,43 @@ class DumpDataViewTests(TestCase):
         self.assertNotIn('auth.user', dumped_models)
         self.assertNotIn('blowcomotion.sitesettings', dumped_models)
 
+    def test_patron_emails_are_never_dumped(self):
+        """The Patreon mirror (patron emails) is left out of both dump modes"""
+        PatreonMember.objects.create(email='patron@example.com', is_active=True, synced_at=timezone.now())
+        self.client.login(username='admin', password='testpass123')
+        for query in ('', '?include_real_data=true'):
+            data = read_dump(self.client.get(reverse('dump_data') + query))
+            self.assertNotIn('blowcomotion.patreonmember', {item['model'] for item in data})
+            self.assertNotIn('patron@example.com', json.dumps(data))
+
+    def test_job_tables_are_not_dumped_and_dump_loads_without_users(self):
+        """Nag jobs and scheduler state stay out, and the dump loads without the requesting admin"""
+        job = InstrumentRentalNagJob.objects.create(requested_by=self.superuser)
+        InstrumentRentalNagJobItem.objects.create(
+            job=job,
+            library_instrument=LibraryInstrument.objects.create(instrument=self.instrument, serial_number='SN1'),
+            member_name='John Doe',
+            member_email='renter@example.com',
+            reasons='attendance',
+        )
+        ScheduledJob.objects.create(name='sync_gigs', last_output='Traceback: secret-token')
+        self.client.login(username='admin', password='testpass123')
+        content = b''.join(self.client.get(reverse('dump_data')).streaming_content)
+        dumped_models = {item['model'] for item in json.loads(content)}
+        for label in ('instrumentrentalnagjob', 'instrumentrentalnagjobitem', 'scheduledjob'):
+            self.assertNotIn(f'blowcomotion.{label}', dumped_models)
+        self.assertNotIn(b'renter@example.com', content)
+        self.assertNotIn(b'secret-token', content)
+
+        self.superuser.delete()  # as in a database that never had this admin
+        self.assertTrue(list(serializers.deserialize('json', content)))
+
     def test_fake_members_after_dependencies(self):
         """Test that dumpdata orders member records after instrument records (FK dependency ordering)"""
         self.client.login(username='admin', password='testpass123')
         response = self.client.get(reverse('dump_data'))
         
-        data = json.loads(response.content)
+        data = read_dump(response)
         
         # Find indices
         instrument_indices = [i for i, item in enumerate(data) if item.get('model') == 'blowcomotion.instrument']
@@ -262,8 +315,8 @@ class DumpDataViewTests(TestCase):
         response1 = self.client.get(reverse('dump_data'))
         response2 = self.client.get(reverse('dump_data'))
         
-        data1 = json.loads(response1.content)
-        data2 = json.loads(response2.content)
+        data1 = read_dump(response1)
+        data2 = read_dump(response2)
         
         # Extract member records
         members1 = [item for item in data1 if item.get('model') == 'blowcomotion.member']
@@ -284,7 +337,7 @@ class DumpDataViewTests(TestCase):
         self.client.login(username='admin', password='testpass123')
         response = self.client.get(reverse('dump_data'))
         
-        data = json.loads(response.content)
+        data = read_dump(response)
         member_records = [item for item in data if item.get('model') == 'blowcomotion.member']
         
         if member_records:
@@ -313,10 +366,10 @@ class DumpDataViewTests(TestCase):
         response = self.client.get(reverse('dump_data'))
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.content)
+        data = read_dump(response)
         
         # Check that any user FK fields in the dump are nulled
-        user_fk_field_names = {'uploaded_by_user', 'user', 'locked_by', 'owner'}
+        user_fk_field_names = {'uploaded_by_user', 'user', 'locked_by', 'owner', 'requested_by'}
         for item in data:
             fields = item.get('fields', {})
             for field_name in user_fk_field_names:
@@ -325,3 +378,29 @@ class DumpDataViewTests(TestCase):
                         fields[field_name],
                         f"User FK field '{field_name}' in {item.get('model')} should be null"
                     )
+
+    def test_streams_same_objects_as_dumpdata(self):
+        """The streamed dump has dumpdata's objects in dumpdata's order"""
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('dump_data') + '?include_real_data=true')
+        self.assertTrue(response.streaming)
+        streamed = [(item['model'], item['pk']) for item in read_dump(response)]
+
+        args = ['--natural-foreign']
+        for label in EXCLUDE:
+            args += ['-e', label]
+        output = StringIO()
+        call_command('dumpdata', *args, stdout=output)
+        expected = [(item['model'], item['pk']) for item in json.loads(output.getvalue())]
+        self.assertEqual(streamed, expected)
+
+    def test_gzip_download(self):
+        """?compress=gzip streams a .json.gz fixture with the same scrubbed content"""
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('dump_data') + '?include_real_data=false&compress=gzip')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="dump_data_.*\.json\.gz"')
+        self.assertIn('no-store', response['Cache-Control'])
+        data = read_dump(response)
+        members = [item for item in data if item['model'] == 'blowcomotion.member']
+        self.assertEqual([m['fields']['phone'] for m in members], ['555-0001', None])
@@ -0,0 +1,66 @@
+"""
+Tests for EventsBlock gig resolution via GigoGigChooserBlock.
+"""
+import datetime
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from blowcomotion.blocks import EventsBlock
+from blowcomotion.chooser_blocks import GigoGigChooserBlock
+from blowcomotion.models import CachedGig
+
+
+def _events_value(gig_ids):
+    return {
+        'scroller_title': 'Upcoming',
+        'gigo_gigs': [
+            {'type': 'item', 'value': {'details': gig_id, 'event_scroller_image': None}, 'id': f'item-{gig_id}'}
+            for gig_id in gig_ids
+        ],
+        'events': [],
+    }
+
+
+@patch('blowcomotion.chooser_viewsets.request_background_sync')
+@patch('requests.get', side_effect=AssertionError('GO3 must not be called while rendering'))
+class EventsBlockGigResolutionTests(TestCase):
+    def setUp(self):
+        for gig_id in (1, 2, 3):
+            CachedGig.objects.create(
+                gig_id=gig_id,
+                title=f'Gig {gig_id}',
+                date=datetime.date(2027, 7, gig_id),
+                gig_status='confirmed',
+                band='Blowcomotion',
+            )
+
+    def test_all_gigs_resolved_in_one_query(self, mock_get, mock_sync):
+        block = EventsBlock()
+        with self.assertNumQueries(1):
+            value = block.to_python(_events_value([1, 2, 3]))
+        details = [item['details'] for item in value['gigo_gigs']]
+        self.assertEqual([gig.title for gig in details], ['Gig 1', 'Gig 2', 'Gig 3'])
+        self.assertEqual(details[0].date, '2027-07-01')
+        mock_sync.assert_not_called()
+
+    def test_missing_gig_renders_placeholder_and_requests_sync(self, mock_get, mock_sync):
+        block = EventsBlock()
+        value = block.to_python(_events_value([1, 99]))
+        missing = value['gigo_gigs'][1]['details']
+        self.assertTrue(missing.is_placeholder)
+        self.assertEqual(missing.pk, 99)
+        mock_sync.assert_called_once_with()
+
+        html = block.render(value)
+        self.assertIn('Gig 1', html)
+        self.assertIn('Details coming soon', html)
+
+    def test_placeholder_keeps_gig_id_when_saved(self, mock_get, mock_sync):
+        chooser = GigoGigChooserBlock()
+        placeholder = chooser.to_python(99)
+        self.assertEqual(chooser.get_prep_value(placeholder), 99)
+
+    def test_empty_value_stays_none(self, mock_get, mock_sync):
+        self.assertIsNone(GigoGigChooserBlock().to_python(None))
+        mock_sync.assert_not_called()
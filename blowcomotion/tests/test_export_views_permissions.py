@@ -1,8 +1,6 @@
 """
 Unit tests for CSV export view permission gates.
 """
-from unittest.mock import patch
-
 from django.contrib.auth.models import Permission, User
 from django.test import Client, TestCase
 from django.urls import reverse
@@ -42,29 +40,19 @@ class ExportViewsPermissionTests(TestCase):
             response = self.client.get(reverse(url_name))
             self.assertEqual(response.status_code, 403, url_name)
 
-    @patch('attendance.views.call_command')
-    @patch('blowcomotion.views.call_command')
-    def test_data_analyst_allowed(self, mock_call_command, mock_attendance_call_command):
-        mock_call_command.return_value = None
-        mock_attendance_call_command.return_value = None
+    def test_data_analyst_allowed(self):
         user = User.objects.create_user(username='analyst', password='pw', is_staff=True)
         user.user_permissions.add(self.analyst_perm)
         if self.admin_perm:
             user.user_permissions.add(self.admin_perm)
         self.client.login(username='analyst', password='pw')
         for url_name in EXPORT_URL_NAMES:
-            with patch('builtins.open', create=True) as mock_open:
-                mock_open.return_value.__enter__.return_value.read.return_value = b'csv,data'
-                response = self.client.get(reverse(url_name))
+            response = self.client.get(reverse(url_name))
             self.assertEqual(response.status_code, 200, url_name)
 
     def test_superuser_allowed(self):
         User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
         self.client.login(username='admin', password='pw')
         for url_name in EXPORT_URL_NAMES:
-            with patch('blowcomotion.views.call_command'), \
-                 patch('attendance.views.call_command'), \
-                 patch('builtins.open', create=True) as mock_open:
-                mock_open.return_value.__enter__.return_value.read.return_value = b'csv,data'
-                response = self.client.get(reverse(url_name))
+            response = self.client.get(reverse(url_name))
             self.assertEqual(response.status_code, 200, url_name)
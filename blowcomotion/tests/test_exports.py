@@ -0,0 +1,72 @@
+"""
+Tests for the shared streaming CSV export layer (blowcomotion.exports) and
+the admin export views built on it.
+"""
+import csv
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+
+from blowcomotion.exports import serialize, streaming_csv_response
+from blowcomotion.models import AttendanceRecord, Instrument, Member, MemberInstrument
+from members.exports import member_rows
+
+
+def read_csv(response):
+    return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+
+
+class StreamingCSVTests(TestCase):
+    def test_rows_are_streamed_one_line_at_a_time(self):
+        response = streaming_csv_response(iter([["a", "b"], [1, None], ["x,y", date(2026, 1, 2)]]), "things")
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertRegex(response["Content-Disposition"], r'attachment; filename="things_\d{8}-\d{6}\.csv"')
+        chunks = list(response.streaming_content)
+        self.assertEqual(chunks, [b"a,b\r\n", b"1,\r\n", b'"x,y",2026-01-02\r\n'])
+
+    def test_serialize(self):
+        self.assertEqual(
+            [serialize(v) for v in (None, True, False, date(2026, 1, 2), ["a", "b"], 3)],
+            ["", "YES", "NO", "2026-01-02", "a; b", "3"],
+        )
+
+    def test_member_rows_query_count_does_not_grow_with_members(self):
+        trumpet = Instrument.objects.create(name="Trumpet")
+        for n in range(5):
+            member = Member.objects.create(first_name=f"M{n}", last_name="Player", primary_instrument=trumpet)
+            MemberInstrument.objects.create(member=member, instrument=trumpet)
+        with self.assertNumQueries(2):  # members with user/instrument, then their additional instruments
+            rows = list(member_rows(include_extra=True))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][-2:], ["Trumpet", "Trumpet"])
+
+
+class ExportViewStreamingTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(username="admin", email="admin@example.com", password="pw")
+        self.client.login(username="admin", password="pw")
+        member = Member.objects.create(first_name="Ada", last_name="Lovelace")
+        AttendanceRecord.objects.create(date=date(2026, 3, 1), member=member)
+        AttendanceRecord.objects.create(date=date(2026, 3, 8), guest_name="Guest")
+
+    def test_attendance_export_streams_filtered_rows(self):
+        response = self.client.get(reverse("export_attendance"), {"start_date": "2026-03-05"})
+        self.assertTrue(response.streaming)
+        rows = read_csv(response)
+        self.assertEqual(rows[0][:2], ["date", "member_id"])
+        self.assertEqual([row[0] for row in rows[1:]], ["2026-03-08"])
+        self.assertEqual(rows[1][13], "Guest")
+
+    def test_attendance_export_rejects_bad_dates(self):
+        response = self.client.get(reverse("export_attendance"), {"end_date": "March 1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("YYYY-MM-DD", response.json()["error"])
+
+    def test_member_export_streams_extra_columns(self):
+        rows = read_csv(self.client.get(reverse("export_members")))
+        self.assertEqual(rows[0][-2:], ["primary_instrument_name", "additional_instruments"])
+        self.assertEqual(len(rows), 2)
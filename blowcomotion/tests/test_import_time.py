@@ -0,0 +1,69 @@
+"""
+Startup guard: booting a WSGI worker (settings, apps and the URLconf) or
+running `manage.py check` must not import the optional integration SDKs.
+Those load on first use (auction.notifications, auction.sms,
+charts.drive_sync, populate_audio_durations) so that processes which never
+send an SMS or touch Drive don't pay for them.
+
+Each check runs a fresh interpreter under `python -X importtime`, so a
+failure lists which of our modules pulled the SDK in and how long it took.
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+LAZY_SDKS = ("twilio", "googleapiclient", "httplib2", "mutagen")
+
+BOOT_WORKER = (
+    "import blowcomotion.wsgi\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+
+
+def import_times(args):
+    """Run ``python -X importtime <args>``; return [(depth, module, cumulative µs)] in import order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode:
+        raise AssertionError(f"{' '.join(args)} failed:\n{result.stdout}\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+    return rows
+
+
+class ImportTimeTests(SimpleTestCase):
+    def assertNoLazySDKs(self, rows):
+        def is_sdk(name):
+            return name.split(".")[0] in LAZY_SDKS
+
+        # importtime prints children before their parent, so a module's
+        # importer is the next line that is one level shallower.
+        culprits = []
+        for index, (depth, name, us) in enumerate(rows):
+            if not is_sdk(name):
+                continue
+            importer = next((n for d, n, _ in rows[index + 1:] if d < depth), "?")
+            if not is_sdk(importer):
+                culprits.append(f"{name} ({us / 1000:.1f}ms) imported by {importer}")
+        if culprits:
+            self.fail("Optional SDKs loaded at startup: " + "; ".join(culprits))
+
+    def test_worker_boot_skips_optional_sdks(self):
+        self.assertNoLazySDKs(import_times(["-c", BOOT_WORKER]))
+
+    def test_manage_check_skips_optional_sdks(self):
+        self.assertNoLazySDKs(import_times(["manage.py", "check"]))
@@ -0,0 +1,244 @@
+"""
+Tests for the outbound-integration circuit breaker and its admin status page.
+"""
+from unittest.mock import MagicMock, patch
+
+import requests
+from wagtail.embeds.exceptions import (
+    EmbedException,
+    EmbedNotFoundException,
+    EmbedUnsupportedProviderException,
+)
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from blowcomotion import integrations
+
+User = get_user_model()
+
+BREAKER_SETTINGS = {
+    "INTEGRATION_BREAKERS_ENABLED": True,
+    "INTEGRATIONS": {"patreon": {"failure_threshold": 2, "reset_timeout": 30}},
+}
+
+
+def _fail(service="patreon", exc=None):
+    try:
+        with integrations.guard(service):
+            raise exc or requests.exceptions.ConnectionError("down")
+    except requests.exceptions.RequestException:
+        pass
+
+
+@override_settings(**BREAKER_SETTINGS)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_guard_yields_configured_timeout(self):
+        with integrations.guard("patreon") as timeout:
+            self.assertEqual(timeout, 10)
+        with override_settings(INTEGRATIONS={"patreon": {"timeout": 3}}):
+            with integrations.guard("patreon") as timeout:
+                self.assertEqual(timeout, 3)
+
+    def test_unknown_service_raises(self):
+        with self.assertRaises(ValueError):
+            with integrations.guard("myspace"):
+                pass
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        _fail()
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.CLOSED)
+        _fail()
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.OPEN)
+
+        ran = False
+        with self.assertRaises(integrations.CircuitOpenError):
+            with integrations.guard("patreon"):
+                ran = True
+        self.assertFalse(ran)
+
+    def test_success_resets_failure_count(self):
+        _fail()
+        with integrations.guard("patreon"):
+            pass
+        _fail()
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.CLOSED)
+
+    def test_client_errors_do_not_trip_breaker(self):
+        response = MagicMock(status_code=404)
+        for _ in range(3):
+            _fail(exc=requests.exceptions.HTTPError(response=response))
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.CLOSED)
+
+    def test_rate_limit_trips_breaker(self):
+        response = MagicMock(status_code=429)
+        for _ in range(2):
+            _fail(exc=requests.exceptions.HTTPError(response=response))
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.OPEN)
+
+    @override_settings(INTEGRATIONS={"oembed": {"failure_threshold": 2}})
+    def test_bad_embed_urls_do_not_trip_breaker(self):
+        not_found = EmbedNotFoundException("Request failed: 404")
+        not_found.__cause__ = requests.exceptions.HTTPError(response=MagicMock(status_code=404))
+        for exc in (EmbedUnsupportedProviderException(), EmbedNotFoundException("Missing 'type'"), not_found) * 2:
+            try:
+                with integrations.guard("oembed"):
+                    raise exc
+            except EmbedException:
+                pass
+        self.assertEqual(integrations.get_state("oembed")["state"], integrations.CLOSED)
+
+    @override_settings(INTEGRATIONS={"oembed": {"failure_threshold": 2}})
+    def test_embed_provider_outage_trips_breaker(self):
+        for _ in range(2):
+            try:
+                with integrations.guard("oembed"):
+                    try:
+                        raise requests.exceptions.ConnectionError("down")
+                    except requests.exceptions.RequestException as e:
+                        raise EmbedNotFoundException(f"Request failed: {e}") from e
+            except EmbedException:
+                pass
+        self.assertEqual(integrations.get_state("oembed")["state"], integrations.OPEN)
+
+    def test_half_open_probe_success_closes(self):
+        _fail()
+        _fail()
+        with patch("blowcomotion.integrations.time.time", return_value=10**10):
+            with integrations.guard("patreon"):
+                self.assertEqual(integrations.get_state("patreon")["state"], integrations.HALF_OPEN)
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.CLOSED)
+
+    def test_half_open_allows_single_probe(self):
+        _fail()
+        _fail()
+        with patch("blowcomotion.integrations.time.time", return_value=10**10):
+            with integrations.guard("patreon"):
+                # A concurrent caller during the probe still fails fast
+                with self.assertRaises(integrations.CircuitOpenError):
+                    with integrations.guard("patreon"):
+                        pass
+
+    def test_half_open_probe_failure_reopens(self):
+        _fail()
+        _fail()
+        with patch("blowcomotion.integrations.time.time", return_value=10**10):
+            _fail()
+            state = integrations.get_state("patreon")
+        self.assertEqual(state["state"], integrations.OPEN)
+        self.assertEqual(state["opened_at"], 10**10)
+
+    def test_reset_closes_circuit(self):
+        _fail()
+        _fail()
+        integrations.reset("patreon")
+        with integrations.guard("patreon"):
+            pass
+
+    def test_status_summary_reports_latency_and_state(self):
+        _fail()
+        _fail()
+        row = next(r for r in integrations.status_summary() if r["service"] == "patreon")
+        self.assertEqual(row["state"], integrations.OPEN)
+        self.assertEqual(row["calls"], 2)
+        self.assertEqual(row["errors"], 2)
+        self.assertIsNotNone(row["median_ms"])
+        self.assertIsNotNone(row["retry_in"])
+
+    @override_settings(INTEGRATION_BREAKERS_ENABLED=False)
+    def test_disabled_breaker_never_opens(self):
+        for _ in range(5):
+            _fail()
+        with integrations.guard("patreon") as timeout:
+            self.assertEqual(timeout, 10)
+
+
+@override_settings(**BREAKER_SETTINGS, PATREON_ACCESS_TOKEN="tok", PATREON_CAMPAIGN_ID="1")
+class PatreonCircuitTests(TestCase):  # check_patreon_membership reads the (empty) mirror first
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch("instruments.patreon.requests.get")
+    def test_open_circuit_skips_patreon_request(self, mock_get):
+        from instruments.patreon import check_patreon_membership
+
+        mock_get.side_effect = requests.exceptions.ConnectionError("down")
+        self.assertIsNone(check_patreon_membership("a@example.com"))
+        self.assertIsNone(check_patreon_membership("a@example.com"))
+        self.assertEqual(mock_get.call_count, 2)
+
+        self.assertIsNone(check_patreon_membership("a@example.com"))
+        self.assertEqual(mock_get.call_count, 2)
+
+
+@override_settings(
+    INTEGRATION_BREAKERS_ENABLED=True,
+    INTEGRATIONS={"go3": {"failure_threshold": 1}},
+    GIGO_API_URL="https://go3.example.com/api",
+    GIGO_API_KEY="key",
+)
+class GigoCircuitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    @patch("gigs.gigo.requests.get")
+    def test_open_circuit_returns_none_without_request(self, mock_get):
+        from gigs.gigo import make_gigo_api_request
+
+        mock_get.side_effect = requests.exceptions.Timeout("slow")
+        self.assertIsNone(make_gigo_api_request("/gigs", retries=2))
+        # The first failure opens the circuit, so the retries never go out
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], 10)
+
+
+class IntegrationStatusViewTests(TestCase):
+    url = "/admin/integrations/"
+
+    def setUp(self):
+        cache.clear()
+        self.dev = User.objects.create_user(username="dev", password="testpass")
+        self.dev.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+            Permission.objects.get(codename="access_dev_tools", content_type__app_label="blowcomotion"),
+        )
+        self.editor = User.objects.create_user(username="editor", password="testpass")
+        self.editor.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_requires_dev_tools_permission(self):
+        self.client.login(username="editor", password="testpass")
+        self.assertNotEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(**BREAKER_SETTINGS)
+    def test_lists_services_and_resets_open_circuit(self):
+        _fail()
+        _fail()
+        self.client.login(username="dev", password="testpass")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Patreon")
+        self.assertContains(response, "Gig-O-Matic (GO3)")
+        self.assertContains(response, 'value="patreon"')
+
+        response = self.client.post(self.url, {"reset": "patreon"})
+        self.assertRedirects(response, self.url)
+        self.assertEqual(integrations.get_state("patreon")["state"], integrations.CLOSED)
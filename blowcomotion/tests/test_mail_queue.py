@@ -0,0 +1,130 @@
+"""
+Tests for the durable outbound email queue (blowcomotion.mail_queue) and
+the send_queued_emails worker.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from blowcomotion import mail_queue
+from blowcomotion.models import Member, OutboundEmail
+from blowcomotion.tests.test_bulk_mail import FLAKY_BACKEND
+from members.auth import send_login_link_email, send_member_signup_welcome_email
+
+Q = OutboundEmail
+
+
+def queue(to, priority=Q.PRIORITY_NORMAL, subject="Hello"):
+    return mail_queue.enqueue(EmailMessage(subject, "Body", "from@example.com", [to]), priority=priority)
+
+
+@override_settings(EMAIL_BACKEND=FLAKY_BACKEND, BULK_MAIL_BATCH_DELAY=0)
+class MailQueueTests(TestCase):
+    def test_enqueue_does_not_send_until_the_worker_runs(self):
+        email = queue("a@example.com")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(email.status, Q.STATUS_PENDING)
+
+        self.assertEqual(mail_queue.deliver_queued(), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ["a@example.com"])
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (Q.STATUS_SENT, 1))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(mail_queue.deliver_queued(), (0, 0))
+
+    def test_auth_emails_jump_the_queue(self):
+        for n in range(3):
+            queue(f"bulk{n}@example.com")
+        queue("login@example.com", priority=Q.PRIORITY_AUTH)
+        mail_queue.deliver_queued(limit=2, workers=1)
+        self.assertEqual([m.to[0] for m in mail.outbox], ["login@example.com", "bulk0@example.com"])
+
+    def test_pool_sends_every_claimed_email_once(self):
+        for n in range(7):
+            queue(f"m{n}@example.com")
+        self.assertEqual(mail_queue.deliver_queued(workers=3), (7, 0))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), sorted(f"m{n}@example.com" for n in range(7)))
+        self.assertFalse(Q.objects.exclude(status=Q.STATUS_SENT).exists())
+
+    def test_failures_back_off_then_dead_letter(self):
+        email = queue("bad@example.com")
+        self.assertEqual(mail_queue.deliver_queued(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (Q.STATUS_PENDING, 1))
+        self.assertIn("550", email.last_error)
+        self.assertGreater(email.send_after, timezone.now() + timedelta(seconds=90))
+        self.assertEqual(mail_queue.deliver_queued(), (0, 0))  # not due yet
+
+        Q.objects.filter(pk=email.pk).update(attempts=mail_queue.MAX_ATTEMPTS - 1, send_after=timezone.now())
+        mail_queue.deliver_queued()
+        email.refresh_from_db()
+        self.assertEqual(email.status, Q.STATUS_DEAD)
+
+        self.assertEqual(mail_queue.retry_dead(), 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (Q.STATUS_PENDING, 0))
+
+    def test_emails_abandoned_mid_send_are_requeued(self):
+        email = queue("a@example.com")
+        Q.objects.filter(pk=email.pk).update(status=Q.STATUS_SENDING, claimed_at=timezone.now() - timedelta(hours=1))
+        fresh = queue("b@example.com")
+        Q.objects.filter(pk=fresh.pk).update(status=Q.STATUS_SENDING, claimed_at=timezone.now())
+
+        self.assertEqual(mail_queue.requeue_stale(), 1)
+        self.assertEqual(mail_queue.deliver_queued(), (1, 0))
+        self.assertEqual(Q.objects.get(pk=fresh.pk).status, Q.STATUS_SENDING)
+
+    def test_worker_command(self):
+        queue("a@example.com")
+        queue("bad@example.com")
+        old = queue("old@example.com")
+        mail_queue.deliver_queued(ids=[old.pk])
+        Q.objects.filter(pk=old.pk).update(sent_at=timezone.now() - timedelta(days=31))
+
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+        self.assertIn("sent 1 email(s), 1 failed", out.getvalue())
+        self.assertFalse(Q.objects.filter(pk=old.pk).exists())  # pruned
+
+    def test_member_auth_emails_are_queued_first(self):
+        member = Member.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+        queue("bulk@example.com")
+        send_login_link_email(member, "https://example.com")
+        send_member_signup_welcome_email(member, "https://example.com", background=True)
+        self.assertEqual(len(mail.outbox), 0)
+
+        queued = Q.objects.order_by("priority", "pk")
+        self.assertEqual(
+            [(e.category, e.priority) for e in queued],
+            [("login_link", Q.PRIORITY_AUTH), ("signup_welcome", Q.PRIORITY_AUTH), ("", Q.PRIORITY_NORMAL)],
+        )
+        mail_queue.deliver_queued(workers=1)
+        self.assertEqual(mail.outbox[0].subject, "Your Blowcomotion login link")
+
+
+class AuthEmailTests(TestCase):
+    def test_auth_body_is_blanked_once_sent(self):
+        auth = queue("a@example.com", priority=Q.PRIORITY_AUTH)
+        normal = queue("b@example.com")
+        mail_queue.deliver_queued()
+        self.assertEqual(mail.outbox[0].body, "Body")
+        auth.refresh_from_db()
+        normal.refresh_from_db()
+        self.assertEqual(auth.status, Q.STATUS_SENT)
+        self.assertEqual(auth.body, "")
+        self.assertEqual(normal.body, "Body")
+
+    @override_settings(EMAIL_BACKEND=FLAKY_BACKEND, BULK_MAIL_BATCH_DELAY=0)
+    def test_dead_auth_email_is_blanked_and_not_retried(self):
+        auth = queue("bad-auth@example.com", priority=Q.PRIORITY_AUTH)
+        Q.objects.filter(pk=auth.pk).update(attempts=mail_queue.MAX_ATTEMPTS - 1)
+        mail_queue.deliver_queued()
+        auth.refresh_from_db()
+        self.assertEqual(auth.status, Q.STATUS_DEAD)
+        self.assertEqual(auth.body, "")
+        self.assertEqual(mail_queue.retry_dead(), 0)
@@ -0,0 +1,238 @@
+"""
+Tests for the resident job scheduler (blowcomotion.scheduler, run_scheduler)
+and its admin status page.
+"""
+import threading
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from blowcomotion import scheduler
+from blowcomotion.management.commands.run_scheduler import (
+    Command as RunSchedulerCommand,
+)
+from blowcomotion.models import ScheduledJob
+from blowcomotion.scheduler import CronSchedule
+
+User = get_user_model()
+
+TEST_JOBS = {
+    "tick": {"schedule": "*/5 * * * *", "command": ["tick"]},
+    "nightly": {"schedule": "0 2 * * *", "command": ["nightly", "--flag"]},
+}
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CronScheduleTests(SimpleTestCase):
+    def test_next_matching_minute(self):
+        self.assertEqual(CronSchedule("0 * * * *").next_after(local(2026, 3, 4, 10, 0)), local(2026, 3, 4, 11, 0))
+        self.assertEqual(CronSchedule("*/15 * * * *").next_after(local(2026, 3, 4, 10, 7, 30)), local(2026, 3, 4, 10, 15))
+        self.assertEqual(CronSchedule("0 9 1 * *").next_after(local(2026, 12, 1, 9, 0)), local(2027, 1, 1, 9, 0))
+
+    def test_weekday_and_day_fields(self):
+        # 2026-03-04 is a Wednesday; Sunday is 0 (or 7).
+        self.assertEqual(CronSchedule("0 9 * * 0").next_after(local(2026, 3, 4, 12, 0)), local(2026, 3, 8, 9, 0))
+        self.assertEqual(CronSchedule("0 9 * * 7").next_after(local(2026, 3, 4, 12, 0)), local(2026, 3, 8, 9, 0))
+        # Both restricted: either one matching is enough, as in cron.
+        self.assertEqual(CronSchedule("0 9 6 * 0").next_after(local(2026, 3, 4, 12, 0)), local(2026, 3, 6, 9, 0))
+
+    def test_invalid_expressions(self):
+        for expression in ("* * * *", "60 * * * *", "0 9 30 2 *", "*/0 * * * *", "a * * * *"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                CronSchedule(expression).next_after(local(2026, 3, 4, 12, 0))
+
+
+class RunJobsTests(TestCase):
+    def setUp(self):
+        patcher = patch.object(scheduler, "JOBS", TEST_JOBS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(scheduler, "call_command")
+        self.call = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.jobs = scheduler.sync_jobs()
+
+    def make_due(self, name, **changes):
+        ScheduledJob.objects.filter(name=name).update(
+            next_run_at=timezone.now() - timedelta(seconds=1), **changes
+        )
+
+    def test_sync_creates_rows_and_follows_schedule_changes(self):
+        tick = ScheduledJob.objects.get(name="tick")
+        self.assertGreater(tick.next_run_at, timezone.now())
+        with override_settings(SCHEDULED_JOBS={"tick": {"schedule": "0 3 * * *"}, "nightly": {"enabled": False}}):
+            jobs = scheduler.sync_jobs()
+        self.assertEqual(list(jobs), ["tick"])
+        tick.refresh_from_db()
+        self.assertEqual(tick.schedule, "0 3 * * *")
+        self.assertEqual(timezone.localtime(tick.next_run_at).hour, 3)
+
+    def test_runs_due_jobs_only_and_records_the_run(self):
+        self.make_due("nightly")
+        self.call.side_effect = lambda *args, stdout, stderr: stdout.write("backed up")
+
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [("nightly", "ok")])
+        self.call.assert_called_once()
+        self.assertEqual(self.call.call_args.args, ("nightly", "--flag"))
+
+        job = ScheduledJob.objects.get(name="nightly")
+        self.assertEqual(job.last_outcome, ScheduledJob.OUTCOME_OK)
+        self.assertEqual(job.last_output, "backed up")
+        self.assertEqual((job.run_count, job.failure_count), (1, 0))
+        self.assertIsNotNone(job.last_duration)
+        self.assertIsNone(job.locked_until)
+        self.assertGreater(job.next_run_at, timezone.now())
+
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [])  # not due again yet
+
+    def test_failure_is_recorded_and_releases_the_lock(self):
+        self.make_due("tick")
+        self.call.side_effect = CommandError("GO3 is down")
+
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [("tick", "failed")])
+        job = ScheduledJob.objects.get(name="tick")
+        self.assertEqual((job.run_count, job.failure_count), (1, 1))
+        self.assertIn("GO3 is down", job.last_output)
+        self.assertIsNone(job.locked_until)
+
+    def test_locked_job_is_skipped_until_the_lease_expires(self):
+        self.make_due("tick", locked_until=timezone.now() + timedelta(minutes=5), locked_by="other:1")
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [])
+        self.call.assert_not_called()
+
+        self.make_due("tick", locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [("tick", "ok")])
+
+    def test_forced_run_ignores_the_schedule(self):
+        before = ScheduledJob.objects.get(name="nightly").next_run_at
+        self.assertEqual(scheduler.run_job("nightly", self.jobs["nightly"], force=True), "ok")
+        self.assertEqual(ScheduledJob.objects.get(name="nightly").next_run_at, before)
+
+    def test_command_runs_one_job(self):
+        out = StringIO()
+        call_command("run_scheduler", job="tick", stdout=out)
+        self.assertIn("tick: ok", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("run_scheduler", job="nope", stdout=out)
+
+        ScheduledJob.objects.filter(name="tick").update(locked_until=timezone.now() + timedelta(minutes=1))
+        with self.assertRaisesMessage(CommandError, "already running"):
+            call_command("run_scheduler", job="tick", stdout=out)
+
+    def test_requested_run_happens_on_the_next_pass(self):
+        self.assertTrue(scheduler.request_run("nightly", min_interval=600))
+        self.assertFalse(scheduler.request_run("nightly", min_interval=600))  # already due
+        self.assertEqual(scheduler.run_due_jobs(self.jobs), [("nightly", "ok")])
+        self.assertGreater(ScheduledJob.objects.get(name="nightly").next_run_at, timezone.now())
+        # Just ran, so another request inside min_interval is ignored.
+        self.assertFalse(scheduler.request_run("nightly", min_interval=600))
+        self.assertTrue(scheduler.request_run("nightly"))
+        self.assertFalse(scheduler.request_run("nope"))
+
+    def test_sleeps_until_the_next_job(self):
+        ScheduledJob.objects.update(next_run_at=timezone.now() + timedelta(seconds=30))
+        self.assertAlmostEqual(scheduler.seconds_until_next_run(self.jobs, 60), 30, delta=1)
+        self.assertEqual(scheduler.seconds_until_next_run(self.jobs, 10), 10)
+        self.make_due("tick")
+        self.assertEqual(scheduler.seconds_until_next_run(self.jobs, 60), 1)
+
+
+LANE_JOBS = {
+    "tick": {"schedule": "* * * * *", "command": ["tick"], "lane": scheduler.FREQUENT_LANE},
+    "nightly": {"schedule": "0 2 * * *", "command": ["nightly"]},
+}
+
+
+class SchedulerLaneTests(TransactionTestCase):
+    def setUp(self):
+        patcher = patch.object(scheduler, "JOBS", LANE_JOBS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        scheduler.sync_jobs()
+
+    def test_each_lane_gets_its_own_loop(self):
+        started = []
+        with patch.object(RunSchedulerCommand, "_run_lane", lambda command, lane, max_sleep: started.append(lane)):
+            call_command("run_scheduler", stdout=StringIO())
+        self.assertEqual(sorted(started), [scheduler.DEFAULT_LANE, scheduler.FREQUENT_LANE])
+
+    def test_long_job_does_not_hold_up_the_frequent_lane(self):
+        nightly_started, release_nightly, ticked = threading.Event(), threading.Event(), threading.Event()
+
+        def fake_call(name, *args, stdout, stderr):
+            if name == "nightly":
+                nightly_started.set()
+                release_nightly.wait(10)
+            else:
+                ticked.set()
+
+        ScheduledJob.objects.update(next_run_at=timezone.now() - timedelta(seconds=1))
+        command = RunSchedulerCommand(stdout=StringIO(), stderr=StringIO())
+        command.stopping = threading.Event()
+        threads = [
+            threading.Thread(target=command._run_lane, args=(lane, 0.1))
+            for lane in (scheduler.DEFAULT_LANE, scheduler.FREQUENT_LANE)
+        ]
+        with patch.object(scheduler, "call_command", side_effect=fake_call):
+            threads[0].start()
+            try:
+                self.assertTrue(nightly_started.wait(5))
+                threads[1].start()
+                self.assertTrue(ticked.wait(5), "tick waited for nightly to finish")
+                self.assertIsNotNone(ScheduledJob.objects.get(name="nightly").locked_until)  # still running
+            finally:
+                release_nightly.set()
+                command.stopping.set()
+                for thread in threads:
+                    if thread.ident:  # started
+                        thread.join(10)
+        self.assertEqual(ScheduledJob.objects.get(name="nightly").last_outcome, ScheduledJob.OUTCOME_OK)
+        self.assertEqual(ScheduledJob.objects.get(name="tick").last_outcome, ScheduledJob.OUTCOME_OK)
+
+
+class ScheduledJobsViewTests(TestCase):
+    url = "/admin/scheduled-jobs/"
+
+    def setUp(self):
+        patcher = patch.object(scheduler, "JOBS", TEST_JOBS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        scheduler.sync_jobs()
+        self.dev = User.objects.create_user(username="dev", password="testpass")
+        self.dev.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+            Permission.objects.get(codename="access_dev_tools", content_type__app_label="blowcomotion"),
+        )
+        self.editor = User.objects.create_user(username="editor", password="testpass")
+        self.editor.user_permissions.add(
+            Permission.objects.get(codename="access_admin", content_type__app_label="wagtailadmin"),
+        )
+
+    def test_requires_dev_tools_permission(self):
+        self.client.login(username="editor", password="testpass")
+        self.assertNotEqual(self.client.get(self.url).status_code, 200)
+
+    def test_lists_jobs_and_runs_one_now(self):
+        ScheduledJob.objects.filter(name="nightly").update(
+            last_outcome=ScheduledJob.OUTCOME_FAILED, last_output="Traceback: boom", run_count=3, failure_count=1
+        )
+        self.client.login(username="dev", password="testpass")
+        response = self.client.get(self.url)
+        self.assertContains(response, "nightly --flag")
+        self.assertContains(response, "*/5 * * * *")
+        self.assertContains(response, "Traceback: boom")
+        self.assertContains(response, "3 (1)")
+
+        response = self.client.post(self.url, {"run": "nightly"})
+        self.assertRedirects(response, self.url)
+        self.assertLessEqual(ScheduledJob.objects.get(name="nightly").next_run_at, timezone.now())
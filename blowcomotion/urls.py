@@ -27,6 +27,8 @@ urlpatterns = [
 
     path("charts/", include("charts.urls")),
 
+    path("gigs/", include("gigs.urls")),
+
     path("instrument-rental/", include("instruments.urls")),
 
     path("member/", include("members.urls")),
@@ -2,20 +2,19 @@ import json
 import logging
 from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
-from io import StringIO
 
 import requests
 
 from django.conf import settings
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
-from django.core.management import call_command
 from django.db.models import Count
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import render
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from blowcomotion import cache_namespaces, data_dump, integrations, scheduler
 from blowcomotion.models import (
     AdminToolUsage,
     BookingFormSubmission,
@@ -24,6 +23,7 @@ from blowcomotion.models import (
     FeedbackFormSubmission,
     JoinBandFormSubmission,
     Member,
+    ScheduledJob,
     SiteSettings,
 )
 from members.auth import (
@@ -75,16 +75,17 @@ def _validate_recaptcha(request):
     
     # Verify the token with Google's reCAPTCHA API
     try:
-        response = requests.post(
-            'https://www.google.com/recaptcha/api/siteverify',
-            data={
-                'secret': settings.RECAPTCHA_PRIVATE_KEY,
-                'response': recaptcha_token,
-                'remoteip': request.META.get('REMOTE_ADDR'),
-            },
-            timeout=10,
-        )
-        response.raise_for_status()
+        with integrations.guard("recaptcha") as timeout:
+            response = requests.post(
+                'https://www.google.com/recaptcha/api/siteverify',
+                data={
+                    'secret': settings.RECAPTCHA_PRIVATE_KEY,
+                    'response': recaptcha_token,
+                    'remoteip': request.META.get('REMOTE_ADDR'),
+                },
+                timeout=timeout,
+            )
+            response.raise_for_status()
         
         try:
             result = response.json()
@@ -118,6 +119,9 @@ def _validate_recaptcha(request):
         logger.debug(f"reCAPTCHA validation successful (score: {score})")
         return True, None
         
+    except integrations.CircuitOpenError:
+        logger.error("reCAPTCHA circuit open - rejecting form submission")
+        return False, "reCAPTCHA verification failed. Please try again."
     except requests.RequestException as e:
         logger.error(f"reCAPTCHA API request failed: {e}")
         # On API failure, fail closed for security
@@ -127,8 +131,8 @@ def _validate_recaptcha(request):
 def _send_form_email(subject, message, recipient_list):
     """Send email for form submission.
 
-    Sent from a background thread (see _dispatch_email) so a slow SMTP
-    server can't stall the form-submission response.
+    Queued for the send_queued_emails worker (see _dispatch_email) so a slow
+    SMTP server can't stall the form-submission response.
     """
     email_message = _MemberEmail(
         subject=subject, body=message, from_email=settings.FROM_EMAIL, to=recipient_list
@@ -453,25 +457,11 @@ def _process_form_submission(request, form_type, form_data, submission_model):
 
 
 def dump_data(request):
-    # Create an in-memory string buffer to capture the output
-    output = StringIO()
-    
-    # Base arguments for `dumpdata`
-    # Always exclude auth users and site settings (may contain credentials and other sensitive data)
-    base_args = [
-        '--natural-foreign', '--indent', '2',
-        '-e', 'contenttypes', '-e', 'auth.permission',
-        '-e', 'wagtailcore.groupcollectionpermission', '-e', 'wagtailcore.grouppagepermission', '-e', 'wagtailcore.referenceindex',
-        '-e', 'sessions', '-e', 'wagtailsearch', '-e', 'wagtailcore.pagelogentry', '-e', 'wagtailcore.revision', '-e', 'wagtailcore.taskstate', '-e', 'wagtailcore.workflowstate', '-e', 'wagtailcore.comment',
-        '-e', 'auth.user',
-        '-e', 'admin.logentry', '-e', 'axes.accesslog',
-        '-e', 'wagtailcore.modellogentry', '-e', 'wagtailcore.pagesubscription',
-        '-e', 'wagtailadmin.editingsession', '-e', 'wagtailadmin.formstate',
-        '-e', 'wagtailusers.userprofile',
-    ]
-    
-    args = base_args
-
+    """
+    Stream a loaddata-compatible JSON dump of the database (see
+    blowcomotion.data_dump). Member details are scrubbed unless real data is
+    included; ?compress=gzip sends it as a .json.gz download instead.
+    """
     has_dev_access = request.user.has_perm('blowcomotion.access_dev_tools')
     has_analyst_access = request.user.has_perm('blowcomotion.access_real_data_exports')
 
@@ -492,104 +482,26 @@ def dump_data(request):
         logger.warning(f"Unauthorized include_real_data access attempt to dump_data by user {request.user.username}")
         return JsonResponse({'error': 'You do not have permission to access real member data'}, status=403)
 
-    try:
-        logger.info(f"Starting data dump by user {request.user.username} (include_real_data={include_real_data})")
-        # Use call_command to execute `dumpdata` and capture the output in the StringIO buffer
-        call_command('dumpdata', *args, stdout=output)
-
-        # Get the content of the buffer and parse it as JSON
-        output_content = output.getvalue()
-        data = json.loads(output_content)
-
-        # Replace all latest_revision and live_revision fields with null to avoid issues when loading data into a different database
-        for item in data:
-            if 'fields' in item:
-                if 'latest_revision' in item['fields']:
-                    item['fields']['latest_revision'] = None
-                if 'live_revision' in item['fields']:
-                    item['fields']['live_revision'] = None
-
-        # Clear user FKs that would otherwise reference excluded `auth.user` records
-        # (e.g. wagtailimages.Image.uploaded_by_user, LibraryInstrument.locked_by, InstrumentHistoryLog.user)
-        user_fk_field_names = {'uploaded_by_user', 'user', 'locked_by', 'owner'}
-        # Optional FileFields serialized as "" instead of null cause DeserializationError on load
-        empty_string_file_fields = {'thumbnail', 'avatar'}
-        for item in data:
-            fields = item.get('fields')
-            if not fields:
-                continue
-            for field_name in user_fk_field_names:
-                if field_name in fields:
-                    fields[field_name] = None
-            for field_name in empty_string_file_fields:
-                if fields.get(field_name) == '':
-                    fields[field_name] = None
-
-        # Scrub member data in-place if not including real data
-        # This preserves Django's dependency ordering while scrubbing sensitive information
-        if not include_real_data:
-            # Build a mapping of member PKs to sequential indices for consistent fake data
-            member_pks = sorted([item['pk'] for item in data if item.get('model') == 'blowcomotion.member'])
-            member_pk_to_index = {pk: idx + 1 for idx, pk in enumerate(member_pks)}
-            
-            scrubbed_count = 0
-            # Scrub member records in-place
-            for item in data:
-                if item.get('model') == 'blowcomotion.member':
-                    member_pk = item['pk']
-                    idx = member_pk_to_index[member_pk]
-                    fields = item['fields']
-                    
-                    # Scrub sensitive fields while preserving structure and non-sensitive data
-                    # (first_name / last_name / email live on auth.user, which is
-                    # excluded from the dump and has its FK nulled above)
-                    fields['preferred_name'] = f'Preferred{idx}' if fields.get('preferred_name') else None
-                    fields['phone'] = f'555-{idx:04d}' if fields.get('phone') else None
-                    fields['address'] = f'{idx} Main Street' if fields.get('address') else None
-                    fields['city'] = 'Austin' if fields.get('city') else None
-                    fields['state'] = 'TX' if fields.get('state') else None
-                    fields['zip_code'] = f'{idx:05d}' if fields.get('zip_code') else None
-                    fields['country'] = 'USA' if fields.get('country') else None
-                    fields['emergency_contact'] = f'Emergency Contact {idx}' if fields.get('emergency_contact') else None
-                    fields['inspired_by'] = 'Scrubbed for privacy' if fields.get('inspired_by') else None
-                    fields['bio'] = 'Scrubbed for privacy' if fields.get('bio') else None
-                    fields['notes'] = 'Scrubbed for privacy' if fields.get('notes') else None
-                    # Scrub GigoGig integration identifiers and member photos
-                    fields['gigomatic_username'] = None
-                    fields['gigomatic_id'] = None
-                    fields['image'] = None
-                    
-                    scrubbed_count += 1
-            
-            logger.info(f'Scrubbed {scrubbed_count} member records in data dump')
-
-        # Always scrub SiteSettings sensitive fields regardless of include_real_data
-        sitesettings_recipients = {
-            'contact_form_email_recipients', 'join_band_form_email_recipients',
-            'booking_form_email_recipients', 'feedback_form_email_recipients',
-            'donate_form_email_recipients', 'birthday_summary_email_recipients',
-            'instrument_rental_notification_recipients',
-            'attendance_report_notification_recipients',
-            'member_signup_notification_recipients',
-        }
-        for item in data:
-            if item.get('model') == 'blowcomotion.sitesettings':
-                fields = item.get('fields', {})
-                for field in sitesettings_recipients:
-                    if field in fields:
-                        fields[field] = 'local@example.com'
-
-        logger.info(f"Data dump completed successfully by user {request.user.username}")
-        # Return the data as a JSON response with pretty formatting
-        # Mark as non-cacheable to prevent sensitive data from being stored by browsers/proxies
-        response = JsonResponse(data, safe=False, json_dumps_params={'indent': 2})
-        response['Cache-Control'] = 'no-store'
-        return response
+    username = request.user.username
+    logger.info(f"Starting data dump by user {username} (include_real_data={include_real_data})")
 
-    except Exception as e:
-        logger.error(f"Error during data dump by user {request.user.username}: {str(e)}")
-        # If something goes wrong, return an error message
-        return JsonResponse({'error': str(e)}, status=500)
+    def stream():
+        try:
+            yield from data_dump.dump_json(include_real_data=include_real_data)
+        except Exception:
+            # The response has already started, so the download is cut short.
+            logger.exception(f"Error during data dump by user {username}")
+            raise
+        logger.info(f"Data dump completed successfully by user {username}")
+
+    if request.GET.get('compress') == 'gzip':
+        response = StreamingHttpResponse(data_dump.gzip_chunks(stream()), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="dump_data_{timezone.now():%Y%m%d-%H%M%S}.json.gz"'
+    else:
+        response = StreamingHttpResponse(stream(), content_type='application/json')
+    # Mark as non-cacheable to prevent sensitive data from being stored by browsers/proxies
+    response['Cache-Control'] = 'no-store'
+    return response
 
 
 def process_form(request):
@@ -771,13 +683,16 @@ def fetch_embed_data(request):
     
     try:
         # Use Wagtail's embed system to fetch metadata
-        embed = get_embed(url)
+        with integrations.guard("oembed"):
+            embed = get_embed(url)
         return JsonResponse({
             'title': embed.title,
             'thumbnail_url': embed.thumbnail_url,
             'author_name': embed.author_name,
             'provider_name': embed.provider_name,
         })
+    except integrations.CircuitOpenError:
+        return JsonResponse({'error': 'Video provider is temporarily unavailable'}, status=503)
     except EmbedException as e:
         logger.warning(f"Failed to fetch embed data for URL {url}: {e}")
         return JsonResponse({'error': f'Unable to fetch embed data: {str(e)}'}, status=400)
@@ -904,3 +819,81 @@ def admin_tool_usage_dashboard(request):
             'top_actions': top_actions,
         },
     )
+
+
+@permission_required('blowcomotion.access_dev_tools', raise_exception=True)
+@require_http_methods(["GET", "POST"])
+def integration_status(request):
+    """
+    Wagtail admin panel showing each outbound integration's circuit breaker
+    state and recent latencies (see blowcomotion.integrations). POSTing a
+    service name forces that circuit closed.
+    """
+    from django.contrib import messages
+
+    if request.method == 'POST':
+        service = request.POST.get('reset', '')
+        if service in integrations.SERVICES:
+            integrations.reset(service)
+            messages.success(request, f"{integrations.SERVICES[service]['label']} circuit reset.")
+        return redirect('integration_status')
+
+    return render(
+        request,
+        'wagtailadmin/integration_status.html',
+        {
+            'services': integrations.status_summary(),
+            'breakers_enabled': getattr(settings, 'INTEGRATION_BREAKERS_ENABLED', True),
+        },
+    )
+
+
+@permission_required('blowcomotion.access_dev_tools', raise_exception=True)
+@require_http_methods(["GET", "POST"])
+def scheduled_jobs(request):
+    """
+    Wagtail admin panel listing the run_scheduler jobs with their schedule,
+    next run and last outcome (see blowcomotion.scheduler). POSTing a job
+    name makes it due now; the scheduler picks it up on its next wake.
+    """
+    from django.contrib import messages
+
+    if request.method == 'POST':
+        name = request.POST.get('run', '')
+        if ScheduledJob.objects.filter(name=name).update(next_run_at=timezone.now()):
+            messages.success(request, f"{name} will run at the scheduler's next check (within a minute).")
+        return redirect('scheduled_jobs')
+
+    return render(request, 'wagtailadmin/scheduled_jobs.html', {'jobs': scheduler.status_summary()})
+
+
+@permission_required('blowcomotion.access_dev_tools', raise_exception=True)
+@require_http_methods(["GET", "POST"])
+def cache_stats(request):
+    """
+    Wagtail admin panel showing hit ratios per cache namespace, pooled across
+    worker processes (see blowcomotion.cache_namespaces), and the configured
+    cache tiers. POSTing a namespace invalidates it; POSTing "reset" zeroes
+    the counters.
+    """
+    from django.contrib import messages
+
+    if request.method == 'POST':
+        namespace = request.POST.get('invalidate', '')
+        if namespace in cache_namespaces.NAMESPACES:
+            cache_namespaces.invalidate(namespace)
+            messages.success(request, f"Cache namespace {namespace} invalidated.")
+        elif 'reset' in request.POST:
+            cache_namespaces.reset_stats()
+            messages.success(request, "Cache statistics reset.")
+        return redirect('cache_stats')
+
+    tiers = [
+        {'alias': alias, 'backend': config['BACKEND'], 'location': config.get('LOCATION', '')}
+        for alias, config in settings.CACHES.items()
+    ]
+    return render(
+        request,
+        'wagtailadmin/cache_stats.html',
+        {'namespaces': cache_namespaces.stats_summary(), 'tiers': tiers},
+    )
@@ -16,7 +16,14 @@ from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 from attendance.views import export_attendance_csv
-from blowcomotion.views import admin_tool_usage_dashboard, dump_data, fetch_embed_data
+from blowcomotion.views import (
+    admin_tool_usage_dashboard,
+    cache_stats,
+    dump_data,
+    fetch_embed_data,
+    integration_status,
+    scheduled_jobs,
+)
 from charts.views import export_charts_csv
 from gigs.views import sync_gigs_admin
 from instruments.views import (
@@ -25,6 +32,7 @@ from instruments.views import (
     instrument_library_gallery,
     instrument_library_needs_repair,
     instrument_library_rented,
+    rental_nag_job_progress,
     rental_request_return,
     rental_request_review,
     rental_requests_dashboard,
@@ -109,6 +117,9 @@ def register_admin_urls():
     return [
         path("dump_data/", dump_data, name="dump_data"),
         path("tool-usage/", admin_tool_usage_dashboard, name="admin_tool_usage_dashboard"),
+        path("integrations/", integration_status, name="integration_status"),
+        path("scheduled-jobs/", scheduled_jobs, name="scheduled_jobs"),
+        path("cache-stats/", cache_stats, name="cache_stats"),
         path("sync_gigs/", sync_gigs_admin, name="sync_gigs"),
         path("export_members/", export_members_csv, name="export_members"),
         path("export_attendance/", export_attendance_csv, name="export_attendance"),
@@ -138,6 +149,7 @@ def register_admin_urls():
         path("rental-requests/", rental_requests_dashboard, name="rental_requests_dashboard"),
         path("rental-requests/<int:pk>/", rental_request_review, name="rental_request_review"),
         path("rental-requests/<int:pk>/return/", rental_request_return, name="rental_request_return"),
+        path("rental-requests/nag-jobs/<int:pk>/", rental_nag_job_progress, name="rental_nag_job_progress"),
     ]
 
 
@@ -188,6 +200,12 @@ def register_management_menu_item():
                             permission='blowcomotion.change_cachedgig'),
         PermissionMenuItem('Tool Usage', reverse('admin_tool_usage_dashboard'), icon_name='cogs',
                             permission='blowcomotion.view_admintoolusage'),
+        PermissionMenuItem('Integration Status', reverse('integration_status'), icon_name='warning',
+                            permission='blowcomotion.access_dev_tools'),
+        PermissionMenuItem('Scheduled Jobs', reverse('scheduled_jobs'), icon_name='time',
+                            permission='blowcomotion.access_dev_tools'),
+        PermissionMenuItem('Cache Stats', reverse('cache_stats'), icon_name='pick',
+                            permission='blowcomotion.access_dev_tools'),
     ])
     return PermissionSubmenuMenuItem(
         'Utilities', submenu, icon_name='cogs', order=10000,
@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 
 from django.conf import settings
 
+from blowcomotion import integrations
+
 EXCLUDE_FOLDERS = []
 ARCHIVE_FOLDERS = ["01 -Warmups and Exercises", "03 - Resources-Reference", "0 - Rehearsal Recordings", "02 - Sound Files and Midis", "04 - Performance Videos", "ZZArchive - INACTIVE"]
 
@@ -250,12 +252,14 @@ def parse_filename(name: str) -> ParsedFile:
 
 
 def _get_drive_service():
+    import httplib2
     from googleapiclient.discovery import build
     api_key = settings.GDRIVE_API_KEY
     if not api_key:
         from django.core.exceptions import ImproperlyConfigured
         raise ImproperlyConfigured("GDRIVE_API_KEY is not set in local.py")
-    return build("drive", "v3", developerKey=api_key)
+    http = httplib2.Http(timeout=integrations.get_timeout("gdrive"))
+    return build("drive", "v3", developerKey=api_key, http=http)
 
 
 _SHARED_DRIVE_KWARGS = dict(supportsAllDrives=True, includeItemsFromAllDrives=True)
@@ -263,23 +267,25 @@ _SHARED_DRIVE_KWARGS = dict(supportsAllDrives=True, includeItemsFromAllDrives=Tr
 
 def list_song_folders(folder_id: str) -> list:
     service = _get_drive_service()
-    results = service.files().list(
-        q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
-        fields="files(id, name)",
-        pageSize=1000,
-        **_SHARED_DRIVE_KWARGS,
-    ).execute()
+    with integrations.guard("gdrive"):
+        results = service.files().list(
+            q=f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
+            fields="files(id, name)",
+            pageSize=1000,
+            **_SHARED_DRIVE_KWARGS,
+        ).execute()
     return results.get("files", [])
 
 
 def list_pdfs_in_folder(folder_id: str, _prefix: str = "") -> list:
     service = _get_drive_service()
-    results = service.files().list(
-        q=f"'{folder_id}' in parents and trashed=false",
-        fields="files(id, name, mimeType, modifiedTime)",
-        pageSize=1000,
-        **_SHARED_DRIVE_KWARGS,
-    ).execute()
+    with integrations.guard("gdrive"):
+        results = service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields="files(id, name, mimeType, modifiedTime)",
+            pageSize=1000,
+            **_SHARED_DRIVE_KWARGS,
+        ).execute()
     files = []
     for item in results.get("files", []):
         if item["mimeType"] == "application/vnd.google-apps.folder":
@@ -297,8 +303,9 @@ def _download_pdf(file_id: str) -> bytes:
     buf = io.BytesIO()
     dl = MediaIoBaseDownload(buf, request)
     done = False
-    while not done:
-        _, done = dl.next_chunk()
+    with integrations.guard("gdrive"):
+        while not done:
+            _, done = dl.next_chunk()
     return buf.getvalue()
 
 
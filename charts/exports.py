@@ -0,0 +1,27 @@
+"""
+CSV export rows for charts (see blowcomotion.exports), shared by the admin
+export view and the export_charts_to_csv command.
+"""
+from blowcomotion.exports import EXPORT_CHUNK_SIZE
+from blowcomotion.models import Chart
+
+HEADERS = [
+    "id",
+    "song_id",
+    "song_title",
+    "instrument_id",
+    "instrument_name",
+    "part",
+    "pdf_id",
+    "pdf_title",
+]
+
+
+def chart_rows():
+    """Header row, then one row per chart ordered by song, instrument and part."""
+    yield HEADERS
+    charts = Chart.objects.values_list(
+        "id", "song_id", "song__title", "instrument_id", "instrument__name", "part", "pdf_id", "pdf__title",
+    ).order_by("song__title", "instrument__name", "part")
+    # csv.writer writes None as an empty cell, so the tuples go out as they are.
+    yield from charts.iterator(chunk_size=EXPORT_CHUNK_SIZE)
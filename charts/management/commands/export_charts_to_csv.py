@@ -1,9 +1,7 @@
-import csv
-import os
-
 from django.core.management.base import BaseCommand
 
-from blowcomotion.models import Chart
+from blowcomotion.exports import write_csv
+from charts.exports import chart_rows
 
 
 class Command(BaseCommand):
@@ -20,43 +18,10 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         output_path = options["output_path"]
 
-        directory = os.path.dirname(os.path.abspath(output_path)) or "."
-        os.makedirs(directory, exist_ok=True)
-
-        charts = Chart.objects.all().select_related('song', 'instrument', 'pdf').order_by('song__title', 'instrument__name', 'part')
-        if not charts.exists():
+        row_count = write_csv(chart_rows(), output_path)
+        if not row_count:
             self.stdout.write(self.style.WARNING("No charts found to export."))
 
-        headers = [
-            "id",
-            "song_id",
-            "song_title",
-            "instrument_id",
-            "instrument_name",
-            "part",
-            "pdf_id",
-            "pdf_title",
-        ]
-
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(headers)
-
-            row_count = 0
-            for chart in charts:
-                row = [
-                    chart.id,
-                    chart.song_id,
-                    chart.song.title if chart.song else "",
-                    chart.instrument_id,
-                    chart.instrument.name if chart.instrument else "",
-                    chart.part or "",
-                    chart.pdf_id,
-                    chart.pdf.title if chart.pdf else "",
-                ]
-                writer.writerow(row)
-                row_count += 1
-
         self.stdout.write(
             self.style.SUCCESS(
                 f"Export complete. {row_count} charts written to {output_path}"
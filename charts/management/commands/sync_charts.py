@@ -4,6 +4,7 @@ from datetime import datetime
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from blowcomotion import integrations
 from blowcomotion.models import Chart, Instrument
 from charts.drive_sync import (
     _get_drive_service,
@@ -52,7 +53,10 @@ class Command(BaseCommand):
                 continue
 
             try:
-                meta = service.files().get(fileId=first_file_id, fields="parents", supportsAllDrives=True).execute()
+                with integrations.guard("gdrive"):
+                    meta = service.files().get(
+                        fileId=first_file_id, fields="parents", supportsAllDrives=True
+                    ).execute()
                 parents = meta.get("parents", [])
                 if not parents:
                     logger.warning("No parent folder found for %s", song.title)
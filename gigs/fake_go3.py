@@ -0,0 +1,335 @@
+"""
+In-process fake of the Gig-O-Matic (GO3) API for tests and offline benchmarks.
+
+Implements the endpoints this site calls:
+
+    GET   /gigs                                   -> {"gigs": [...]}
+    GET   /gigs/<id>                              -> gig dict
+    GET   /members/query?email=<email>            -> {"member_id", "username", "email"}
+    PATCH /bands/<band_id>/members/<id>/occasional -> {"member_id", "is_occasional"}
+    POST  /bands/<band_id>/invites                -> {"invited", "in_band", "invalid"}
+
+with configurable latency, jitter, error rate and dataset size. It can be used
+two ways:
+
+- as a ``requests`` transport adapter, for unit tests and in-process timing.
+  ``install()`` routes every request under ``settings.GIGO_API_URL`` to the
+  fake (including ``requests.get()`` calls made by queryish and the module
+  level helpers); everything else goes out as usual:
+
+      fake = FakeGO3(gigs=500, latency=0.2)
+      with fake.install():
+          call_command("sync_gigs")
+      fake.calls  # [("GET", "/gigs"), ...]
+
+- as a real HTTP server (``manage.py fake_go3_server``), so runserver or a
+  load tool can be pointed at a slow or flaky GO3 by setting GIGO_API_URL.
+
+Latency honours the caller's timeout: a response slower than the read
+timeout raises ``requests.exceptions.ReadTimeout`` after waiting the timeout,
+just as a slow real server would.
+"""
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from django.conf import settings
+
+GIG_STATUSES = (("confirmed", 0.7), ("unconfirmed", 0.2), ("cancelled", 0.1))
+OTHER_BAND = "Some Other Band"
+
+_GIG_DETAIL = re.compile(r"^/gigs/(?P<gig_id>\d+)/?$")
+_OCCASIONAL = re.compile(r"^/bands/(?P<band_id>\d+)/members/(?P<member_id>\d+)/occasional/?$")
+_INVITES = re.compile(r"^/bands/(?P<band_id>\d+)/invites/?$")
+
+
+class FakeGO3:
+    """
+    State and request handling for a fake GO3 instance.
+
+    Args:
+        gigs: number of generated gigs (spread from 30 days ago to a year out).
+        members: number of generated band members (member1@example.com, ...).
+        latency: base seconds added to every response.
+        jitter: up to this many extra seconds, chosen at random per response.
+        error_rate: fraction (0-1) of requests answered with ``error_status``.
+        error_status: HTTP status used for random and queued failures.
+        api_key: if set, requests without a matching X-API-KEY get a 401.
+        band_name: band the generated gigs mostly belong to.
+        other_band_fraction: fraction of gigs assigned to another band, so the
+            band filter in sync_gigs has something to drop.
+        seed: seed for dataset generation, jitter and error injection.
+    """
+
+    def __init__(
+        self,
+        gigs=0,
+        members=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        api_key=None,
+        band_name="Blowcomotion",
+        other_band_fraction=0.1,
+        seed=0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_key = api_key
+        self.band_name = band_name
+        self.calls = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._queued_failures = []
+        self.gigs = {}
+        self.members = {}
+        self._generate_gigs(gigs, other_band_fraction)
+        for _ in range(members):
+            self.add_member()
+
+    # -- dataset -------------------------------------------------------------
+
+    def _generate_gigs(self, count, other_band_fraction):
+        today = datetime.date.today()
+        statuses, weights = zip(*GIG_STATUSES)
+        for _ in range(count):
+            gig_date = today + datetime.timedelta(days=self._random.randint(-30, 365))
+            band = OTHER_BAND if self._random.random() < other_band_fraction else self.band_name
+            self.add_gig(
+                date=gig_date.isoformat(),
+                set_time=f"{self._random.randint(0, 23):02d}:{self._random.choice((0, 15, 30, 45)):02d}",
+                gig_status=self._random.choices(statuses, weights)[0],
+                band=band,
+                is_private=self._random.random() < 0.05,
+            )
+
+    def add_gig(self, **fields):
+        """Add a gig (GO3 JSON shape) and return it; unspecified fields get defaults."""
+        gig_id = fields.pop("id", None) or max(self.gigs, default=0) + 1
+        gig = {
+            "id": gig_id,
+            "title": f"Fake Gig {gig_id}",
+            "date": datetime.date.today().isoformat(),
+            "call_time": "",
+            "set_time": "",
+            "end_time": "",
+            "address": f"{gig_id} Congress Ave, Austin, TX",
+            "gig_status": "confirmed",
+            "band": self.band_name,
+            "is_private": False,
+            "hide_from_calendar": False,
+            "is_archived": False,
+            "is_in_trash": False,
+        }
+        gig.update(fields)
+        self.gigs[gig_id] = gig
+        return gig
+
+    def add_member(self, email=None, username=None, is_occasional=False):
+        """Add a band member and return it."""
+        member_id = len(self.members) + 1
+        member = {
+            "member_id": member_id,
+            "email": (email or f"member{member_id}@example.com").lower(),
+            "username": username or f"member{member_id}",
+            "is_occasional": is_occasional,
+        }
+        self.members[member["email"]] = member
+        return member
+
+    def fail_next(self, count=1, status=None):
+        """Answer the next ``count`` requests with an HTTP error (default ``error_status``)."""
+        self._queued_failures.extend([status or self.error_status] * count)
+
+    def drop_next(self, count=1):
+        """Drop the next ``count`` connections (requests.ConnectionError)."""
+        self._queued_failures.extend([None] * count)
+
+    # -- request handling ----------------------------------------------------
+
+    def response_delay(self):
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def handle(self, method, path, query=None, body=None, headers=None):
+        """
+        Route one request; returns ``(status, payload)``, or ``(None, None)`` to
+        signal a dropped connection. Latency is applied by the transport.
+        """
+        method = method.upper()
+        query = query or {}
+        headers = CaseInsensitiveDict(headers or {})
+        with self._lock:
+            self.calls.append((method, path))
+            if self._queued_failures:
+                status = self._queued_failures.pop(0)
+                return (status, {"detail": "Injected failure"}) if status else (None, None)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self.error_status, {"detail": "Injected failure"}
+            if self.api_key and headers.get("X-API-KEY") != self.api_key:
+                return 401, {"detail": "Invalid API key"}
+            return self._route(method, path, query, body)
+
+    def _route(self, method, path, query, body):
+        path = "/" + path.strip("/")
+        if path == "/gigs" and method == "GET":
+            return 200, {"gigs": list(self.gigs.values())}
+
+        match = _GIG_DETAIL.match(path)
+        if match and method == "GET":
+            gig = self.gigs.get(int(match["gig_id"]))
+            return (200, gig) if gig else (404, {"detail": "Not found."})
+
+        if path == "/members/query" and method == "GET":
+            email = (query.get("email") or "").lower()
+            member = self.members.get(email)
+            if not member:
+                return 404, {"detail": "Member not found"}
+            return 200, {key: member[key] for key in ("member_id", "username", "email")}
+
+        match = _OCCASIONAL.match(path)
+        if match and method == "PATCH":
+            member_id = int(match["member_id"])
+            member = next((m for m in self.members.values() if m["member_id"] == member_id), None)
+            if not member:
+                return 404, {"detail": "Not found."}
+            member["is_occasional"] = not member["is_occasional"]
+            return 200, {"member_id": member_id, "is_occasional": member["is_occasional"]}
+
+        match = _INVITES.match(path)
+        if match and method == "POST":
+            result = {"invited": [], "in_band": [], "invalid": []}
+            for email in (body or {}).get("emails", []):
+                if "@" not in email:
+                    result["invalid"].append(email)
+                elif email.lower() in self.members:
+                    result["in_band"].append(email)
+                else:
+                    result["invited"].append(email)
+                    self.add_member(email=email)
+            return 200, result
+
+        return 404, {"detail": "Not found."}
+
+    # -- requests transport --------------------------------------------------
+
+    @contextmanager
+    def install(self, base_url=None):
+        """Route requests under ``base_url`` (default settings.GIGO_API_URL) to this fake."""
+        base_url = (base_url or settings.GIGO_API_URL).rstrip("/")
+        adapter = FakeGO3Adapter(self, base_url)
+        original_get_adapter = requests.Session.get_adapter
+
+        def get_adapter(session, url):
+            if url.startswith(base_url + "/") or url == base_url:
+                return adapter
+            return original_get_adapter(session, url)
+
+        with mock.patch.object(requests.Session, "get_adapter", get_adapter):
+            yield self
+
+
+class FakeGO3Adapter(BaseAdapter):
+    """requests transport adapter that answers from a FakeGO3 instead of the network."""
+
+    def __init__(self, fake, base_url):
+        super().__init__()
+        self.fake = fake
+        self.base_url = base_url
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        split = urlsplit(request.url)
+        path = split.path[len(urlsplit(self.base_url).path):]
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        body = None
+        if request.body:
+            raw = request.body.decode() if isinstance(request.body, bytes) else request.body
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = None
+
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        delay = self.fake.response_delay()
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Fake GO3 took longer than {read_timeout}s", request=request)
+        if delay:
+            time.sleep(delay)
+
+        status, payload = self.fake.handle(request.method, path, query, body, request.headers)
+        if status is None:
+            raise requests.exceptions.ConnectionError("Fake GO3 dropped the connection", request=request)
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = "OK" if status < 400 else "Error"
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response._content = json.dumps(payload).encode()
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def make_server(fake, host="127.0.0.1", port=8001, prefix="/api"):
+    """Return a ThreadingHTTPServer serving ``fake`` under ``prefix`` (call serve_forever())."""
+    prefix = "/" + prefix.strip("/") if prefix.strip("/") else ""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _dispatch(self):
+            split = urlsplit(self.path)
+            if not split.path.startswith(prefix):
+                self._send(404, {"detail": "Not found."})
+                return
+            body = None
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    body = None
+            query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+
+            delay = fake.response_delay()
+            if delay:
+                time.sleep(delay)
+            status, payload = fake.handle(
+                self.command, split.path[len(prefix):], query, body, dict(self.headers)
+            )
+            if status is None:
+                self.close_connection = True
+                return
+            self._send(status, payload)
+
+        def _send(self, status, payload):
+            content = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
@@ -9,8 +9,13 @@ import requests
 
 from django.conf import settings
 
+from blowcomotion import integrations
+
 logger = logging.getLogger(__name__)
 
+# At most one requested sync per this many seconds (since sync_gigs last started)
+BACKGROUND_SYNC_THROTTLE = 60 * 10
+
 
 def convert_utc_gig_to_central(gig):
     """
@@ -58,13 +63,14 @@ def convert_utc_gig_to_central(gig):
     return gig_date, None
 
 
-def make_gigo_api_request(endpoint, timeout=10, retries=0, method='GET', data=None):
+def make_gigo_api_request(endpoint, timeout=None, retries=0, method='GET', data=None):
     """
     Make requests to the Gig-O-Matic API with proper error handling.
     
     Args:
         endpoint (str): The API endpoint (e.g., '/gigs' or '/gigs/{id}')
-        timeout (int): Request timeout in seconds (default: 10)
+        timeout (int): Request timeout in seconds (default: the GO3 timeout from
+            blowcomotion.integrations, 10s unless overridden in settings)
         retries (int): Number of retry attempts (default: 0)
         method (str): HTTP method - 'GET', 'POST', 'PATCH', 'PUT', 'DELETE' (default: 'GET')
         data (dict): JSON data to send with POST/PATCH/PUT requests (default: None)
@@ -77,6 +83,8 @@ def make_gigo_api_request(endpoint, timeout=10, retries=0, method='GET', data=No
         This function uses the GIGO_API_URL and GIGO_API_KEY settings from Django
         settings. It will retry failed requests up to the specified number of times.
         Handles empty response bodies (common for DELETE operations) and non-JSON responses gracefully.
+        Calls go through the GO3 circuit breaker; while it is open this returns None
+        immediately without touching the network.
     """
     api_url = getattr(settings, "GIGO_API_URL", None)
     api_key = getattr(settings, "GIGO_API_KEY", None)
@@ -91,29 +99,31 @@ def make_gigo_api_request(endpoint, timeout=10, retries=0, method='GET', data=No
 
     url = f"{api_url}{endpoint}"
     headers = {"X-API-KEY": api_key}
-    
+    method_upper = method.upper()
+    if method_upper not in {"GET", "POST", "PATCH", "PUT", "DELETE"}:
+        logger.error("Unsupported HTTP method: %s", method)
+        return None
+
     for attempt in range(retries + 1):
         try:
-            method_upper = method.upper()
-            request_kwargs = {"headers": headers, "timeout": timeout}
-            if data is not None and method_upper in {"POST", "PATCH", "PUT"}:
-                request_kwargs["json"] = data
-
-            if method_upper == 'GET':
-                response = requests.get(url, headers=headers, timeout=timeout)
-            elif method_upper == 'POST':
-                response = requests.post(url, **request_kwargs)
-            elif method_upper == 'PATCH':
-                response = requests.patch(url, **request_kwargs)
-            elif method_upper == 'PUT':
-                response = requests.put(url, **request_kwargs)
-            elif method_upper == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=timeout)
-            else:
-                logger.error("Unsupported HTTP method: %s", method)
-                return None
-                
-            response.raise_for_status()
+            with integrations.guard("go3") as default_timeout:
+                request_timeout = timeout or default_timeout
+                request_kwargs = {"headers": headers, "timeout": request_timeout}
+                if data is not None and method_upper in {"POST", "PATCH", "PUT"}:
+                    request_kwargs["json"] = data
+
+                if method_upper == 'GET':
+                    response = requests.get(url, headers=headers, timeout=request_timeout)
+                elif method_upper == 'POST':
+                    response = requests.post(url, **request_kwargs)
+                elif method_upper == 'PATCH':
+                    response = requests.patch(url, **request_kwargs)
+                elif method_upper == 'PUT':
+                    response = requests.put(url, **request_kwargs)
+                else:
+                    response = requests.delete(url, headers=headers, timeout=request_timeout)
+
+                response.raise_for_status()
             
             # Handle responses with no content (e.g., 204 No Content)
             if response.status_code == 204 or not response.content:
@@ -125,7 +135,10 @@ def make_gigo_api_request(endpoint, timeout=10, retries=0, method='GET', data=No
             except ValueError:
                 logger.warning("Non-JSON response from %s: %s", endpoint, response.text[:100])
                 return None
-                
+
+        except integrations.CircuitOpenError:
+            logger.warning("GO3 circuit open; skipping API request to %s", endpoint)
+            return None
         except requests.exceptions.RequestException as e:
             if attempt < retries:
                 logger.info("API request attempt %d failed for %s, retrying: %s", attempt + 1, endpoint, e)
@@ -136,3 +149,22 @@ def make_gigo_api_request(endpoint, timeout=10, retries=0, method='GET', data=No
         except Exception as e:
             logger.error("Unexpected error making API request to %s: %s", endpoint, e, exc_info=True)
             return None
+
+
+def request_background_sync():
+    """
+    Ask run_scheduler to run sync_gigs on its next pass, so request handlers
+    never wait on GO3 or start work of their own.
+
+    Used when a page references a gig that isn't in CachedGig yet (typically
+    one created in GO3 since the last scheduled sync). Skipped if sync_gigs
+    started within BACKGROUND_SYNC_THROTTLE seconds, so a busy page with a
+    stale gig can't trigger a sync on every render.
+
+    Returns True if a sync was requested.
+    """
+    if not getattr(settings, "GIGO_API_URL", None) or not getattr(settings, "GIGO_API_KEY", None):
+        return False
+    from blowcomotion.scheduler import request_run
+
+    return request_run("sync_gigs", min_interval=BACKGROUND_SYNC_THROTTLE)
@@ -0,0 +1,108 @@
+"""
+Minimal iCalendar (RFC 5545) serialization for the gig calendar feeds.
+
+Only the handful of properties the feeds need are emitted, so this is written
+by hand rather than pulling in an icalendar dependency.
+"""
+import datetime
+from zoneinfo import ZoneInfo
+
+CENTRAL = ZoneInfo("America/Chicago")
+UTC = ZoneInfo("UTC")
+
+# CachedGig only stores a start time; calendar clients need an end.
+DEFAULT_GIG_DURATION = datetime.timedelta(hours=2)
+
+# Weekly practice night (see members.views._count_tuesdays)
+REHEARSAL_BYDAY = "TU"
+
+PRODID = "-//Blowcomotion//Gig Calendar//EN"
+
+
+def _escape(value):
+    """Escape a TEXT property value."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Fold a content line at 75 octets, as RFC 5545 §3.1 requires."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts)
+
+
+def _utc_stamp(dt):
+    return dt.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def gig_event_lines(gig, dtstamp):
+    """Return the VEVENT lines for a CachedGig."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:gig-{gig.gig_id}@blowcomotion.org",
+        f"DTSTAMP:{_utc_stamp(dtstamp)}",
+    ]
+    if gig.time:
+        # CachedGig.time is already Central (sync_gigs converts from UTC)
+        start = datetime.datetime.combine(gig.date, gig.time, tzinfo=CENTRAL)
+        lines.append(f"DTSTART:{_utc_stamp(start)}")
+        lines.append(f"DTEND:{_utc_stamp(start + DEFAULT_GIG_DURATION)}")
+    else:
+        lines.append(f"DTSTART;VALUE=DATE:{gig.date:%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{gig.date + datetime.timedelta(days=1):%Y%m%d}")
+    lines.append(f"SUMMARY:{_escape(gig.title)}")
+    if gig.address:
+        lines.append(f"LOCATION:{_escape(gig.address)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def rehearsal_event_lines(dtstamp, start_date):
+    """Return the VEVENT lines for the recurring weekly rehearsal."""
+    # Roll forward to the first practice night on or after start_date
+    days_ahead = (1 - start_date.weekday()) % 7  # Tuesday == 1
+    first = start_date + datetime.timedelta(days=days_ahead)
+    return [
+        "BEGIN:VEVENT",
+        "UID:weekly-rehearsal@blowcomotion.org",
+        f"DTSTAMP:{_utc_stamp(dtstamp)}",
+        f"DTSTART;VALUE=DATE:{first:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{first + datetime.timedelta(days=1):%Y%m%d}",
+        f"RRULE:FREQ=WEEKLY;BYDAY={REHEARSAL_BYDAY}",
+        "SUMMARY:Blowcomotion rehearsal",
+        "END:VEVENT",
+    ]
+
+
+def build_calendar(name, event_lines):
+    """Wrap VEVENT lines in a VCALENDAR and return the serialized feed."""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        "X-WR-TIMEZONE:America/Chicago",
+        *event_lines,
+        "END:VCALENDAR",
+    ]
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
@@ -0,0 +1,71 @@
+"""
+Management command to run a fake Gig-O-Matic (GO3) API server locally.
+
+Serves the endpoints the site uses (see gigs.fake_go3) from generated data,
+with optional latency and error injection, so sync_gigs, member GO3 sync and
+page rendering can be exercised and timed without a real GO3 instance.
+
+Usage:
+    python manage.py fake_go3_server                         # http://127.0.0.1:8001/api
+    python manage.py fake_go3_server --gigs 2000 --latency 1.5 --jitter 0.5
+    python manage.py fake_go3_server --error-rate 0.2 --error-status 502
+
+Then point the site at it (e.g. in local.py):
+    GIGO_API_URL = "http://127.0.0.1:8001/api"
+    GIGO_API_KEY = "fake-go3-key"
+"""
+from django.core.management.base import BaseCommand
+
+from gigs.fake_go3 import FakeGO3, make_server
+
+
+class Command(BaseCommand):
+    help = 'Run a fake Gig-O-Matic API server with configurable latency, errors and dataset size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8001)
+        parser.add_argument('--prefix', default='/api', help='URL prefix (default: /api)')
+        parser.add_argument('--gigs', type=int, default=200, help='Number of generated gigs')
+        parser.add_argument('--members', type=int, default=50, help='Number of generated band members')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction (0-1) of requests that fail')
+        parser.add_argument('--error-status', type=int, default=503, help='HTTP status for injected failures')
+        parser.add_argument(
+            '--api-key',
+            default='',
+            help='Require this X-API-KEY (default: accept any key)',
+        )
+        parser.add_argument('--band-name', default='Blowcomotion')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for data and error injection')
+
+    def handle(self, *args, **options):
+        fake = FakeGO3(
+            gigs=options['gigs'],
+            members=options['members'],
+            latency=options['latency'],
+            jitter=options['jitter'],
+            error_rate=options['error_rate'],
+            error_status=options['error_status'],
+            api_key=options['api_key'] or None,
+            band_name=options['band_name'],
+            seed=options['seed'],
+        )
+        server = make_server(fake, options['host'], options['port'], options['prefix'])
+        host, port = server.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(
+            f"Fake GO3 serving {len(fake.gigs)} gigs and {len(fake.members)} members "
+            f"at http://{host}:{port}{options['prefix']}"
+        ))
+        self.stdout.write(
+            f"latency={options['latency']}s jitter={options['jitter']}s "
+            f"error_rate={options['error_rate']} (HTTP {options['error_status']}). Ctrl-C to stop."
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write(f"Served {len(fake.calls)} requests")
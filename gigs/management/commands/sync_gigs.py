@@ -19,6 +19,7 @@ from datetime import date, datetime
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from blowcomotion import cache_namespaces
 from blowcomotion.models import CachedGig
 from gigs.gigo import convert_utc_gig_to_central, make_gigo_api_request
 
@@ -262,3 +263,5 @@ class Command(BaseCommand):
                 f'sync_gigs: Synced {created_count + updated_count} gigs '
                 f'({created_count} created, {updated_count} updated, {error_count} errors)'
             )
+            # Drop only gig-derived cache entries (gigs_for_date_*, upcoming_public_gigs)
+            cache_namespaces.invalidate(cache_namespaces.GIGS)
@@ -0,0 +1,39 @@
+"""
+Tests for the throttled background gig sync.
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from blowcomotion import scheduler
+from blowcomotion.models import ScheduledJob
+from gigs.gigo import BACKGROUND_SYNC_THROTTLE, request_background_sync
+
+
+class RequestBackgroundSyncTests(TestCase):
+    def setUp(self):
+        scheduler.sync_jobs()
+
+    def next_run(self):
+        return ScheduledJob.objects.get(name="sync_gigs").next_run_at
+
+    @override_settings(GIGO_API_URL='http://test-api/api', GIGO_API_KEY='key')
+    def test_makes_the_scheduled_sync_due_instead_of_running_it(self):
+        self.assertTrue(request_background_sync())
+        self.assertLessEqual(self.next_run(), timezone.now())
+        self.assertFalse(request_background_sync())
+
+    @override_settings(GIGO_API_URL='http://test-api/api', GIGO_API_KEY='key')
+    def test_throttled_after_a_recent_sync(self):
+        ScheduledJob.objects.filter(name="sync_gigs").update(
+            last_started_at=timezone.now() - timedelta(seconds=BACKGROUND_SYNC_THROTTLE - 60)
+        )
+        before = self.next_run()
+        self.assertFalse(request_background_sync())
+        self.assertEqual(self.next_run(), before)
+
+    @override_settings(GIGO_API_URL=None, GIGO_API_KEY=None)
+    def test_skipped_when_api_not_configured(self):
+        self.assertFalse(request_background_sync())
+        self.assertGreater(self.next_run(), timezone.now())
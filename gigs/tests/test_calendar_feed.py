@@ -0,0 +1,114 @@
+"""
+Tests for the public and member iCalendar gig feeds.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blowcomotion.models import CachedGig, Member
+from gigs import ical
+from gigs.views import make_member_calendar_token
+
+FUTURE = datetime.date.today() + datetime.timedelta(days=10)
+
+
+@override_settings(GIGO_BAND_NAME='Blowcomotion')
+class PublicCalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        CachedGig.objects.create(
+            gig_id=1, title='Park Show', date=FUTURE, time=datetime.time(18, 30),
+            address='Zilker Park', gig_status='confirmed', band='Blowcomotion',
+        )
+        CachedGig.objects.create(
+            gig_id=2, title='Private Party', date=FUTURE, gig_status='confirmed',
+            band='Blowcomotion', raw_data={'is_private': True},
+        )
+        CachedGig.objects.create(
+            gig_id=3, title='Maybe Gig', date=FUTURE, gig_status='unconfirmed', band='Blowcomotion',
+        )
+
+    def test_feed_contains_only_public_confirmed_gigs(self):
+        response = self.client.get(reverse('gigs-calendar'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn('BEGIN:VCALENDAR', body)
+        self.assertIn('SUMMARY:Park Show', body)
+        self.assertIn('LOCATION:Zilker Park', body)
+        self.assertNotIn('Private Party', body)
+        self.assertNotIn('Maybe Gig', body)
+        self.assertNotIn('RRULE', body)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        first = self.client.get(reverse('gigs-calendar'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('gigs-calendar'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_feed_is_rebuilt_after_gig_namespace_invalidation(self):
+        from blowcomotion import cache_namespaces
+
+        first = self.client.get(reverse('gigs-calendar'))
+        CachedGig.objects.filter(gig_id=1).update(title='Renamed Show')
+        self.assertContains(self.client.get(reverse('gigs-calendar')), 'Park Show')
+
+        cache_namespaces.invalidate(cache_namespaces.GIGS)
+        response = self.client.get(reverse('gigs-calendar'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed Show')
+
+
+@override_settings(GIGO_BAND_NAME='Blowcomotion')
+class MemberCalendarFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.member = Member(first_name='Cal', last_name='Endar')
+        self.member.save(sync_go3=False)
+        CachedGig.objects.create(
+            gig_id=2, title='Private Party', date=FUTURE, gig_status='confirmed',
+            band='Blowcomotion', raw_data={'is_private': True},
+        )
+
+    def test_member_feed_includes_private_gigs_and_rehearsal(self):
+        url = reverse('gigs-member-calendar', args=[make_member_calendar_token(self.member)])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('Private Party', body)
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=TU', body)
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_bad_token_is_404(self):
+        response = self.client.get(reverse('gigs-member-calendar', args=['not-a-token']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_inactive_member_token_is_404(self):
+        token = make_member_calendar_token(self.member)
+        Member.objects.filter(pk=self.member.pk).update(is_active=False)
+        response = self.client.get(reverse('gigs-member-calendar', args=[token]))
+        self.assertEqual(response.status_code, 404)
+
+
+class IcalSerializationTests(TestCase):
+    def test_long_lines_are_folded(self):
+        body = ical.build_calendar('x' * 200, [])
+        for line in body.split('\r\n'):
+            self.assertLessEqual(len(line.encode('utf-8')), 75)
+
+    def test_text_values_are_escaped(self):
+        body = ical.build_calendar('Gigs; Parades, etc', [])
+        self.assertIn(r'X-WR-CALNAME:Gigs\; Parades\, etc', body)
+
+    def test_timed_gig_is_emitted_in_utc(self):
+        gig = CachedGig(gig_id=9, title='Show', date=datetime.date(2027, 7, 15), time=datetime.time(18, 0))
+        lines = ical.gig_event_lines(gig, datetime.datetime(2027, 7, 1, tzinfo=datetime.timezone.utc))
+        # 18:00 CDT == 23:00 UTC
+        self.assertIn('DTSTART:20270715T230000Z', lines)
+        self.assertIn('DTEND:20270716T010000Z', lines)
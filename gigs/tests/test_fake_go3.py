@@ -0,0 +1,149 @@
+"""
+Tests for the fake GO3 API (gigs.fake_go3), exercising the real GO3 client
+code paths against it: sync_gigs, retries, timeouts, member sync and invites.
+"""
+import datetime
+import threading
+import time
+from io import StringIO
+from unittest.mock import patch
+
+import requests
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from blowcomotion.chooser_viewsets import GigoAPIQuerySet, GigoGig
+from blowcomotion.models import CachedGig, Member
+from gigs.fake_go3 import FakeGO3, make_server
+from gigs.gigo import make_gigo_api_request
+from members.utils import send_member_to_go3_band_invite
+
+GO3_SETTINGS = dict(
+    GIGO_API_URL="http://fake-go3.test/api",
+    GIGO_API_KEY="fake-key",
+    GIGO_BAND_NAME="Blowcomotion",
+    GIGO_BAND_ID=1,
+    DEBUG=False,
+)
+
+
+@override_settings(**GO3_SETTINGS)
+class FakeGO3SyncTests(TestCase):
+    def test_sync_gigs_against_generated_dataset(self):
+        fake = FakeGO3(gigs=300, seed=7)
+        today = datetime.date.today().isoformat()
+        expected = {
+            gig_id for gig_id, gig in fake.gigs.items()
+            if gig["band"] == "Blowcomotion" and gig["date"] >= today
+        }
+
+        with fake.install():
+            call_command("sync_gigs", stdout=StringIO())
+
+        self.assertEqual(set(CachedGig.objects.values_list("gig_id", flat=True)), expected)
+        self.assertEqual(fake.calls, [("GET", "/gigs")])
+
+    def test_sync_gigs_retries_transient_errors(self):
+        fake = FakeGO3(gigs=10)
+        fake.fail_next(2, status=502)
+
+        with fake.install():
+            call_command("sync_gigs", stdout=StringIO())
+
+        self.assertEqual(len(fake.calls), 3)
+        self.assertTrue(CachedGig.objects.exists())
+
+    def test_sync_gigs_gives_up_after_retries(self):
+        fake = FakeGO3(gigs=10)
+        fake.drop_next(3)
+        out = StringIO()
+
+        with fake.install():
+            call_command("sync_gigs", stdout=out)
+
+        self.assertEqual(len(fake.calls), 3)
+        self.assertIn("Failed to fetch gigs", out.getvalue())
+        self.assertFalse(CachedGig.objects.exists())
+
+
+@override_settings(**GO3_SETTINGS)
+class FakeGO3ClientTests(TestCase):
+    def test_slow_response_hits_caller_timeout(self):
+        fake = FakeGO3(gigs=1, latency=0.5)
+        with fake.install():
+            start = time.monotonic()
+            self.assertIsNone(make_gigo_api_request("/gigs/1", timeout=0.05))
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(fake.calls, [])  # the request never completed
+
+    def test_api_key_is_checked(self):
+        fake = FakeGO3(gigs=1, api_key="other-key")
+        with fake.install():
+            self.assertIsNone(make_gigo_api_request("/gigs/1"))
+        with fake.install(), override_settings(GIGO_API_KEY="other-key"):
+            self.assertEqual(make_gigo_api_request("/gigs/1")["id"], 1)
+
+    def test_error_rate_is_seeded(self):
+        def failures():
+            fake = FakeGO3(gigs=1, error_rate=0.5, seed=3)
+            with fake.install():
+                return [make_gigo_api_request("/gigs/1") is None for _ in range(20)]
+
+        first = failures()
+        self.assertEqual(first, failures())
+        self.assertTrue(any(first) and not all(first))
+
+    def test_member_save_toggles_occasional(self):
+        fake = FakeGO3(members=3)
+        with fake.install():
+            member = Member.objects.create(first_name="Sam", last_name="Player", email="member2@example.com")
+            self.assertEqual(member.gigomatic_id, 2)
+            self.assertEqual(member.gigomatic_username, "member2")
+
+            member.is_active = False
+            member.save()
+
+        self.assertTrue(fake.members["member2@example.com"]["is_occasional"])
+        self.assertIn(("PATCH", "/bands/1/members/2/occasional"), fake.calls)
+
+    def test_band_invite(self):
+        fake = FakeGO3(members=1)
+        with fake.install():
+            existing = send_member_to_go3_band_invite("member1@example.com")
+            new = send_member_to_go3_band_invite("new@example.com")
+
+        self.assertTrue(existing["in_band"])
+        self.assertEqual(new["status"], "success")
+        self.assertIn("new@example.com", fake.members)
+
+    def test_gig_chooser_lists_through_queryish(self):
+        fake = FakeGO3()
+        fake.add_gig(id=42, title="Porch Fest")
+        # The queryset's URL is built from settings at import time
+        base_url = patch.object(GigoAPIQuerySet, "base_url", "http://fake-go3.test/api/gigs")
+        with fake.install(), base_url:
+            self.assertEqual([gig.title for gig in GigoGig.objects.all()], ["Porch Fest"])
+
+
+class FakeGO3ServerTests(SimpleTestCase):
+    def test_serves_over_http(self):
+        fake = FakeGO3(gigs=5, api_key="k")
+        server = make_server(fake, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}/api"
+            response = requests.get(f"{base}/gigs", headers={"X-API-KEY": "k"}, timeout=5)
+            self.assertEqual(len(response.json()["gigs"]), 5)
+
+            response = requests.post(
+                f"{base}/bands/1/invites", json={"emails": ["a@example.com"]},
+                headers={"X-API-KEY": "k"}, timeout=5,
+            )
+            self.assertEqual(response.json()["invited"], ["a@example.com"])
+            self.assertEqual(requests.get(f"{base}/gigs", timeout=5).status_code, 401)
+        finally:
+            server.shutdown()
+            server.server_close()
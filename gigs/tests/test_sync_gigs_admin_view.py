@@ -50,3 +50,22 @@ class SyncGigsAdminPermissionTests(TestCase):
         self.client.login(username='admin', password='pw')
         response = self.client.get(reverse('sync_gigs'))
         self.assertEqual(response.status_code, 200)
+
+
+class SyncGigsAdminCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User.objects.create_superuser(username='admin', email='admin@example.com', password='pw')
+        self.client.login(username='admin', password='pw')
+
+    @patch('gigs.views.call_command')
+    def test_post_does_not_clear_unrelated_cache(self, mock_call_command):
+        from django.core.cache import cache
+
+        cache.set('signup_invite:a@example.com', 1, 3600)
+        response = self.client.post(reverse('sync_gigs'))
+        self.assertEqual(response.status_code, 200)
+        mock_call_command.assert_called_once()
+        self.assertEqual(cache.get('signup_invite:a@example.com'), 1)
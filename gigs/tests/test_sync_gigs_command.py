@@ -446,3 +446,69 @@ class SyncGigsCommandTests(TestCase):
         self.assertIn('124', output)
         # Should also see summary of skipped gigs
         self.assertIn('Skipped 1 gigs with invalid dates', output)
+
+
+class SyncGigsCacheInvalidationTests(TestCase):
+    """sync_gigs should drop gig-derived cache entries without touching anything else."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    @override_settings(
+        GIGO_API_URL='http://test-api/api',
+        GIGO_API_KEY='test-key',
+        GIGO_BAND_NAME='TestBand'
+    )
+    @patch('gigs.management.commands.sync_gigs.make_gigo_api_request')
+    def test_sync_invalidates_only_gig_namespace(self, mock_request):
+        from django.core.cache import cache
+
+        from blowcomotion import cache_namespaces
+
+        mock_request.return_value = {
+            'gigs': [{
+                'id': 1,
+                'title': 'Test Concert',
+                'date': TEST_DATE.strftime('%Y-%m-%d'),
+                'gig_status': 'confirmed',
+                'band': 'TestBand',
+            }]
+        }
+        cache_namespaces.set(cache_namespaces.GIGS, 'upcoming_public_gigs', ['stale'], 3600)
+        cache_namespaces.set(cache_namespaces.PATREON, 'member_patreon_status:a@example.com', {'is_active': True}, 3600)
+        cache.set('signup_invite:a@example.com', 1, 3600)
+
+        call_command('sync_gigs', stdout=StringIO())
+
+        self.assertIsNone(cache_namespaces.get(cache_namespaces.GIGS, 'upcoming_public_gigs'))
+        self.assertEqual(
+            cache_namespaces.get(cache_namespaces.PATREON, 'member_patreon_status:a@example.com'),
+            {'is_active': True},
+        )
+        self.assertEqual(cache.get('signup_invite:a@example.com'), 1)
+
+    @override_settings(
+        GIGO_API_URL='http://test-api/api',
+        GIGO_API_KEY='test-key',
+        GIGO_BAND_NAME='TestBand'
+    )
+    @patch('gigs.management.commands.sync_gigs.make_gigo_api_request')
+    def test_dry_run_keeps_gig_cache(self, mock_request):
+        from blowcomotion import cache_namespaces
+
+        mock_request.return_value = {
+            'gigs': [{
+                'id': 1,
+                'title': 'Test Concert',
+                'date': TEST_DATE.strftime('%Y-%m-%d'),
+                'gig_status': 'confirmed',
+                'band': 'TestBand',
+            }]
+        }
+        cache_namespaces.set(cache_namespaces.GIGS, 'upcoming_public_gigs', ['cached'], 3600)
+
+        call_command('sync_gigs', '--dry-run', stdout=StringIO())
+
+        self.assertEqual(cache_namespaces.get(cache_namespaces.GIGS, 'upcoming_public_gigs'), ['cached'])
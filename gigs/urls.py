@@ -0,0 +1,8 @@
+from django.urls import path
+
+from gigs import views
+
+urlpatterns = [
+    path("calendar.ics", views.public_gigs_ical, name="gigs-calendar"),
+    path("calendar/member/<str:token>.ics", views.member_gigs_ical, name="gigs-member-calendar"),
+]
@@ -1,15 +1,20 @@
+import hashlib
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from io import StringIO
 
 from django.contrib.auth.decorators import login_required, permission_required
-from django.core.cache import cache
+from django.core import signing
 from django.core.management import call_command
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
-from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET, require_http_methods
 
-from blowcomotion.models import CachedGig
+from blowcomotion import cache_namespaces
+from blowcomotion.models import CachedGig, Member
+from gigs import ical
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +46,8 @@ def sync_gigs_admin(request):
             gig_count = CachedGig.objects.count()
             upcoming_count = CachedGig.get_upcoming_gigs().count()
 
-            cache.clear()  # Clear cache to ensure updated gig data is shown on the site
+            # sync_gigs invalidates the gigs cache namespace itself; only gig-derived
+            # keys are dropped, so ratelimit counters and other caches survive.
             
             return render(request, 'admin/sync_gigs_result.html', {
                 'success': True,
@@ -85,7 +91,7 @@ def gigs_for_date(request):
         cache_key = f"gigs_for_date_{date_str}"
         
         # Check cache first
-        cached_result = cache.get(cache_key)
+        cached_result = cache_namespaces.get(cache_namespaces.GIGS, cache_key)
         if cached_result is not None:
             logger.info(f"Returning cached gigs for {date_str}: {len(cached_result.get('gigs', []))} gig(s)")
             return JsonResponse(cached_result)
@@ -108,7 +114,7 @@ def gigs_for_date(request):
         logger.info(f"Returning {len(filtered_gigs)} gig(s) for {date_str}, caching for 10 minutes")
         
         # Cache the result for 10 minutes
-        cache.set(cache_key, result, 600)
+        cache_namespaces.set(cache_namespaces.GIGS, cache_key, result)
         
         return JsonResponse(result)
         
@@ -120,3 +126,112 @@ def gigs_for_date(request):
         logger.error("Unexpected error in gigs_for_date for date %s: %s", date_param, e, exc_info=True)
         return JsonResponse({'error': 'An internal error occurred while fetching gigs'}, status=500)
 
+
+
+# ── iCalendar feeds ──────────────────────────────────────────────────────────
+
+PUBLIC_FEED = "public"
+MEMBER_FEED = "member"
+ICAL_FEED_CACHE_TTL = 60 * 60 * 24  # rebuilt sooner whenever sync_gigs bumps the gigs namespace
+ICAL_CLIENT_MAX_AGE = 60 * 15
+_MEMBER_CALENDAR_SALT = "gigs.member-calendar"
+
+
+def make_member_calendar_token(member):
+    """Signed, non-expiring token for a member's private calendar subscription URL."""
+    return signing.dumps(member.pk, salt=_MEMBER_CALENDAR_SALT)
+
+
+def _member_for_calendar_token(token):
+    try:
+        member_pk = signing.loads(token, salt=_MEMBER_CALENDAR_SALT)
+    except signing.BadSignature:
+        return None
+    return Member.objects.filter(pk=member_pk, is_active=True).first()
+
+
+def _get_calendar_feed(kind):
+    """
+    Return the rendered feed as a dict with 'body', 'etag' and 'last_modified'.
+
+    The feed is rendered once and cached in the gigs namespace, so it is only
+    rebuilt after sync_gigs invalidates it (or the day rolls over and past
+    gigs need to drop off).
+    """
+    cache_key = f"ical_feed:{kind}:{date.today().isoformat()}"
+    feed = cache_namespaces.get(cache_namespaces.GIGS, cache_key)
+    if feed is not None:
+        return feed
+
+    gigs = list(CachedGig.get_upcoming_gigs())
+    if kind == PUBLIC_FEED:
+        gigs = [gig for gig in gigs if gig.is_public]
+        name = "Blowcomotion Gigs"
+    else:
+        # Members see private gigs too, but not ones GO3 has archived or trashed
+        gigs = [
+            gig for gig in gigs
+            if not (gig.raw_data or {}).get('is_archived') and not (gig.raw_data or {}).get('is_in_trash')
+        ]
+        name = "Blowcomotion Member Calendar"
+
+    last_modified = max((gig.last_synced for gig in gigs), default=None)
+    dtstamp = last_modified or timezone.now()
+    event_lines = []
+    for gig in gigs:
+        event_lines.extend(ical.gig_event_lines(gig, dtstamp))
+    if kind == MEMBER_FEED:
+        event_lines.extend(ical.rehearsal_event_lines(dtstamp, date.today()))
+
+    body = ical.build_calendar(name, event_lines)
+    feed = {
+        'body': body,
+        'etag': hashlib.md5(body.encode('utf-8')).hexdigest(),
+        'last_modified': last_modified,
+    }
+    cache_namespaces.set(cache_namespaces.GIGS, cache_key, feed, ICAL_FEED_CACHE_TTL)
+    return feed
+
+
+def _calendar_response(feed, private):
+    response = HttpResponse(feed['body'], content_type='text/calendar; charset=utf-8')
+    if private:
+        patch_cache_control(response, private=True, max_age=ICAL_CLIENT_MAX_AGE)
+    else:
+        patch_cache_control(response, public=True, max_age=ICAL_CLIENT_MAX_AGE)
+    return response
+
+
+@require_GET
+@condition(
+    etag_func=lambda request: _get_calendar_feed(PUBLIC_FEED)['etag'],
+    last_modified_func=lambda request: _get_calendar_feed(PUBLIC_FEED)['last_modified'],
+)
+def public_gigs_ical(request):
+    """Public, confirmed upcoming gigs as an .ics feed for calendar subscriptions."""
+    return _calendar_response(_get_calendar_feed(PUBLIC_FEED), private=False)
+
+
+def _member_feed_etag(request, token):
+    if _member_for_calendar_token(token) is None:
+        return None
+    return _get_calendar_feed(MEMBER_FEED)['etag']
+
+
+def _member_feed_last_modified(request, token):
+    if _member_for_calendar_token(token) is None:
+        return None
+    return _get_calendar_feed(MEMBER_FEED)['last_modified']
+
+
+@require_GET
+@condition(etag_func=_member_feed_etag, last_modified_func=_member_feed_last_modified)
+def member_gigs_ical(request, token):
+    """
+    Member calendar feed: all confirmed upcoming gigs (including private ones)
+    plus the weekly rehearsal. Calendar clients can't log in, so access is via a
+    signed per-member token shown on the member profile page.
+    """
+    if _member_for_calendar_token(token) is None:
+        raise Http404("Unknown calendar feed")
+    return _calendar_response(_get_calendar_feed(MEMBER_FEED), private=True)
@@ -0,0 +1,62 @@
+"""
+CSV export rows for library instruments (see blowcomotion.exports), shared
+by the admin export view and the export_library_instruments_to_csv command.
+"""
+from blowcomotion.exports import EXPORT_CHUNK_SIZE
+from blowcomotion.models import LibraryInstrument
+
+HEADERS = [
+    "id",
+    "instrument_id",
+    "instrument_name",
+    "status",
+    "status_display",
+    "serial_number",
+    "member_id",
+    "member_name",
+    "rental_date",
+    "acquisition_cost",
+    "current_value",
+    "replacement_cost",
+    "patreon_active",
+    "patreon_amount",
+    "storage_location_id",
+    "storage_location_name",
+    "comments",
+    "created_at",
+    "updated_at",
+]
+
+
+def _decimal(value):
+    return str(value) if value is not None else ""
+
+
+def library_instrument_rows():
+    """Header row, then one row per library instrument ordered by instrument and serial number."""
+    yield HEADERS
+    instruments = LibraryInstrument.objects.select_related(
+        'instrument', 'member', 'storage_location'
+    ).order_by('instrument__name', 'serial_number')
+    for instrument in instruments.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            instrument.id,
+            instrument.instrument_id,
+            instrument.instrument.name if instrument.instrument else "",
+            instrument.status,
+            instrument.get_status_display(),
+            instrument.serial_number or "",
+            instrument.member_id if instrument.member_id else "",
+            instrument.member.full_name if instrument.member else "",
+            instrument.rental_date.isoformat() if instrument.rental_date else "",
+            _decimal(instrument.acquisition_cost),
+            _decimal(instrument.current_value),
+            _decimal(instrument.replacement_cost),
+            "YES" if instrument.patreon_active else "NO",
+            _decimal(instrument.patreon_amount),
+            instrument.storage_location_id if instrument.storage_location_id else "",
+            instrument.storage_location.name if instrument.storage_location else "",
+            instrument.comments or "",
+            instrument.created_at.isoformat() if instrument.created_at else "",
+            instrument.updated_at.isoformat() if instrument.updated_at else "",
+        ]
@@ -6,6 +6,7 @@ from wagtail.models import Site
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from blowcomotion.bulk_mail import BulkMailer
 from blowcomotion.models import InstrumentRentalNagLog, LibraryInstrument, SiteSettings
 from instruments.views import _build_nag_email
 from members.auth import _MemberEmail, _send_mail
@@ -54,55 +55,57 @@ class Command(BaseCommand):
             member__user__isnull=False,
         ).exclude(member__user__email="").select_related("member", "member__user", "instrument")
 
-        nagged = []
-        skipped_cooldown = 0
+        # One SMTP connection for every nag and the summary rather than one per email
+        with BulkMailer() as mailer:
+            nagged = []
+            skipped_cooldown = 0
 
-        for li in instruments:
-            if li.last_nag_sent and (today - li.last_nag_sent).days < cooldown_days:
-                skipped_cooldown += 1
-                continue
+            for li in instruments:
+                if li.last_nag_sent and (today - li.last_nag_sent).days < cooldown_days:
+                    skipped_cooldown += 1
+                    continue
 
-            member = li.member
-            reasons = []
+                member = li.member
+                reasons = []
 
-            if not member.is_active or not member.last_seen or member.last_seen < cutoff:
-                reasons.append("attendance")
+                if not member.is_active or not member.last_seen or member.last_seen < cutoff:
+                    reasons.append("attendance")
 
-            if not li.patreon_active:
-                reasons.append("patreon")
+                if not li.patreon_active:
+                    reasons.append("patreon")
 
-            if not reasons:
-                continue
+                if not reasons:
+                    continue
 
-            reason_str = "+".join(reasons)
-            self._send_renter_nag(li, member, base_url, patreon_url, reasons, dry_run)
+                reason_str = "+".join(reasons)
+                self._send_renter_nag(li, member, base_url, patreon_url, reasons, dry_run, mailer)
 
-            if not dry_run:
-                LibraryInstrument.objects.filter(pk=li.pk).update(last_nag_sent=today)
-                InstrumentRentalNagLog.objects.create(
-                    library_instrument=li,
-                    member_name=member.full_name,
-                    member_email=member.email,
-                    reasons=reason_str,
-                    sent_at=today,
-                )
+                if not dry_run:
+                    LibraryInstrument.objects.filter(pk=li.pk).update(last_nag_sent=today)
+                    InstrumentRentalNagLog.objects.create(
+                        library_instrument=li,
+                        member_name=member.full_name,
+                        member_email=member.email,
+                        reasons=reason_str,
+                        sent_at=today,
+                    )
 
-            nagged.append({"instrument": li, "member": member, "reasons": reasons})
-            self.stdout.write(self.style.SUCCESS(f"Nagged {member.full_name} ({li.instrument.name}) — {reason_str}"))
+                nagged.append({"instrument": li, "member": member, "reasons": reasons})
+                self.stdout.write(self.style.SUCCESS(f"Nagged {member.full_name} ({li.instrument.name}) — {reason_str}"))
 
-        if nagged:
-            self._send_admin_summary(nagged, skipped_cooldown, admin_recipients, today, dry_run)
-        else:
-            self.stdout.write(self.style.SUCCESS(f"Nothing to nag today ({skipped_cooldown} skipped by cooldown)."))
+            if nagged:
+                self._send_admin_summary(nagged, skipped_cooldown, admin_recipients, today, dry_run, mailer)
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Nothing to nag today ({skipped_cooldown} skipped by cooldown)."))
 
-    def _send_renter_nag(self, li, member, base_url, patreon_url, reasons, dry_run):
+    def _send_renter_nag(self, li, member, base_url, patreon_url, reasons, dry_run, mailer):
         subject, message = _build_nag_email(li, member, base_url, patreon_url, reasons)
         if dry_run:
             self.stdout.write(self.style.NOTICE(f"[Dry Run] Would email {member.email}:\nSubject: {subject}\n{message}\n"))
         else:
-            _send_mail(subject, message, settings.FROM_EMAIL, member.email)
+            _send_mail(subject, message, settings.FROM_EMAIL, member.email, mailer=mailer)
 
-    def _send_admin_summary(self, nagged, skipped_cooldown, recipients, today, dry_run):
+    def _send_admin_summary(self, nagged, skipped_cooldown, recipients, today, dry_run, mailer):
         lines = [
             f"Instrument Rental Nag Summary — {today}",
             "=" * 50,
@@ -124,7 +127,7 @@ class Command(BaseCommand):
             return
 
         if recipients:
-            _MemberEmail(subject=subject, body=message, from_email=settings.FROM_EMAIL, to=recipients).send(fail_silently=False)
+            mailer.send(_MemberEmail(subject=subject, body=message, from_email=settings.FROM_EMAIL, to=recipients))
 
     def _get_site_settings(self):
         try:
@@ -0,0 +1,41 @@
+"""
+Work queued "Nag all eligible renters" runs; see instruments.nag_jobs.
+
+run_scheduler runs a pass every minute. To start runs as soon as they are
+queued, run the worker as an always-on task instead:
+
+    python manage.py process_nag_jobs --watch
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from instruments.nag_jobs import process_nag_jobs
+
+
+class Command(BaseCommand):
+    help = 'Send the nag emails for queued "Nag all" runs from the rental dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep running, picking up runs as they are queued')
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=2,
+            help='Nap between checks in --watch mode (default: 2s)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['watch']:
+            self.stdout.write(f"Finished {process_nag_jobs()} nag run(s)")
+            return
+        try:
+            while True:
+                close_old_connections()
+                finished = process_nag_jobs()
+                if finished:
+                    self.stdout.write(f"Finished {finished} nag run(s)")
+                time.sleep(options['max_sleep'])
+        except KeyboardInterrupt:
+            pass
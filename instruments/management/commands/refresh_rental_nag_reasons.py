@@ -0,0 +1,20 @@
+"""
+Recompute LibraryInstrument.nag_reasons for every current renter.
+
+The rental dashboard reads "Nag all" candidates from nag_reasons, which is
+updated whenever a rental, a renter's attendance or Patreon status, or the
+attendance window changes. Renters also cross the attendance cutoff just by
+not turning up, so run_scheduler runs this once a day:
+
+    python manage.py refresh_rental_nag_reasons
+"""
+from django.core.management.base import BaseCommand
+
+from blowcomotion.models import LibraryInstrument
+
+
+class Command(BaseCommand):
+    help = 'Recompute which rented instruments "Nag all" would email, and why'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Updated nag reasons on {LibraryInstrument.refresh_nag_reasons()} instrument(s)")
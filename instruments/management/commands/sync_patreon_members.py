@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from instruments.patreon import apply_patreon_mirror, sync_patreon_members
+
+
+class Command(BaseCommand):
+    help = "Refresh the local Patreon member mirror and copy it onto rentals and member records"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mirror-only",
+            action="store_true",
+            help="Only refresh the PatreonMember table; leave rental requests, members and instruments alone",
+        )
+
+    def handle(self, *args, **options):
+        result = sync_patreon_members()
+        if result is None:
+            raise CommandError("Patreon API not configured or error fetching members.")
+
+        self.stdout.write(f"{result['fetched']} Patreon members mirrored, {result['removed']} removed.")
+        if not result["complete"]:
+            self.stdout.write(self.style.WARNING("Stopped at the page limit; members not seen were kept."))
+        if options["mirror_only"]:
+            return
+
+        applied = apply_patreon_mirror()
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {applied['submissions']} submissions updated, {applied['skipped']} skipped, "
+            f"{applied['members']} members cached, {applied['instruments']} instruments synced"
+        ))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from blowcomotion import cache_namespaces
 from blowcomotion.models import (
     InstrumentRentalRequestSubmission,
     LibraryInstrument,
@@ -137,6 +138,9 @@ class Command(BaseCommand):
                     li.save(update_fields=["patreon_active"])
                 instrument_updated += 1
 
+        if not dry_run:
+            cache_namespaces.invalidate(cache_namespaces.PATREON)
+
         suffix = " (dry run)" if dry_run else ""
         self.stdout.write(self.style.SUCCESS(
             f"Done{suffix}: {updated} submissions updated, {skipped} skipped, "
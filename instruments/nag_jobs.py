@@ -0,0 +1,185 @@
+"""
+Background "Nag all eligible renters" runs (InstrumentRentalNagJob).
+
+The rental dashboard calls enqueue_nag_all() with the current candidates and
+returns straight away; the process_nag_jobs worker (every minute from
+run_scheduler, or always-on with --watch) sends the emails and records an
+outcome per rental, while the dashboard polls the job's progress.
+
+A rental is nagged at most once per day however many jobs list it: each send
+is gated by the same conditional UPDATE of LibraryInstrument.last_nag_sent
+the single "Nag" button uses, with the cooldown never shorter than a day. A
+job abandoned by a worker that died is picked up again after STALE_AFTER;
+an email that was mid-send at the time is recorded as failed, not resent.
+"""
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from blowcomotion.bulk_mail import BulkMailer
+from blowcomotion.models import (
+    InstrumentRentalNagJob,
+    InstrumentRentalNagJobItem,
+    InstrumentRentalNagLog,
+    LibraryInstrument,
+)
+
+logger = logging.getLogger(__name__)
+
+Job = InstrumentRentalNagJob
+Item = InstrumentRentalNagJobItem
+
+STALE_AFTER = timedelta(minutes=30)
+# How long a finished run stays on the dashboard.
+SHOW_FINISHED_FOR = timedelta(hours=1)
+
+
+def enqueue_nag_all(candidates, requested_by=None):
+    """Queue a job for ``candidates`` (see instruments.views._get_nag_all_candidates); returns it."""
+    job = Job.objects.create(requested_by=requested_by)
+    Item.objects.bulk_create([
+        Item(
+            job=job,
+            library_instrument=candidate["instrument"],
+            member_name=candidate["member"].full_name,
+            member_email=candidate["member"].email,
+            reasons="+".join(candidate["reasons"]),
+        )
+        for candidate in candidates
+    ])
+    return job
+
+
+def unfinished_job():
+    return Job.objects.exclude(status=Job.STATUS_DONE).first()
+
+
+def dashboard_job(now=None):
+    """The run to show on the dashboard: one in progress, else one that finished recently."""
+    now = now or timezone.now()
+    return unfinished_job() or Job.objects.filter(finished_at__gte=now - SHOW_FINISHED_FOR).first()
+
+
+def requeue_stale(now=None):
+    """Hand jobs abandoned by a worker that died back to the queue; returns how many."""
+    now = now or timezone.now()
+    stale = list(Job.objects.filter(status=Job.STATUS_RUNNING, started_at__lt=now - STALE_AFTER))
+    for job in stale:
+        job.items.filter(status=Item.STATUS_SENDING).update(
+            status=Item.STATUS_FAILED, detail="Interrupted mid-send; not retried in case it went out.", processed_at=now
+        )
+        Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING).update(status=Job.STATUS_QUEUED)
+    return len(stale)
+
+
+def _claim():
+    for job in Job.objects.filter(status=Job.STATUS_QUEUED).order_by("created_at"):
+        if Job.objects.filter(pk=job.pk, status=Job.STATUS_QUEUED).update(
+            status=Job.STATUS_RUNNING, started_at=timezone.now()
+        ):
+            return job
+    return None
+
+
+def process_nag_jobs():
+    """Work every queued job; returns how many were finished."""
+    requeue_stale()
+    finished = 0
+    while (job := _claim()) is not None:
+        run_job(job)
+        finished += 1
+    return finished
+
+
+def _context():
+    from wagtail.models import Site
+
+    from instruments.views import _get_site_settings_for_view
+
+    site_settings = _get_site_settings_for_view()
+    site = Site.objects.filter(is_default_site=True).first() or Site.objects.first()
+    raw_recipients = (site_settings.instrument_rental_notification_recipients or "") if site_settings else ""
+    return {
+        "base_url": site.root_url if site else "https://blowcomotion.org",
+        "patreon_url": (site_settings.patreon_url or "") if site_settings else "",
+        "cooldown_days": max(site_settings.nag_cooldown_days if site_settings else 7, 1),
+        "admin_recipients": [r.strip() for r in raw_recipients.replace("\n", ",").split(",") if r.strip()],
+    }
+
+
+def _finish_item(item, status, detail=""):
+    Item.objects.filter(pk=item.pk).update(status=status, detail=detail, processed_at=timezone.now())
+
+
+def _send_item(item, context, today, mailer):
+    """Nag one rental; returns (status, detail)."""
+    from instruments.views import _build_nag_email
+    from members.auth import _send_mail
+
+    li = LibraryInstrument.objects.select_related("member__user", "instrument").get(pk=item.library_instrument_id)
+    member = li.member
+    if li.status != LibraryInstrument.STATUS_RENTED or not member or not member.email:
+        return Item.STATUS_SKIPPED, "No longer rented out."
+
+    # The same atomic cooldown gate as the single "Nag" button.
+    claimed = LibraryInstrument.objects.filter(pk=li.pk).filter(
+        Q(last_nag_sent__isnull=True) |
+        Q(last_nag_sent__lte=today - timedelta(days=context["cooldown_days"]))
+    ).update(last_nag_sent=today)
+    if not claimed:
+        return Item.STATUS_SKIPPED, f"Cooldown (last nag: {li.last_nag_sent})."
+
+    reasons = item.reasons.split("+")
+    subject, body = _build_nag_email(li, member, context["base_url"], context["patreon_url"], reasons)
+    Item.objects.filter(pk=item.pk).update(status=Item.STATUS_SENDING)
+    try:
+        _send_mail(subject, body, settings.FROM_EMAIL, member.email, mailer=mailer)
+    except Exception as exc:
+        LibraryInstrument.objects.filter(pk=li.pk).update(last_nag_sent=li.last_nag_sent)
+        return Item.STATUS_FAILED, str(exc) or exc.__class__.__name__
+
+    InstrumentRentalNagLog.objects.create(
+        library_instrument=li,
+        member_name=member.full_name,
+        member_email=member.email,
+        reasons=item.reasons,
+        sent_at=today,
+    )
+    return Item.STATUS_SENT, ""
+
+
+def run_job(job):
+    """Send every pending item of a claimed job, then the admin summary."""
+    from instruments.views import _nag_all_summary
+    from members.auth import _MemberEmail
+
+    context = _context()
+    today = date.today()
+    with BulkMailer() as mailer:
+        for item in job.items.filter(status=Item.STATUS_PENDING):
+            status, detail = _send_item(item, context, today, mailer)
+            _finish_item(item, status, detail)
+
+        items = list(job.items.select_related("library_instrument__instrument", "library_instrument__member__user"))
+        nagged = [
+            {"instrument": i.library_instrument, "member": i.library_instrument.member, "reasons": i.reasons.split("+")}
+            for i in items
+            if i.status == Item.STATUS_SENT and i.library_instrument.member
+        ]
+        failed = [f"{i.member_name} ({i.library_instrument.instrument.name}): {i.detail}"
+                  for i in items if i.status == Item.STATUS_FAILED]
+        skipped = sum(1 for i in items if i.status == Item.STATUS_SKIPPED)
+        if (nagged or failed) and context["admin_recipients"]:
+            subject, body = _nag_all_summary(today, nagged, failed, skipped)
+            try:
+                mailer.send(_MemberEmail(
+                    subject=subject, body=body, from_email=settings.FROM_EMAIL, to=context["admin_recipients"]
+                ))
+            except Exception:
+                logger.exception("Failed to send the summary for nag job %s", job.pk)
+
+    Job.objects.filter(pk=job.pk).update(status=Job.STATUS_DONE, finished_at=timezone.now())
+    logger.info("Nag job %s: %d sent, %d failed, %d skipped", job.pk, len(nagged), len(failed), skipped)
@@ -10,6 +10,11 @@ Configuration (in local.py / production secrets):
     PATREON_CAMPAIGN_ID    — numeric Patreon campaign ID for the organisation
 
 If either setting is absent the function returns None (skip silently).
+
+The campaign's member list is mirrored into the PatreonMember table by
+sync_patreon_members() (the sync_patreon_members command, run by the
+scheduler); once the mirror has been synced, check_patreon_membership() and
+apply_patreon_mirror() read it instead of calling the API.
 """
 
 import logging
@@ -17,8 +22,19 @@ import logging
 import requests
 
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
+from blowcomotion import cache_namespaces, integrations
+from blowcomotion.models import (
+    InstrumentRentalRequestSubmission,
+    LibraryInstrument,
+    Member,
+    PatreonMember,
+)
+from blowcomotion.models.patreon import normalize_email
+
 logger = logging.getLogger(__name__)
 
 PATREON_MEMBERS_URL = "https://www.patreon.com/api/oauth2/v2/campaigns/{campaign_id}/members"
@@ -27,6 +43,17 @@ ACTIVE_PATRON_STATUS = "active_patron"
 MIN_RENTAL_PLEDGE_CENTS = 500
 # Safety cap: stop paginating after this many pages to avoid hanging in-request.
 MAX_PAGES = 20
+# The mirror sync runs in the background, so it can afford a far higher cap.
+SYNC_MAX_PAGES = 200
+
+NOT_FOUND = {
+    "is_active": False,
+    "pledge_cents": None,
+    "last_charge_date": None,
+    "last_charge_status": None,
+    "patron_since": None,
+    "lifetime_cents": None,
+}
 
 _MEMBER_FIELDS = ",".join([
     "patron_status",
@@ -50,11 +77,21 @@ def fetch_all_members() -> dict | None:
         check_patreon_membership's return value), or None if the API is not
         configured or a network/HTTP error occurs.
     """
+    members, _complete = _fetch_members(MAX_PAGES)
+    return members
+
+
+def _fetch_members(max_pages):
+    """
+    Page through the campaign member list; returns (members, complete), where
+    complete is False if max_pages ran out before the last page. members is
+    None if the API is not configured or a request failed.
+    """
     access_token = getattr(settings, "PATREON_ACCESS_TOKEN", None)
     campaign_id = getattr(settings, "PATREON_CAMPAIGN_ID", None)
 
     if not access_token or not campaign_id:
-        return None
+        return None, False
 
     headers = {"Authorization": f"Bearer {access_token}"}
     url = PATREON_MEMBERS_URL.format(campaign_id=campaign_id)
@@ -63,22 +100,26 @@ def fetch_all_members() -> dict | None:
     members: dict = {}
     pages_fetched = 0
 
-    while url and pages_fetched < MAX_PAGES:
+    while url and pages_fetched < max_pages:
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
+            with integrations.guard("patreon") as timeout:
+                response = requests.get(url, headers=headers, params=params, timeout=timeout)
+                response.raise_for_status()
             data = response.json()
+        except integrations.CircuitOpenError:
+            logger.warning("patreon_client: Patreon circuit open; skipping fetch_all_members")
+            return None, False
         except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
                 requests.exceptions.HTTPError, Exception) as exc:  # noqa: BLE001
             logger.error("patreon_client: fetch_all_members error (page %d): %s", pages_fetched + 1, exc)
-            return None
+            return None, False
 
         pages_fetched += 1
         params = {}
 
         for member in data.get("data", []):
             attrs = member.get("attributes", {})
-            email = (attrs.get("email") or "").lower()
+            email = normalize_email(attrs.get("email"))
             if email:
                 members[email] = {
                     "is_active": attrs.get("patron_status") == ACTIVE_PATRON_STATUS,
@@ -91,8 +132,10 @@ def fetch_all_members() -> dict | None:
 
         url = (data.get("links") or {}).get("next")
 
+    if url:
+        logger.warning("patreon_client: stopped after %d pages with more to fetch", max_pages)
     logger.info("patreon_client: fetch_all_members fetched %d members", len(members))
-    return members
+    return members, not url
 
 
 def check_patreon_membership(email: str) -> dict | None:
@@ -113,7 +156,14 @@ def check_patreon_membership(email: str) -> dict | None:
 
     Returns None if configuration is missing or an API/network error occurred
     (callers should treat this as "unknown / not checked").
+
+    Once the PatreonMember mirror has been synced this is a local lookup
+    instead, and the dict also carries the mirror's "synced_at".
     """
+    mirrored = _mirror_lookup(email)
+    if mirrored is not None:
+        return mirrored
+
     access_token = getattr(settings, "PATREON_ACCESS_TOKEN", None)
     campaign_id = getattr(settings, "PATREON_CAMPAIGN_ID", None)
 
@@ -136,9 +186,13 @@ def check_patreon_membership(email: str) -> dict | None:
 
     while url and pages_fetched < MAX_PAGES:
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
+            with integrations.guard("patreon") as timeout:
+                response = requests.get(url, headers=headers, params=params, timeout=timeout)
+                response.raise_for_status()
             data = response.json()
+        except integrations.CircuitOpenError:
+            logger.warning("patreon_client: Patreon circuit open; skipping membership check")
+            return None
         except requests.exceptions.Timeout:
             logger.error("patreon_client: request timed out (page %d)", pages_fetched + 1)
             return None
@@ -193,3 +247,115 @@ def check_patreon_membership(email: str) -> dict | None:
 
     logger.info("patreon_client: member not found in campaign member list")
     return {"is_active": False, "pledge_cents": None, "last_charge_date": None, "last_charge_status": None, "patron_since": None, "lifetime_cents": None}
+
+
+def _mirror_lookup(email):
+    row = PatreonMember.objects.filter(email=normalize_email(email)).first()
+    if row is not None:
+        return row.as_status()
+    synced_at = PatreonMember.last_synced_at()
+    if synced_at is None:
+        return None
+    return {**NOT_FOUND, "synced_at": synced_at}
+
+
+def sync_patreon_members(now=None):
+    """
+    Refresh the PatreonMember mirror from the API with one bulk upsert.
+
+    Members no longer in the campaign are removed, unless the fetch stopped
+    at SYNC_MAX_PAGES. Returns {"fetched", "removed", "complete"}, or None if
+    the API is not configured or the fetch failed (the mirror is left as is).
+    """
+    members, complete = _fetch_members(SYNC_MAX_PAGES)
+    if members is None:
+        return None
+
+    now = now or timezone.now()
+    rows = [PatreonMember(email=email, synced_at=now, **detail) for email, detail in members.items()]
+    with transaction.atomic():
+        PatreonMember.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=[*NOT_FOUND, "synced_at"],
+        )
+        removed = 0
+        if complete:
+            removed, _ = PatreonMember.objects.filter(synced_at__lt=now).delete()
+    cache_namespaces.invalidate(cache_namespaces.PATREON)
+    logger.info("patreon_client: mirrored %d members (%d removed)", len(rows), removed)
+    return {"fetched": len(rows), "removed": removed, "complete": complete}
+
+
+_SUBMISSION_FIELDS = {
+    "patreon_validated": "is_active",
+    "patreon_pledge_cents": "pledge_cents",
+    "patreon_last_charge_date": "last_charge_date",
+    "patreon_last_charge_status": "last_charge_status",
+    "patreon_patron_since": "patron_since",
+    "patreon_lifetime_cents": "lifetime_cents",
+}
+_MEMBER_CACHE_FIELDS = {
+    "patreon_is_active": "is_active",
+    "patreon_pledge_cents": "pledge_cents",
+    "patreon_last_charge_date": "last_charge_date",
+    "patreon_last_charge_status": "last_charge_status",
+    "patreon_patron_since": "patron_since",
+    "patreon_lifetime_cents": "lifetime_cents",
+}
+
+
+def apply_patreon_mirror(now=None):
+    """
+    Copy mirrored Patreon status onto rental submissions, the Member cache
+    fields and LibraryInstrument.patreon_active (and so nag_reasons), with
+    one bulk update per model. Members missing from the mirror count as not
+    found on submissions and instruments; their Member cache is left
+    untouched.
+    Returns {"submissions", "skipped", "members", "instruments"} counts.
+    """
+    now = now or timezone.now()
+    mirror = {row.email: row.as_status() for row in PatreonMember.objects.all()}
+
+    submissions, skipped = [], 0
+    for sub in InstrumentRentalRequestSubmission.objects.select_related("member__user"):
+        email = sub.member.email if sub.member else None
+        if not email:
+            skipped += 1
+            continue
+        result = mirror.get(normalize_email(email), NOT_FOUND)
+        for field, key in _SUBMISSION_FIELDS.items():
+            setattr(sub, field, result[key])
+        submissions.append(sub)
+    InstrumentRentalRequestSubmission.objects.bulk_update(submissions, list(_SUBMISSION_FIELDS), batch_size=500)
+
+    members = []
+    for member in Member.objects.filter(user__isnull=False).exclude(user__email="").select_related("user"):
+        result = mirror.get(normalize_email(member.email))
+        if result is None:
+            continue
+        for field, key in _MEMBER_CACHE_FIELDS.items():
+            setattr(member, field, result[key])
+        member.patreon_last_synced = now
+        members.append(member)
+    Member.objects.bulk_update(members, [*_MEMBER_CACHE_FIELDS, "patreon_last_synced"], batch_size=500)
+
+    instruments = []
+    for li in LibraryInstrument.objects.filter(member__isnull=False).select_related("member__user"):
+        result = mirror.get(normalize_email(li.member.email))
+        new_active = bool(result and result["is_active"] and (result["pledge_cents"] or 0) >= MIN_RENTAL_PLEDGE_CENTS)
+        if li.patreon_active != new_active:
+            li.patreon_active = new_active
+            instruments.append(li)
+    LibraryInstrument.objects.bulk_update(instruments, ["patreon_active"], batch_size=500)
+    LibraryInstrument.refresh_nag_reasons(LibraryInstrument.objects.filter(pk__in=[li.pk for li in instruments]))
+
+    cache_namespaces.invalidate(cache_namespaces.PATREON)
+    return {
+        "submissions": len(submissions),
+        "skipped": skipped,
+        "members": len(members),
+        "instruments": len(instruments),
+    }
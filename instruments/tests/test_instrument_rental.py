@@ -13,6 +13,7 @@ from blowcomotion.models import (
     Member,
     SiteSettings,
 )
+from instruments.nag_jobs import process_nag_jobs
 from instruments.patreon import check_patreon_membership
 from members.forms import InstrumentRentalRequestForm
 
@@ -629,6 +630,7 @@ class RentalRequestsAdminViewTest(TestCase):
             reverse("rental_requests_dashboard"),
             {"action": "nag_all"},
         )
+        process_nag_jobs()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn(self.member.email, mail.outbox[0].to)
 
@@ -642,6 +644,7 @@ class RentalRequestsAdminViewTest(TestCase):
             reverse("rental_requests_dashboard"),
             {"action": "nag_all"},
         )
+        process_nag_jobs()
         self.assertEqual(len(mail.outbox), 0)
 
     def test_nag_one_no_assigned_unit(self):
@@ -683,6 +686,7 @@ class RentalRequestsAdminViewTest(TestCase):
             reverse("rental_requests_dashboard"),
             {"action": "nag_all"},
         )
+        process_nag_jobs()
         # renter email + copy, admin summary + copy
         self.assertEqual(len(mail.outbox), 4)
         subjects = [m.subject for m in mail.outbox]
@@ -739,6 +743,7 @@ class RentalRequestsAdminViewTest(TestCase):
         self.assertNotIn(other_member.full_name, confirm_message)
 
         self.client.post(reverse("rental_requests_dashboard"), {"action": "nag_all"})
+        process_nag_jobs()
         sent_emails = {addr for m in mail.outbox for addr in m.to}
 
         self.assertEqual(sendable_emails, sent_emails)
@@ -0,0 +1,119 @@
+"""
+Tests for background "Nag all" runs (instruments.nag_jobs) and the
+dashboard's progress polling.
+"""
+import datetime
+from io import StringIO
+
+from wagtail.models import Site
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blowcomotion.models import (
+    InstrumentRentalNagJob,
+    InstrumentRentalNagJobItem,
+    InstrumentRentalNagLog,
+    LibraryInstrument,
+    SiteSettings,
+)
+from blowcomotion.tests.test_bulk_mail import FLAKY_BACKEND
+from instruments import nag_jobs
+from instruments.tests.test_instrument_rental import (
+    make_instrument,
+    make_library_instrument,
+    make_member,
+)
+
+Job = InstrumentRentalNagJob
+Item = InstrumentRentalNagJobItem
+
+
+class NagJobTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.force_login(self.admin)
+        self.url = reverse("rental_requests_dashboard")
+        self.rentals = []
+        for n, email in enumerate(["ann@example.com", "bad@example.com", "cat@example.com"]):
+            li = make_library_instrument(make_instrument(f"Horn {n}"), serial=f"SN{n}")
+            li.status = LibraryInstrument.STATUS_RENTED
+            li.member = make_member(first_name=f"Renter{n}", email=email)
+            li.save()
+            self.rentals.append(li)
+
+    def nag_all(self):
+        return self.client.post(self.url, {"action": "nag_all"}, follow=True)
+
+    def test_post_queues_a_job_without_sending(self):
+        response = self.nag_all()
+        self.assertContains(response, "queued 3 renter(s)")
+        self.assertEqual(len(mail.outbox), 0)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.requested_by), (Job.STATUS_QUEUED, self.admin))
+        self.assertEqual(job.items.count(), 3)
+        self.assertContains(response, 'hx-trigger="every 2s"')
+
+        # A second click while it's unfinished doesn't queue another.
+        self.assertContains(self.nag_all(), "already running")
+        self.assertEqual(Job.objects.count(), 1)
+
+    @override_settings(EMAIL_BACKEND=FLAKY_BACKEND, BULK_MAIL_BATCH_DELAY=0)
+    def test_worker_records_an_outcome_per_rental(self):
+        LibraryInstrument.objects.filter(pk=self.rentals[2].pk).update(last_nag_sent=datetime.date.today())
+        self.nag_all()
+
+        out = StringIO()
+        call_command("process_nag_jobs", stdout=out)
+        self.assertIn("Finished 1 nag run(s)", out.getvalue())
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+        outcomes = {i.member_email: (i.status, i.detail) for i in job.items.all()}
+        self.assertEqual(outcomes["ann@example.com"], (Item.STATUS_SENT, ""))
+        self.assertEqual(outcomes["bad@example.com"][0], Item.STATUS_FAILED)
+        self.assertIn("550", outcomes["bad@example.com"][1])
+        self.assertEqual(outcomes["cat@example.com"][0], Item.STATUS_SKIPPED)
+        self.assertEqual([m.to for m in mail.outbox], [["ann@example.com"]])
+        self.assertEqual(InstrumentRentalNagLog.objects.count(), 1)
+        # The failed send doesn't start a cooldown.
+        self.assertIsNone(LibraryInstrument.objects.get(pk=self.rentals[1].pk).last_nag_sent)
+
+        progress = self.client.get(reverse("rental_nag_job_progress", args=[job.pk]))
+        self.assertContains(progress, "1 sent, 1 skipped, 1 failed")
+        self.assertNotContains(progress, "hx-trigger")
+
+    def test_a_rental_is_nagged_at_most_once_a_day(self):
+        site_settings = SiteSettings.for_site(Site.objects.get(is_default_site=True))
+        site_settings.nag_cooldown_days = 0
+        site_settings.save()
+
+        self.nag_all()
+        nag_jobs.process_nag_jobs()
+        self.nag_all()  # a retry of the same POST
+        nag_jobs.process_nag_jobs()
+
+        self.assertEqual(len(mail.outbox), 3)
+        second = Job.objects.first()
+        self.assertEqual(set(second.items.values_list("status", flat=True)), {Item.STATUS_SKIPPED})
+
+    def test_job_abandoned_by_a_dead_worker_is_resumed(self):
+        self.nag_all()
+        job = Job.objects.get()
+        first, second, third = job.items.all()
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING, started_at=timezone.now() - nag_jobs.STALE_AFTER * 2
+        )
+        Item.objects.filter(pk=first.pk).update(status=Item.STATUS_SENDING)
+
+        nag_jobs.process_nag_jobs()
+
+        statuses = dict(job.items.values_list("pk", "status"))
+        self.assertEqual(statuses[first.pk], Item.STATUS_FAILED)  # might have gone out; not resent
+        self.assertEqual({statuses[second.pk], statuses[third.pk]}, {Item.STATUS_SENT})
+        self.assertEqual(len(mail.outbox), 2)
@@ -0,0 +1,129 @@
+"""
+Tests for the precomputed "Nag all" eligibility (LibraryInstrument.nag_reasons)
+and the rental dashboard that reads it.
+"""
+import datetime
+from io import StringIO
+
+from wagtail.models import Site
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blowcomotion.models import (
+    InstrumentRentalRequestSubmission,
+    LibraryInstrument,
+    Member,
+    PatreonMember,
+    SiteSettings,
+)
+from instruments.patreon import apply_patreon_mirror
+from instruments.tests.test_instrument_rental import (
+    make_instrument,
+    make_library_instrument,
+    make_member,
+)
+
+TODAY = datetime.date.today()
+
+
+def nag_reasons(li):
+    return LibraryInstrument.objects.values_list("nag_reasons", flat=True).get(pk=li.pk)
+
+
+class NagReasonsTests(TestCase):
+    def setUp(self):
+        self.member = make_member(last_seen=TODAY)
+        self.li = make_library_instrument(make_instrument("Tuba"))
+        self.li.status = LibraryInstrument.STATUS_RENTED
+        self.li.member = self.member
+        self.li.save()
+
+    def test_rental_is_flagged_on_save_and_cleared_on_return(self):
+        self.assertEqual(nag_reasons(self.li), "patreon")
+        self.li.status = LibraryInstrument.STATUS_AVAILABLE
+        self.li.member = None
+        self.li.save()
+        self.assertEqual(nag_reasons(self.li), "")
+
+    def test_attendance_and_active_changes_update_the_rental(self):
+        self.member.last_seen = TODAY - datetime.timedelta(days=200)
+        self.member.save(update_fields=["last_seen"])
+        self.assertEqual(nag_reasons(self.li), "attendance+patreon")
+
+        self.member.last_seen = TODAY
+        self.member.is_active = False
+        self.member.save()
+        self.assertEqual(nag_reasons(self.li), "attendance+patreon")
+
+    def test_patreon_mirror_updates_the_rental(self):
+        PatreonMember.objects.create(
+            email=self.member.email, is_active=True, pledge_cents=2500, synced_at=timezone.now()
+        )
+        apply_patreon_mirror()
+        self.assertEqual(nag_reasons(self.li), "")
+
+    def test_attendance_window_setting_moves_the_cutoff(self):
+        Member.objects.filter(pk=self.member.pk).update(last_seen=TODAY - datetime.timedelta(days=30))
+        site_settings = SiteSettings.for_site(Site.objects.get(is_default_site=True))
+        site_settings.attendance_cleanup_days = 14
+        site_settings.save()
+        self.assertEqual(nag_reasons(self.li), "attendance+patreon")
+
+    def test_daily_refresh_picks_up_renters_who_stopped_coming(self):
+        Member.objects.filter(pk=self.member.pk).update(last_seen=TODAY - datetime.timedelta(days=200))
+        self.assertEqual(nag_reasons(self.li), "patreon")  # not written through save()
+
+        out = StringIO()
+        call_command("refresh_rental_nag_reasons", stdout=out)
+        self.assertIn("Updated nag reasons on 1 instrument(s)", out.getvalue())
+        self.assertEqual(nag_reasons(self.li), "attendance+patreon")
+
+
+class RentalDashboardSummaryTests(TestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        instrument = make_instrument("Horn")
+        for n in range(4):
+            li = make_library_instrument(instrument, serial=f"SN{n}")
+            li.status = LibraryInstrument.STATUS_RENTED
+            li.member = make_member(first_name=f"Renter{n}", email=f"r{n}@example.com", last_seen=TODAY)
+            li.patreon_active = n % 2 == 0
+            li.save()
+        for status in ["pending", "pending", "approved", "returned"]:
+            InstrumentRentalRequestSubmission.objects.create(
+                name="Someone", email="someone@example.com", instrument=instrument, status=status,
+                policy_acknowledged=True,
+            )
+
+    def test_counts_and_candidates_come_from_the_precomputed_summary(self):
+        response = self.client.get(reverse("rental_requests_dashboard"))
+        self.assertEqual(
+            response.context["status_counts"], {"pending": 2, "approved": 1, "denied": 0, "returned": 1}
+        )
+        preview = response.context["nag_all_preview"]
+        self.assertEqual(sorted(item["member"].email for item in preview), ["r1@example.com", "r3@example.com"])
+        self.assertTrue(all(item["reasons"] == ["patreon"] for item in preview))
+        self.assertContains(response, "<strong>2</strong> eligible for a nag")
+
+    def test_query_count_does_not_grow_with_renters(self):
+        url = reverse("rental_requests_dashboard")
+        self.client.get(url)  # warm per-request caches
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(url)
+        instrument = make_instrument("Tenor Horn")
+        for n in range(4, 8):
+            li = make_library_instrument(instrument, serial=f"SN{n}")
+            li.status = LibraryInstrument.STATUS_RENTED
+            li.member = make_member(first_name=f"Renter{n}", email=f"r{n}@example.com")
+            li.save()
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["nag_all_preview"]), 6)
+        self.assertEqual(len(after), len(before))
@@ -0,0 +1,167 @@
+"""
+Tests for the local Patreon member mirror (PatreonMember), its sync and the
+lookups that read it.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blowcomotion.models import (
+    InstrumentRentalRequestSubmission,
+    LibraryInstrument,
+    PatreonMember,
+)
+from instruments.patreon import (
+    apply_patreon_mirror,
+    check_patreon_membership,
+    sync_patreon_members,
+)
+from instruments.tests.test_instrument_rental import (
+    make_instrument,
+    make_library_instrument,
+    make_member,
+)
+from members.auth import create_member_user
+
+PATREON = dict(PATREON_ACCESS_TOKEN="tok", PATREON_CAMPAIGN_ID="cam123")
+
+
+def page(members, next_url=None):
+    resp = MagicMock()
+    resp.raise_for_status.return_value = None
+    payload = {"data": [
+        {"id": str(i), "type": "member", "attributes": attrs} for i, attrs in enumerate(members)
+    ]}
+    if next_url:
+        payload["links"] = {"next": next_url}
+    resp.json.return_value = payload
+    return resp
+
+
+def patron(email, status="active_patron", cents=500):
+    return {"email": email, "patron_status": status, "currently_entitled_amount_cents": cents}
+
+
+@override_settings(**PATREON)
+class PatreonMirrorSyncTests(TestCase):
+    @patch("instruments.patreon.requests.get")
+    def test_sync_upserts_by_normalized_email_and_drops_leavers(self, mock_get):
+        old = timezone.now() - timedelta(hours=1)
+        PatreonMember.objects.create(email="a@example.com", is_active=False, synced_at=old)
+        PatreonMember.objects.create(email="gone@example.com", is_active=True, synced_at=old)
+        mock_get.side_effect = [
+            page([patron(" A@Example.com ")], next_url="https://patreon.test/next"),
+            page([patron("b@example.com", "declined_patron", 0)]),
+        ]
+
+        result = sync_patreon_members()
+
+        self.assertEqual(result, {"fetched": 2, "removed": 1, "complete": True})
+        rows = {row.email: row for row in PatreonMember.objects.all()}
+        self.assertEqual(set(rows), {"a@example.com", "b@example.com"})
+        self.assertTrue(rows["a@example.com"].is_active)
+        self.assertEqual(rows["a@example.com"].pledge_cents, 500)
+        self.assertGreater(rows["a@example.com"].synced_at, old)
+        self.assertFalse(rows["b@example.com"].is_active)
+
+    @patch("instruments.patreon.SYNC_MAX_PAGES", 1)
+    @patch("instruments.patreon.requests.get")
+    def test_truncated_sync_keeps_members_it_did_not_see(self, mock_get):
+        PatreonMember.objects.create(email="later@example.com", synced_at=timezone.now() - timedelta(hours=1))
+        mock_get.return_value = page([patron("a@example.com")], next_url="https://patreon.test/next")
+
+        self.assertEqual(sync_patreon_members()["complete"], False)
+        self.assertTrue(PatreonMember.objects.filter(email="later@example.com").exists())
+
+    @patch("instruments.patreon.requests.get", side_effect=ConnectionError("down"))
+    def test_failed_fetch_leaves_the_mirror_alone(self, mock_get):
+        PatreonMember.objects.create(email="a@example.com", is_active=True, synced_at=timezone.now())
+        self.assertIsNone(sync_patreon_members())
+        self.assertTrue(PatreonMember.objects.get().is_active)
+
+
+class PatreonMirrorLookupTests(TestCase):
+    def setUp(self):
+        self.synced_at = timezone.now()
+        PatreonMember.objects.create(email="patron@example.com", is_active=True, pledge_cents=1000,
+                                     synced_at=self.synced_at)
+
+    @patch("instruments.patreon.requests.get")
+    def test_membership_check_reads_the_mirror(self, mock_get):
+        with override_settings(**PATREON):
+            found = check_patreon_membership("Patron@Example.com")
+            missing = check_patreon_membership("nobody@example.com")
+        mock_get.assert_not_called()
+        self.assertEqual((found["is_active"], found["pledge_cents"], found["synced_at"]),
+                         (True, 1000, self.synced_at))
+        self.assertFalse(missing["is_active"])
+        self.assertEqual(missing["synced_at"], self.synced_at)
+
+    def test_apply_copies_status_onto_rentals_members_and_instruments(self):
+        instrument = make_instrument()
+        patron_member = make_member(email="patron@example.com")
+        other = make_member(first_name="Other", email="other@example.com")
+        sub = InstrumentRentalRequestSubmission.objects.create(
+            name="Sam", email="patron@example.com", instrument=instrument, member=patron_member,
+            policy_acknowledged=True,
+        )
+        other_sub = InstrumentRentalRequestSubmission.objects.create(
+            name="Other", email="other@example.com", instrument=instrument, member=other,
+            policy_acknowledged=True, patreon_validated=True,
+        )
+        li = make_library_instrument(instrument, status=LibraryInstrument.STATUS_RENTED)
+        LibraryInstrument.objects.filter(pk=li.pk).update(member=patron_member, patreon_active=False)
+
+        result = apply_patreon_mirror()
+
+        self.assertEqual(result, {"submissions": 2, "skipped": 0, "members": 1, "instruments": 1})
+        sub.refresh_from_db()
+        other_sub.refresh_from_db()
+        patron_member.refresh_from_db()
+        self.assertEqual((sub.patreon_validated, sub.patreon_pledge_cents), (True, 1000))
+        self.assertIs(other_sub.patreon_validated, False)
+        self.assertTrue(patron_member.patreon_is_active)
+        self.assertIsNotNone(patron_member.patreon_last_synced)
+        self.assertTrue(LibraryInstrument.objects.get(pk=li.pk).patreon_active)
+
+
+@override_settings(**PATREON)
+class PatreonMirrorEntryPointTests(TestCase):
+    @patch("instruments.patreon.requests.get")
+    def test_command_syncs_and_applies(self, mock_get):
+        mock_get.return_value = page([patron("a@example.com")])
+        out = StringIO()
+        call_command("sync_patreon_members", stdout=out)
+        self.assertIn("1 Patreon members mirrored", out.getvalue())
+        self.assertIn("Done:", out.getvalue())
+
+    @patch("instruments.patreon.requests.get")
+    def test_dashboard_refresh_and_synced_at(self, mock_get):
+        User = get_user_model()
+        User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.login(username="admin", password="pass")
+        url = reverse("rental_requests_dashboard")
+        self.assertContains(self.client.get(url), "Patreon synced never")
+
+        mock_get.return_value = page([patron("a@example.com")])
+        response = self.client.post(url, {"action": "refresh_patreon"}, follow=True)
+        self.assertContains(response, "1 Patreon members fetched")
+        self.assertNotContains(response, "Patreon synced never")
+        self.assertEqual(PatreonMember.objects.count(), 1)
+
+    def test_member_profile_shows_when_status_was_checked(self):
+        member = make_member(email="patron@example.com")
+        user = create_member_user(member)
+        user.set_password("Pass123!")
+        user.save()
+        PatreonMember.objects.create(email="patron@example.com", is_active=True, synced_at=timezone.now())
+        self.client.login(username="patron@example.com", password="Pass123!")
+        response = self.client.get(reverse("member-profile"))
+        self.assertContains(response, "Active patron")
+        self.assertContains(response, "Checked with Patreon")
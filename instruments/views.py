@@ -1,35 +1,35 @@
 import logging
-import os
-import tempfile
 from datetime import date, timedelta
-from io import StringIO
 from types import SimpleNamespace
 
 from django import forms as django_forms
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
-from django.core.management import call_command
 from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 
+from blowcomotion.exports import streaming_csv_response
 from blowcomotion.models import (
     Equipment,
     Instrument,
     InstrumentHistoryLog,
+    InstrumentRentalNagJob,
     InstrumentRentalNagLog,
     InstrumentRentalRequestSubmission,
     InstrumentStorageLocation,
     LibraryInstrument,
-    Member,
+    PatreonMember,
     SiteSettings,
 )
-from instruments.patreon import MIN_RENTAL_PLEDGE_CENTS, fetch_all_members
+from instruments import nag_jobs
+from instruments.exports import library_instrument_rows
+from instruments.patreon import apply_patreon_mirror, sync_patreon_members
 from members.auth import _MemberEmail, _send_mail
 
 logger = logging.getLogger(__name__)
@@ -206,36 +206,8 @@ def export_library_instruments_csv(request):
         logger.warning("Unauthorized access attempt to export library instruments by user %s", request.user.username)
         return JsonResponse({'error': 'You do not have permission to access this feature'}, status=403)
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
-    temp_path = temp_file.name
-    temp_file.close()
-
-    try:
-        logger.info("Starting library instrument export by user %s", request.user.username)
-        call_command(
-            'export_library_instruments_to_csv',
-            output_path=temp_path,
-            stdout=StringIO(),
-        )
-
-    except Exception:
-        logger.exception("Error during library instrument export by user %s", request.user.username)
-        return JsonResponse({'error': 'Export failed. See server logs for details.'}, status=500)
-    else:
-        with open(temp_path, 'rb') as csv_file:
-            csv_data = csv_file.read()
-
-        timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
-        filename = f'library_instruments_export_{timestamp}.csv'
-        response = HttpResponse(csv_data, content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        logger.info("Library instrument export completed successfully by user %s", request.user.username)
-        return response
-    finally:
-        try:
-            os.remove(temp_path)
-        except OSError:
-            logger.warning("Temporary file %s could not be removed after library instrument export", temp_path)
+    logger.info("Starting library instrument export by user %s", request.user.username)
+    return streaming_csv_response(library_instrument_rows(), 'library_instruments_export')
 
 
 # ── Rental Request Admin Views ──────────────────────────────────────────────────
@@ -384,7 +356,7 @@ def rental_requests_dashboard(request):
     from wagtail.models import Site
 
     from django.contrib import messages
-    from django.db.models import Case, IntegerField, Value, When
+    from django.db.models import Case, Count, IntegerField, Value, When
 
     site_settings = _get_site_settings_for_view()
     today = date.today()
@@ -401,64 +373,15 @@ def rental_requests_dashboard(request):
         action = request.POST.get("action")
 
         if action == "refresh_patreon":
-            from django.utils import timezone
-
-            patreon_data = fetch_all_members()
-            if patreon_data is None:
+            synced = sync_patreon_members()
+            if synced is None:
                 messages.error(request, "Patreon API not configured or error fetching members.")
                 return redirect("rental_requests_dashboard")
+            applied = apply_patreon_mirror()
 
-            now = timezone.now()
-            _not_found = {"is_active": False, "pledge_cents": None, "last_charge_date": None,
-                          "last_charge_status": None, "patron_since": None, "lifetime_cents": None}
-            _sub_fields = ["patreon_validated", "patreon_pledge_cents", "patreon_last_charge_date",
-                           "patreon_last_charge_status", "patreon_patron_since", "patreon_lifetime_cents"]
-            _member_fields = ["patreon_is_active", "patreon_pledge_cents", "patreon_last_charge_date",
-                               "patreon_last_charge_status", "patreon_patron_since", "patreon_lifetime_cents",
-                               "patreon_last_synced"]
-
-            updated = skipped = 0
-            for sub in InstrumentRentalRequestSubmission.objects.select_related("member"):
-                email = sub.member.email if sub.member else None
-                if not email:
-                    skipped += 1
-                    continue
-                result = patreon_data.get(email.lower(), _not_found)
-                sub.patreon_validated = result["is_active"]
-                sub.patreon_pledge_cents = result["pledge_cents"]
-                sub.patreon_last_charge_date = result["last_charge_date"]
-                sub.patreon_last_charge_status = result["last_charge_status"]
-                sub.patreon_patron_since = result["patron_since"]
-                sub.patreon_lifetime_cents = result["lifetime_cents"]
-                sub.save(update_fields=_sub_fields)
-                updated += 1
-
-            for member in Member.objects.filter(user__isnull=False).exclude(user__email="").select_related("user"):
-                result = patreon_data.get(member.email.lower())
-                if result is None:
-                    continue
-                member.patreon_is_active = result["is_active"]
-                member.patreon_pledge_cents = result["pledge_cents"]
-                member.patreon_last_charge_date = result["last_charge_date"]
-                member.patreon_last_charge_status = result["last_charge_status"]
-                member.patreon_patron_since = result["patron_since"]
-                member.patreon_lifetime_cents = result["lifetime_cents"]
-                member.patreon_last_synced = now
-                member.save(update_fields=_member_fields)
-
-            for li in LibraryInstrument.objects.select_related("member"):
-                member = li.member
-                if not member:
-                    continue
-                result = patreon_data.get((member.email or "").lower())
-                new_active = bool(result and result["is_active"] and (result["pledge_cents"] or 0) >= MIN_RENTAL_PLEDGE_CENTS)
-                if li.patreon_active != new_active:
-                    li.patreon_active = new_active
-                    li.save(update_fields=["patreon_active"])
-
-            msg = f"Patreon refresh: {updated} submissions updated, {len(patreon_data)} Patreon members fetched"
-            if skipped:
-                msg += f", {skipped} skipped (no email)"
+            msg = f"Patreon refresh: {applied['submissions']} submissions updated, {synced['fetched']} Patreon members fetched"
+            if applied["skipped"]:
+                msg += f", {applied['skipped']} skipped (no email)"
             messages.success(request, msg)
             return redirect("rental_requests_dashboard")
 
@@ -521,69 +444,15 @@ def rental_requests_dashboard(request):
             return redirect("rental_requests_dashboard")
 
         elif action == "nag_all":
-            candidates = _get_nag_all_candidates(cutoff)
-
-            nagged = []
-            failed = []
-            skipped_cooldown = 0
-            for candidate in candidates:
-                li = candidate["instrument"]
-                member = candidate["member"]
-                reasons = candidate["reasons"]
-
-                # Atomic cooldown gate — prevents double-send on concurrent clicks
-                claimed = LibraryInstrument.objects.filter(pk=li.pk).filter(
-                    Q(last_nag_sent__isnull=True) |
-                    Q(last_nag_sent__lte=today - timedelta(days=cooldown_days))
-                ).update(last_nag_sent=today)
-                if not claimed:
-                    skipped_cooldown += 1
-                    continue
-
-                subject, body = _build_nag_email(li, member, base_url, patreon_url, reasons)
-                try:
-                    _send_mail(subject, body, settings.FROM_EMAIL, member.email)
-                except Exception as exc:
-                    LibraryInstrument.objects.filter(pk=li.pk).update(last_nag_sent=li.last_nag_sent)
-                    failed.append(f"{member.full_name} ({li.instrument.name}): {exc}")
-                    continue
-
-                InstrumentRentalNagLog.objects.create(
-                    library_instrument=li,
-                    member_name=member.full_name,
-                    member_email=member.email,
-                    reasons="+".join(reasons),
-                    sent_at=today,
-                )
-                nagged.append({"instrument": li, "member": member, "reasons": reasons})
-
-            if nagged or failed:
-                summary_lines = [
-                    f"Instrument Rental Nag Summary — {today}",
-                    "=" * 50,
-                    "",
-                    f"Nag emails sent to {len(nagged)} renter(s):",
-                    "",
-                ]
-                for item in nagged:
-                    m = item["member"]
-                    reason_label = " + ".join(item["reasons"])
-                    last_seen_note = f", last seen {m.last_seen}" if m.last_seen and "attendance" in item["reasons"] else ""
-                    summary_lines.append(f"  * {m.full_name} — {item['instrument'].instrument.name} (Reason: {reason_label}{last_seen_note})")
-                if failed:
-                    summary_lines += ["", f"Failed ({len(failed)}):"]
-                    summary_lines.extend(f"  * {f}" for f in failed)
-                summary_lines += ["", f"Skipped (cooldown active): {skipped_cooldown} renter(s)"]
-                summary_body = "\n".join(summary_lines)
-                summary_subject = f"Instrument Rental Nag Summary — {today}"
-                if admin_recipients:
-                    _MemberEmail(subject=summary_subject, body=summary_body, from_email=settings.FROM_EMAIL, to=admin_recipients).send(fail_silently=False)
-                msg = f"Nag all: {len(nagged)} email(s) sent, {skipped_cooldown} skipped (cooldown)"
-                if failed:
-                    msg += f", {len(failed)} failed"
-                messages.success(request, msg + ".")
-            else:
-                messages.info(request, f"Nag all: nothing to send ({skipped_cooldown} skipped by cooldown).")
+            if nag_jobs.unfinished_job():
+                messages.warning(request, "Nag all is already running — see its progress below.")
+                return redirect("rental_requests_dashboard")
+            candidates = _get_nag_all_candidates()
+            if not candidates:
+                messages.info(request, "Nag all: nothing to send.")
+                return redirect("rental_requests_dashboard")
+            nag_jobs.enqueue_nag_all(candidates, requested_by=request.user)
+            messages.success(request, f"Nag all: queued {len(candidates)} renter(s) — progress below.")
             return redirect("rental_requests_dashboard")
 
         elif action == "delete":
@@ -626,7 +495,7 @@ def rental_requests_dashboard(request):
         )
         .order_by(*order_by)
         .select_related("member", "instrument", "second_choice", "third_choice", "assigned_unit",
-                        "assigned_unit__member", "assigned_unit__instrument")
+                        "assigned_unit__member__user", "assigned_unit__instrument")
     )
     for sub in submissions:
         li = sub.assigned_unit
@@ -636,19 +505,21 @@ def rental_requests_dashboard(request):
             and li.last_nag_sent
             and (today - li.last_nag_sent).days < cooldown_days
         )
-        nag_eligible = False
-        if (sub.status == InstrumentRentalRequestSubmission.STATUS_APPROVED
-                and li and li.member and li.member.email):
-            m = li.member
-            nag_eligible = (
-                not m.is_active or not m.last_seen or m.last_seen < cutoff
-                or sub.patreon_validated is not True
-            )
-        sub.nag_eligible = nag_eligible
+        sub.nag_eligible = bool(
+            sub.status == InstrumentRentalRequestSubmission.STATUS_APPROVED
+            and li and li.member and li.member.email
+            and (LibraryInstrument.NAG_REASON_ATTENDANCE in li.nag_reasons.split("+")
+                 or sub.patreon_validated is not True)
+        )
+
+    status_counts = InstrumentRentalRequestSubmission.objects.aggregate(**{
+        status: Count("pk", filter=Q(status=status))
+        for status, _label in InstrumentRentalRequestSubmission.STATUS_CHOICES
+    })
 
     nag_all_preview = []
     sendable_lines = []
-    for candidate in _get_nag_all_candidates(cutoff):
+    for candidate in _get_nag_all_candidates():
         li = candidate["instrument"]
         in_cooldown = bool(li.last_nag_sent and (today - li.last_nag_sent).days < cooldown_days)
         reason_label = " + ".join(candidate["reasons"])
@@ -672,11 +543,21 @@ def rental_requests_dashboard(request):
     return render(request, "wagtailadmin/rental_requests_dashboard.html", {
         "submissions": submissions,
         "sort_columns": sort_columns,
+        "status_counts": status_counts,
         "nag_all_preview": nag_all_preview,
         "nag_all_confirm_message": nag_all_confirm_message,
+        "patreon_synced_at": PatreonMember.last_synced_at(),
+        "nag_job": nag_jobs.dashboard_job(),
     })
 
 
+@permission_required('blowcomotion.change_libraryinstrument', raise_exception=True)
+def rental_nag_job_progress(request, pk):
+    """HTMX partial polled by the rental dashboard while a "Nag all" run is in progress."""
+    job = get_object_or_404(InstrumentRentalNagJob, pk=pk)
+    return render(request, "wagtailadmin/_nag_job_progress.html", {"nag_job": job})
+
+
 @permission_required('blowcomotion.change_libraryinstrument', raise_exception=True)
 def rental_request_review(request, pk):
     submission = get_object_or_404(InstrumentRentalRequestSubmission, pk=pk)
@@ -794,7 +675,7 @@ def _get_site_settings_for_view():
     return SiteSettings.for_site(site)
 
 
-def _get_nag_all_candidates(cutoff):
+def _get_nag_all_candidates():
     """Return the list of renters that 'Nag all eligible renters' would email right now.
 
     Read-only — does not touch cooldown state or send anything. Used both to build the
@@ -802,28 +683,21 @@ def _get_nag_all_candidates(cutoff):
     eligibility/reasons, by the nag_all POST handler itself, so the preview can never
     drift from what actually gets sent.
 
+    Eligibility is precomputed in LibraryInstrument.nag_reasons (see
+    LibraryInstrument.refresh_nag_reasons), so this is a single indexed query.
+
     Each item: {"instrument": LibraryInstrument, "member": Member, "reasons": [...]}.
     "reasons" may include "attendance" and/or "patreon"; see _build_nag_email for how
     reasons map to the CTA included in the email.
     """
     instruments = LibraryInstrument.objects.filter(
         status=LibraryInstrument.STATUS_RENTED,
-        member__isnull=False,
         member__user__isnull=False,
-    ).exclude(member__user__email="").select_related("member", "member__user", "instrument")
-
-    candidates = []
-    for li in instruments:
-        member = li.member
-        reasons = []
-        if not member.is_active or not member.last_seen or member.last_seen < cutoff:
-            reasons.append("attendance")
-        if not li.patreon_active:
-            reasons.append("patreon")
-        if not reasons:
-            continue
-        candidates.append({"instrument": li, "member": member, "reasons": reasons})
-    return candidates
+    ).exclude(nag_reasons="").exclude(member__user__email="").select_related("member__user", "instrument")
+    return [
+        {"instrument": li, "member": li.member, "reasons": li.nag_reasons.split("+")}
+        for li in instruments
+    ]
 
 
 def _nag_cta_for_reasons(reasons):
@@ -880,6 +754,27 @@ def _build_nag_email(li, member, base_url, patreon_url, reasons):
     return subject, "\n".join(lines)
 
 
+def _nag_all_summary(today, nagged, failed, skipped_cooldown):
+    """Subject and body of the admin summary email sent after nag_all."""
+    summary_lines = [
+        f"Instrument Rental Nag Summary — {today}",
+        "=" * 50,
+        "",
+        f"Nag emails sent to {len(nagged)} renter(s):",
+        "",
+    ]
+    for item in nagged:
+        m = item["member"]
+        reason_label = " + ".join(item["reasons"])
+        last_seen_note = f", last seen {m.last_seen}" if m.last_seen and "attendance" in item["reasons"] else ""
+        summary_lines.append(f"  * {m.full_name} — {item['instrument'].instrument.name} (Reason: {reason_label}{last_seen_note})")
+    if failed:
+        summary_lines += ["", f"Failed ({len(failed)}):"]
+        summary_lines.extend(f"  * {f}" for f in failed)
+    summary_lines += ["", f"Skipped (cooldown active): {skipped_cooldown} renter(s)"]
+    return f"Instrument Rental Nag Summary — {today}", "\n".join(summary_lines)
+
+
 def instrument_rental_staying(request):
     from django.core.signing import TimestampSigner
     token = request.GET.get("t", "")
@@ -1,7 +1,6 @@
 import email.policy
 import hashlib
 import logging
-import threading
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -11,7 +10,13 @@ from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.urls import reverse
 
-from blowcomotion.models import EmailChangeToken, Member, PasswordSetToken
+from blowcomotion import mail_queue
+from blowcomotion.models import (
+    EmailChangeToken,
+    Member,
+    OutboundEmail,
+    PasswordSetToken,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,47 +37,53 @@ class _MemberEmail(EmailMessage):
         result = super().send(fail_silently=fail_silently)
         extra = getattr(settings, "FORM_TEST_EMAIL", None)
         if extra and extra not in self.to:
-            copy = _MemberEmail(subject=self.subject, body=self.body, from_email=self.from_email, to=[extra])
-            EmailMessage.send(copy, fail_silently=True)
+            # Same connection as the original, so a BulkMailer batch stays on one SMTP session.
+            copy = _MemberEmail(
+                subject=self.subject, body=self.body, from_email=self.from_email, to=[extra], connection=self.connection
+            )
+            try:
+                EmailMessage.send(copy, fail_silently=True)
+            except Exception:
+                # fail_silently only applies to connections send() opens itself.
+                logger.warning("Failed to send FORM_TEST_EMAIL copy of %r", self.subject, exc_info=True)
         return result
 
 
-def _dispatch_email(email_message, fail_silently=False, background=False):
-    """Send an EmailMessage, optionally off of the request/command thread.
-
-    Runs synchronously whenever the locmem test backend is active, so tests
-    can assert on mail.outbox immediately after the request/command returns.
-    Otherwise, when background=True, sends from a daemon thread so a slow
-    SMTP server can't stall the caller (e.g. a public form submission).
+def _dispatch_email(email_message, fail_silently=False, background=False,
+                    priority=OutboundEmail.PRIORITY_NORMAL, category=""):
+    """Send an EmailMessage now, or queue it for the send_queued_emails worker.
 
-    background should only be True for request-serving code paths: a daemon
-    thread is killed the instant its process exits, so one-shot management
-    commands must keep sending synchronously to avoid dropping mail.
+    background=True writes an OutboundEmail row (see blowcomotion.mail_queue)
+    instead of talking to SMTP, so a slow mail server can't stall the caller
+    (e.g. a public form submission) and a worker restart can't drop the
+    message; the worker retries failures.
     """
-    if not background or settings.EMAIL_BACKEND == "django.core.mail.backends.locmem.EmailBackend":
-        email_message.send(fail_silently=fail_silently)
+    if background:
+        mail_queue.enqueue(email_message, priority=priority, category=category)
         return
-
-    def _send():
-        try:
-            email_message.send(fail_silently=False)
-        except Exception:
-            logger.exception(
-                "Background email send failed (subject=%r, to=%r)",
-                email_message.subject, email_message.to,
-            )
-
-    threading.Thread(target=_send, daemon=True).start()
+    email_message.send(fail_silently=fail_silently)
 
 
-def _send_mail(subject, body, from_email, recipient, background=False):
+def _send_mail(subject, body, from_email, recipient, background=False, mailer=None,
+               priority=OutboundEmail.PRIORITY_NORMAL, category=""):
     email_message = _MemberEmail(
         subject=subject,
         body=body,
         from_email=from_email,
         to=[recipient],
     )
-    _dispatch_email(email_message, fail_silently=False, background=background)
+    if mailer is not None:
+        mailer.send(email_message)
+        return
+    _dispatch_email(email_message, fail_silently=False, background=background, priority=priority, category=category)
+
+
+def _send_auth_mail(subject, body, recipient, category, mailer=None):
+    """Queue an account email ahead of everything else, unless a bulk sender passes its BulkMailer."""
+    _send_mail(
+        subject, body, settings.FROM_EMAIL, recipient,
+        background=mailer is None, mailer=mailer, priority=OutboundEmail.PRIORITY_AUTH, category=category,
+    )
 
 
 def needs_set_password(member):
@@ -124,8 +135,11 @@ def _supersede_set_password_tokens(member):
     ).update(superseded=True)
 
 
-def send_set_password_email(member, base_url):
-    """Generate a PasswordSetToken and email member a direct set-password link."""
+def send_set_password_email(member, base_url, mailer=None):
+    """Generate a PasswordSetToken and email member a direct set-password link.
+
+    Pass a blowcomotion.bulk_mail.BulkMailer when sending many (see invite_members).
+    """
     _supersede_set_password_tokens(member)
     token = PasswordSetToken.objects.create(member=member)
 
@@ -135,7 +149,7 @@ def send_set_password_email(member, base_url):
         "emails/set_password.txt",
         {"member": member, "set_password_url": set_password_url},
     )
-    _send_mail(subject, message, settings.FROM_EMAIL, member.email)
+    _send_auth_mail(subject, message, member.email, "set_password", mailer=mailer)
     logger.info(f"Sent set-password email to member {member.pk} ({member.email})")
 
 
@@ -150,7 +164,7 @@ def send_email_change_confirmation(member, new_email, base_url):
         "emails/email_change_confirm.txt",
         {"member": member, "new_email": new_email, "confirm_url": confirm_url},
     )
-    _send_mail(subject, message, settings.FROM_EMAIL, new_email)
+    _send_auth_mail(subject, message, new_email, "email_change")
     member.pending_email = new_email
     member.save(update_fields=["pending_email"], sync_go3=False)
     logger.info(f"Sent email-change confirmation to {new_email} for member {member.pk}")
@@ -159,9 +173,8 @@ def send_email_change_confirmation(member, new_email, base_url):
 def send_member_signup_welcome_email(member, base_url, background=False):
     """Create a PasswordSetToken and email the new member a welcome with both next steps.
 
-    background=True sends the email from a daemon thread so a slow SMTP
-    server doesn't stall the signup request; pass it only from request-serving
-    call sites (see _dispatch_email).
+    background=True queues the email (see _dispatch_email) so a slow SMTP
+    server doesn't stall the signup request.
     """
     _supersede_set_password_tokens(member)
     token = PasswordSetToken.objects.create(member=member)
@@ -175,7 +188,10 @@ def send_member_signup_welcome_email(member, base_url, background=False):
             "get_access_url": f"{base_url}{reverse('member-get-access')}",
         },
     )
-    _send_mail(subject, message, settings.FROM_EMAIL, member.email, background=background)
+    _send_mail(
+        subject, message, settings.FROM_EMAIL, member.email,
+        background=background, priority=OutboundEmail.PRIORITY_AUTH, category="signup_welcome",
+    )
     logger.info(f"Sent signup welcome email to member {member.pk} ({member.email})")
 
 
@@ -222,7 +238,7 @@ def send_login_link_email(member, base_url):
         "emails/login_link.txt",
         {"member": member, "login_url": login_url},
     )
-    _send_mail(subject, message, settings.FROM_EMAIL, member.email)
+    _send_auth_mail(subject, message, member.email, "login_link")
     logger.info(f"Sent login link email to member {member.pk} ({member.email})")
 
 
@@ -245,5 +261,5 @@ def send_signup_invite_email(email, base_url):
         "emails/member_signup_invite.txt",
         {"signup_url": signup_url},
     )
-    _send_mail(subject, message, settings.FROM_EMAIL, email)
+    _send_auth_mail(subject, message, email, "signup_invite")
     logger.info(f"Sent signup invite to non-member address: {email}")
@@ -0,0 +1,37 @@
+"""
+CSV export rows for members (see blowcomotion.exports), shared by the admin
+export view and the export_members_to_csv command.
+"""
+from django.db.models import Prefetch
+
+from blowcomotion.exports import EXPORT_CHUNK_SIZE, serialize
+from blowcomotion.models import Member, MemberInstrument
+
+EXTRA_HEADERS = [
+    "primary_instrument_name",
+    "additional_instruments",
+]
+
+
+def member_rows(include_extra=False):
+    """
+    Header row, then one row per member with every concrete Member field;
+    ``include_extra`` adds human-readable primary and additional instrument
+    columns.
+    """
+    fields = Member._meta.concrete_fields
+    yield [field.attname for field in fields] + (EXTRA_HEADERS if include_extra else [])
+
+    members = Member.objects.select_related("user").order_by("user__last_name", "user__first_name", "id")
+    if include_extra:
+        members = members.select_related("primary_instrument").prefetch_related(
+            Prefetch("additional_instruments", MemberInstrument.objects.select_related("instrument"))
+        )
+    for member in members.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = [serialize(getattr(member, field.attname)) for field in fields]
+        if include_extra:
+            row.extend([
+                member.primary_instrument.name if member.primary_instrument else "",
+                "; ".join(instrument.instrument.name for instrument in member.additional_instruments.all()),
+            ])
+        yield row
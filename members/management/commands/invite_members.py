@@ -12,6 +12,7 @@ from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from blowcomotion.bulk_mail import BulkMailer
 from blowcomotion.models import Member
 from members.auth import create_member_user, send_set_password_email
 
@@ -58,35 +59,39 @@ class Command(BaseCommand):
         base_url = settings.WAGTAILADMIN_BASE_URL.rstrip("/")
         invited = skipped = errored = 0
 
-        for member in qs:
-            if not member.email:
-                self.stdout.write(f"  SKIP (no email): {member}")
-                skipped += 1
-                continue
+        # One SMTP connection per batch of invites rather than one per email.
+        with BulkMailer() as mailer:
+            for member in qs:
+                if not member.email:
+                    self.stdout.write(f"  SKIP (no email): {member}")
+                    skipped += 1
+                    continue
 
-            if dry_run:
-                self.stdout.write(f"  DRY RUN — would invite: {member} <{member.email}>")
-                if preview_email:
-                    preview_url = f"{base_url}/member/set-password/00000000-0000-0000-0000-000000000000/"
-                    preview = render_to_string(
-                        "emails/set_password.txt",
-                        {"member": member, "set_password_url": preview_url},
-                    )
-                    self.stdout.write(preview)
-                invited += 1
-                continue
+                if dry_run:
+                    self.stdout.write(f"  DRY RUN — would invite: {member} <{member.email}>")
+                    if preview_email:
+                        preview_url = f"{base_url}/member/set-password/00000000-0000-0000-0000-000000000000/"
+                        preview = render_to_string(
+                            "emails/set_password.txt",
+                            {"member": member, "set_password_url": preview_url},
+                        )
+                        self.stdout.write(preview)
+                    invited += 1
+                    continue
 
-            try:
-                create_member_user(member)
-                send_set_password_email(member, base_url)
-                member.invite_sent_at = timezone.now()
-                member.save(update_fields=["invite_sent_at"])
-                self.stdout.write(f"  Invited: {member} <{member.email}>")
-                invited += 1
-            except Exception as exc:
-                self.stderr.write(f"  ERROR for {member} <{member.email}>: {exc}")
-                logger.error(f"invite_members: error inviting member {member.pk}: {exc}")
-                errored += 1
+                try:
+                    create_member_user(member)
+                    send_set_password_email(member, base_url, mailer=mailer)
+                    member.invite_sent_at = timezone.now()
+                    member.save(update_fields=["invite_sent_at"])
+                    self.stdout.write(f"  Invited: {member} <{member.email}>")
+                    invited += 1
+                except Exception as exc:
+                    self.stderr.write(f"  ERROR for {member} <{member.email}>: {exc}")
+                    logger.error(f"invite_members: error inviting member {member.pk}: {exc}")
+                    errored += 1
+        if not dry_run:
+            mailer.log_summary("invite_members")
 
         prefix = "Would invite" if dry_run else "Invited"
         self.stdout.write(
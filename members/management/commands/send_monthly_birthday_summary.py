@@ -39,10 +39,11 @@ from datetime import date, timedelta
 from wagtail.models import Site
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
 from django.core.management.base import BaseCommand, CommandError
 from django.template.loader import render_to_string
 
+from blowcomotion.bulk_mail import send_bulk
 from blowcomotion.models import Member, SiteSettings
 from members.birthdays import get_birthday, get_next_year_birthday_info
 
@@ -268,27 +269,16 @@ class Command(BaseCommand):
                 self.stdout.write('-' * 50)
                 return
 
-            # Send email
+            # Send email (and the copy) over one SMTP connection
             try:
-                send_mail(
-                    subject=subject,
-                    message=text_content,
-                    html_message=html_content,
-                    from_email=settings.FROM_EMAIL,
-                    recipient_list=recipient_list,
-                    fail_silently=False,
-                )
+                messages = [self._build_message(subject, text_content, html_content, recipient_list)]
                 # Send a copy for verifying functionality
                 extra_email = settings.FORM_TEST_EMAIL if hasattr(settings, 'FORM_TEST_EMAIL') else None
                 if extra_email:
-                    send_mail(
-                        subject=f"[COPY] {subject}",
-                        message=text_content,
-                        html_message=html_content,
-                        from_email=settings.FROM_EMAIL,
-                        recipient_list=[extra_email],
-                        fail_silently=False,
-                    )
+                    messages.append(self._build_message(f"[COPY] {subject}", text_content, html_content, [extra_email]))
+                report = send_bulk(messages)
+                if report.failed:
+                    raise RuntimeError('; '.join(report.report_lines()))
                 logger.info(
                     f"{email_label} sent successfully for {period_label} "
                     f"to {len(recipient_list)} recipient(s)"
@@ -311,6 +301,12 @@ class Command(BaseCommand):
             logger.error(f"Unexpected error in send_monthly_birthday_summary command: {str(e)}")
             raise CommandError(f"Unexpected error: {str(e)}")
 
+    def _build_message(self, subject, text_content, html_content, recipients):
+        message = EmailMultiAlternatives(subject, text_content, settings.FROM_EMAIL, recipients)
+        if html_content:
+            message.attach_alternative(html_content, 'text/html')
+        return message
+
     def _get_upcoming_birthdays(self, target_month, target_year):
         """Get all members with birthdays in the specified month"""
         # Get all active members with birthday information for the target month
@@ -8,7 +8,16 @@ logger = logging.getLogger(__name__)
 
 
 class MemberIdleLogoutMiddleware:
-    """Logs out non-staff members after MEMBER_IDLE_TIMEOUT seconds of inactivity."""
+    """
+    Logs out non-staff members after MEMBER_IDLE_TIMEOUT seconds of inactivity.
+
+    The session's last_activity timestamp is only rewritten once it is
+    MEMBER_IDLE_WRITE_GRANULARITY seconds old, so a burst of page views costs
+    one session save rather than one per request (the timeout is therefore
+    accurate to within that many seconds). Requests matching
+    MEMBER_IDLE_EXEMPT_PATHS, and optionally HTMX polls and JSON calls, are
+    still logged out when idle but never count as activity.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
@@ -36,5 +45,27 @@ class MemberIdleLogoutMiddleware:
             logger.info(f"Member session expired for user {request.user.pk}")
             return redirect(f"{login_url}?next={request.path}")
 
-        request.session["last_activity"] = now
+        if self.is_background_request(request):
+            return None
+
+        granularity = getattr(settings, "MEMBER_IDLE_WRITE_GRANULARITY", 60)
+        if last_activity is None or (now - last_activity) >= granularity:
+            request.session["last_activity"] = now
         return None
+
+    @staticmethod
+    def is_background_request(request):
+        """True for requests that shouldn't keep an idle member logged in."""
+        if any(request.path.startswith(prefix) for prefix in getattr(settings, "MEMBER_IDLE_EXEMPT_PATHS", ())):
+            return True
+        if (
+            getattr(settings, "MEMBER_IDLE_EXEMPT_HTMX_POLLS", False)
+            and request.headers.get("HX-Request") == "true"
+            and request.headers.get("X-Poll") == "true"
+        ):
+            return True
+        if getattr(settings, "MEMBER_IDLE_EXEMPT_JSON", False):
+            accept = request.headers.get("Accept", "")
+            if "application/json" in accept and "text/html" not in accept:
+                return True
+        return False
@@ -72,7 +72,7 @@ class InviteMembersCommandTests(TestCase):
         m2 = make_member("ok@example.com")
 
         call_count = [0]
-        def email_side_effect(member, base_url):
+        def email_side_effect(member, base_url, mailer=None):
             call_count[0] += 1
             if member.email == "fail@example.com":
                 raise Exception("SMTP error")
@@ -5,6 +5,7 @@ from django.core import mail
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from blowcomotion.mail_queue import deliver_queued
 from blowcomotion.models import Member
 from members import auth as members_auth
 from members.auth import create_member_user, make_login_link_token
@@ -45,6 +46,7 @@ class LoginLinkRequestTests(TestCase):
         response = self.client.post(
             reverse("member-login-link-request"), {"email": "SAM@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "a login link has been sent")
         self.assertEqual(len(mail.outbox), 1)
@@ -76,6 +78,7 @@ class LoginLinkRequestTests(TestCase):
         response = self.client.post(
             reverse("member-login-link-request"), {"email": "nopass@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "a login link has been sent")
         self.assertEqual(len(mail.outbox), 1)
@@ -3,6 +3,7 @@ from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 
+from blowcomotion.mail_queue import deliver_queued
 from blowcomotion.models import EmailChangeToken, Member, PasswordSetToken
 from members.auth import create_member_user
 
@@ -262,12 +263,14 @@ class SendSetPasswordEmailTests(TestCase):
     def test_sends_email_to_member(self):
         from django.core import mail
         send_set_password_email(self.member, "http://testserver")
+        deliver_queued()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("invite@example.com", mail.outbox[0].to)
 
     def test_email_contains_set_password_link(self):
         from django.core import mail
         send_set_password_email(self.member, "http://testserver")
+        deliver_queued()
         self.assertIn("/member/set-password/", mail.outbox[0].body)
 
     def test_creates_password_set_token(self):
@@ -285,6 +288,7 @@ class SendSetPasswordEmailTests(TestCase):
     def test_set_password_email_url_not_qp_wrapped(self):
         from django.core import mail
         send_set_password_email(self.member, "https://www.blowcomotion.org")
+        deliver_queued()
         raw = mail.outbox[0].message().as_string()
         self.assertNotIn("=\n", raw)
 
@@ -300,16 +304,19 @@ class SendEmailChangeConfirmationTests(TestCase):
     def test_sends_email_to_new_address(self):
         from django.core import mail
         send_email_change_confirmation(self.member, "newemail@example.com", "http://testserver")
+        deliver_queued()
         self.assertIn("newemail@example.com", mail.outbox[0].to)
 
     def test_email_contains_confirm_link(self):
         from django.core import mail
         send_email_change_confirmation(self.member, "newemail@example.com", "http://testserver")
+        deliver_queued()
         self.assertIn("/member/confirm-email/", mail.outbox[0].body)
 
     def test_email_change_confirmation_url_not_qp_wrapped(self):
         from django.core import mail
         send_email_change_confirmation(self.member, "newemail@example.com", "https://www.blowcomotion.org")
+        deliver_queued()
         raw = mail.outbox[0].message().as_string()
         self.assertNotIn("=\n", raw)
 
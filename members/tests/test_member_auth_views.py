@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from blowcomotion.mail_queue import deliver_queued
 from blowcomotion.models import Member, PasswordSetToken
 from members.auth import create_member_user
 
@@ -126,6 +127,7 @@ class GetAccessViewTests(TestCase):
         response = self.client.post(
             reverse("member-get-access"), {"email": "nobody@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         from django.core import mail
         self.assertEqual(len(mail.outbox), 1)
@@ -137,6 +139,7 @@ class GetAccessViewTests(TestCase):
         response = self.client.post(
             reverse("member-get-access"), {"email": "newbie@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         from django.core import mail
         self.assertEqual(len(mail.outbox), 1)
@@ -162,6 +165,7 @@ class GetAccessViewTests(TestCase):
         response = self.client.post(
             reverse("member-get-access"), {"email": "inactive@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("/member/set-password/", mail.outbox[0].body)
@@ -177,6 +181,7 @@ class GetAccessViewTests(TestCase):
         response = self.client.post(
             reverse("member-get-access"), {"email": "oldmember@example.com"}
         )
+        deliver_queued()
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn("/member/set-password/", mail.outbox[0].body)
@@ -197,6 +202,7 @@ class GetAccessViewTests(TestCase):
         self.client.post(
             reverse("member-get-access"), {"email": "newperson2@example.com"}
         )
+        deliver_queued()
         raw = mail.outbox[0].message().as_string()
         self.assertNotIn("=\n", raw)
 
@@ -208,6 +214,7 @@ class GetAccessViewTests(TestCase):
             self.client.post(
                 reverse("member-get-access"), {"email": "newperson@example.com"}
             )
+        deliver_queued()
         self.assertEqual(len(mail.outbox), 2)
 
 
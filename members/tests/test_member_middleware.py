@@ -2,6 +2,7 @@ import time
 
 from django.contrib.auth import get_user_model
 from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
 from django.utils import timezone
 
 User = get_user_model()
@@ -77,3 +78,89 @@ class MemberIdleLogoutMiddlewareTests(TestCase):
         request = _make_request(AnonymousUser())
         result = mw.process_request(request)
         self.assertIsNone(result)
+
+
+@override_settings(
+    MEMBER_IDLE_TIMEOUT=3600,
+    MEMBER_IDLE_WRITE_GRANULARITY=60,
+    MEMBER_IDLE_EXEMPT_PATHS=["/static/"],
+    MEMBER_IDLE_EXEMPT_HTMX_POLLS=True,
+    MEMBER_IDLE_EXEMPT_JSON=True,
+)
+class MemberIdleWriteThrottleTests(TestCase):
+    def get_middleware(self):
+        from members.middleware import MemberIdleLogoutMiddleware
+        return MemberIdleLogoutMiddleware(get_response=lambda r: None)
+
+    def test_rapid_requests_do_not_save_the_session(self):
+        from unittest.mock import patch
+
+        from django.contrib.sessions.backends.db import SessionStore
+
+        self.client.force_login(_make_user())
+        url = reverse("member-home")
+        self.client.get(url)  # first request records last_activity
+        with patch.object(SessionStore, "save", autospec=True, side_effect=SessionStore.save) as save:
+            for _ in range(5):
+                self.client.get(url)
+        self.assertEqual(save.call_count, 0)
+
+    def test_timestamp_refreshed_once_older_than_granularity(self):
+        mw = self.get_middleware()
+        stale = timezone.now().timestamp() - 90
+        request = _make_request(_make_user(), {"last_activity": stale})
+        mw.process_request(request)
+        self.assertGreater(request.session["last_activity"], stale)
+
+        fresh = timezone.now().timestamp() - 30
+        request = _make_request(_make_user(), {"last_activity": fresh})
+        mw.process_request(request)
+        self.assertEqual(request.session["last_activity"], fresh)
+
+    def test_background_requests_are_not_activity(self):
+        mw = self.get_middleware()
+        user = _make_user()
+        stale = timezone.now().timestamp() - 90
+        factory = RequestFactory()
+        for request in (
+            factory.get("/static/css/site.css"),
+            factory.get("/auction/1/grid/", HTTP_HX_REQUEST="true", HTTP_X_POLL="true"),
+            factory.get("/attendance/charts/data/", HTTP_ACCEPT="application/json"),
+        ):
+            request.user = user
+            request.session = {"last_activity": stale}
+            self.assertIsNone(mw.process_request(request))
+            self.assertEqual(request.session["last_activity"], stale)
+
+        request = factory.get("/member/", HTTP_HX_REQUEST="true")  # htmx navigation still counts
+        request.user = user
+        request.session = {"last_activity": stale}
+        mw.process_request(request)
+        self.assertGreater(request.session["last_activity"], stale)
+
+    @override_settings(MEMBER_IDLE_TIMEOUT=60)
+    def test_background_requests_still_log_out_idle_members(self):
+        mw = self.get_middleware()
+        request = RequestFactory().get("/auction/1/grid/", HTTP_HX_REQUEST="true", HTTP_X_POLL="true")
+        request.user = _make_user()
+        request.session = {"last_activity": timezone.now().timestamp() - 120}
+        result = mw.process_request(request)
+        self.assertEqual(result.status_code, 302)
+
+
+class MemberIdleExemptionDefaultsTests(TestCase):
+    def test_polls_and_json_count_as_activity_by_default(self):
+        from members.middleware import MemberIdleLogoutMiddleware
+
+        mw = MemberIdleLogoutMiddleware(get_response=lambda r: None)
+        user = _make_user()
+        stale = timezone.now().timestamp() - 90
+        factory = RequestFactory()
+        for request in (
+            factory.get("/auction/1/grid/", HTTP_HX_REQUEST="true", HTTP_X_POLL="true"),
+            factory.get("/attendance/charts/data/", HTTP_ACCEPT="application/json"),
+        ):
+            request.user = user
+            request.session = {"last_activity": stale}
+            mw.process_request(request)
+            self.assertGreater(request.session["last_activity"], stale)
@@ -9,6 +9,7 @@ from wagtail.models import Site
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from blowcomotion.mail_queue import deliver_queued
 from blowcomotion.models import Instrument, Member, Section, SiteSettings
 from members.utils import send_member_to_go3_band_invite
 
@@ -483,6 +484,7 @@ class MemberSignupCreatesUserTests(TestCase):
                 "primary_instrument": self.instrument.pk,
             },
         )
+        deliver_queued()
         # Welcome email with set-password link should have been sent to member only
         welcome_emails = [m for m in mail.outbox if "http://testserver/member/set-password/" in m.body]
         self.assertTrue(welcome_emails, "Expected a welcome email with a valid set-password URL but none found")
@@ -10,6 +10,8 @@ import requests
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from blowcomotion import integrations
+
 logger = logging.getLogger(__name__)
 
 
@@ -142,8 +144,9 @@ def send_member_to_go3_band_invite(email, use_local_band=False):
     
     try:
         logger.info(f"Sending band invite to GO3 for {email} to band {band_id}")
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        response.raise_for_status()
+        with integrations.guard("go3") as timeout:
+            response = requests.post(url, json=payload, headers=headers, timeout=timeout)
+            response.raise_for_status()
         
         data = response.json()
         
@@ -190,6 +193,13 @@ def send_member_to_go3_band_invite(email, use_local_band=False):
             'invalid': False
         }
         
+    except integrations.CircuitOpenError:
+        logger.warning(f"GO3 circuit open; band invite for {email} not sent")
+        return {
+            'status': 'error',
+            'message': 'GO3 is temporarily unavailable',
+            'data': None
+        }
     except requests.exceptions.Timeout:
         logger.warning(f"Timeout sending GO3 band invite for {email}")
         return {
@@ -1,8 +1,5 @@
 import logging
-import os
-import tempfile
 from datetime import date, timedelta
-from io import StringIO
 
 from django_ratelimit.decorators import ratelimit
 
@@ -15,18 +12,19 @@ from django.contrib.auth.forms import (
     PasswordResetForm,
     SetPasswordForm,
 )
-from django.core.cache import cache
-from django.core.management import call_command
 from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.models import Count
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_GET
 
+from blowcomotion import cache_namespaces
+from blowcomotion.exports import streaming_csv_response
 from blowcomotion.models import (
     CustomImage,
     EmailChangeToken,
@@ -38,6 +36,7 @@ from blowcomotion.models import (
     SiteSettings,
 )
 from blowcomotion.views import _validate_recaptcha
+from gigs.views import make_member_calendar_token
 from instruments.patreon import check_patreon_membership
 from members.auth import (
     _MemberEmail,
@@ -50,6 +49,7 @@ from members.auth import (
     send_set_password_email,
     send_signup_invite_email,
 )
+from members.exports import member_rows
 from members.forms import (
     ALLERGEN_CHOICES,
     DIETARY_CHOICES,
@@ -78,10 +78,12 @@ def _get_member_patreon_status(member):
     """
     Look up (and cache) the logged-in member's own Patreon pledge status.
 
-    Hits the Patreon API via instruments.patreon.check_patreon_membership,
-    which is a full paginated scan of the campaign's member list — too slow
-    to run on every profile page load, so the result is cached per-email for
-    PATREON_STATUS_CACHE_TTL seconds.
+    instruments.patreon.check_patreon_membership reads the local
+    PatreonMember mirror (an indexed lookup whose result carries the mirror's
+    "synced_at"); only before the first sync does it fall back to a full
+    paginated scan of the Patreon API, which is why the result is still
+    cached per-email for PATREON_STATUS_CACHE_TTL seconds. Syncing the mirror
+    invalidates the cache.
 
     Returns None if the member has no email or the lookup fails; callers
     should treat None as "unavailable" rather than erroring. Assumes the
@@ -91,7 +93,7 @@ def _get_member_patreon_status(member):
         return None
 
     cache_key = f"member_patreon_status:{member.email.lower()}"
-    cached = cache.get(cache_key)
+    cached = cache_namespaces.get(cache_namespaces.PATREON, cache_key)
     if cached is not None:
         return cached
 
@@ -104,7 +106,7 @@ def _get_member_patreon_status(member):
         return None
 
     if result is not None:
-        cache.set(cache_key, result, PATREON_STATUS_CACHE_TTL)
+        cache_namespaces.set(cache_namespaces.PATREON, cache_key, result, PATREON_STATUS_CACHE_TTL)
     return result
 
 
@@ -344,6 +346,9 @@ def profile_view(request):
             ).count(),
             "patreon_configured": patreon_configured,
             "patreon_status": _get_member_patreon_status(member) if patreon_configured else None,
+            "calendar_feed_url": request.build_absolute_uri(
+                reverse("gigs-member-calendar", args=[make_member_calendar_token(member)])
+            ),
         }
 
     if request.method == "POST":
@@ -758,39 +763,5 @@ def export_members_csv(request):
         logger.warning("Unauthorized access attempt to export members by user %s", request.user.username)
         return JsonResponse({'error': 'You do not have permission to access this feature'}, status=403)
 
-    include_extra = True
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
-    temp_path = temp_file.name
-    temp_file.close()
-
-    try:
-        logger.info(
-            "Starting member export by user %s (include_extra=%s)",
-            request.user.username,
-            include_extra,
-        )
-        call_command(
-            'export_members_to_csv',
-            output=temp_path,
-            include_extra=include_extra,
-            stdout=StringIO(),
-        )
-
-    except Exception:
-        logger.exception("Error during member export by user %s", request.user.username)
-        return JsonResponse({'error': 'An internal error occurred while exporting members'}, status=500)
-    else:
-        with open(temp_path, 'rb') as csv_file:
-            csv_data = csv_file.read()
-
-        timestamp = timezone.now().strftime('%Y%m%d-%H%M%S')
-        filename = f'members_export_{timestamp}.csv'
-        response = HttpResponse(csv_data, content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        logger.info("Member export completed successfully by user %s", request.user.username)
-        return response
-    finally:
-        try:
-            os.remove(temp_path)
-        except OSError:
-            logger.warning("Temporary file %s could not be removed after member export", temp_path)
+    logger.info("Starting member export by user %s (include_extra=True)", request.user.username)
+    return streaming_csv_response(member_rows(include_extra=True), 'members_export')